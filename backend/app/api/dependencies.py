@@ -9,6 +9,7 @@ from jose import jwt, JWTError
 from typing import Dict, List, Optional
 
 from app.core.config import settings
+from app.db.async_client import async_db
 from app.services.ml_integration_service import get_ml_service, MLIntegrationService
 
 # Permisos por rol fijo. Formato: { moduleId: [submoduleId, ...] }
@@ -106,7 +107,7 @@ async def verify_admin_role(
     role = current_user.get("role")
     if role == "administrador":
         return current_user
-    if _is_custom_role(role) and _get_role_perms(role) is not None:
+    if _is_custom_role(role) and await _get_role_perms(role) is not None:
         return current_user
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -124,7 +125,7 @@ async def verify_operator_access(
     role = current_user.get("role")
     if role in ("operador", "administrador"):
         return current_user
-    if _is_custom_role(role) and _get_role_perms(role) is not None:
+    if _is_custom_role(role) and await _get_role_perms(role) is not None:
         return current_user
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -153,11 +154,11 @@ def get_ml_service_dependency() -> MLIntegrationService:
     return get_ml_service()
 
 
-def _get_role_perms(role: str) -> Optional[Dict[str, List[str]]]:
+async def _get_role_perms(role: str) -> Optional[Dict[str, List[str]]]:
     """
     Retorna el dict de permisos {moduleId: [submoduleId]} para un rol.
     Para roles fijos usa FIXED_ROLE_MODULES.
-    Para roles personalizados consulta la BD (síncrono via supabase client).
+    Para roles personalizados consulta la BD (pool de app.db.async_client).
     Retorna None si el rol no existe.
     """
     if role in FIXED_ROLE_MODULES:
@@ -166,7 +167,8 @@ def _get_role_perms(role: str) -> Optional[Dict[str, List[str]]]:
     from app.db.client import supabase
     if not supabase:
         return None
-    result = supabase.table("roles_personalizados").select("modulos_permitidos").eq("nombre", role).execute()
+    result = await async_db(supabase).table("roles_personalizados") \
+        .select("modulos_permitidos").eq("nombre", role).execute()
     return result.data[0]["modulos_permitidos"] if result.data else None
 
 
@@ -178,7 +180,7 @@ def require_module_access(module_id: str, submodule_id: Optional[str] = None):
     """
     async def _check(current_user: dict = Depends(get_current_user)) -> dict:
         role = current_user.get("role")
-        perms = _get_role_perms(role)
+        perms = await _get_role_perms(role)
 
         if perms is None or module_id not in perms:
             raise HTTPException(
@@ -1,9 +1,19 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from collections import Counter
 
 from app.api.dependencies import verify_admin_role, verify_operator_access
+from app.db.analytics_repository import (
+    fetch_ofertas_stats_por_institucion,
+    fetch_postulaciones_stats,
+    fetch_postulantes_por_oferta,
+    fetch_skills_cloud
+)
+from app.db.async_client import async_db, run_db
+from app.db.batch_queries import fetch_by_ids
 from app.db.client import supabase
 
 router = APIRouter()
@@ -37,16 +47,16 @@ async def get_users_summary(
     """
     try:
         # Total users (Always absolute)
-        total_query = supabase.table("usuarios").select("*", count="exact", head=True).execute()
+        total_query = await async_db(supabase).table("usuarios").select("*", count="exact", head=True).execute()
         total_users = total_query.count
 
         # By Role (Always absolute for distribution chart usually, but let's keep it absolute)
-        estudiantes_query = supabase.table("usuarios").select("*", count="exact", head=True).eq("rol", "estudiante").execute()
-        titulados_query = supabase.table("usuarios").select("*", count="exact", head=True).eq("rol", "titulado").execute()
-        admins_query = supabase.table("usuarios").select("*", count="exact", head=True).eq("rol", "administrador").execute()
+        estudiantes_query = await async_db(supabase).table("usuarios").select("*", count="exact", head=True).eq("rol", "estudiante").execute()
+        titulados_query = await async_db(supabase).table("usuarios").select("*", count="exact", head=True).eq("rol", "titulado").execute()
+        admins_query = await async_db(supabase).table("usuarios").select("*", count="exact", head=True).eq("rol", "administrador").execute()
 
         # Users in period (New Users)
-        recent_query = supabase.table("usuarios").select("*", count="exact", head=True)
+        recent_query = async_db(supabase).table("usuarios").select("*", count="exact", head=True)
         
         if start_date or end_date:
             recent_query = apply_date_filter(recent_query, "created_at", start_date, end_date)
@@ -55,7 +65,7 @@ async def get_users_summary(
             last_month = (datetime.now() - timedelta(days=30)).isoformat()
             recent_query = recent_query.gt("created_at", last_month)
             
-        recent_count = recent_query.execute().count
+        recent_count = (await recent_query.execute()).count
 
         return {
             "total_users": total_users,
@@ -80,9 +90,9 @@ async def get_user_growth(
     Obtener crecimiento de usuarios en el rango.
     """
     try:
-        query = supabase.table("usuarios").select("created_at")
+        query = async_db(supabase).table("usuarios").select("created_at")
         query = apply_date_filter(query, "created_at", start_date, end_date)
-        response = query.execute()
+        response = await query.execute()
         
         growth_data = {}
         
@@ -134,32 +144,8 @@ async def get_skills_cloud(
     Obtener habilidades de perfiles actualizados en el rango.
     """
     try:
-        query = supabase.table("perfiles_profesionales").select("hard_skills, soft_skills")
-        # Filter by updated_at to reflect skills active/added in that period
-        query = apply_date_filter(query, "updated_at", start_date, end_date)
-        response = query.execute()
-        
-        hard_counter = Counter()
-        soft_counter = Counter()
-        
-        for profile in response.data:
-            h_skills = profile.get("hard_skills") or []
-            s_skills = profile.get("soft_skills") or []
-            
-            for s in h_skills:
-                if s: hard_counter[s.strip().lower()] += 1
-                
-            for s in s_skills:
-                if s: soft_counter[s.strip().lower()] += 1
-                
-        # Get top 15
-        top_hard = [{"name": k, "count": v} for k, v in hard_counter.most_common(15)]
-        top_soft = [{"name": k, "count": v} for k, v in soft_counter.most_common(15)]
-        
-        return {
-            "hard_skills": top_hard,
-            "soft_skills": top_soft
-        }
+        # Range sum over the per-day skill counters (migration v11)
+        return await run_db(fetch_skills_cloud, supabase, start_date, end_date)
     except Exception as e:
         print(f"Error fetching skills cloud: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,23 +166,21 @@ async def get_users_report(
     Reporte detallado de usuarios con filtros extendidos.
     """
     try:
-        query = supabase.table("usuarios").select("id, email, nombre_completo, rol, created_at")
+        query = async_db(supabase).table("usuarios").select("id, email, nombre_completo, rol, created_at")
         query = apply_date_filter(query, "created_at", start_date, end_date)
 
         if role:
             query = query.eq("rol", role)
 
-        response = query.order("created_at", desc=True).execute()
+        response = await query.order("created_at", desc=True).execute()
         users = response.data
 
-        # Fetch extended profile info for all users
-        profile_response = supabase.table("perfiles_profesionales") \
-            .select("usuario_id, is_complete, cv_filename, cv_uploaded_at, completeness_score, updated_at, carrera, semestre_actual, hard_skills, soft_skills, nombre_completo") \
-            .execute()
-
-        profiles_map = {}
-        for p in profile_response.data:
-            profiles_map[p['usuario_id']] = p
+        # Only the profiles of the users that passed the date/role filters
+        profiles_map = await run_db(
+            fetch_by_ids, supabase, "perfiles_profesionales", "usuario_id",
+            [user['id'] for user in users],
+            "usuario_id, is_complete, cv_filename, cv_uploaded_at, completeness_score, updated_at, carrera, semestre_actual, hard_skills, soft_skills, nombre_completo"
+        )
 
         result_users = []
         for user in users:
@@ -287,7 +271,7 @@ async def get_offers_report(
     incluyendo segmentacion por rol y carrera de postulantes.
     """
     try:
-        query = supabase.table("convocatorias_laborales") \
+        query = async_db(supabase).table("convocatorias_laborales") \
             .select("*, institutional_profiles(institution_name, sector)")
         query = apply_date_filter(query, "created_at", start_date, end_date)
 
@@ -296,36 +280,12 @@ async def get_offers_report(
         if modalidad:
             query = query.eq("modalidad", modalidad)
 
-        response = query.order("created_at", desc=True).execute()
+        response = await query.order("created_at", desc=True).execute()
         ofertas = response.data
 
-        # Fetch postulaciones with usuario_id for role/career breakdown
-        postulaciones_resp = supabase.table("postulaciones") \
-            .select("oferta_id, match_score, clasificacion, usuario_id") \
-            .execute()
-
-        # Build user role map: usuario_id -> rol
-        users_resp = supabase.table("usuarios").select("id, rol").execute()
-        user_rol_map: Dict[str, str] = {u['id']: u.get('rol', '') for u in users_resp.data}
-
-        # Build user carrera map: usuario_id -> carrera
-        profiles_resp = supabase.table("perfiles_profesionales") \
-            .select("usuario_id, carrera").execute()
-        user_carrera_map: Dict[str, str] = {
-            p['usuario_id']: p['carrera']
-            for p in profiles_resp.data if p.get('carrera')
-        }
-
-        # Build enriched post_map: oferta_id -> [postulacion + rol + carrera]
-        post_map: Dict[str, List] = {}
-        for p in postulaciones_resp.data:
-            oid = p['oferta_id']
-            uid = p.get('usuario_id')
-            post_map.setdefault(oid, []).append({
-                **p,
-                'rol': user_rol_map.get(uid, '') if uid else '',
-                'carrera': user_carrera_map.get(uid, '') if uid else '',
-            })
+        # Aggregates per offer computed in Postgres (views v9/v10)
+        post_stats = await run_db(fetch_postulaciones_stats, supabase)
+        postulantes = await run_db(fetch_postulantes_por_oferta, supabase)
 
         today_dt = datetime.now()
         today = today_dt.strftime("%Y-%m-%d")
@@ -359,21 +319,21 @@ async def get_offers_report(
                 continue
 
             # Postulaciones stats
-            posts = post_map.get(o['id'], [])
-            total_posts = len(posts)
-            scores = [p['match_score'] for p in posts if p.get('match_score') is not None]
-            avg_score = round(sum(scores) / len(scores) * 100, 1) if scores else None
-            aptos = sum(1 for p in posts if p.get('clasificacion') == 'APTO')
-            considerados = sum(1 for p in posts if p.get('clasificacion') == 'CONSIDERADO')
-            no_aptos = sum(1 for p in posts if p.get('clasificacion') == 'NO_APTO')
+            stats = post_stats.get(o['id']) or {}
+            total_posts = stats.get('total', 0)
+            avg_score = round(stats['avg_score'] * 100, 1) if stats.get('avg_score') is not None else None
+            aptos = stats.get('apto', 0)
+            considerados = stats.get('considerado', 0)
+            no_aptos = stats.get('no_apto', 0)
 
             # Role breakdown of applicants
-            n_estudiantes = sum(1 for p in posts if p.get('rol') == 'estudiante')
-            n_titulados = sum(1 for p in posts if p.get('rol') == 'titulado')
+            applicants = postulantes.get(o['id']) or {}
+            n_estudiantes = applicants.get('estudiantes', 0)
+            n_titulados = applicants.get('titulados', 0)
 
-            # Top 3 careers of applicants
-            carrera_counter = Counter(p['carrera'] for p in posts if p.get('carrera'))
-            top_carreras = [c for c, _ in carrera_counter.most_common(3)]
+            # Careers of applicants, most frequent first
+            carreras_postulantes = applicants.get('carreras', [])
+            top_carreras = carreras_postulantes[:3]
 
             # Apply new filters
             if con_postulaciones is True and total_posts == 0:
@@ -387,7 +347,7 @@ async def get_offers_report(
             if rol_postulante == 'titulado' and n_titulados == 0:
                 continue
             if carrera_postulante and not any(
-                carrera_postulante.lower() in c.lower() for c in carrera_counter
+                carrera_postulante.lower() in c.lower() for c in carreras_postulantes
             ):
                 continue
 
@@ -476,39 +436,13 @@ async def get_profiles_report(
     Reporte detallado de perfiles institucionales con filtros extendidos.
     """
     try:
-        query = supabase.table("institutional_profiles").select("*")
+        query = async_db(supabase).table("institutional_profiles").select("*")
         query = apply_date_filter(query, "created_at", start_date, end_date)
-        response = query.order("created_at", desc=True).execute()
+        response = await query.order("created_at", desc=True).execute()
         profiles = response.data
 
-        # Offers count per institution
-        today = datetime.now().strftime("%Y-%m-%d")
-        offers_resp = supabase.table("convocatorias_laborales") \
-            .select("id, institutional_profile_id, is_active, fecha_cierre") \
-            .execute()
-
-        offers_map: Dict[str, Dict] = {}
-        oferta_inst_map: Dict[str, str] = {}
-        for o in offers_resp.data:
-            iid = o.get('institutional_profile_id')
-            oid = o.get('id')
-            if iid:
-                oferta_inst_map[oid] = iid
-                if iid not in offers_map:
-                    offers_map[iid] = {'total': 0, 'activas': 0}
-                offers_map[iid]['total'] += 1
-                is_active = o.get('is_active', True)
-                fecha_cierre = o.get('fecha_cierre')
-                if is_active and not (fecha_cierre and fecha_cierre < today):
-                    offers_map[iid]['activas'] += 1
-
-        # Postulaciones count per institution (through offers)
-        post_resp = supabase.table("postulaciones").select("oferta_id").execute()
-        post_by_inst: Dict[str, int] = {}
-        for p in post_resp.data:
-            iid = oferta_inst_map.get(p.get('oferta_id'))
-            if iid:
-                post_by_inst[iid] = post_by_inst.get(iid, 0) + 1
+        # Offers and postulaciones per institution (view v10)
+        offers_map = await run_db(fetch_ofertas_stats_por_institucion, supabase)
 
         result_profiles = []
 
@@ -531,7 +465,7 @@ async def get_profiles_report(
             if tipo_institucion and tipo_institucion != inst_tipo:
                 continue
 
-            inst_offers = offers_map.get(p['id'], {'total': 0, 'activas': 0})
+            inst_offers = offers_map.get(p['id'], {'total': 0, 'activas': 0, 'postulaciones': 0})
 
             result_profiles.append({
                 "id": p['id'],
@@ -544,7 +478,7 @@ async def get_profiles_report(
                 "is_active": is_active,
                 "total_ofertas": inst_offers['total'],
                 "ofertas_activas": inst_offers['activas'],
-                "total_postulaciones": post_by_inst.get(p['id'], 0),
+                "total_postulaciones": inst_offers['postulaciones'],
                 "created_at": p['created_at'],
                 "updated_at": p.get('updated_at'),
             })
@@ -588,20 +522,16 @@ async def get_compliance_report(
     Muestra cupos disponibles vs postulaciones APTAS por oferta.
     """
     try:
-        query = supabase.table("convocatorias_laborales") \
+        query = async_db(supabase).table("convocatorias_laborales") \
             .select("*, institutional_profiles(institution_name, sector, tipo_institucion)")
         query = apply_date_filter(query, "created_at", start_date, end_date)
         if tipo:
             query = query.eq("tipo", tipo)
-        response = query.order("created_at", desc=True).execute()
+        response = await query.order("created_at", desc=True).execute()
         ofertas = response.data
 
-        # Postulaciones con clasificacion
-        post_resp = supabase.table("postulaciones") \
-            .select("oferta_id, clasificacion").execute()
-        post_map: Dict[str, List] = {}
-        for p in post_resp.data:
-            post_map.setdefault(p['oferta_id'], []).append(p)
+        # Postulaciones por clasificacion (view v9)
+        post_stats = await run_db(fetch_postulaciones_stats, supabase)
 
         today = datetime.now().strftime("%Y-%m-%d")
         result = []
@@ -629,11 +559,11 @@ async def get_compliance_report(
             if institucion and institucion.lower() not in inst_name.lower():
                 continue
 
-            posts = post_map.get(o['id'], [])
-            total_posts = len(posts)
-            aptos = sum(1 for p in posts if p.get('clasificacion') == 'APTO')
-            considerados = sum(1 for p in posts if p.get('clasificacion') == 'CONSIDERADO')
-            no_aptos = sum(1 for p in posts if p.get('clasificacion') == 'NO_APTO')
+            stats = post_stats.get(o['id']) or {}
+            total_posts = stats.get('total', 0)
+            aptos = stats.get('apto', 0)
+            considerados = stats.get('considerado', 0)
+            no_aptos = stats.get('no_apto', 0)
             cupos = o.get('cupos_disponibles') or 1
             # % cumplimiento: aptos / cupos * 100, capped at 100
             pct_cumplimiento = round(min(aptos / cupos * 100, 100), 1) if cupos > 0 else 0
@@ -692,20 +622,16 @@ async def get_positions_by_sector(
     Muestra qué posiciones publicaron las empresas públicas y privadas.
     """
     try:
-        query = supabase.table("convocatorias_laborales") \
+        query = async_db(supabase).table("convocatorias_laborales") \
             .select("id, titulo, tipo, area, created_at, institutional_profiles(institution_name, sector, tipo_institucion)")
         query = apply_date_filter(query, "created_at", start_date, end_date)
         if tipo:
             query = query.eq("tipo", tipo)
-        response = query.order("created_at", desc=True).execute()
+        response = await query.order("created_at", desc=True).execute()
         ofertas = response.data
 
-        # Postulaciones count per offer
-        post_resp = supabase.table("postulaciones").select("oferta_id").execute()
-        post_count: Dict[str, int] = {}
-        for p in post_resp.data:
-            oid = p['oferta_id']
-            post_count[oid] = post_count.get(oid, 0) + 1
+        # Postulaciones count per offer (view v9)
+        post_stats = await run_db(fetch_postulaciones_stats, supabase)
 
         positions = []
         # Aggregated by cargo title + tipo_institucion
@@ -720,7 +646,7 @@ async def get_positions_by_sector(
             if tipo_institucion and tipo_institucion != inst_tipo:
                 continue
 
-            n_posts = post_count.get(o['id'], 0)
+            n_posts = (post_stats.get(o['id']) or {}).get('total', 0)
             cargo = (o.get('titulo') or '').strip()
             area = (o.get('area') or '').strip()
 
@@ -784,20 +710,24 @@ async def get_profile_completion(
     """
     try:
         # Users candidates (Always absolute total)
-        users_query = supabase.table("usuarios").select("id", count="exact", head=True) \
+        users_query = await async_db(supabase).table("usuarios").select("id", count="exact", head=True) \
             .neq("rol", "administrador").execute()
         total_candidates = users_query.count
         
-        # Profiles active/updated in period
-        query = supabase.table("perfiles_profesionales").select("is_complete, cv_filename", count="exact")
-        query = apply_date_filter(query, "updated_at", start_date, end_date)
-        response = query.execute()
-        
-        active_in_period = response.count # Profiles touched in this period
-        data = response.data
-        
-        completed_count = sum(1 for p in data if p.get("is_complete"))
-        with_cv_count = sum(1 for p in data if p.get("cv_filename"))
+        # Profiles active/updated in period: counted in Postgres, no rows downloaded
+        def profiles_in_period():
+            query = async_db(supabase).table("perfiles_profesionales").select("usuario_id", count="exact", head=True)
+            return apply_date_filter(query, "updated_at", start_date, end_date)
+
+        active_resp, completed_resp, with_cv_resp = await asyncio.gather(
+            profiles_in_period().execute(),
+            profiles_in_period().eq("is_complete", True).execute(),
+            profiles_in_period().not_.is_("cv_filename", "null").neq("cv_filename", "").execute(),
+        )
+
+        active_in_period = active_resp.count or 0 # Profiles touched in this period
+        completed_count = completed_resp.count or 0
+        with_cv_count = with_cv_resp.count or 0
         
         return {
             "total_candidates": total_candidates,
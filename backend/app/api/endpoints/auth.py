@@ -1,5 +1,6 @@
 import logging
 from fastapi import APIRouter, HTTPException, status, Depends
+from app.db.async_client import async_db
 from app.db.client import supabase
 from app.core.security import get_password_hash, verify_password, create_access_token
 from app.api.models import UserRegister, UserLogin, Token
@@ -17,7 +18,7 @@ async def register(user: UserRegister):
 
     # 1. Check if email exists
     try:
-        check = supabase.table("usuarios").select("id").eq("email", user.email).execute()
+        check = await async_db(supabase).table("usuarios").select("id").eq("email", user.email).execute()
     except Exception as e:
         logger.error(f"Error de base de datos al verificar email: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -35,12 +36,12 @@ async def register(user: UserRegister):
     }
     
     try:
-        response = supabase.table("usuarios").insert(new_user_data).execute()
+        response = await async_db(supabase).table("usuarios").insert(new_user_data).execute()
         created_user = response.data[0]
         user_id = created_user["id"]
         
         # 3. Create empty profile
-        supabase.table("perfiles_profesionales").insert({"usuario_id": user_id}).execute()
+        await async_db(supabase).table("perfiles_profesionales").insert({"usuario_id": user_id}).execute()
         
         # 4. Generate Token
         access_token = create_access_token(user_id, user.rol)
@@ -64,7 +65,7 @@ async def login(user: UserLogin):
 
     # 1. Get user
     try:
-        response = supabase.table("usuarios").select("*").eq("email", user.email).execute()
+        response = await async_db(supabase).table("usuarios").select("*").eq("email", user.email).execute()
     except Exception as e:
         logger.error(f"Error de base de datos al buscar usuario: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error de conexión con la base de datos: {str(e)}")
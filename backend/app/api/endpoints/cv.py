@@ -1,7 +1,6 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.core import nlp
-import pdfplumber
-import io
+from app.services.pdf_extraction_service import get_pdf_extraction_service
 
 router = APIRouter()
 
@@ -13,18 +12,13 @@ async def upload_cv(file: UploadFile = File(...)):
     try:
         contents = await file.read()
         
-        text = ""
-        with pdfplumber.open(io.BytesIO(contents)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if not text.strip():
-             raise HTTPException(status_code=400, detail="Could not extract text from PDF. It might be an image scan.")
+        try:
+            text = await get_pdf_extraction_service().extract_text(contents)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Could not extract text from PDF. It might be an image scan. ({e})")
 
         # Process with NLP
-        nlp_data = nlp.process_cv_text(text)
+        nlp_data = await nlp.process_cv_text_async(text)
         entities = nlp_data.get("entities", {})
         
         # Extract Skills and Occupations
@@ -69,5 +63,7 @@ async def upload_cv(file: UploadFile = File(...)):
              "raw_text_preview": text[:500] + "..." # Limit preview
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
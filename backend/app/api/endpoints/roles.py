@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.dependencies import get_current_user, verify_admin_role
 from app.api.schemas.role_schemas import RoleCreateRequest, RoleUpdateRequest, RoleResponse
+from app.db.async_client import async_db
 from app.db.client import supabase
 
 router = APIRouter()
@@ -16,7 +17,7 @@ async def list_roles(
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        response = supabase.table("roles_personalizados").select("*").order("created_at", desc=False).execute()
+        response = await async_db(supabase).table("roles_personalizados").select("*").order("created_at", desc=False).execute()
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listando roles: {str(e)}")
@@ -33,7 +34,7 @@ async def create_role(
 
     try:
         # Check name uniqueness
-        check = supabase.table("roles_personalizados").select("id").eq("nombre", role_data.nombre).execute()
+        check = await async_db(supabase).table("roles_personalizados").select("id").eq("nombre", role_data.nombre).execute()
         if check.data:
             raise HTTPException(status_code=400, detail="Ya existe un rol con ese nombre")
 
@@ -42,7 +43,7 @@ async def create_role(
             "descripcion": role_data.descripcion,
             "modulos_permitidos": role_data.modulos_permitidos,
         }
-        response = supabase.table("roles_personalizados").insert(new_role).execute()
+        response = await async_db(supabase).table("roles_personalizados").insert(new_role).execute()
         return response.data[0]
     except HTTPException:
         raise
@@ -60,7 +61,7 @@ async def get_role_by_name(
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        response = supabase.table("roles_personalizados").select("modulos_permitidos").eq("nombre", role_name).execute()
+        response = await async_db(supabase).table("roles_personalizados").select("modulos_permitidos").eq("nombre", role_name).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Rol no encontrado")
         return {"modulos_permitidos": response.data[0]["modulos_permitidos"]}
@@ -80,7 +81,7 @@ async def get_role(
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        response = supabase.table("roles_personalizados").select("*").eq("id", role_id).execute()
+        response = await async_db(supabase).table("roles_personalizados").select("*").eq("id", role_id).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Rol no encontrado")
         return response.data[0]
@@ -107,11 +108,11 @@ async def update_role(
     try:
         # If renaming, check uniqueness
         if "nombre" in data:
-            check = supabase.table("roles_personalizados").select("id").eq("nombre", data["nombre"]).neq("id", role_id).execute()
+            check = await async_db(supabase).table("roles_personalizados").select("id").eq("nombre", data["nombre"]).neq("id", role_id).execute()
             if check.data:
                 raise HTTPException(status_code=400, detail="Ya existe un rol con ese nombre")
 
-        response = supabase.table("roles_personalizados").update(data).eq("id", role_id).execute()
+        response = await async_db(supabase).table("roles_personalizados").update(data).eq("id", role_id).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Rol no encontrado")
         return response.data[0]
@@ -131,7 +132,7 @@ async def delete_role(
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        response = supabase.table("roles_personalizados").delete().eq("id", role_id).execute()
+        response = await async_db(supabase).table("roles_personalizados").delete().eq("id", role_id).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Rol no encontrado")
         return {"message": "Rol eliminado exitosamente"}
@@ -1,9 +1,14 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
 from datetime import datetime
 
 from app.api.dependencies import get_current_user, verify_admin_role, verify_operator_access
 from app.db.client import supabase
+from app.db import pagination
+from app.db.async_client import async_db, run_db
+from app.db.batch_queries import fetch_by_ids
 from app.api.schemas.ml_schemas import (
     UsuariosListResponse, 
     UsuarioAdminResponse, 
@@ -12,8 +17,31 @@ from app.api.schemas.ml_schemas import (
 from app.api.schemas.user_schemas import UserUpdateRequest, PasswordChangeRequest, UserCreateRequest
 from app.services.profile_service import get_profile_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Projections for the admin users table
+USER_LIST_COLUMNS = "id, email, nombre_completo, rol, created_at"
+PROFILE_SUMMARY_COLUMNS = "usuario_id, is_complete, completeness_score, cv_uploaded_at"
+
+
+def _to_admin_response(user: dict, profile: Optional[dict]) -> UsuarioAdminResponse:
+    """Build the admin row from a user and its profile summary (None if missing)"""
+    profile = profile or {}
+    return UsuarioAdminResponse(
+        id=user['id'],
+        email=user['email'],
+        nombre_completo=user.get('nombre_completo'),
+        rol=user['rol'],
+        created_at=user['created_at'],
+        tiene_perfil=bool(profile),
+        perfil_completo=profile.get('is_complete') or False,
+        completeness_score=float(profile.get('completeness_score') or 0),
+        cv_uploaded_at=profile.get('cv_uploaded_at')
+    )
+
+
 # ============================================
 # User Account Self-Management Endpoints
 # ============================================
@@ -30,7 +58,7 @@ async def get_my_account(
 
     try:
         user_id = current_user['user_id']
-        response = supabase.table("usuarios").select("id, email, nombre_completo, rol, created_at").eq("id", user_id).execute()
+        response = await async_db(supabase).table("usuarios").select("id, email, nombre_completo, rol, created_at").eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="User not found")
@@ -48,7 +76,7 @@ async def get_my_account(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting account info: {e}")
+        logger.error(f"Error getting account info: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting account info: {str(e)}")
 
 @router.put("/me")
@@ -73,12 +101,12 @@ async def update_my_account(
     try:
         # If updating email, check if it's already taken by another user
         if 'email' in data:
-            check = supabase.table("usuarios").select("id").eq("email", data['email']).neq("id", user_id).execute()
+            check = await async_db(supabase).table("usuarios").select("id").eq("email", data['email']).neq("id", user_id).execute()
             if check.data:
                 raise HTTPException(status_code=400, detail="Email ya está en uso por otro usuario")
         
         # Update user
-        response = supabase.table("usuarios").update(data).eq("id", user_id).execute()
+        response = await async_db(supabase).table("usuarios").update(data).eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="User not found")
@@ -98,7 +126,7 @@ async def update_my_account(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error updating account: {e}")
+        logger.error(f"Error updating account: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error updating account: {str(e)}")
 
 @router.put("/me/password")
@@ -122,7 +150,7 @@ async def change_my_password(
 
     try:
         # Get current user data
-        response = supabase.table("usuarios").select("password_hash").eq("id", user_id).execute()
+        response = await async_db(supabase).table("usuarios").select("password_hash").eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="User not found")
@@ -138,7 +166,7 @@ async def change_my_password(
         new_password_hash = get_password_hash(new_password)
         
         # Update password
-        update_response = supabase.table("usuarios").update({
+        update_response = await async_db(supabase).table("usuarios").update({
             "password_hash": new_password_hash
         }).eq("id", user_id).execute()
         
@@ -150,7 +178,7 @@ async def change_my_password(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error changing password: {e}")
+        logger.error(f"Error changing password: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error changing password: {str(e)}")
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -167,7 +195,7 @@ async def create_user(
     fixed_roles = ["estudiante", "titulado", "operador", "administrador"]
     if user_data.rol not in fixed_roles:
         # Check if it's a valid custom role
-        custom_check = supabase.table("roles_personalizados").select("id").eq("nombre", user_data.rol).execute()
+        custom_check = await async_db(supabase).table("roles_personalizados").select("id").eq("nombre", user_data.rol).execute()
         if not custom_check.data:
             raise HTTPException(status_code=400, detail=f"Rol inválido. Roles fijos: {', '.join(fixed_roles)}. También puedes usar un rol personalizado creado en Gestión de Sistema.")
 
@@ -176,7 +204,7 @@ async def create_user(
 
     try:
         # Check email uniqueness
-        check = supabase.table("usuarios").select("id").eq("email", user_data.email).execute()
+        check = await async_db(supabase).table("usuarios").select("id").eq("email", user_data.email).execute()
         if check.data:
             raise HTTPException(status_code=400, detail="Email ya registrado")
 
@@ -191,12 +219,12 @@ async def create_user(
             "nombre_completo": user_data.nombre_completo
         }
 
-        response = supabase.table("usuarios").insert(new_user).execute()
+        response = await async_db(supabase).table("usuarios").insert(new_user).execute()
         created_user = response.data[0]
         user_id = created_user["id"]
 
         # Create empty profile
-        supabase.table("perfiles_profesionales").insert({"usuario_id": user_id}).execute()
+        await async_db(supabase).table("perfiles_profesionales").insert({"usuario_id": user_id}).execute()
 
         return {
             "message": "Usuario creado exitosamente",
@@ -212,7 +240,7 @@ async def create_user(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error creating user: {e}")
+        logger.error(f"Error creating user: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error creando usuario: {str(e)}")
 
 @router.get("/", response_model=UsuariosListResponse)
@@ -221,18 +249,25 @@ async def list_users(
     page_size: int = Query(20, ge=1, le=100),
     role: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor de la pagina anterior"),
+    count: str = Query('estimated', description="Conteo del total: 'exact', 'estimated' o 'none'"),
     current_user: dict = Depends(verify_operator_access)
 ):
     """
-    Listar usuarios con paginacion y filtros.
+    Listar usuarios con paginacion por cursor y filtros.
     Solo para operadores y administradores.
     """
     if not supabase:
         raise HTTPException(status_code=500, detail="Database connection not available")
 
+    try:
+        count_mode = pagination.count_option(count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Construct query
-        query = supabase.table("usuarios").select("*", count="exact")
+        query = async_db(supabase).table("usuarios").select(USER_LIST_COLUMNS, count=count_mode)
         
         # Apply filters
         if role:
@@ -242,60 +277,38 @@ async def list_users(
             # Search by email or full name
             query = query.or_(f"email.ilike.%{search}%,nombre_completo.ilike.%{search}%")
             
-        # Pagination
-        start = (page - 1) * page_size
-        end = start + page_size - 1
-        
-        query = query.range(start, end).order("created_at", desc=True)
+        # Keyset pagination on (created_at, id); page only applies without cursor
+        try:
+            query = pagination.apply_keyset(
+                query, page_size, cursor=cursor, offset=(page - 1) * page_size
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Execute
-        response = query.execute()
+        response = await query.execute()
+        rows, next_cursor = pagination.split_page(response.data or [], page_size)
         
-        users_data = []
-        for user in response.data:
-            # Check profile status for each user
-            # Optimization: Try to batch fetch profiles later if performance is an issue
-            # For now, fetching one by one is simpler but slower
-            
-            # Get profile info lightly
-            profile_query = supabase.table("perfiles_profesionales") \
-                .select("id, is_complete, completeness_score, cv_uploaded_at") \
-                .eq("usuario_id", user['id']) \
-                .execute()
-            
-            has_profile = False
-            is_complete = False
-            completeness_score = 0
-            cv_uploaded_at = None
-            
-            if profile_query.data:
-                p_data = profile_query.data[0]
-                has_profile = True
-                is_complete = p_data.get('is_complete', False)
-                completeness_score = p_data.get('completeness_score', 0)
-                cv_uploaded_at = p_data.get('cv_uploaded_at')
-
-            users_data.append(UsuarioAdminResponse(
-                id=user['id'],
-                email=user['email'],
-                nombre_completo=user.get('nombre_completo'),
-                rol=user['rol'],
-                created_at=user['created_at'],
-                tiene_perfil=has_profile,
-                perfil_completo=is_complete,
-                completeness_score=float(completeness_score),
-                cv_uploaded_at=cv_uploaded_at
-            ))
+        # Profile summaries for the whole page in one in_ query
+        profiles = await run_db(
+            fetch_by_ids, supabase, "perfiles_profesionales", "usuario_id",
+            [user['id'] for user in rows], PROFILE_SUMMARY_COLUMNS
+        )
+        users_data = [_to_admin_response(user, profiles.get(user['id'])) for user in rows]
             
         return UsuariosListResponse(
             usuarios=users_data,
             total=response.count,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error listing users: {e}")
+        logger.error(f"Error listing users: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error listing users: {str(e)}")
 
 @router.get("/{user_id}", response_model=UsuarioAdminResponse)
@@ -311,7 +324,7 @@ async def get_user_detail(
 
     try:
         # Get user
-        response = supabase.table("usuarios").select("*").eq("id", user_id).execute()
+        response = await async_db(supabase).table("usuarios").select(USER_LIST_COLUMNS).eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="User not found")
@@ -319,39 +332,17 @@ async def get_user_detail(
         user = response.data[0]
         
         # Get profile status
-        profile_query = supabase.table("perfiles_profesionales") \
-            .select("id, is_complete, completeness_score, cv_uploaded_at") \
+        profile_query = await async_db(supabase).table("perfiles_profesionales") \
+            .select(PROFILE_SUMMARY_COLUMNS) \
             .eq("usuario_id", user['id']) \
             .execute()
-            
-        has_profile = False
-        is_complete = False
-        completeness_score = 0
-        cv_uploaded_at = None
-        
-        if profile_query.data:
-            p_data = profile_query.data[0]
-            has_profile = True
-            is_complete = p_data.get('is_complete', False)
-            completeness_score = p_data.get('completeness_score', 0)
-            cv_uploaded_at = p_data.get('cv_uploaded_at')
-
-        return UsuarioAdminResponse(
-            id=user['id'],
-            email=user['email'],
-            nombre_completo=user.get('nombre_completo'),
-            rol=user['rol'],
-            created_at=user['created_at'],
-            tiene_perfil=has_profile,
-            perfil_completo=is_complete,
-            completeness_score=float(completeness_score),
-            cv_uploaded_at=cv_uploaded_at
-        )
+
+        return _to_admin_response(user, profile_query.data[0] if profile_query.data else None)
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting user: {e}")
+        logger.error(f"Error getting user: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting user: {str(e)}")
 
 @router.get("/{user_id}/profile", response_model=PerfilProfesionalResponse)
@@ -365,7 +356,7 @@ async def get_user_profile_full(
     profile_service = get_profile_service()
     
     try:
-        profile = profile_service.get_profile(user_id)
+        profile = await run_db(profile_service.get_profile, user_id)
         
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found for this user")
@@ -397,7 +388,7 @@ async def get_user_profile_full(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting user profile: {e}")
+        logger.error(f"Error getting user profile: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting user profile: {str(e)}")
 
 
@@ -414,12 +405,12 @@ async def update_user_profile(
     profile_service = get_profile_service()
 
     try:
-        updated = profile_service.update_profile_manual(user_id, updates)
+        updated = await run_db(profile_service.update_profile_manual, user_id, updates)
         return {"message": "Perfil actualizado correctamente", "perfil": updated}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error updating user profile: {e}")
+        logger.error(f"Error updating user profile: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error updating profile: {str(e)}")
 
 
@@ -443,7 +434,7 @@ async def update_user(
          raise HTTPException(status_code=400, detail="No valid fields to update")
 
     try:
-        response = supabase.table("usuarios").update(data).eq("id", user_id).execute()
+        response = await async_db(supabase).table("usuarios").update(data).eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="User not found")
@@ -451,7 +442,7 @@ async def update_user(
         return {"message": "User updated successfully", "user": response.data[0]}
         
     except Exception as e:
-        print(f"Error updating user: {e}")
+        logger.error(f"Error updating user: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error updating user: {str(e)}")
 
 @router.delete("/{user_id}")
@@ -471,10 +462,10 @@ async def delete_user(
     try:
         # Supabase should handle cascade usually, but let's be safe
         # Delete profile first
-        supabase.table("perfiles_profesionales").delete().eq("usuario_id", user_id).execute()
+        await async_db(supabase).table("perfiles_profesionales").delete().eq("usuario_id", user_id).execute()
         
         # Delete user
-        response = supabase.table("usuarios").delete().eq("id", user_id).execute()
+        response = await async_db(supabase).table("usuarios").delete().eq("id", user_id).execute()
         
         if not response.data:
              raise HTTPException(status_code=404, detail="User not found")
@@ -482,7 +473,7 @@ async def delete_user(
         return {"message": "User deleted successfully"}
         
     except Exception as e:
-        print(f"Error deleting user: {e}")
+        logger.error(f"Error deleting user: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
 
 
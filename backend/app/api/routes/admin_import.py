@@ -0,0 +1,125 @@
+"""
+Admin Import Routes - Importacion masiva de CVs
+Endpoint para cargar los CVs de una cohorte completa (PDFs o zip)
+y actualizar los perfiles de los usuarios existentes. La importacion corre
+como job de la cola de CVs; la respuesta es el job_id y el informe se
+consulta en /api/admin/cv-import/{job_id}.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+
+from app.api.dependencies import verify_admin_role
+from app.services.bulk_import_service import MAX_PDF_BYTES, ZipLimitError, read_pdfs_from_zip
+from app.services.cv_job_service import (
+    JOB_KIND_BULK_IMPORT,
+    CVJobQueueFullError,
+    get_cv_job_service
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin/cv-import", tags=["Admin - Importacion CVs"])
+
+# Maximo de CVs por request (cohortes mas grandes: usar import_cvs.py)
+MAX_FILES_PER_REQUEST = 500
+
+# Maximo de bytes de PDF (descomprimidos) por request
+MAX_BYTES_PER_REQUEST = 500 * 1024 * 1024
+
+
+@router.post("", status_code=202)
+async def import_cvs(
+    files: List[UploadFile] = File(..., description="PDFs de CV o un zip con PDFs"),
+    batch_size: Optional[int] = Query(None, ge=1, le=20, description="CVs por request de Gemini"),
+    dry_run: bool = Query(False, description="Extrae y asocia usuarios sin escribir perfiles"),
+    admin_user: dict = Depends(verify_admin_role)
+):
+    """
+    Encola una importacion de CVs en lote.
+
+    Cada CV se asocia al usuario cuyo email aparece en el nombre del archivo
+    (p. ej. juan.perez@ucb.edu.bo.pdf) o, si no hay, en el propio CV.
+    Responde de inmediato con el job_id; al terminar, el resultado del job
+    es el informe de la importacion: CVs importados, errores por archivo,
+    tiempos por etapa y CVs/min.
+    """
+    pdfs = []
+    total_bytes = 0
+    for upload in files:
+        name = upload.filename or ""
+        try:
+            if name.lower().endswith(".zip"):
+                # El indice del zip se valida contra lo que queda del cupo antes
+                # de descomprimir; la lectura va en un hilo (no bloquea el loop)
+                entries = await asyncio.to_thread(
+                    read_pdfs_from_zip,
+                    upload.file,
+                    max_files=MAX_FILES_PER_REQUEST - len(pdfs),
+                    max_bytes=MAX_BYTES_PER_REQUEST - total_bytes
+                )
+                pdfs.extend(entries)
+                total_bytes += sum(len(data) for _, data in entries)
+            elif name.lower().endswith(".pdf") and (upload.size or 0) <= MAX_PDF_BYTES:
+                if len(pdfs) >= MAX_FILES_PER_REQUEST:
+                    raise ZipLimitError(f"Maximo {MAX_FILES_PER_REQUEST} CVs por request")
+                contents = await upload.read()
+                if len(contents) > MAX_PDF_BYTES:
+                    continue
+                if total_bytes + len(contents) > MAX_BYTES_PER_REQUEST:
+                    raise ZipLimitError(
+                        f"Maximo {MAX_BYTES_PER_REQUEST // (1024 * 1024)} MB de PDFs por request"
+                    )
+                pdfs.append((name, contents))
+                total_bytes += len(contents)
+        except ZipLimitError as e:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{str(e)}; use import_cvs.py para lotes mayores"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if not pdfs:
+        raise HTTPException(status_code=400, detail="No se recibieron PDFs validos")
+
+    try:
+        job = await get_cv_job_service().submit_bulk_import(
+            admin_user['user_id'], pdfs, batch_size=batch_size, dry_run=dry_run
+        )
+    except CVJobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'total_files': len(pdfs),
+        'status_url': f"/api/admin/cv-import/{job['id']}"
+    }
+
+
+@router.get("/{job_id}")
+async def get_import_job(
+    job_id: str,
+    admin_user: dict = Depends(verify_admin_role)
+):
+    """
+    Estado de una importacion masiva; al terminar, result es el informe.
+    """
+    job = await get_cv_job_service().get_job(job_id)
+    if job is None or job['kind'] != JOB_KIND_BULK_IMPORT:
+        raise HTTPException(status_code=404, detail="Importacion no encontrada")
+
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'stage': job['stage'],
+        'progress': job['progress'],
+        'error': job['error'],
+        'result': job['result'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    }
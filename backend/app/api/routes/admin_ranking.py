@@ -1,9 +1,11 @@
 """
 Admin Ranking Routes - Evaluación de Candidatos por Oferta
 Endpoints para que administradores vean el ranking de candidatos
-para cada oferta laboral, basado en las postulaciones realizadas.
+para cada oferta laboral, basado en las postulaciones realizadas,
+y el matching inverso contra todos los perfiles completos.
 """
 
+import asyncio
 import io
 import logging
 from typing import Optional
@@ -12,14 +14,110 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import verify_admin_role
+from app.db.async_client import DatabaseTimeoutError, async_db, run_db
 from app.db.client import supabase
+from app.db.batch_queries import (
+    fetch_profiles_by_user_ids,
+    fetch_top_postulaciones,
+    fetch_users_by_ids
+)
 from app.services.oferta_service import get_oferta_service
+from app.services.recommendation_service import get_recommendation_service
+from app.services.postulacion_service import get_postulacion_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/admin/ranking", tags=["Admin - Ranking Candidatos"])
 
 
+EMPTY_STATS = {
+    "total": 0,
+    "apto": 0,
+    "considerado": 0,
+    "no_apto": 0,
+    "mejor_puntaje": None,
+    "promedio_puntaje": None,
+}
+
+# El matching inverso recorre todos los perfiles completos: mas margen que una
+# consulta (cada pagina leida tiene ademas el timeout normal de run_db)
+RANKING_TIMEOUT_SECONDS = 120
+
+PERFIL_COLUMNS = (
+    "usuario_id, nombre_completo, email_contacto, telefono, direccion,"
+    " hard_skills, soft_skills, education_level, experience_years,"
+    " languages, cv_filename, completeness_score"
+)
+
+
+def _load_ranked_candidatos(oferta_id: str, top_n: int, include_gemini: bool = False):
+    """
+    Carga las top_n postulaciones de una oferta con el perfil profesional y
+    los datos de usuario de cada candidato.
+
+    Usa 3 consultas en total (postulaciones + count, perfiles con in_(),
+    usuarios con in_()) en lugar de 2 consultas por candidato.
+
+    Args:
+        oferta_id: ID de la oferta
+        top_n: Número de candidatos
+        include_gemini: Incluir gemini_extraction (para el CV Harvard del informe)
+
+    Returns:
+        Tupla (candidatos, total_postulantes)
+    """
+    posts, total_postulantes = fetch_top_postulaciones(supabase, oferta_id, top_n)
+
+    user_ids = [post["usuario_id"] for post in posts]
+    columns = PERFIL_COLUMNS + (", gemini_extraction" if include_gemini else "")
+    perfiles = fetch_profiles_by_user_ids(supabase, user_ids, columns) if posts else {}
+    usuarios = fetch_users_by_ids(supabase, user_ids) if posts else {}
+
+    candidatos = []
+    for rank, post in enumerate(posts, start=1):
+        usuario_id = post["usuario_id"]
+        perfil = dict(perfiles.get(usuario_id) or {})
+        usuario = usuarios.get(usuario_id) or {}
+        gemini_data = perfil.pop("gemini_extraction", None) or {}
+
+        candidato = {
+            "rank": rank,
+            "usuario_id": usuario_id,
+            "match_score": post["match_score"],
+            "clasificacion": post["clasificacion"],
+            "scores_detalle": post.get("scores_detalle") or {},
+            "fortalezas": post.get("fortalezas") or [],
+            "debilidades": post.get("debilidades") or [],
+            "match_details": post.get("match_details"),
+            "estado_postulacion": post.get("estado", "pendiente"),
+            "postulado_en": post.get("created_at"),
+        }
+        if include_gemini:
+            candidato["gemini_extraction"] = gemini_data
+
+        candidato["perfil"] = {
+            "nombre_completo": (
+                perfil.get("nombre_completo")
+                or usuario.get("nombre_completo")
+                or "Sin nombre"
+            ),
+            "email": perfil.get("email_contacto") or usuario.get("email"),
+            "telefono": perfil.get("telefono"),
+            "direccion": perfil.get("direccion"),
+            "rol": usuario.get("rol"),
+            "hard_skills": perfil.get("hard_skills") or [],
+            "soft_skills": perfil.get("soft_skills") or [],
+            "education_level": perfil.get("education_level"),
+            "experience_years": perfil.get("experience_years") or 0,
+            "languages": perfil.get("languages") or [],
+            "completeness_score": perfil.get("completeness_score") or 0,
+            "cv_filename": perfil.get("cv_filename"),
+        }
+        candidatos.append(candidato)
+
+    return candidatos, total_postulantes
+
+
 @router.get("/convocatorias")
 async def list_ofertas_con_stats(
     tipo: Optional[str] = Query(None, description="Filtrar por tipo: 'pasantia' o 'empleo'"),
@@ -36,7 +134,7 @@ async def list_ofertas_con_stats(
         raise HTTPException(status_code=503, detail="Base de datos no disponible")
 
     try:
-        query = supabase.table("convocatorias_laborales") \
+        query = async_db(supabase).table("convocatorias_laborales") \
             .select(
                 "id, titulo, tipo, modalidad, ubicacion, area, descripcion,"
                 " cupos_disponibles, is_active, fecha_inicio, fecha_cierre,"
@@ -51,7 +149,7 @@ async def list_ofertas_con_stats(
         if is_active is not None:
             query = query.eq("is_active", is_active)
 
-        response = query.execute()
+        response = await query.execute()
         ofertas = response.data or []
 
         # Filtro de búsqueda por título (client-side, dataset pequeño)
@@ -59,29 +157,15 @@ async def list_ofertas_con_stats(
             search_lower = search.lower()
             ofertas = [o for o in ofertas if search_lower in o.get("titulo", "").lower()]
 
+        # Estadísticas de todas las ofertas en una sola consulta (con cache)
+        stats_por_oferta = await run_db(get_postulacion_service().get_stats_por_oferta)
+
         result = []
         for oferta in ofertas:
             inst = oferta.pop("institutional_profiles", None) or {}
             oferta["institution_name"] = inst.get("institution_name")
             oferta["sector"] = inst.get("sector")
-
-            # Estadísticas de postulaciones para esta oferta
-            stats_resp = supabase.table("postulaciones") \
-                .select("clasificacion, match_score") \
-                .eq("oferta_id", oferta["id"]) \
-                .execute()
-
-            posts = stats_resp.data or []
-            scores = [p["match_score"] for p in posts if p.get("match_score") is not None]
-
-            oferta["stats"] = {
-                "total": len(posts),
-                "apto": sum(1 for p in posts if p.get("clasificacion") == "APTO"),
-                "considerado": sum(1 for p in posts if p.get("clasificacion") == "CONSIDERADO"),
-                "no_apto": sum(1 for p in posts if p.get("clasificacion") == "NO_APTO"),
-                "mejor_puntaje": round(max(scores) * 100) if scores else None,
-                "promedio_puntaje": round(sum(scores) / len(scores) * 100) if scores else None,
-            }
+            oferta["stats"] = stats_por_oferta.get(oferta["id"]) or dict(EMPTY_STATS)
             result.append(oferta)
 
         return {"ofertas": result, "total": len(result)}
@@ -112,75 +196,12 @@ async def get_ranking_candidatos(
     try:
         # Detalle completo de la oferta
         oferta_service = get_oferta_service()
-        oferta = oferta_service.get_oferta(oferta_id)
+        oferta = await run_db(oferta_service.get_oferta, oferta_id)
         if not oferta:
             raise HTTPException(status_code=404, detail="Oferta no encontrada")
 
-        # Top N postulaciones ordenadas por puntaje
-        posts_resp = supabase.table("postulaciones") \
-            .select("*") \
-            .eq("oferta_id", oferta_id) \
-            .order("match_score", desc=True) \
-            .limit(top_n) \
-            .execute()
-
-        posts = posts_resp.data or []
-
-        # Total de postulantes (para contexto)
-        total_resp = supabase.table("postulaciones") \
-            .select("id", count="exact") \
-            .eq("oferta_id", oferta_id) \
-            .execute()
-        total_postulantes = total_resp.count or len(posts)
-
-        candidatos = []
-        for rank, post in enumerate(posts, start=1):
-            usuario_id = post["usuario_id"]
-
-            # Perfil profesional del candidato
-            perfil_resp = supabase.table("perfiles_profesionales") \
-                .select(
-                    "nombre_completo, email_contacto, telefono, direccion,"
-                    " hard_skills, soft_skills, education_level, experience_years,"
-                    " languages, cv_filename, completeness_score"
-                ) \
-                .eq("usuario_id", usuario_id) \
-                .execute()
-            perfil = perfil_resp.data[0] if perfil_resp.data else {}
-
-            # Datos básicos del usuario (email, rol)
-            usuario_resp = supabase.table("usuarios") \
-                .select("email, nombre_completo, rol") \
-                .eq("id", usuario_id) \
-                .execute()
-            usuario = usuario_resp.data[0] if usuario_resp.data else {}
-
-            candidatos.append({
-                "rank": rank,
-                "usuario_id": usuario_id,
-                "match_score": post["match_score"],
-                "clasificacion": post["clasificacion"],
-                "scores_detalle": post.get("scores_detalle") or {},
-                "fortalezas": post.get("fortalezas") or [],
-                "debilidades": post.get("debilidades") or [],
-                "match_details": post.get("match_details"),
-                "estado_postulacion": post.get("estado", "pendiente"),
-                "postulado_en": post.get("created_at"),
-                "perfil": {
-                    "nombre_completo": perfil.get("nombre_completo") or usuario.get("nombre_completo") or "Sin nombre",
-                    "email": perfil.get("email_contacto") or usuario.get("email"),
-                    "telefono": perfil.get("telefono"),
-                    "direccion": perfil.get("direccion"),
-                    "rol": usuario.get("rol"),
-                    "hard_skills": perfil.get("hard_skills") or [],
-                    "soft_skills": perfil.get("soft_skills") or [],
-                    "education_level": perfil.get("education_level"),
-                    "experience_years": perfil.get("experience_years") or 0,
-                    "languages": perfil.get("languages") or [],
-                    "completeness_score": perfil.get("completeness_score") or 0,
-                    "cv_filename": perfil.get("cv_filename"),
-                },
-            })
+        # Top N postulaciones con perfil y usuario (round trips constantes)
+        candidatos, total_postulantes = await run_db(_load_ranked_candidatos, oferta_id, top_n)
 
         return {
             "oferta": oferta,
@@ -196,6 +217,55 @@ async def get_ranking_candidatos(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/convocatorias/{oferta_id}/candidatos-sugeridos")
+async def get_candidatos_sugeridos(
+    oferta_id: str,
+    top_n: int = Query(default=10, ge=1, le=100, description="Número de candidatos a mostrar"),
+    page_size: int = Query(default=500, ge=50, le=2000, description="Perfiles evaluados por lote"),
+    prefilter_k: Optional[int] = Query(
+        default=None, ge=10, le=50000,
+        description="Evaluar solo los K perfiles con más skills en común (opcional)"
+    ),
+    current_user: dict = Depends(verify_admin_role)
+):
+    """
+    Matching inverso: los mejores candidatos para una oferta entre TODOS
+    los perfiles completos, hayan postulado o no.
+
+    Los perfiles se evalúan por páginas con una llamada vectorizada por
+    página; la respuesta incluye explicación (fortalezas, debilidades y
+    match details) solo para los top_n. Solo las lecturas usan el pool de
+    la base de datos; la evaluación corre en un thread aparte.
+    """
+    if not supabase:
+        raise HTTPException(status_code=503, detail="Base de datos no disponible")
+
+    try:
+        recommendation_service = get_recommendation_service()
+        return await asyncio.wait_for(
+            recommendation_service.rank_candidates_for_oferta_async(
+                oferta_id,
+                top_n=top_n,
+                page_size=page_size,
+                prefilter_k=prefilter_k
+            ),
+            timeout=RANKING_TIMEOUT_SECONDS
+        )
+
+    except DatabaseTimeoutError:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"El matching inverso excedio {RANKING_TIMEOUT_SECONDS} segundos"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error en matching inverso para oferta {oferta_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/convocatorias/{oferta_id}/generar-informe")
 async def generar_informe_candidatos(
     oferta_id: str,
@@ -220,14 +290,14 @@ async def generar_informe_candidatos(
     try:
         # Obtener oferta
         oferta_service = get_oferta_service()
-        oferta = oferta_service.get_oferta(oferta_id)
+        oferta = await run_db(oferta_service.get_oferta, oferta_id)
         if not oferta:
             raise HTTPException(status_code=404, detail="Oferta no encontrada")
 
         # Complementar con datos institucionales si faltan
         inst_id = oferta.get('institutional_profile_id')
         if inst_id and not oferta.get('institution_name'):
-            inst_resp = supabase.table("institutional_profiles") \
+            inst_resp = await async_db(supabase).table("institutional_profiles") \
                 .select("institution_name, sector") \
                 .eq("id", inst_id) \
                 .execute()
@@ -235,75 +305,10 @@ async def generar_informe_candidatos(
                 oferta['institution_name'] = inst_resp.data[0].get('institution_name')
                 oferta['sector'] = inst_resp.data[0].get('sector')
 
-        # Top N postulaciones ordenadas por puntaje
-        posts_resp = supabase.table("postulaciones") \
-            .select("*") \
-            .eq("oferta_id", oferta_id) \
-            .order("match_score", desc=True) \
-            .limit(top_n) \
-            .execute()
-        posts = posts_resp.data or []
-
-        # Total de postulantes
-        total_resp = supabase.table("postulaciones") \
-            .select("id", count="exact") \
-            .eq("oferta_id", oferta_id) \
-            .execute()
-        total_postulantes = total_resp.count or len(posts)
-
-        candidatos = []
-        for rank, post in enumerate(posts, start=1):
-            usuario_id = post["usuario_id"]
-
-            # Perfil profesional con gemini_extraction para el CV Harvard
-            perfil_resp = supabase.table("perfiles_profesionales") \
-                .select(
-                    "nombre_completo, email_contacto, telefono, direccion,"
-                    " hard_skills, soft_skills, education_level, experience_years,"
-                    " languages, cv_filename, completeness_score, gemini_extraction"
-                ) \
-                .eq("usuario_id", usuario_id) \
-                .execute()
-            perfil = perfil_resp.data[0] if perfil_resp.data else {}
-            gemini_data = perfil.pop("gemini_extraction", None) or {}
-
-            usuario_resp = supabase.table("usuarios") \
-                .select("email, nombre_completo, rol") \
-                .eq("id", usuario_id) \
-                .execute()
-            usuario = usuario_resp.data[0] if usuario_resp.data else {}
-
-            candidatos.append({
-                "rank": rank,
-                "usuario_id": usuario_id,
-                "match_score": post["match_score"],
-                "clasificacion": post["clasificacion"],
-                "scores_detalle": post.get("scores_detalle") or {},
-                "fortalezas": post.get("fortalezas") or [],
-                "debilidades": post.get("debilidades") or [],
-                "match_details": post.get("match_details"),
-                "estado_postulacion": post.get("estado", "pendiente"),
-                "postulado_en": post.get("created_at"),
-                "gemini_extraction": gemini_data,
-                "perfil": {
-                    "nombre_completo": (
-                        perfil.get("nombre_completo")
-                        or usuario.get("nombre_completo")
-                        or "Sin nombre"
-                    ),
-                    "email": perfil.get("email_contacto") or usuario.get("email"),
-                    "telefono": perfil.get("telefono"),
-                    "direccion": perfil.get("direccion"),
-                    "rol": usuario.get("rol"),
-                    "hard_skills": perfil.get("hard_skills") or [],
-                    "soft_skills": perfil.get("soft_skills") or [],
-                    "education_level": perfil.get("education_level"),
-                    "experience_years": perfil.get("experience_years") or 0,
-                    "languages": perfil.get("languages") or [],
-                    "completeness_score": perfil.get("completeness_score") or 0,
-                    "cv_filename": perfil.get("cv_filename"),
-                },
-            })
+        # Top N postulaciones con perfil y usuario (round trips constantes)
+        candidatos, total_postulantes = await run_db(
+            _load_ranked_candidatos, oferta_id, top_n, include_gemini=True
+        )
 
         # Generar PDF
         from app.services.pdf_report_service import get_pdf_report_service
@@ -0,0 +1,53 @@
+"""
+Admin Search Routes - Busqueda del panel de administracion
+Endpoint de busqueda por prefijos sobre usuarios, perfiles y ofertas,
+ordenada por relevancia (indices full-text y trigram de la migracion v14).
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.dependencies import verify_operator_access
+from app.db import search_repository
+from app.db.async_client import run_db
+from app.db.client import supabase
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin/search", tags=["Admin - Busqueda"])
+
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=2, max_length=100, description="Texto a buscar (cada palabra como prefijo)"),
+    entidad: Optional[str] = Query(None, description="'usuarios', 'perfiles' u 'ofertas' (todas si se omite)"),
+    limit: int = Query(20, ge=1, le=50, description="Maximo de resultados"),
+    current_user: dict = Depends(verify_operator_access)
+):
+    """
+    Busca usuarios, perfiles profesionales y ofertas.
+
+    Pensado para busqueda mientras se escribe: "ana ing" encuentra a
+    "Ana Ingrid ..." y perfiles de "Ingenieria ...". Los resultados vienen
+    ordenados por relevancia (rank); en perfiles el id es el del usuario.
+    """
+    if not supabase:
+        raise HTTPException(status_code=503, detail="Base de datos no disponible")
+
+    try:
+        resultados = await run_db(
+            search_repository.search, supabase, q, entidad=entidad, limit=limit
+        )
+        return {
+            "query": q,
+            "resultados": resultados,
+            "total": len(resultados)
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error en busqueda admin: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
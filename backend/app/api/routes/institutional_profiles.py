@@ -8,6 +8,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 
+from app.db.async_client import async_db
 from app.db.client import supabase
 from app.api.schemas.ml_schemas import (
     InstitutionalProfileCreate,
@@ -48,10 +49,10 @@ async def list_active_institutional_profiles(
     check_database()
 
     try:
-        query = supabase.table("institutional_profiles").select("*") \
+        query = async_db(supabase).table("institutional_profiles").select("*") \
             .eq("is_active", True) \
             .order("created_at", desc=True)
-        response = query.execute()
+        response = await query.execute()
 
         profiles = [
             InstitutionalProfileResponse(
@@ -100,7 +101,7 @@ async def list_institutional_profiles(
     check_database()
 
     try:
-        query = supabase.table("institutional_profiles").select("*")
+        query = async_db(supabase).table("institutional_profiles").select("*")
 
         if not include_inactive:
             query = query.eq("is_active", True)
@@ -109,7 +110,7 @@ async def list_institutional_profiles(
             query = query.eq("sector", sector)
 
         query = query.order("created_at", desc=True)
-        response = query.execute()
+        response = await query.execute()
 
         profiles = [
             InstitutionalProfileResponse(
@@ -157,7 +158,7 @@ async def get_institutional_profile(
     check_database()
 
     try:
-        response = supabase.table("institutional_profiles") \
+        response = await async_db(supabase).table("institutional_profiles") \
             .select("*") \
             .eq("id", profile_id) \
             .execute()
@@ -214,7 +215,7 @@ async def create_institutional_profile(
 
     try:
         # Verificar que el nombre no exista
-        existing = supabase.table("institutional_profiles") \
+        existing = await async_db(supabase).table("institutional_profiles") \
             .select("id") \
             .eq("institution_name", profile.institution_name) \
             .execute()
@@ -242,7 +243,7 @@ async def create_institutional_profile(
         }
 
         # Insertar
-        response = supabase.table("institutional_profiles").insert(data).execute()
+        response = await async_db(supabase).table("institutional_profiles").insert(data).execute()
 
         if not response.data:
             raise HTTPException(
@@ -300,7 +301,7 @@ async def update_institutional_profile(
 
     try:
         # Verificar que existe
-        existing = supabase.table("institutional_profiles") \
+        existing = await async_db(supabase).table("institutional_profiles") \
             .select("*") \
             .eq("id", profile_id) \
             .execute()
@@ -313,7 +314,7 @@ async def update_institutional_profile(
 
         # Verificar nombre unico si se esta cambiando
         if profile.institution_name:
-            name_check = supabase.table("institutional_profiles") \
+            name_check = await async_db(supabase).table("institutional_profiles") \
                 .select("id") \
                 .eq("institution_name", profile.institution_name) \
                 .neq("id", profile_id) \
@@ -346,7 +347,7 @@ async def update_institutional_profile(
             update_data['is_active'] = profile.is_active
 
         # Actualizar
-        response = supabase.table("institutional_profiles") \
+        response = await async_db(supabase).table("institutional_profiles") \
             .update(update_data) \
             .eq("id", profile_id) \
             .execute()
@@ -399,7 +400,7 @@ async def delete_institutional_profile(
 
     try:
         # Verificar que existe
-        existing = supabase.table("institutional_profiles") \
+        existing = await async_db(supabase).table("institutional_profiles") \
             .select("id, institution_name") \
             .eq("id", profile_id) \
             .execute()
@@ -411,7 +412,7 @@ async def delete_institutional_profile(
             )
 
         # Soft delete
-        response = supabase.table("institutional_profiles") \
+        response = await async_db(supabase).table("institutional_profiles") \
             .update({
                 'is_active': False,
                 'updated_at': datetime.utcnow().isoformat()
@@ -457,7 +458,7 @@ async def permanent_delete_institutional_profile(
     check_database()
 
     try:
-        existing = supabase.table("institutional_profiles") \
+        existing = await async_db(supabase).table("institutional_profiles") \
             .select("id, institution_name") \
             .eq("id", profile_id) \
             .execute()
@@ -471,12 +472,12 @@ async def permanent_delete_institutional_profile(
         institution_name = existing.data[0]['institution_name']
 
         # Manual cascade delete for cv_evaluations
-        supabase.table("cv_evaluations") \
+        await async_db(supabase).table("cv_evaluations") \
             .delete() \
             .eq("institutional_profile_id", profile_id) \
             .execute()
 
-        supabase.table("institutional_profiles") \
+        await async_db(supabase).table("institutional_profiles") \
             .delete() \
             .eq("id", profile_id) \
             .execute()
@@ -517,7 +518,7 @@ async def activate_institutional_profile(
 
     try:
         # Verificar que existe
-        existing = supabase.table("institutional_profiles") \
+        existing = await async_db(supabase).table("institutional_profiles") \
             .select("id, institution_name, is_active") \
             .eq("id", profile_id) \
             .execute()
@@ -535,7 +536,7 @@ async def activate_institutional_profile(
             )
 
         # Reactivar
-        response = supabase.table("institutional_profiles") \
+        response = await async_db(supabase).table("institutional_profiles") \
             .update({
                 'is_active': True,
                 'updated_at': datetime.utcnow().isoformat()
@@ -578,7 +579,7 @@ async def list_sectors(
     check_database()
 
     try:
-        response = supabase.table("institutional_profiles") \
+        response = await async_db(supabase).table("institutional_profiles") \
             .select("sector") \
             .eq("is_active", True) \
             .execute()
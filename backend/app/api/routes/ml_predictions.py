@@ -21,9 +21,12 @@ from app.api.schemas.ml_schemas import (
 from app.api.dependencies import (
     get_current_user,
     get_current_user_optional,
+    verify_admin_role,
     verify_ml_model_loaded,
     get_ml_service_dependency
 )
+from app.core.llm_extractor import get_gemini_usage
+from app.db.async_client import run_db
 from app.services.ml_integration_service import MLIntegrationService
 
 # Configurar logging
@@ -61,7 +64,7 @@ async def evaluate_cv(
         gemini_output = await ml_service.extract_cv_with_gemini(request.cv_file)
 
         # 2. Cargar perfil institucional
-        profile = ml_service.load_institutional_profile(request.institutional_profile_id)
+        profile = await run_db(ml_service.load_institutional_profile, request.institutional_profile_id)
 
         if profile is None:
             raise HTTPException(
@@ -75,7 +78,8 @@ async def evaluate_cv(
         # 4. Guardar evaluacion si hay usuario autenticado
         evaluation_id = None
         if current_user:
-            evaluation_id = ml_service.save_evaluation(
+            evaluation_id = await run_db(
+                ml_service.save_evaluation,
                 user_id=current_user['user_id'],
                 profile_id=request.institutional_profile_id,
                 evaluation_result=evaluation,
@@ -137,7 +141,8 @@ async def get_recommendations(
         gemini_output = await ml_service.extract_cv_with_gemini(request.cv_file)
 
         # 2. Obtener recomendaciones
-        recommendations = ml_service.get_recommendations(
+        recommendations = await run_db(
+            ml_service.get_recommendations,
             gemini_output=gemini_output,
             top_n=request.top_n
         )
@@ -152,7 +157,7 @@ async def get_recommendations(
         cv_summary = ml_service.extract_cv_summary(gemini_output)
 
         # 4. Contar total de perfiles evaluados
-        all_profiles = ml_service.load_all_active_profiles()
+        all_profiles = await run_db(ml_service.load_all_active_profiles)
         total_evaluated = len(all_profiles)
 
         # 5. Construir respuesta
@@ -228,6 +233,21 @@ async def get_model_info(
     )
 
 
+@router.get(
+    "/gemini-usage",
+    summary="Uso de cuota de Gemini",
+    description="Utilizacion actual de RPM/TPM por API key de Gemini"
+)
+async def get_gemini_usage_metrics(
+    admin_user: dict = Depends(verify_admin_role)
+):
+    """
+    Metricas del rate limiter de Gemini (uso del ultimo minuto, RPM efectivo,
+    enfriamiento y errores de cuota por key).
+    """
+    return get_gemini_usage()
+
+
 @router.get(
     "/user-evaluations",
     summary="Historial de evaluaciones del usuario",
@@ -241,7 +261,8 @@ async def get_user_evaluations(
     """
     Obtiene el historial de evaluaciones del usuario
     """
-    evaluations = ml_service.get_user_evaluations(
+    evaluations = await run_db(
+        ml_service.get_user_evaluations,
         user_id=current_user['user_id'],
         limit=limit
     )
@@ -3,7 +3,6 @@ Ofertas Routes - Sistema de Recomendaciones v2
 Endpoints para gestionar ofertas laborales (admin)
 """
 
-import base64
 import logging
 from typing import Optional
 
@@ -18,6 +17,7 @@ from app.api.schemas.ml_schemas import (
 )
 from app.services.oferta_service import get_oferta_service
 from app.services.ml_integration_service import get_ml_service
+from app.db.async_client import async_db, run_db
 from app.db.client import supabase
 
 # Configurar logging
@@ -74,9 +74,8 @@ async def analyze_oferta_pdf(
 
     ml_service = get_ml_service()
     try:
-        pdf_base64 = base64.b64encode(contents).decode('utf-8')
         logger.info(f"Analizando PDF de oferta: {file.filename}")
-        extraction = await ml_service.extract_oferta_with_gemini(pdf_base64)
+        extraction = await ml_service.extract_oferta_with_gemini(contents)
         return extraction
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -99,7 +98,7 @@ async def get_contact_suggestions(
     oferta_service = get_oferta_service()
 
     try:
-        suggestions = oferta_service.get_contact_suggestions(institution_id)
+        suggestions = await run_db(oferta_service.get_contact_suggestions, institution_id)
         return suggestions
     except Exception as e:
         logger.error(f"Error obteniendo sugerencias de contacto: {e}")
@@ -112,25 +111,31 @@ async def list_ofertas(
     is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
     sector: Optional[str] = Query(None, description="Filtrar por sector"),
     include_expired: bool = Query(False, description="Incluir ofertas expiradas"),
-    page: int = Query(1, ge=1, description="Numero de pagina"),
+    page: int = Query(1, ge=1, description="Numero de pagina (sin cursor)"),
     page_size: int = Query(20, ge=1, le=100, description="Tamano de pagina"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la pagina anterior"),
+    count: str = Query('estimated', description="Conteo del total: 'exact', 'estimated' o 'none'"),
     admin_user: dict = Depends(verify_operator_access)
 ):
     """
     Lista todas las ofertas laborales con filtros.
 
-    Solo accesible para operadores y administradores.
+    Paginacion por cursor: la respuesta incluye next_cursor para pedir la
+    pagina siguiente. Solo accesible para operadores y administradores.
     """
     oferta_service = get_oferta_service()
 
     try:
-        result = oferta_service.list_ofertas(
+        result = await run_db(
+            oferta_service.list_ofertas,
             tipo=tipo,
             is_active=is_active,
             sector=sector,
             include_expired=include_expired,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor,
+            count=count
         )
 
         ofertas_response = [_oferta_to_response(o) for o in result['ofertas']]
@@ -139,9 +144,13 @@ async def list_ofertas(
             ofertas=ofertas_response,
             total=result['total'],
             page=result['page'],
-            page_size=result['page_size']
+            page_size=result['page_size'],
+            next_cursor=result['next_cursor'],
+            has_more=result['has_more']
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listando ofertas: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -160,7 +169,7 @@ async def get_oferta(
     oferta_service = get_oferta_service()
 
     try:
-        oferta = oferta_service.get_oferta(oferta_id)
+        oferta = await run_db(oferta_service.get_oferta, oferta_id)
 
         if not oferta:
             raise HTTPException(
@@ -202,7 +211,8 @@ async def create_oferta(
     oferta_service = get_oferta_service()
 
     try:
-        oferta = oferta_service.create_oferta(
+        oferta = await run_db(
+            oferta_service.create_oferta,
             data.model_dump(),
             created_by=admin_user['user_id']
         )
@@ -238,7 +248,7 @@ async def update_oferta(
                 detail="No se proporcionaron campos para actualizar"
             )
 
-        oferta = oferta_service.update_oferta(oferta_id, update_dict)
+        oferta = await run_db(oferta_service.update_oferta, oferta_id, update_dict)
 
         return _oferta_to_response(oferta)
 
@@ -263,7 +273,7 @@ async def delete_oferta(
     oferta_service = get_oferta_service()
 
     try:
-        success = oferta_service.delete_oferta(oferta_id)
+        success = await run_db(oferta_service.delete_oferta, oferta_id)
 
         if success:
             return {
@@ -296,7 +306,7 @@ async def permanent_delete_oferta(
         raise HTTPException(status_code=503, detail="Base de datos no configurada")
 
     try:
-        existing = supabase.table("convocatorias_laborales") \
+        existing = await async_db(supabase).table("convocatorias_laborales") \
             .select("id, titulo") \
             .eq("id", oferta_id) \
             .execute()
@@ -306,7 +316,7 @@ async def permanent_delete_oferta(
 
         titulo = existing.data[0]['titulo']
 
-        supabase.table("convocatorias_laborales") \
+        await async_db(supabase).table("convocatorias_laborales") \
             .delete() \
             .eq("id", oferta_id) \
             .execute()
@@ -339,7 +349,7 @@ async def activate_oferta(
     oferta_service = get_oferta_service()
 
     try:
-        oferta = oferta_service.activate_oferta(oferta_id)
+        oferta = await run_db(oferta_service.activate_oferta, oferta_id)
 
         return _oferta_to_response(oferta)
 
@@ -362,7 +372,7 @@ async def get_ofertas_stats(
     oferta_service = get_oferta_service()
 
     try:
-        stats = oferta_service.get_statistics()
+        stats = await run_db(oferta_service.get_statistics)
         return stats
 
     except Exception as e:
@@ -9,6 +9,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.api.dependencies import get_current_user
+from app.db.async_client import async_db, run_db
 from app.db.client import supabase
 from app.services.postulacion_service import get_postulacion_service
 
@@ -30,7 +31,7 @@ async def get_ofertas_disponibles(
     """
     service = get_postulacion_service()
     try:
-        ofertas = service.get_ofertas_disponibles(current_user['role'])
+        ofertas = await run_db(service.get_ofertas_disponibles, current_user['role'])
         return {'ofertas': ofertas, 'total': len(ofertas)}
     except Exception as e:
         logger.error(f"Error listando ofertas para postulacion: {e}")
@@ -57,7 +58,8 @@ async def postular_a_oferta(
     """
     service = get_postulacion_service()
     try:
-        result = service.postular(
+        result = await run_db(
+            service.postular,
             user_id=current_user['user_id'],
             user_role=current_user['role'],
             oferta_id=oferta_id
@@ -85,7 +87,7 @@ async def postular_desde_recomendacion(
     user_id = current_user['user_id']
 
     # Buscar recomendación existente para este usuario+oferta
-    rec = supabase.table("recomendaciones") \
+    rec = await async_db(supabase).table("recomendaciones") \
         .select("*") \
         .eq("usuario_id", user_id) \
         .eq("oferta_id", oferta_id) \
@@ -111,14 +113,15 @@ async def postular_desde_recomendacion(
     }
 
     try:
-        saved = supabase.table("postulaciones") \
+        saved = await async_db(supabase).table("postulaciones") \
             .upsert(data, on_conflict="usuario_id,oferta_id") \
             .execute()
+        get_postulacion_service().invalidate_stats_cache()
 
         row = saved.data[0] if saved.data else {}
 
         # Obtener datos de la oferta para devolver al frontend
-        oferta_row = supabase.table("convocatorias_laborales") \
+        oferta_row = await async_db(supabase).table("convocatorias_laborales") \
             .select("*, institutional_profiles(institution_name, sector)") \
             .eq("id", oferta_id) \
             .limit(1) \
@@ -154,7 +157,7 @@ async def get_my_postulaciones(
     """
     service = get_postulacion_service()
     try:
-        postulaciones = service.get_my_postulaciones(current_user['user_id'])
+        postulaciones = await run_db(service.get_my_postulaciones, current_user['user_id'])
         return {
             'postulaciones': postulaciones,
             'total': len(postulaciones)
@@ -3,7 +3,7 @@ Profile Routes - Sistema de Recomendaciones v2
 Endpoints para gestionar el perfil profesional del usuario
 """
 
-import base64
+import json
 import logging
 from typing import Optional
 
@@ -19,9 +19,15 @@ from app.api.schemas.ml_schemas import (
     PerfilCompletenessResponse,
     CVUploadResponse
 )
+from app.db.async_client import run_db
 from app.services.profile_service import get_profile_service
 from app.services.ml_integration_service import get_ml_service
 from app.services.cv_pdf_service import get_cv_pdf_service
+from app.services.cv_job_service import (
+    CVJobQueueFullError,
+    build_extraction_summary,
+    get_cv_job_service,
+)
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -46,7 +52,7 @@ async def get_my_profile(
     profile_service = get_profile_service()
 
     try:
-        profile = profile_service.get_or_create_profile(current_user['user_id'])
+        profile = await run_db(profile_service.get_or_create_profile, current_user['user_id'])
 
         return PerfilProfesionalResponse(
             id=profile['id'],
@@ -105,7 +111,8 @@ async def update_my_profile(
                 detail="No se proporcionaron campos para actualizar"
             )
 
-        profile = profile_service.update_profile_manual(
+        profile = await run_db(
+            profile_service.update_profile_manual,
             current_user['user_id'],
             update_dict
         )
@@ -158,7 +165,7 @@ async def get_profile_completeness(
     profile_service = get_profile_service()
 
     try:
-        profile = profile_service.get_or_create_profile(current_user['user_id'])
+        profile = await run_db(profile_service.get_or_create_profile, current_user['user_id'])
         completeness = profile_service.calculate_completeness(profile)
 
         return PerfilCompletenessResponse(**completeness)
@@ -205,28 +212,19 @@ async def upload_cv(
     profile_service = get_profile_service()
 
     try:
-        # Codificar a base64
-        pdf_base64 = base64.b64encode(contents).decode('utf-8')
-
         # Extraer con Gemini (async - no bloquea event loop)
         logger.info(f"Procesando CV: {file.filename}")
-        gemini_output = await ml_service.extract_cv_with_gemini(pdf_base64)
+        gemini_output = await ml_service.extract_cv_with_gemini(contents)
 
         # Actualizar perfil
-        profile = profile_service.update_profile_from_cv(
+        profile = await run_db(
+            profile_service.update_profile_from_cv,
             current_user['user_id'],
             gemini_output,
             cv_filename=file.filename
         )
 
-        # Preparar resumen de extraccion
-        extraction_summary = {
-            'hard_skills_count': len(gemini_output.get('hard_skills', [])),
-            'soft_skills_count': len(gemini_output.get('soft_skills', [])),
-            'education_items': len(gemini_output.get('education', [])),
-            'experience_items': len(gemini_output.get('experience', [])),
-            'languages_detected': gemini_output.get('personal_info', {}).get('languages', [])
-        }
+        extraction_summary = build_extraction_summary(gemini_output)
 
         perfil_response = PerfilProfesionalResponse(
             id=profile['id'],
@@ -267,6 +265,98 @@ async def upload_cv(
         )
 
 
+@router.post("/upload-cv/jobs", status_code=202)
+async def upload_cv_job(
+    file: UploadFile = File(..., description="Archivo PDF del CV"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Encola un CV para procesarlo en segundo plano.
+
+    Responde de inmediato con el job_id; el avance se consulta en
+    /cv-jobs/{job_id} o se sigue por SSE en /cv-jobs/{job_id}/events.
+    Al terminar, el resultado tiene el mismo contenido que /upload-cv.
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="Solo se permiten archivos PDF"
+        )
+
+    contents = await file.read()
+    max_size = 10 * 1024 * 1024  # 10MB
+    if len(contents) > max_size:
+        raise HTTPException(
+            status_code=400,
+            detail="El archivo excede el tamano maximo de 10MB"
+        )
+
+    try:
+        job = await get_cv_job_service().submit(
+            current_user['user_id'], file.filename, contents
+        )
+    except CVJobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': f"/api/profile/cv-jobs/{job['id']}",
+        'events_url': f"/api/profile/cv-jobs/{job['id']}/events"
+    }
+
+
+def _job_response(job: dict) -> dict:
+    return {
+        'job_id': job['id'],
+        'filename': job['filename'],
+        'status': job['status'],
+        'stage': job['stage'],
+        'progress': job['progress'],
+        'error': job['error'],
+        'result': job['result'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    }
+
+
+@router.get("/cv-jobs/{job_id}")
+async def get_cv_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Estado de un job de procesamiento de CV del usuario actual.
+    """
+    job = await get_cv_job_service().get_job(job_id, current_user['user_id'])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    return _job_response(job)
+
+
+@router.get("/cv-jobs/{job_id}/events")
+async def stream_cv_job_events(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Server-Sent Events con cada cambio de estado del job hasta que termina.
+    """
+    service = get_cv_job_service()
+    if await service.get_job(job_id, current_user['user_id']) is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+
+    async def event_stream():
+        async for job in service.watch_job(job_id, current_user['user_id']):
+            yield f"event: {job['status']}\ndata: {json.dumps(_job_response(job), default=str)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @router.delete("/me")
 async def delete_my_profile(
     current_user: dict = Depends(get_current_user)
@@ -280,7 +370,7 @@ async def delete_my_profile(
     profile_service = get_profile_service()
 
     try:
-        success = profile_service.delete_profile(current_user['user_id'])
+        success = await run_db(profile_service.delete_profile, current_user['user_id'])
 
         if success:
             return {"message": "Perfil limpiado exitosamente"}
@@ -307,7 +397,7 @@ async def preview_profile_from_cv(
     profile_service = get_profile_service()
 
     try:
-        profile = profile_service.get_profile(current_user['user_id'])
+        profile = await run_db(profile_service.get_profile, current_user['user_id'])
 
         if not profile:
             raise HTTPException(
@@ -315,9 +405,7 @@ async def preview_profile_from_cv(
                 detail="Perfil no encontrado. Sube tu CV primero."
             )
 
-        ml_format = profile_service.get_profile_for_recommendations(
-            current_user['user_id']
-        )
+        ml_format = profile_service.build_gemini_output(profile)
 
         completeness = profile_service.calculate_completeness(profile)
 
@@ -353,7 +441,7 @@ async def download_cv_pdf(
     cv_service = get_cv_pdf_service()
 
     try:
-        profile = profile_service.get_profile(current_user['user_id'])
+        profile = await run_db(profile_service.get_profile, current_user['user_id'])
 
         if not profile:
             raise HTTPException(
@@ -12,8 +12,10 @@ from app.api.dependencies import get_current_user
 from app.api.schemas.ml_schemas import (
     MisRecomendacionesResponse,
     RecomendacionesRequestFromProfile,
+    MarcarVistasRequest,
     OfertaLaboralResponse
 )
+from app.db.async_client import run_db
 from app.services.recommendation_service import get_recommendation_service
 from app.services.profile_service import get_profile_service
 
@@ -50,7 +52,8 @@ async def get_my_recommendations(
     recommendation_service = get_recommendation_service()
 
     try:
-        result = recommendation_service.get_recommendations_for_user(
+        result = await run_db(
+            recommendation_service.get_recommendations_for_user,
             user_id=current_user['user_id'],
             user_role=current_user['role'],
             top_n=top_n,
@@ -101,7 +104,8 @@ async def get_my_recommendations(
             recomendaciones=recomendaciones_formatted,
             total=result['total'],
             nuevas=result['nuevas'],
-            perfil_summary=result['perfil_summary']
+            perfil_summary=result['perfil_summary'],
+            matriz=result.get('matriz')
         )
 
     except ValueError as e:
@@ -126,7 +130,8 @@ async def get_recommendation_history(
     recommendation_service = get_recommendation_service()
 
     try:
-        result = recommendation_service.get_recommendation_history(
+        result = await run_db(
+            recommendation_service.get_recommendation_history,
             user_id=current_user['user_id'],
             limit=limit,
             offset=offset
@@ -139,6 +144,36 @@ async def get_recommendation_history(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/viewed")
+async def mark_recommendations_viewed(
+    request: MarcarVistasRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Marca varias recomendaciones como vistas en una sola operacion.
+
+    Los IDs que no pertenecen al usuario se ignoran.
+    """
+    recommendation_service = get_recommendation_service()
+
+    try:
+        marked = await run_db(
+            recommendation_service.mark_many_as_viewed,
+            user_id=current_user['user_id'],
+            recommendation_ids=request.recommendation_ids
+        )
+
+        return {
+            "message": f"{len(marked)} recomendaciones marcadas como vistas",
+            "marcadas": len(marked),
+            "recommendation_ids": marked
+        }
+
+    except Exception as e:
+        logger.error(f"Error marcando como vistas: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/{recommendation_id}/viewed")
 async def mark_recommendation_viewed(
     recommendation_id: str,
@@ -153,7 +188,8 @@ async def mark_recommendation_viewed(
     recommendation_service = get_recommendation_service()
 
     try:
-        success = recommendation_service.mark_as_viewed(
+        success = await run_db(
+            recommendation_service.mark_as_viewed,
             user_id=current_user['user_id'],
             recommendation_id=recommendation_id
         )
@@ -190,7 +226,7 @@ async def check_recommendation_eligibility(
     profile_service = get_profile_service()
 
     try:
-        profile = profile_service.get_profile(current_user['user_id'])
+        profile = await run_db(profile_service.get_profile, current_user['user_id'])
 
         if not profile:
             return {
@@ -264,7 +300,8 @@ async def get_my_recommendation_stats(
     recommendation_service = get_recommendation_service()
 
     try:
-        history = recommendation_service.get_recommendation_history(
+        history = await run_db(
+            recommendation_service.get_recommendation_history,
             user_id=current_user['user_id'],
             limit=1000,
             offset=0
@@ -655,9 +655,11 @@ class OfertaLaboralResponse(BaseModel):
 class OfertaLaboralListResponse(BaseModel):
     """Response de lista de ofertas"""
     ofertas: List[OfertaLaboralResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Total exacto o estimado (None con count=none)")
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = Field(default=None, description="Cursor de la pagina siguiente")
+    has_more: bool = False
 
 
 # ============================================================
@@ -719,6 +721,9 @@ class MisRecomendacionesResponse(BaseModel):
     # Resumen del perfil usado
     perfil_summary: Dict[str, Any] = Field(default={})
 
+    # Antiguedad de la matriz precalculada (computed_at, stale, pending_recompute)
+    matriz: Optional[Dict[str, Any]] = Field(default=None, description="Estado de la matriz precalculada")
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -749,6 +754,13 @@ class RecomendacionesRequestFromProfile(BaseModel):
         return v
 
 
+class MarcarVistasRequest(BaseModel):
+    """Request para marcar varias recomendaciones como vistas"""
+    recommendation_ids: List[str] = Field(
+        min_length=1, max_length=100, description="IDs de las recomendaciones"
+    )
+
+
 # ============================================================
 # ESTADISTICAS ADMIN SCHEMAS
 # ============================================================
@@ -838,6 +850,8 @@ class UsuarioAdminResponse(BaseModel):
 class UsuariosListResponse(BaseModel):
     """Response de lista de usuarios para admin"""
     usuarios: List[UsuarioAdminResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Total exacto o estimado (None con count=none)")
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = Field(default=None, description="Cursor de la pagina siguiente")
+    has_more: bool = False
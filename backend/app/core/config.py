@@ -4,6 +4,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Carpeta backend/: las rutas relativas de archivos locales (caches SQLite)
+# se resuelven contra ella, no contra el directorio desde donde se lanza
+# uvicorn o un script
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def backend_path(path: str) -> str:
+    """Ruta absoluta; las relativas se toman desde la carpeta backend/"""
+    return path if os.path.isabs(path) else os.path.join(BACKEND_DIR, path)
+
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Job Intermediation Platform"
@@ -17,6 +27,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Database pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "16"))
+    DB_MAX_CONCURRENCY: int = int(os.getenv("DB_MAX_CONCURRENCY", "32"))
+    DB_TIMEOUT_SECONDS: float = float(os.getenv("DB_TIMEOUT_SECONDS", "15"))
+
     # ML Model (Fase 6)
     ML_MODEL_PATH: str = os.getenv("ML_MODEL_PATH", "app/ml/trained_models/ridge_v1.joblib")
     ML_MODEL_VERSION: str = os.getenv("ML_MODEL_VERSION", "v1")
@@ -25,10 +40,33 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GEMINI_MAX_RETRIES: int = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
 
+    # Gemini extraction cache (SQLite)
+    EXTRACTION_CACHE_ENABLED: bool = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_PATH: str = backend_path(os.getenv("EXTRACTION_CACHE_PATH", ".cache/gemini_extractions.sqlite3"))
+    EXTRACTION_CACHE_TTL_HOURS: int = int(os.getenv("EXTRACTION_CACHE_TTL_HOURS", str(24 * 30)))
+    EXTRACTION_CACHE_MAX_MB: int = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "100"))
+
     # File Upload
     MAX_CV_FILE_SIZE_MB: int = int(os.getenv("MAX_CV_FILE_SIZE_MB", "10"))
     ALLOWED_CV_EXTENSIONS: str = os.getenv("ALLOWED_CV_EXTENSIONS", "pdf")
 
+    # CV processing (PDF process pool + job queue)
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "30"))
+    PDF_TIMEOUT_SECONDS: float = float(os.getenv("PDF_TIMEOUT_SECONDS", "30"))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "6"))
+    PDF_PAGES_PER_TASK: int = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+    CV_JOB_WORKERS: int = int(os.getenv("CV_JOB_WORKERS", "4"))
+    CV_JOB_MAX_PENDING: int = int(os.getenv("CV_JOB_MAX_PENDING", "1000"))
+    CV_JOB_HEARTBEAT_SECONDS: float = float(os.getenv("CV_JOB_HEARTBEAT_SECONDS", "15"))
+    CV_JOB_STALE_SECONDS: int = int(os.getenv("CV_JOB_STALE_SECONDS", "90"))
+    CV_JOBS_DB_PATH: str = backend_path(os.getenv("CV_JOBS_DB_PATH", ".cache/cv_jobs.sqlite3"))
+
+    # Matriz precalculada de recomendaciones (candidato x oferta activa)
+    RECOMMENDATION_MATRIX_WORKERS: int = int(os.getenv("RECOMMENDATION_MATRIX_WORKERS", "2"))
+    RECOMMENDATION_MATRIX_BATCH_SIZE: int = int(os.getenv("RECOMMENDATION_MATRIX_BATCH_SIZE", "50"))
+    RECOMMENDATION_MATRIX_PAGE_SIZE: int = int(os.getenv("RECOMMENDATION_MATRIX_PAGE_SIZE", "500"))
+
     # Cache
     PROFILE_CACHE_TTL_SECONDS: int = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "300"))
 
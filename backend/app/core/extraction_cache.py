@@ -0,0 +1,219 @@
+"""
+Extraction Cache
+Cache persistente (SQLite) de resultados de extraccion con Gemini
+
+La clave es un hash del texto normalizado del PDF junto con el tipo de
+extraccion, la version del prompt y el modelo de Gemini: re-subir el mismo
+CV (o uno con el mismo texto) no vuelve a llamar a la API, y cambiar el
+prompt o el modelo invalida las entradas anteriores.
+
+- TTL: las entradas vencen a los EXTRACTION_CACHE_TTL_HOURS
+- Tamano: si el total supera EXTRACTION_CACHE_MAX_MB se eliminan las
+  entradas usadas hace mas tiempo (LRU)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Texto normalizado para la clave: sin espacios repetidos ni mayusculas"""
+    return _WHITESPACE_RE.sub(" ", text or "").strip().lower()
+
+
+def make_cache_key(text: str, kind: str, prompt_version: str, model: str) -> str:
+    """
+    Clave de cache para una extraccion.
+
+    Args:
+        text: Texto extraido del PDF
+        kind: Tipo de extraccion ('cv', 'oferta')
+        prompt_version: Version del prompt usado
+        model: Modelo de Gemini
+
+    Returns:
+        Hash sha256 hexadecimal
+    """
+    payload = f"{kind}\x00{prompt_version}\x00{model}\x00{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Cache de extracciones en un archivo SQLite.
+
+    Una sola conexion protegida con lock: las operaciones son lecturas o
+    escrituras de una fila y no justifican un pool.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extracciones (
+                key         TEXT PRIMARY KEY,
+                kind        TEXT NOT NULL,
+                value       TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                created_at  REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extracciones_last_access ON extracciones (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Resultado guardado para la clave (None si no existe o vencio).
+
+        Returns:
+            Dict nuevo en cada llamada (el llamador puede modificarlo)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM extracciones WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM extracciones WHERE key = ?", (key,))
+                self._conn.commit()
+                self._misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE extracciones SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._hits += 1
+
+        return json.loads(value)
+
+    def put(self, key: str, kind: str, result: Dict[str, Any]):
+        """
+        Guarda un resultado y aplica la eviccion por tamano.
+
+        Args:
+            key: Clave de make_cache_key
+            kind: Tipo de extraccion
+            result: Resultado de Gemini (serializable a JSON)
+        """
+        value = json.dumps(result, ensure_ascii=False)
+        size = len(value.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extracciones (key, kind, value, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, value, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Elimina vencidas y, si se excede max_bytes, las menos usadas"""
+        self._conn.execute(
+            "DELETE FROM extracciones WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM extracciones"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM extracciones ORDER BY last_access ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self._conn.executemany("DELETE FROM extracciones WHERE key = ?", victims)
+        logger.info(f"Extraction cache: {len(victims)} entradas eliminadas por tamano")
+
+    def clear(self):
+        """Vacia el cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM extracciones")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadisticas del cache"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracciones"
+            ).fetchone()
+        return {
+            'entries': entries,
+            'size_bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self._hits,
+            'misses': self._misses,
+        }
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Cache global de extracciones (None si esta deshabilitado o no se pudo
+    abrir el archivo; en ese caso se llama siempre a Gemini).
+    """
+    global _extraction_cache
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                try:
+                    _extraction_cache = ExtractionCache(
+                        settings.EXTRACTION_CACHE_PATH,
+                        ttl_seconds=settings.EXTRACTION_CACHE_TTL_HOURS * 3600,
+                        max_bytes=settings.EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+                    )
+                except sqlite3.Error as e:
+                    logger.error(f"No se pudo abrir el cache de extracciones: {e}")
+                    return None
+    return _extraction_cache
@@ -0,0 +1,288 @@
+"""
+Gemini Rate Limiter
+Reparto proactivo de llamadas a Gemini entre las API keys del pool
+
+Cada key tiene dos token buckets (requests/min y tokens/min). Antes de cada
+llamada se elige la key con mas presupuesto libre; si ninguna tiene, se
+espera lo justo en lugar de provocar un 429. Los limites son adaptativos
+(AIMD): un 429 pone la key en enfriamiento con backoff exponencial + jitter y
+reduce a la mitad su RPM efectivo; cada exito lo recupera de a poco hasta el
+limite configurado. metrics() expone la utilizacion actual de cada key.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Salida tipica de una extraccion (para estimar TPM antes de la llamada)
+OUTPUT_TOKENS_ESTIMATE = 1024
+
+# Rafaga permitida: fraccion del limite por minuto disponible de inmediato
+BURST_FRACTION = 0.1
+
+# Backoff ante 429 sin retry-after explicito
+COOLDOWN_BASE_SECONDS = 2.0
+COOLDOWN_MAX_SECONDS = 60.0
+
+# Recuperacion del RPM efectivo por llamada exitosa
+RPM_RECOVERY_STEP = 0.5
+
+_RETRY_AFTER_RE = re.compile(r"retry in ([\d.]+)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE)
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Tokens estimados de una llamada (~4 caracteres por token + salida)"""
+    return len(prompt) // 4 + OUTPUT_TOKENS_ESTIMATE
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """Segundos sugeridos por la API en un error 429 (None si no vienen)"""
+    match = _RETRY_AFTER_RE.search(str(error))
+    if not match:
+        return None
+    return float(match.group(1) or match.group(2))
+
+
+def with_jitter(seconds: float) -> float:
+    """Aplica jitter (+-50%) para que los reintentos no lleguen juntos"""
+    return seconds * random.uniform(0.5, 1.5)
+
+
+class TokenBucket:
+    """
+    Token bucket con reposicion continua.
+
+    rate_per_minute se puede cambiar en caliente (limites adaptativos).
+    """
+
+    def __init__(self, rate_per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.rate_per_minute = rate_per_minute
+        self.tokens = self.capacity
+        self._updated = clock()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate_per_minute * BURST_FRACTION)
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_minute / 60.0)
+        self._updated = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, amount: float) -> float:
+        """Segundos hasta que haya amount tokens (0 si ya hay)"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing * 60.0 / self.rate_per_minute
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class KeyState:
+    """Presupuesto y estadisticas de una API key"""
+
+    def __init__(self, slot: int, rpm: float, tpm: float, clock: Callable[[], float]):
+        self.slot = slot
+        self.rpm_limit = rpm
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock)
+        self.cooldown_until = 0.0
+        self.consecutive_quota_errors = 0
+        self.in_flight = 0
+        self.total_requests = 0
+        self.total_quota_errors = 0
+        self.window: List[Tuple[float, int]] = []  # (instante, tokens) del ultimo minuto
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        return max(
+            self.cooldown_until - now,
+            self.requests.wait_time(1),
+            self.tokens.wait_time(tokens)
+        )
+
+
+class GeminiRateLimiter:
+    """
+    Planificador de llamadas a Gemini por key.
+
+    Thread-safe: lo usan tanto el camino async como el sync. Las keys se
+    leen del GeminiKeyPool en cada adquisicion, por lo que agregar keys al
+    pool no requiere reiniciar.
+    """
+
+    def __init__(
+        self,
+        get_keys: Callable[[], List[str]],
+        rpm_per_key: float,
+        tpm_per_key: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._get_keys = get_keys
+        self.rpm_per_key = rpm_per_key
+        self.tpm_per_key = tpm_per_key
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: Dict[str, KeyState] = {}
+        self.total_wait_seconds = 0.0
+
+    def _state(self, key: str, slot: int) -> KeyState:
+        state = self._states.get(key)
+        if state is None:
+            state = KeyState(slot, self.rpm_per_key, self.tpm_per_key, self._clock)
+            self._states[key] = state
+        state.slot = slot
+        return state
+
+    def try_acquire(self, tokens: int) -> Tuple[Optional[str], float]:
+        """
+        Reserva presupuesto en la key con mas capacidad libre.
+
+        Args:
+            tokens: Tokens estimados de la llamada
+
+        Returns:
+            (key, 0) si se reservo; (None, segundos a esperar) si no hay
+            presupuesto en ninguna key
+        """
+        keys = self._get_keys()
+        if not keys:
+            raise ValueError("No hay API keys de Gemini configuradas")
+
+        with self._lock:
+            now = self._clock()
+            best, best_score, min_wait = None, None, None
+            for slot, key in enumerate(keys):
+                state = self._state(key, slot)
+                wait = state.wait_time(tokens, now)
+                if wait > 0:
+                    min_wait = wait if min_wait is None else min(min_wait, wait)
+                    continue
+                # Mas presupuesto relativo primero; a igualdad, menos llamadas en curso
+                score = (state.requests.available() / state.requests.capacity, -state.in_flight)
+                if best_score is None or score > best_score:
+                    best, best_score = key, score
+
+            if best is None:
+                return None, min_wait
+
+            state = self._states[best]
+            state.requests.consume(1)
+            state.tokens.consume(tokens)
+            state.in_flight += 1
+            state.total_requests += 1
+            state.window.append((now, tokens))
+            return best, 0.0
+
+    async def acquire(self, tokens: int) -> str:
+        """Espera (sin bloquear el loop) hasta reservar una key"""
+        while True:
+            key, wait = self.try_acquire(tokens)
+            if key is not None:
+                return key
+            self.total_wait_seconds += wait
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: int) -> str:
+        """Version bloqueante de acquire (camino sync)"""
+        while True:
+            key, wait = self.try_acquire(tokens)
+            if key is not None:
+                return key
+            self.total_wait_seconds += wait
+            time.sleep(wait)
+
+    def report_success(self, key: str):
+        """La llamada termino bien: libera y recupera el RPM efectivo"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return
+            state.in_flight = max(0, state.in_flight - 1)
+            state.consecutive_quota_errors = 0
+            state.requests.rate_per_minute = min(
+                state.rpm_limit, state.requests.rate_per_minute + RPM_RECOVERY_STEP
+            )
+
+    def report_failure(self, key: str):
+        """La llamada fallo por otro motivo (timeout, JSON): solo libera"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                state.in_flight = max(0, state.in_flight - 1)
+
+    def report_quota_error(self, key: str, retry_after: Optional[float] = None) -> float:
+        """
+        La API respondio 429: enfria la key y reduce su RPM efectivo.
+
+        Args:
+            key: Key que recibio el 429
+            retry_after: Segundos indicados por la API (si los hay)
+
+        Returns:
+            Segundos de enfriamiento aplicados
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return 0.0
+            state.in_flight = max(0, state.in_flight - 1)
+            state.consecutive_quota_errors += 1
+            state.total_quota_errors += 1
+            state.requests.rate_per_minute = max(1.0, state.requests.rate_per_minute / 2)
+            state.requests.tokens = min(state.requests.tokens, 0.0)
+
+            if retry_after is None:
+                retry_after = with_jitter(min(
+                    COOLDOWN_MAX_SECONDS,
+                    COOLDOWN_BASE_SECONDS * 2 ** (state.consecutive_quota_errors - 1)
+                ))
+            state.cooldown_until = self._clock() + retry_after
+            return retry_after
+
+    def metrics(self) -> Dict:
+        """
+        Utilizacion actual por key (las keys se muestran por slot).
+
+        Returns:
+            Dict con limites, uso del ultimo minuto, enfriamiento y errores
+        """
+        keys = self._get_keys()
+        with self._lock:
+            now = self._clock()
+            per_key = []
+            for slot, key in enumerate(keys):
+                state = self._state(key, slot)
+                state.window = [(t, n) for t, n in state.window if now - t < 60.0]
+                requests_last_minute = len(state.window)
+                tokens_last_minute = sum(n for _, n in state.window)
+                per_key.append({
+                    'slot': slot,
+                    'key_suffix': key[-4:],
+                    'rpm_limit': state.rpm_limit,
+                    'rpm_effective': round(state.requests.rate_per_minute, 2),
+                    'tpm_limit': self.tpm_per_key,
+                    'requests_last_minute': requests_last_minute,
+                    'tokens_last_minute': tokens_last_minute,
+                    'rpm_utilization': round(requests_last_minute / state.rpm_limit, 3),
+                    'tpm_utilization': round(tokens_last_minute / self.tpm_per_key, 3),
+                    'in_flight': state.in_flight,
+                    'cooldown_seconds': round(max(0.0, state.cooldown_until - now), 2),
+                    'total_requests': state.total_requests,
+                    'quota_errors': state.total_quota_errors,
+                })
+        return {
+            'keys': per_key,
+            'total_wait_seconds': round(self.total_wait_seconds, 2),
+        }
@@ -3,11 +3,23 @@ import json
 import asyncio
 import logging
 import threading
-from typing import Dict, Any, List
+import unicodedata
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
+import google.ai.generativelanguage as glm
 import google.generativeai as genai
+from google.generativeai.types import GenerateContentResponse
 
 from app.core.config import settings
+from app.core.extraction_cache import get_extraction_cache, make_cache_key
+from app.core.gemini_rate_limiter import (
+    GeminiRateLimiter,
+    estimate_tokens,
+    parse_retry_after,
+    with_jitter
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +37,8 @@ class GeminiKeyPool:
         GEMINI_API_KEYS=key1,key2,key3 (multiples keys separadas por coma)
 
     Si ambas existen, se combinan sin duplicados.
-    Cuando una key da error 429 (quota), rota a la siguiente.
+    El reparto de llamadas entre keys lo hace GeminiRateLimiter (presupuesto
+    por key); rotate() queda para el camino legado con genai.configure global.
     """
 
     def __init__(self):
@@ -95,25 +108,76 @@ class GeminiKeyPool:
 # Global key pool instance
 _key_pool = GeminiKeyPool()
 
-# Semaphore: max concurrent Gemini calls
+# Max concurrent Gemini calls (per event loop, see _get_gemini_semaphore)
 MAX_CONCURRENT_GEMINI = int(os.getenv("MAX_CONCURRENT_GEMINI", "5"))
-_gemini_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GEMINI)
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+# Dedicated threads for the blocking SDK calls (not the loop's default executor).
+# Extra headroom: a call abandoned on timeout holds its thread until the
+# request deadline expires.
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+# Per-key quota (requests and tokens per minute) used by the rate limiter
+GEMINI_RPM_PER_KEY = float(os.getenv("GEMINI_RPM_PER_KEY", "60"))
+GEMINI_TPM_PER_KEY = float(os.getenv("GEMINI_TPM_PER_KEY", "1000000"))
+_rate_limiter = GeminiRateLimiter(lambda: _key_pool._keys, GEMINI_RPM_PER_KEY, GEMINI_TPM_PER_KEY)
 
 # Retry settings
 MAX_RETRIES = settings.GEMINI_MAX_RETRIES  # default 3
 GEMINI_TIMEOUT_SECONDS = int(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
 
+
+def _get_gemini_semaphore() -> asyncio.Semaphore:
+    """
+    Concurrency semaphore of the running event loop.
+
+    An asyncio.Semaphore binds to the loop that first waits on it, so one
+    module-level instance breaks as soon as a second loop (tests, workers,
+    asyncio.run in scripts) uses it. Keep one per loop instead.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GEMINI)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """Thread pool for Gemini SDK calls (created on first use)."""
+    global _llm_executor
+    with _llm_executor_lock:
+        if _llm_executor is None:
+            _llm_executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_GEMINI * 2,
+                thread_name_prefix="gemini"
+            )
+        return _llm_executor
+
+
+def shutdown_llm_executor() -> None:
+    """Release the Gemini thread pool (application shutdown)."""
+    global _llm_executor
+    with _llm_executor_lock:
+        if _llm_executor is not None:
+            _llm_executor.shutdown(wait=False, cancel_futures=True)
+            _llm_executor = None
+
+# CVs packed per Gemini request in bulk imports
+GEMINI_CV_BATCH_SIZE = int(os.getenv("GEMINI_CV_BATCH_SIZE", "5"))
+
 # Model (configurable via env)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 
+# Prompt versions: bump when a prompt changes so cached extractions are not reused
+CV_PROMPT_VERSION = "cv-v1"
+OFERTA_PROMPT_VERSION = "oferta-v1"
+PROMPT_VERSIONS = {"cv": CV_PROMPT_VERSION, "oferta": OFERTA_PROMPT_VERSION}
 
-def _build_prompt(text: str) -> str:
-    return f"""
-    Actúa como un reclutador experto en tecnología y RRHH. Analiza el siguiente texto extraído de un CV y extrae la información relevante en un formato estructurado.
-
-    TEXTO DEL CV:
-    {text[:4000]}
 
+_CV_INSTRUCTIONS = """
     Instrucciones:
     1. Extrae los **Datos Personales**: nombre completo, teléfono, email, ubicación/dirección y nacionalidad si están mencionados.
     2. Extrae **Habilidades Técnicas** (Hard Skills) y **Habilidades Blandas** (Soft Skills).
@@ -121,10 +185,11 @@ def _build_prompt(text: str) -> str:
     4. Extrae la **Experiencia Laboral** (Experience) con cargo, empresa, duración y una breve descripción.
     5. Extrae los **Idiomas**.
     6. Redacta un **Breve Resumen Profesional** (máximo 3 líneas).
+"""
 
-    Retorna SOLAMENTE un JSON válido con el siguiente formato:
-    {{
-        "personal_info": {{
+_CV_SCHEMA = """
+    {
+        "personal_info": {
             "name": "Nombre Completo del candidato o null si no está",
             "phone": "Número de teléfono o null si no está",
             "email": "email@ejemplo.com o null si no está",
@@ -132,28 +197,53 @@ def _build_prompt(text: str) -> str:
             "nationality": "Nacionalidad o null si no está",
             "summary": "Resumen del perfil...",
             "languages": ["Inglés (B2)", "Español (Nativo)"]
-        }},
+        },
         "hard_skills": ["Python", "React", "SQL"],
         "soft_skills": ["Liderazgo", "Comunicación"],
         "education": [
-            {{
+            {
                 "degree": "Título obtenido",
                 "institution": "Nombre Universidad",
                 "year": "2020"
-            }}
+            }
         ],
         "experience": [
-            {{
+            {
                 "role": "Cargo desempeñado",
                 "company": "Nombre Empresa",
                 "duration": "2021 - Presente",
                 "description": "Breve descripción de responsabilidades"
-            }}
+            }
         ]
-    }}
-    """
+    }
+"""
 
 
+def _build_prompt(text: str) -> str:
+    return f"""
+    Actúa como un reclutador experto en tecnología y RRHH. Analiza el siguiente texto extraído de un CV y extrae la información relevante en un formato estructurado.
+
+    TEXTO DEL CV:
+    {text[:4000]}
+{_CV_INSTRUCTIONS}
+    Retorna SOLAMENTE un JSON válido con el siguiente formato:{_CV_SCHEMA}    """
+
+
+def _build_batch_prompt(texts: List[str]) -> str:
+    """Prompt con varios CVs; mismas instrucciones y formato que _build_prompt."""
+    blocks = "\n".join(
+        f"""
+    === CV {i} ===
+    {text[:4000]}
+    === FIN CV {i} ==="""
+        for i, text in enumerate(texts)
+    )
+    return f"""
+    Actúa como un reclutador experto en tecnología y RRHH. Analiza por separado cada uno de los siguientes {len(texts)} CVs y extrae la información relevante de cada uno en un formato estructurado. No mezcles datos entre CVs.
+{blocks}
+{_CV_INSTRUCTIONS}
+    Retorna SOLAMENTE un arreglo JSON válido con exactamente {len(texts)} objetos, uno por CV y en el mismo orden. Cada objeto incluye el campo "cv_index" (número del CV) y el siguiente formato:{_CV_SCHEMA}    """
+
 
 def _build_oferta_prompt(text: str) -> str:
     return f"""
@@ -216,70 +306,185 @@ def _parse_gemini_response(response_text: str) -> Dict[str, Any]:
 
 def _is_quota_error(error: Exception) -> bool:
     """Check if error is a 429 quota/rate-limit error."""
-    err_str = str(error)
-    return "429" in err_str or "quota" in err_str.lower() or "rate" in err_str.lower()
+    err_str = str(error).lower()
+    return (
+        "429" in err_str
+        or "quota" in err_str
+        or "resource has been exhausted" in err_str
+        or "resource_exhausted" in err_str
+        or "rate limit" in err_str
+    )
+
+
+def _cache_lookup(kind: str, text: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Return (cache key, cached result) for a text; (None, None) if the cache is off."""
+    cache = get_extraction_cache()
+    if cache is None:
+        return None, None
+    key = make_cache_key(text, kind, PROMPT_VERSIONS[kind], GEMINI_MODEL)
+    try:
+        result = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Extraction cache read failed: {e}")
+        return key, None
+    if result is not None:
+        logger.info(f"Gemini {kind} extraction served from cache")
+    return key, result
+
+
+def _cache_store(kind: str, key: Optional[str], result: Dict[str, Any]):
+    """Store a successful extraction (errors are never cached)."""
+    if key is None or result.get("error"):
+        return
+    cache = get_extraction_cache()
+    if cache is None:
+        return
+    try:
+        cache.put(key, kind, result)
+    except Exception as e:
+        logger.warning(f"Extraction cache write failed: {e}")
+
 
+_clients_by_key: Dict[str, glm.GenerativeServiceClient] = {}
+_clients_lock = threading.Lock()
 
-def _call_gemini_sync(prompt: str) -> Dict[str, Any]:
-    """Synchronous Gemini call (runs inside thread executor)."""
-    _key_pool.configure_current()
-    model = genai.GenerativeModel(GEMINI_MODEL)
-    response = model.generate_content(prompt)
+
+def _client_for_key(key: str) -> glm.GenerativeServiceClient:
+    """
+    Generative service client bound to one API key (no global configure).
+
+    google.generativeai only takes the key through the process-wide
+    genai.configure(); the public client of google.ai.generativelanguage
+    (which google.generativeai wraps) accepts it per instance.
+    """
+    with _clients_lock:
+        client = _clients_by_key.get(key)
+        if client is None:
+            client = glm.GenerativeServiceClient(client_options={"api_key": key})
+            _clients_by_key[key] = client
+        return client
+
+
+def _generate_with_key(prompt: str, key: str) -> GenerateContentResponse:
+    """generate_content with a per-key client, same request as GenerativeModel."""
+    request = glm.GenerateContentRequest(
+        model=GEMINI_MODEL if GEMINI_MODEL.startswith("models/") else f"models/{GEMINI_MODEL}",
+        contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+    )
+    response = _client_for_key(key).generate_content(
+        request=request, timeout=GEMINI_TIMEOUT_SECONDS
+    )
+    return GenerateContentResponse.from_response(response)
+
+
+def _call_gemini_sync(prompt: str, key: Optional[str] = None) -> Any:
+    """
+    Synchronous Gemini call (runs inside the Gemini thread pool).
+
+    The request carries its own deadline, so a call the async side gave up
+    on does not keep its thread busy past GEMINI_TIMEOUT_SECONDS.
+    """
+    if key is None:
+        _key_pool.configure_current()
+        response = genai.GenerativeModel(GEMINI_MODEL).generate_content(
+            prompt, request_options={"timeout": GEMINI_TIMEOUT_SECONDS}
+        )
+    else:
+        response = _generate_with_key(prompt, key)
     return _parse_gemini_response(response.text)
 
 
+def _slot(key: str) -> int:
+    """Position of a key in the pool (for logs; keys are never logged)."""
+    return _key_pool._keys.index(key) if key in _key_pool._keys else -1
+
+
+def get_gemini_usage() -> Dict[str, Any]:
+    """Current per-key utilization of the Gemini rate limiter."""
+    usage = _rate_limiter.metrics()
+    usage['max_concurrent'] = MAX_CONCURRENT_GEMINI
+    usage['model'] = GEMINI_MODEL
+    return usage
+
+
 def extract_skills_with_llm_sync(text: str) -> Dict[str, Any]:
-    """Sync wrapper for backward compat (used by deprecated nlp.py)."""
+    """
+    Sync wrapper for backward compat (scripts and nlp.process_cv_text).
+    Blocks the calling thread for the whole round trip: async code must
+    use extract_skills_with_llm (or nlp.process_cv_text_async).
+    """
+    cache_key, cached = _cache_lookup("cv", text)
+    if cached is not None:
+        return cached
     if not _key_pool.has_keys:
         return {"error": "API Key missing", "skills": [], "summary": ""}
     prompt = _build_prompt(text)
-    try:
-        return _call_gemini_sync(prompt)
-    except Exception as e:
-        if _is_quota_error(e) and _key_pool.key_count > 1:
-            _key_pool.rotate()
-            _key_pool.configure_current()
-            try:
-                return _call_gemini_sync(prompt)
-            except Exception as e2:
-                logger.error(f"Sync Gemini extraction error after rotation: {e2}")
-                return {"error": str(e2), "skills": [], "summary": ""}
-        logger.error(f"Sync Gemini extraction error: {e}")
-        return {"error": str(e), "skills": [], "summary": ""}
+    tokens = estimate_tokens(prompt)
 
+    # One retry on a different key after a quota error
+    for attempt in range(2):
+        key = _rate_limiter.acquire_sync(tokens)
+        try:
+            result = _call_gemini_sync(prompt, key)
+            _rate_limiter.report_success(key)
+            _cache_store("cv", cache_key, result)
+            return result
+        except Exception as e:
+            if _is_quota_error(e):
+                _rate_limiter.report_quota_error(key, parse_retry_after(e))
+                if attempt == 0 and _key_pool.key_count > 1:
+                    continue
+            else:
+                _rate_limiter.report_failure(key)
+            logger.error(f"Sync Gemini extraction error: {e}")
+            return {"error": str(e), "skills": [], "summary": ""}
 
-async def extract_skills_with_llm(text: str) -> Dict[str, Any]:
-    """
-    Extracts skills and professional info using Google Gemini.
-    - Async: does not block the event loop
-    - Semaphore: limits concurrent Gemini calls
-    - Timeout: fails after GEMINI_TIMEOUT_SECONDS
-    - Retries: up to MAX_RETRIES with exponential backoff
-    - Key rotation: on 429 errors, rotates to next API key
+
+async def _generate_with_retries(prompt: str, label: str) -> Tuple[Any, Optional[str]]:
     """
-    if not _key_pool.has_keys:
-        return {"error": "API Key missing", "skills": [], "summary": ""}
+    Gemini call with rate limiting, semaphore, timeout and retries.
 
-    prompt = _build_prompt(text)
+    The rate limiter picks the key with the most free budget before each
+    call. A 429 cools that key down and the call is retried at once on
+    another key (or after the cooldown); other errors consume one of the
+    MAX_RETRIES attempts and back off exponentially with jitter.
+
+    Returns:
+        (parsed JSON, None) on success, (None, last error) when retries run out
+    """
+    tokens = estimate_tokens(prompt)
+    max_quota_errors = MAX_RETRIES * max(1, _key_pool.key_count)
     last_error = None
-    keys_tried = 0
+    failures = 0
+    quota_errors = 0
 
-    for attempt in range(1, MAX_RETRIES + 1):
+    while failures < MAX_RETRIES and quota_errors < max_quota_errors:
+        attempt = failures + quota_errors + 1
+        key = await _rate_limiter.acquire(tokens)
         try:
-            async with _gemini_semaphore:
-                logger.info(f"Gemini attempt {attempt}/{MAX_RETRIES} (key slot {_key_pool._current_index})")
-                loop = asyncio.get_event_loop()
+            async with _get_gemini_semaphore():
+                logger.info(f"Gemini {label} attempt {attempt} (key slot {_slot(key)})")
+                loop = asyncio.get_running_loop()
                 result = await asyncio.wait_for(
-                    loop.run_in_executor(None, _call_gemini_sync, prompt),
+                    loop.run_in_executor(get_llm_executor(), _call_gemini_sync, prompt, key),
                     timeout=GEMINI_TIMEOUT_SECONDS
                 )
-                return result
+            _rate_limiter.report_success(key)
+            return result, None
+
+        except asyncio.CancelledError:
+            # Caller went away (client disconnect, job cancelled): stop waiting,
+            # free the semaphore slot and the key's in-flight count
+            _rate_limiter.report_failure(key)
+            raise
 
         except asyncio.TimeoutError:
+            _rate_limiter.report_failure(key)
             last_error = f"Timeout after {GEMINI_TIMEOUT_SECONDS}s (attempt {attempt})"
             logger.warning(last_error)
 
         except json.JSONDecodeError as e:
+            _rate_limiter.report_failure(key)
             last_error = f"Invalid JSON from Gemini (attempt {attempt}): {e}"
             logger.warning(last_error)
 
@@ -287,69 +492,195 @@ async def extract_skills_with_llm(text: str) -> Dict[str, Any]:
             last_error = f"Gemini error (attempt {attempt}): {e}"
             logger.warning(last_error)
 
-            # On quota error: rotate key immediately
-            if _is_quota_error(e) and _key_pool.key_count > 1:
-                keys_tried += 1
-                if keys_tried < _key_pool.key_count:
-                    _key_pool.rotate()
-                    logger.info(f"Quota hit - rotated to key slot {_key_pool._current_index}")
-                    # Retry immediately with new key (no backoff)
-                    continue
-                else:
-                    logger.error("All API keys exhausted (quota on all)")
-
-        # Exponential backoff before retry
-        if attempt < MAX_RETRIES:
-            wait = 2 ** (attempt - 1)
-            logger.info(f"Retrying in {wait}s...")
+            if _is_quota_error(e):
+                cooldown = _rate_limiter.report_quota_error(key, parse_retry_after(e))
+                quota_errors += 1
+                logger.info(f"Quota hit on key slot {_slot(key)} - cooling down {cooldown:.1f}s")
+                # The limiter moves the retry to another key or waits the cooldown
+                continue
+            _rate_limiter.report_failure(key)
+
+        failures += 1
+        if failures < MAX_RETRIES:
+            wait = with_jitter(2 ** (failures - 1))
+            logger.info(f"Retrying in {wait:.1f}s...")
             await asyncio.sleep(wait)
 
-    logger.error(f"Gemini extraction failed after {MAX_RETRIES} attempts: {last_error}")
-    return {"error": last_error, "skills": [], "summary": ""}
+    logger.error(f"Gemini {label} extraction failed after {failures + quota_errors} attempts: {last_error}")
+    return None, last_error
 
 
-async def extract_oferta_with_llm(text: str) -> Dict[str, Any]:
+async def extract_skills_with_llm(text: str) -> Dict[str, Any]:
     """
-    Extrae información estructurada de una convocatoria laboral usando Gemini.
-    Mismo mecanismo que extract_skills_with_llm (semáforo, reintentos, rotación de keys).
+    Extracts skills and professional info using Google Gemini.
+    - Async: does not block the event loop
+    - Semaphore: limits concurrent Gemini calls
+    - Timeout: fails after GEMINI_TIMEOUT_SECONDS
+    - Retries: up to MAX_RETRIES with exponential backoff
+    - Key rotation: on 429 errors, rotates to next API key
+    - Cache: identical CV text (same prompt version and model) skips the API
     """
+    cache_key, cached = _cache_lookup("cv", text)
+    if cached is not None:
+        return cached
+
     if not _key_pool.has_keys:
-        return {"error": "API Key missing"}
+        return {"error": "API Key missing", "skills": [], "summary": ""}
 
-    prompt = _build_oferta_prompt(text)
-    last_error = None
-    keys_tried = 0
+    result, error = await _generate_with_retries(_build_prompt(text), "cv")
+    if error is not None:
+        return {"error": error, "skills": [], "summary": ""}
 
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            async with _gemini_semaphore:
-                logger.info(f"Gemini oferta attempt {attempt}/{MAX_RETRIES} (key slot {_key_pool._current_index})")
-                loop = asyncio.get_event_loop()
-                result = await asyncio.wait_for(
-                    loop.run_in_executor(None, _call_gemini_sync, prompt),
-                    timeout=GEMINI_TIMEOUT_SECONDS
-                )
-                return result
+    _cache_store("cv", cache_key, result)
+    return result
 
-        except asyncio.TimeoutError:
-            last_error = f"Timeout after {GEMINI_TIMEOUT_SECONDS}s (attempt {attempt})"
-            logger.warning(last_error)
 
-        except json.JSONDecodeError as e:
-            last_error = f"Invalid JSON from Gemini (attempt {attempt}): {e}"
-            logger.warning(last_error)
+def _align_batch_items(parsed: Any, size: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Orders a batch response to match the CVs in the prompt.
 
-        except Exception as e:
-            last_error = f"Gemini error (attempt {attempt}): {e}"
-            logger.warning(last_error)
-            if _is_quota_error(e) and _key_pool.key_count > 1:
-                keys_tried += 1
-                if keys_tried < _key_pool.key_count:
-                    _key_pool.rotate()
+    The response must have exactly `size` objects. cv_index is only trusted
+    when every object has one and they are exactly 0..size-1 (no gaps or
+    duplicates); without any cv_index the objects are matched by position.
+    Any other shape (shifted or repeated indexes, partial indexes, wrong
+    count) returns None so the caller retries each CV on its own.
+    """
+    if not isinstance(parsed, list) or len(parsed) != size:
+        return None
+    if not all(isinstance(item, dict) for item in parsed):
+        return None
+
+    if all("cv_index" not in item for item in parsed):
+        return parsed
+
+    try:
+        indexes = [int(item["cv_index"]) for item in parsed]
+    except (KeyError, TypeError, ValueError):
+        return None
+    if sorted(indexes) != list(range(size)):
+        return None
+
+    aligned: List[Optional[Dict[str, Any]]] = [None] * size
+    for index, item in zip(indexes, parsed):
+        aligned[index] = {k: v for k, v in item.items() if k != "cv_index"}
+    return aligned
+
+
+def _normalize_for_match(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _matches_source(result: Dict[str, Any], text: str) -> bool:
+    """
+    Checks that a batch item belongs to the CV it was matched to: the
+    extracted email, or every word (3+ letters) of the extracted name, must
+    appear in that CV's text. Items without email or name are accepted.
+    """
+    info = result.get("personal_info") or {}
+    email = (info.get("email") or "").strip().lower() if isinstance(info, dict) else ""
+    name = (info.get("name") or "").strip() if isinstance(info, dict) else ""
+    name_words = [w for w in _normalize_for_match(name).split() if len(w) >= 3]
+
+    if not email and not name_words:
+        return True
+
+    source = _normalize_for_match(text)
+    if email and email in source:
+        return True
+    return bool(name_words) and all(w in source for w in name_words)
+
+
+async def extract_skills_batch_with_llm(texts: List[str], batch_size: int = None) -> List[Dict[str, Any]]:
+    """
+    Extracts several CVs packing up to batch_size CVs per Gemini request.
+
+    Each request goes through the same semaphore, retries and key rotation
+    as extract_skills_with_llm, so MAX_CONCURRENT_GEMINI bounds the number
+    of requests (not CVs) in flight. Cached CVs are not sent. A batch whose
+    response cannot be aligned to its CVs is retried one CV at a time, and
+    so is any CV whose extracted email/name is not in its own text. A batch
+    request that fails after its retries gives an error dict for each CV.
+
+    Returns:
+        One result per text, in the same order (error dicts on failure)
+    """
+    batch_size = max(1, batch_size or GEMINI_CV_BATCH_SIZE)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    pending: List[Tuple[int, Optional[str]]] = []
+
+    for i, text in enumerate(texts):
+        cache_key, cached = _cache_lookup("cv", text)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, cache_key))
+
+    if pending and not _key_pool.has_keys:
+        for i, _ in pending:
+            results[i] = {"error": "API Key missing", "skills": [], "summary": ""}
+        return results
+
+    async def run_batch(batch: List[Tuple[int, Optional[str]]]):
+        if len(batch) == 1:
+            i, _ = batch[0]
+            results[i] = await extract_skills_with_llm(texts[i])
+            return
+
+        parsed, error = await _generate_with_retries(
+            _build_batch_prompt([texts[i] for i, _ in batch]), f"cv batch x{len(batch)}"
+        )
+        if error is not None:
+            # Retries (and key rotation) already ran out: one request per CV
+            # would only multiply the calls while Gemini is failing or throttling
+            for i, _ in batch:
+                results[i] = {"error": error, "skills": [], "summary": ""}
+            return
+
+        items = _align_batch_items(parsed, len(batch))
+
+        retry = []
+        if items is None:
+            logger.warning(f"Gemini batch x{len(batch)} could not be aligned to its CVs "
+                           f"(unexpected cv_index or item count); retrying one by one")
+            retry = [i for i, _ in batch]
+        else:
+            for (i, cache_key), item in zip(batch, items):
+                if not _matches_source(item, texts[i]):
+                    retry.append(i)
                     continue
+                results[i] = item
+                _cache_store("cv", cache_key, item)
+            if retry:
+                logger.warning(f"Gemini batch x{len(batch)}: {len(retry)} CVs do not match "
+                               f"their source text; retrying them individually")
+
+        retried = await asyncio.gather(*[extract_skills_with_llm(texts[i]) for i in retry])
+        for i, result in zip(retry, retried):
+            results[i] = result
+
+    await asyncio.gather(*[
+        run_batch(pending[start:start + batch_size])
+        for start in range(0, len(pending), batch_size)
+    ])
+    return results
+
+
+async def extract_oferta_with_llm(text: str) -> Dict[str, Any]:
+    """
+    Extrae información estructurada de una convocatoria laboral usando Gemini.
+    Mismo mecanismo que extract_skills_with_llm (semáforo, reintentos, rotación de keys, cache).
+    """
+    cache_key, cached = _cache_lookup("oferta", text)
+    if cached is not None:
+        return cached
+
+    if not _key_pool.has_keys:
+        return {"error": "API Key missing"}
 
-        if attempt < MAX_RETRIES:
-            await asyncio.sleep(2 ** (attempt - 1))
+    result, error = await _generate_with_retries(_build_oferta_prompt(text), "oferta")
+    if error is not None:
+        return {"error": error}
 
-    logger.error(f"Oferta extraction failed after {MAX_RETRIES} attempts: {last_error}")
-    return {"error": last_error}
+    _cache_store("oferta", cache_key, result)
+    return result
@@ -1,15 +1,133 @@
+import asyncio
+import logging
 import re
-import spacy
+import threading
+import time
 from .llm_extractor import extract_skills_with_llm_sync as extract_skills_with_llm
+from .llm_extractor import extract_skills_with_llm as extract_skills_with_llm_async
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = "es_core_news_sm"
+
+# Only doc.ents is used: these components are never loaded
+SPACY_EXCLUDE = ["parser", "morphologizer", "tagger", "lemmatizer", "attribute_ruler", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+_nlp_load_seconds = None
+
 
 def load_spacy_model():
+    """
+    Load the Spanish pipeline with only what NER needs.
+
+    tok2vec stays loaded only if ner listens to it (in the small models
+    ner has its own embedding layer, so the shared tok2vec is disabled).
+    """
+    import spacy
+
     try:
-        return spacy.load("es_core_news_sm")
+        model = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
     except OSError:
-        print("Warning: es_core_news_sm not found. Using blank 'es' model.")
+        print(f"Warning: {SPACY_MODEL} not found. Using blank 'es' model.")
         return spacy.blank("es")
 
-nlp = load_spacy_model()
+    if "tok2vec" in model.pipe_names and not model.get_pipe("tok2vec").listening_components:
+        model.disable_pipe("tok2vec")
+    return model
+
+
+def get_nlp():
+    """spaCy pipeline shared by the process, loaded on first use."""
+    global _nlp, _nlp_load_seconds
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                started = time.perf_counter()
+                _nlp = load_spacy_model()
+                _nlp_load_seconds = time.perf_counter() - started
+                logger.info(f"spaCy pipeline loaded in {_nlp_load_seconds:.2f}s: {_nlp.pipe_names}")
+    return _nlp
+
+
+def warm_up() -> float:
+    """
+    Load the pipeline and run it once (application startup).
+
+    Returns:
+        Seconds spent loading the model
+    """
+    get_nlp()("Juan Perez trabaja en La Paz, Bolivia.")
+    return _nlp_load_seconds or 0.0
+
+
+def __getattr__(name):
+    # Backward compat: nlp.nlp used to be the model loaded at import time
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# =============================================
+# Precompiled patterns (built once at import)
+# =============================================
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_DIGIT_RE = re.compile(r'\D')
+_NON_DIGITS_RE = re.compile(r'\D+')
+
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# General pattern: Optional Country Code (+34, +51) + Blocks of digits
+# Must be at least 8 digits long.
+# Matches formats like: +34 600 000 000, 600-000-000, 600 000 000, or 8 consecutive digits
+_PHONE_RE = re.compile(r'(?:\+?\d{1,3}[ -]?)?(?:[679]\d{2}[ -]?\d{3}[ -]?\d{3}|\b\d{3}[ -]?\d{2}[ -]?\d{2}[ -]?\d{2}\b|\b\d{4}[ -]?\d{4}\b|\b\d{8}\b)')
+
+# Regex Patterns for precise titles
+_CAREER_TITLE_RES = [
+    re.compile(r'(?i)(?:Ingenier[ía|o]|Licenciatur[a|o]|Grado|Diplomatura|Técnic[o|a]|Máster|Doctorado) (?:en|de) [a-zA-ZáéíóúÁÉÍÓÚñÑ ]+'),
+    re.compile(r'(?i)(?:Arquitect[o|ura]|Psicólog[o|ía]|Abogad[o|a])'),
+]
+
+# Keyword fallback (if regex didn't catch specific "Administrador")
+CAREER_KEYWORDS = [
+    "Analista de Sistemas", "Desarrollador Full Stack", "Project Manager",
+    "Contador Público", "Economista", "Administrador de Empresas",
+    "Enfermero", "Médico Cirujano", "Marketing Digital", "Community Manager",
+    "Diseñador Gráfico", "Diseño Gráfico", "Consultor", "Auditor", "Psicólogo Organizacional",
+    "Recursos Humanos", "Ventas", "Atención al Cliente", "Soporte Técnico"
+]
+_CAREER_KEYWORD_BY_LOWER = {k.lower(): k for k in CAREER_KEYWORDS}
+# One alternation instead of one search per keyword (longest first)
+_CAREER_KEYWORDS_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(k) for k in sorted(CAREER_KEYWORDS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# Keywords to trigger section change (dict order = priority when a line has several)
+SECTION_MAP = {
+    "experiencia": "experience",
+    "laboral": "experience",
+    "trayectoria": "experience",
+    "educación": "education",
+    "formación": "education",
+    "estudios": "education",
+    "académica": "education",
+    "habilidades": "skills",
+    "competencias": "skills",
+    "conocimientos": "skills",
+    "skills": "skills",
+    "idiomas": "skills",
+    "proyectos": "other",
+    "referencias": "other"
+}
+_SECTION_PRIORITY = {key: i for i, key in enumerate(SECTION_MAP)}
+# Lookahead so overlapping keywords are all seen, like the old `key in line` loop
+_SECTION_HEADER_RE = re.compile('(?=(' + '|'.join(re.escape(k) for k in SECTION_MAP) + '))')
+
+# Lines shorter than this may be section headers
+_HEADER_MAX_LENGTH = 40
+
 
 def clean_text(text: str) -> str:
     """
@@ -20,7 +138,7 @@ def clean_text(text: str) -> str:
         return ""
     
     # Replace multiple whitespace characters with a single space
-    cleaned_text = re.sub(r'\s+', ' ', text)
+    cleaned_text = _WHITESPACE_RE.sub(' ', text)
     
     # Strip leading and trailing whitespace
     return cleaned_text.strip()
@@ -29,46 +147,33 @@ def clean_text(text: str) -> str:
 
 def extract_emails(text: str) -> list:
     """Extract email addresses using regex."""
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    return list(set(re.findall(email_pattern, text)))
+    return list(set(_EMAIL_RE.findall(text)))
 
 def extract_phone_numbers(text: str) -> list:
     """
     Extract phone numbers with strict filtering to avoid dates/indices.
     """
-    # General pattern: Optional Country Code (+34, +51) + Blocks of digits
-    # Must be at least 8 digits long.
-    # Matches formats like: +34 600 000 000, 600-000-000, 600 000 000, or 8 consecutive digits
-    phone_pattern = r'(?:\+?\d{1,3}[ -]?)?(?:[679]\d{2}[ -]?\d{3}[ -]?\d{3}|\b\d{3}[ -]?\d{2}[ -]?\d{2}[ -]?\d{2}\b|\b\d{4}[ -]?\d{4}\b|\b\d{8}\b)'
-    
-    matches = re.findall(phone_pattern, text)
     valid_phones = []
-    for m in matches:
+    for m in _PHONE_RE.findall(text):
         # Cleanup
-        clean_p = re.sub(r'\D', '', m)
+        clean_p = _NON_DIGIT_RE.sub('', m)
         
         # Length check (7 to 15 digits)
         if not (7 <= len(clean_p) <= 15):
             continue
             
         # Anti-Date/Year Heuristics
-        # 1. Single Year: If it looks like a year 1990-2030 standing alone (4 digits), ignore (covered by length check > 7, but just in case logic changes)
-        
-        # 2. Date Ranges (e.g. 2017-2019, 1990-2000). Total digits = 8.
-        if len(clean_p) == 8:
-            # Check if it starts with 19 or 20 (common centuries)
-            if clean_p.startswith('19') or clean_p.startswith('20'):
-                # Check for separator structure
-                # If the match has a separator in the middle, likely a date range
-                # Regex to split: 2017-2019 -> ['2017', '2019']
-                parts = re.split(r'\D+', m)
-                parts = [p for p in parts if p] # filter empty
-                
-                # If we have 2 parts of 4 digits, and both look like years
-                if len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 4:
-                     p1, p2 = int(parts[0]), int(parts[1])
-                     if (1900 <= p1 <= 2100) and (1900 <= p2 <= 2100):
-                         continue
+        # Date Ranges (e.g. 2017-2019, 1990-2000). Total digits = 8.
+        if len(clean_p) == 8 and (clean_p.startswith('19') or clean_p.startswith('20')):
+            # If the match has a separator in the middle, likely a date range
+            # 2017-2019 -> ['2017', '2019']
+            parts = [p for p in _NON_DIGITS_RE.split(m) if p]
+            
+            # If we have 2 parts of 4 digits, and both look like years
+            if len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 4:
+                 p1, p2 = int(parts[0]), int(parts[1])
+                 if (1900 <= p1 <= 2100) and (1900 <= p2 <= 2100):
+                     continue
 
         valid_phones.append(m.strip())
             
@@ -78,37 +183,28 @@ def extract_careers(text: str) -> list:
     """
     Extract potential degrees/careers using Regex patterns and expanded Keywords.
     """
-    careers = []
-    cleaned_text = re.sub(r'\s+', ' ', text) # Single line for easier regex
+    careers = set()
+    cleaned_text = _WHITESPACE_RE.sub(' ', text) # Single line for easier regex
 
-    # 1. Regex Patterns for precise titles
-    patterns = [
-        r'(?i)(?:Ingenier[ía|o]|Licenciatur[a|o]|Grado|Diplomatura|Técnic[o|a]|Máster|Doctorado) (?:en|de) [a-zA-ZáéíóúÁÉÍÓÚñÑ ]+',
-        r'(?i)(?:Arquitect[o|ura]|Psicólog[o|ía]|Abogad[o|a])'
-    ]
-    
-    for pat in patterns:
-        matches = re.findall(pat, cleaned_text)
-        for m in matches:
+    for pat in _CAREER_TITLE_RES:
+        for m in pat.findall(cleaned_text):
             # Filter out too long phrases (false positives capturing whole paragraphs)
             if len(m.split()) <= 6: 
-                careers.append(m.strip())
-
-    # 2. Keyword fallback (if regex didn't catch specific "Administrador")
-    keywords = [
-        "Analista de Sistemas", "Desarrollador Full Stack", "Project Manager",
-        "Contador Público", "Economista", "Administrador de Empresas",
-        "Enfermero", "Médico Cirujano", "Marketing Digital", "Community Manager",
-        "Diseñador Gráfico", "Diseño Gráfico", "Consultor", "Auditor", "Psicólogo Organizacional",
-        "Recursos Humanos", "Ventas", "Atención al Cliente", "Soporte Técnico"
-    ]
-    
-    for k in keywords:
-        # Case insensitive search for keywords
-        if re.search(r'\b' + re.escape(k) + r'\b', cleaned_text, re.IGNORECASE):
-            careers.append(k)
+                careers.add(m.strip())
 
-    return list(set(careers))
+    for m in _CAREER_KEYWORDS_RE.findall(cleaned_text):
+        careers.add(_CAREER_KEYWORD_BY_LOWER.get(m.lower(), m))
+
+    return list(careers)
+
+def _section_for_line(clean_line: str):
+    """Section a short line is a header for (None if it is not a header)."""
+    best = None
+    for match in _SECTION_HEADER_RE.finditer(clean_line):
+        key = match.group(1)
+        if best is None or _SECTION_PRIORITY[key] < _SECTION_PRIORITY[best]:
+            best = key
+    return SECTION_MAP[best] if best is not None else None
 
 def segment_cv(text: str) -> dict:
     """
@@ -122,42 +218,16 @@ def segment_cv(text: str) -> dict:
         "other": ""
     }
     
-    # Simple keyword-based segmentation
-    lower_text = text.lower()
-    lines = text.split('\n')
-    
     current_section = "personal_info" # Default start
     
-    # Keywords to trigger section change
-    section_map = {
-        "experiencia": "experience",
-        "laboral": "experience",
-        "trayectoria": "experience",
-        "educación": "education",
-        "formación": "education",
-        "estudios": "education",
-        "académica": "education",
-        "habilidades": "skills",
-        "competencias": "skills",
-        "conocimientos": "skills",
-        "skills": "skills",
-        "idiomas": "skills",
-        "proyectos": "other",
-        "referencias": "other"
-    }
-    
     buffer = []
     
-    for line in lines:
+    for line in text.split('\n'):
         clean_line = line.strip().lower()
         
         # Check if line is a likely header (short, contains keyword)
-        if len(clean_line) < 40:
-            found_section = None
-            for key, sec in section_map.items():
-                if key in clean_line:
-                    found_section = sec
-                    break
+        if len(clean_line) < _HEADER_MAX_LENGTH:
+            found_section = _section_for_line(clean_line)
             
             if found_section:
                 # Save buffer to current section
@@ -175,13 +245,38 @@ def segment_cv(text: str) -> dict:
         
     return segments
 
-def process_cv_text(text: str) -> dict:
+def analyze_cv_text(cleaned_text: str) -> dict:
     """
-    Process CV text using spaCy and Custom Regex logic.
-    Now includes Segmentation and Text Cleaning.
+    Regex analysis of a cleaned CV text: segments, emails, phones and careers
+    with the precompiled patterns above.
+
+    Returns:
+        Dict with 'segments', 'emails', 'phones' and 'careers'
+    """
+    segments = segment_cv(cleaned_text)
+
+    # Improvement: Search in 'education' segment if available, else full text
+    search_scope_careers = segments['education'] + "\n" + segments['personal_info'] if segments['education'] else cleaned_text
+
+    return {
+        'segments': segments,
+        'emails': extract_emails(cleaned_text),
+        'phones': extract_phone_numbers(cleaned_text),
+        'careers': extract_careers(search_scope_careers),
+    }
+
+def _process_local(text: str) -> tuple:
+    """
+    spaCy NER, segmentation and regex extraction (CPU-bound, no network).
+
+    Args:
+        text: Raw CV text
+
+    Returns:
+        (cleaned_text, entities, segments)
     """
     cleaned_text = clean_text(text)
-    doc = nlp(cleaned_text) # Process the cleaned text
+    doc = get_nlp()(cleaned_text) # Process the cleaned text
     
     entities = {}
     
@@ -192,28 +287,36 @@ def process_cv_text(text: str) -> dict:
         if ent.text not in entities[ent.label_]:
             entities[ent.label_].append(ent.text)
             
-    # 2. Text Segmentation (New)
-    segments = segment_cv(cleaned_text)
-    
-    # 3. Custom Regex Extraction
-    
-    # EMails 
-    custom_emails = extract_emails(cleaned_text)
-    if custom_emails:
-        entities['EMAIL'] = custom_emails
-        
-    # Phones (Strict)
-    custom_phones = extract_phone_numbers(cleaned_text)
-    if custom_phones:
-        entities['PHONE'] = custom_phones
-        
-    # Careers/Titles
-    # Improvement: Search in 'education' segment if available, else full text
-    search_scope_careers = segments['education'] + "\n" + segments['personal_info'] if segments['education'] else cleaned_text
-    custom_careers = extract_careers(search_scope_careers)
-    
-    if custom_careers:
-        entities['CAREERS'] = custom_careers
+    # 2-3. Segmentation + Custom Regex Extraction (precompiled patterns)
+    analysis = analyze_cv_text(cleaned_text)
+    segments = analysis['segments']
+
+    if analysis['emails']:
+        entities['EMAIL'] = analysis['emails']
+    if analysis['phones']:
+        entities['PHONE'] = analysis['phones']
+    if analysis['careers']:
+        entities['CAREERS'] = analysis['careers']
+
+    return cleaned_text, entities, segments
+
+
+def _build_result(cleaned_text: str, entities: dict, segments: dict) -> dict:
+    return {
+        "entities": entities,
+        "segments": segments,
+        "text_summary": cleaned_text[:300]
+    }
+
+
+def process_cv_text(text: str) -> dict:
+    """
+    Process CV text using spaCy and Custom Regex logic.
+    Now includes Segmentation and Text Cleaning.
+
+    Blocks for the Gemini round trip; from async code use process_cv_text_async.
+    """
+    cleaned_text, entities, segments = _process_local(text)
 
     # 4. LLM Extraction (Gemini)
     try:
@@ -223,9 +326,23 @@ def process_cv_text(text: str) -> dict:
     except Exception as e:
         print(f"LLM Extraction failed: {e}")
             
-    return {
-        "entities": entities,
-        "segments": segments,
-        "text_summary": cleaned_text[:300]
-    }
+    return _build_result(cleaned_text, entities, segments)
+
+
+async def process_cv_text_async(text: str) -> dict:
+    """
+    Non-blocking process_cv_text: spaCy/regex run in a worker thread and the
+    Gemini call uses the async client (semaphore, rate limiter, timeout).
+    Cancelling the caller stops waiting on Gemini.
+    """
+    cleaned_text, entities, segments = await asyncio.to_thread(_process_local, text)
+
+    # 4. LLM Extraction (Gemini)
+    try:
+        llm_data = await extract_skills_with_llm_async(cleaned_text)
+        if "error" not in llm_data:
+            entities['LLM_SKILLS'] = llm_data
+    except Exception as e:
+        print(f"LLM Extraction failed: {e}")
 
+    return _build_result(cleaned_text, entities, segments)
@@ -0,0 +1,211 @@
+"""
+Analytics Repository
+Lecturas agregadas para los informes de /api/analytics
+
+Cada funcion lee una vista o funcion de las migraciones v9-v11: la
+agrupacion, los conteos y los joins con usuarios/perfiles se hacen en
+Postgres y solo viaja una fila por oferta, institucion o skill.
+"""
+
+import logging
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _select_all(client, view: str) -> List[Dict]:
+    response = client.table(view).select("*").execute()
+    return response.data or []
+
+
+def fetch_postulaciones_stats(client) -> Dict[str, Dict]:
+    """
+    Conteos por clasificacion y puntajes de cada oferta con postulaciones
+    (vista postulaciones_stats_por_oferta). Es el unico lector de la vista:
+    informes y PostulacionService.get_stats_por_oferta parten de aqui. Si la
+    migracion v9 no se aplico, agrega las postulaciones en Python.
+
+    Args:
+        client: Cliente Supabase
+
+    Returns:
+        Dict {oferta_id: {total, apto, considerado, no_apto, max_score, avg_score}}
+        con los puntajes en escala 0-1 (None si no hay puntajes)
+    """
+    try:
+        rows = _select_all(client, "postulaciones_stats_por_oferta")
+    except Exception as e:
+        logger.warning(f"Vista postulaciones_stats_por_oferta no disponible: {e}")
+        rows = _aggregate_postulaciones_stats(client)
+
+    stats = {}
+    for row in rows:
+        stats[row['oferta_id']] = {
+            'total': row.get('total') or 0,
+            'apto': row.get('apto') or 0,
+            'considerado': row.get('considerado') or 0,
+            'no_apto': row.get('no_apto') or 0,
+            'max_score': _to_float(row.get('max_score')),
+            'avg_score': _to_float(row.get('avg_score')),
+        }
+    return stats
+
+
+def _aggregate_postulaciones_stats(client, page_size: int = 1000) -> List[Dict]:
+    """
+    Agrega las estadisticas en Python (sin la migracion v9).
+    Lee solo oferta_id, clasificacion y match_score, por paginas.
+
+    Returns:
+        Filas con el mismo formato que la vista
+    """
+    acc: Dict[str, Dict] = {}
+    offset = 0
+    while True:
+        response = client.table("postulaciones") \
+            .select("oferta_id, clasificacion, match_score") \
+            .order("id") \
+            .range(offset, offset + page_size - 1) \
+            .execute()
+        posts = response.data or []
+
+        for p in posts:
+            row = acc.setdefault(p['oferta_id'], {
+                'oferta_id': p['oferta_id'], 'total': 0, 'apto': 0,
+                'considerado': 0, 'no_apto': 0, 'scores': []
+            })
+            row['total'] += 1
+            key = {'APTO': 'apto', 'CONSIDERADO': 'considerado',
+                   'NO_APTO': 'no_apto'}.get(p.get('clasificacion'))
+            if key:
+                row[key] += 1
+            if p.get('match_score') is not None:
+                row['scores'].append(p['match_score'])
+
+        if len(posts) < page_size:
+            break
+        offset += page_size
+
+    for row in acc.values():
+        scores = row.pop('scores')
+        row['max_score'] = max(scores) if scores else None
+        row['avg_score'] = sum(scores) / len(scores) if scores else None
+
+    return list(acc.values())
+
+
+def fetch_postulantes_por_oferta(client) -> Dict[str, Dict]:
+    """
+    Rol y carreras de los postulantes de cada oferta
+    (vista postulantes_por_oferta).
+
+    Args:
+        client: Cliente Supabase
+
+    Returns:
+        Dict {oferta_id: {estudiantes, titulados, carreras}} con carreras
+        ordenadas de mas a menos frecuente
+    """
+    postulantes = {}
+    for row in _select_all(client, "postulantes_por_oferta"):
+        postulantes[row['oferta_id']] = {
+            'estudiantes': row.get('estudiantes') or 0,
+            'titulados': row.get('titulados') or 0,
+            'carreras': row.get('carreras') or [],
+        }
+    return postulantes
+
+
+def fetch_ofertas_stats_por_institucion(client) -> Dict[str, Dict]:
+    """
+    Ofertas publicadas, ofertas vigentes y postulaciones recibidas por
+    institucion (vista ofertas_stats_por_institucion).
+
+    Args:
+        client: Cliente Supabase
+
+    Returns:
+        Dict {institutional_profile_id: {total, activas, postulaciones}}
+    """
+    stats = {}
+    for row in _select_all(client, "ofertas_stats_por_institucion"):
+        stats[row['institutional_profile_id']] = {
+            'total': row.get('total_ofertas') or 0,
+            'activas': row.get('ofertas_activas') or 0,
+            'postulaciones': row.get('total_postulaciones') or 0,
+        }
+    return stats
+
+
+def fetch_skills_cloud(
+    client,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 15
+) -> Dict[str, List[Dict]]:
+    """
+    Skills mas frecuentes de los perfiles actualizados en el rango, sumando
+    los contadores diarios de skills_frecuencia_diaria (migracion v11).
+
+    Args:
+        client: Cliente Supabase
+        start_date: Fecha inicial YYYY-MM-DD (inclusive)
+        end_date: Fecha final YYYY-MM-DD (inclusive)
+        limit: Skills por tipo
+
+    Returns:
+        Dict {'hard_skills': [{name, count}], 'soft_skills': [{name, count}]}
+    """
+    desde = start_date[:10] if start_date else None
+    hasta = end_date[:10] if end_date else None
+
+    try:
+        cloud = {}
+        for tipo in ("hard", "soft"):
+            response = client.rpc("skills_cloud", {
+                "p_tipo": tipo, "p_desde": desde, "p_hasta": hasta, "p_limite": limit
+            }).execute()
+            cloud[f"{tipo}_skills"] = [
+                {"name": row["skill"], "count": row["total"]} for row in response.data or []
+            ]
+        return cloud
+    except Exception as e:
+        logger.warning(f"Funcion skills_cloud no disponible, contando en Python: {e}")
+        return _count_skills_from_profiles(client, desde, hasta, limit)
+
+
+def _count_skills_from_profiles(
+    client,
+    desde: Optional[str],
+    hasta: Optional[str],
+    limit: int
+) -> Dict[str, List[Dict]]:
+    """Cuenta los skills en Python (si la migracion v11 no se aplico)"""
+    query = client.table("perfiles_profesionales").select("hard_skills, soft_skills")
+    if desde:
+        query = query.gte("updated_at", desde)
+    if hasta:
+        query = query.lt("updated_at", (date.fromisoformat(hasta) + timedelta(days=1)).isoformat())
+    response = query.execute()
+
+    hard_counter = Counter()
+    soft_counter = Counter()
+    for profile in response.data or []:
+        for s in profile.get("hard_skills") or []:
+            if s:
+                hard_counter[s.strip().lower()] += 1
+        for s in profile.get("soft_skills") or []:
+            if s:
+                soft_counter[s.strip().lower()] += 1
+
+    return {
+        "hard_skills": [{"name": k, "count": v} for k, v in hard_counter.most_common(limit)],
+        "soft_skills": [{"name": k, "count": v} for k, v in soft_counter.most_common(limit)],
+    }
+
+
+def _to_float(value) -> Optional[float]:
+    # PostgREST puede devolver numeric como string
+    return float(value) if value is not None else None
@@ -0,0 +1,179 @@
+"""
+Async Database Access
+Capa asincrona sobre el cliente Supabase (supabase-py es sincrono)
+
+Las consultas se ejecutan en un pool de threads dedicado y acotado, de modo
+que una consulta lenta nunca bloquea el event loop de FastAPI:
+- DB_POOL_SIZE: threads del pool (y conexiones HTTP simultaneas a PostgREST)
+- DB_MAX_CONCURRENCY: consultas en vuelo por event loop; el resto espera turno
+- DB_TIMEOUT_SECONDS: tiempo maximo por consulta antes de DatabaseTimeoutError
+
+Uso en rutas:
+    response = await async_db(supabase).table("usuarios") \\
+        .select("*") \\
+        .eq("id", user_id) \\
+        .execute()
+
+    perfil = await run_db(profile_service.get_profile, user_id)
+"""
+
+import asyncio
+import functools
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseTimeoutError(TimeoutError):
+    """La consulta supero DB_TIMEOUT_SECONDS"""
+    pass
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Pool de threads dedicado a la base de datos (creado al primer uso)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DB_POOL_SIZE,
+            thread_name_prefix="db"
+        )
+    return _executor
+
+
+def shutdown_db_executor() -> None:
+    """Libera el pool de threads (shutdown de la aplicacion)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """
+    Semaforo de concurrencia del event loop actual.
+
+    Un semaforo queda ligado al loop donde se usa por primera vez, asi que
+    se mantiene uno por loop (tests y workers crean loops distintos).
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.DB_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_db(
+    fn: Callable[..., Any],
+    *args,
+    timeout: Optional[float] = None,
+    **kwargs
+) -> Any:
+    """
+    Ejecuta una funcion sincrona de acceso a datos en el pool de la base
+    de datos, respetando el limite de concurrencia y el timeout.
+
+    Sirve tanto para un execute() suelto como para un metodo de servicio
+    completo (varias consultas en un solo salto al pool).
+
+    Args:
+        fn: Funcion sincrona a ejecutar
+        *args: Argumentos posicionales de fn
+        timeout: Segundos maximos (default: settings.DB_TIMEOUT_SECONDS)
+        **kwargs: Argumentos nombrados de fn
+
+    Returns:
+        Lo que retorne fn
+
+    Raises:
+        DatabaseTimeoutError: Si fn no termina dentro del timeout
+    """
+    timeout = settings.DB_TIMEOUT_SECONDS if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+
+    async with _get_semaphore():
+        future = loop.run_in_executor(get_db_executor(), call)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            name = getattr(fn, "__qualname__", repr(fn))
+            logger.warning(f"Timeout de base de datos ({timeout}s) en {name}")
+            raise DatabaseTimeoutError(
+                f"La consulta a la base de datos excedio {timeout}s"
+            )
+
+
+class AsyncQuery:
+    """
+    Envoltorio de un query builder de postgrest.
+
+    Los metodos de construccion (select, eq, order, ...) se delegan tal cual
+    y solo execute() es asincrono y pasa por run_db().
+    """
+
+    __slots__ = ("_builder", "_timeout")
+
+    def __init__(self, builder, timeout: Optional[float] = None):
+        self._builder = builder
+        self._timeout = timeout
+
+    def _wrap(self, value):
+        return AsyncQuery(value, self._timeout) if hasattr(value, "execute") else value
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # Propiedades como .not_ devuelven otro builder
+            return self._wrap(attr)
+
+        def _chain(*args, **kwargs):
+            return self._wrap(attr(*args, **kwargs))
+
+        return _chain
+
+    async def execute(self):
+        return await run_db(self._builder.execute, timeout=self._timeout)
+
+
+class AsyncSupabase:
+    """Vista asincrona de un cliente Supabase (table / rpc)"""
+
+    __slots__ = ("_client", "_timeout")
+
+    def __init__(self, client, timeout: Optional[float] = None):
+        self._client = client
+        self._timeout = timeout
+
+    def table(self, name: str) -> AsyncQuery:
+        return AsyncQuery(self._client.table(name), self._timeout)
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> AsyncQuery:
+        return AsyncQuery(self._client.rpc(fn, params or {}), self._timeout)
+
+
+def async_db(client, timeout: Optional[float] = None) -> AsyncSupabase:
+    """
+    Vista asincrona del cliente dado.
+
+    Recibe el cliente explicitamente para que los modulos sigan usando su
+    referencia `supabase` (y los tests puedan reemplazarla).
+
+    Args:
+        client: Cliente Supabase sincrono
+        timeout: Timeout por consulta (default: settings.DB_TIMEOUT_SECONDS)
+
+    Returns:
+        AsyncSupabase
+    """
+    return AsyncSupabase(client, timeout)
@@ -0,0 +1,126 @@
+"""
+Batch Queries
+Consultas agrupadas por lista de ids para evitar patrones N+1
+
+Cada funcion hace un numero constante de round trips (una consulta in_()
+por cada IN_CHUNK_SIZE ids) sin importar cuantos ids se pidan.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Maximo de ids por filtro in_() (van en la URL de PostgREST)
+IN_CHUNK_SIZE = 200
+
+
+def fetch_by_ids(
+    client,
+    table: str,
+    column: str,
+    ids: Iterable[str],
+    columns: str = "*"
+) -> Dict[str, Dict]:
+    """
+    Obtiene las filas de una tabla para una lista de ids.
+
+    Args:
+        client: Cliente Supabase
+        table: Nombre de la tabla
+        column: Columna por la que se filtra (debe venir en columns)
+        ids: Ids a buscar (se ignoran duplicados y None)
+        columns: Columnas a seleccionar
+
+    Returns:
+        Dict {id: fila}
+    """
+    unique_ids = list(dict.fromkeys(i for i in ids if i is not None))
+    rows: Dict[str, Dict] = {}
+
+    for start in range(0, len(unique_ids), IN_CHUNK_SIZE):
+        response = client.table(table) \
+            .select(columns) \
+            .in_(column, unique_ids[start:start + IN_CHUNK_SIZE]) \
+            .execute()
+        for row in response.data or []:
+            rows[row[column]] = row
+
+    return rows
+
+
+def fetch_profiles_by_user_ids(
+    client,
+    user_ids: Iterable[str],
+    columns: str
+) -> Dict[str, Dict]:
+    """
+    Perfiles profesionales de varios usuarios en una sola consulta.
+
+    Args:
+        client: Cliente Supabase
+        user_ids: Ids de usuario
+        columns: Columnas de perfiles_profesionales (usuario_id se agrega)
+
+    Returns:
+        Dict {usuario_id: perfil}
+    """
+    return fetch_by_ids(
+        client, "perfiles_profesionales", "usuario_id", user_ids,
+        _with_key(columns, "usuario_id")
+    )
+
+
+def fetch_users_by_ids(
+    client,
+    user_ids: Iterable[str],
+    columns: str = "id, email, nombre_completo, rol"
+) -> Dict[str, Dict]:
+    """
+    Usuarios por id en una sola consulta.
+
+    Args:
+        client: Cliente Supabase
+        user_ids: Ids de usuario
+        columns: Columnas de usuarios (id se agrega)
+
+    Returns:
+        Dict {id: usuario}
+    """
+    return fetch_by_ids(client, "usuarios", "id", user_ids, _with_key(columns, "id"))
+
+
+def fetch_top_postulaciones(
+    client,
+    oferta_id: str,
+    top_n: int,
+    columns: str = "*"
+) -> Tuple[List[Dict], int]:
+    """
+    Top N postulaciones de una oferta y el total de postulantes en un
+    solo round trip (count="exact" viaja en la misma respuesta).
+
+    Args:
+        client: Cliente Supabase
+        oferta_id: ID de la oferta
+        top_n: Numero de postulaciones a devolver
+        columns: Columnas a seleccionar
+
+    Returns:
+        Tupla (postulaciones ordenadas por match_score desc, total)
+    """
+    response = client.table("postulaciones") \
+        .select(columns, count="exact") \
+        .eq("oferta_id", oferta_id) \
+        .order("match_score", desc=True) \
+        .limit(top_n) \
+        .execute()
+
+    posts = response.data or []
+    total: Optional[int] = response.count
+    return posts, total if total is not None else len(posts)
+
+
+def _with_key(columns: str, key: str) -> str:
+    """Agrega la columna clave a la seleccion si no esta"""
+    if columns.strip() == "*":
+        return columns
+    names = [c.strip() for c in columns.split(",")]
+    return columns if key in names else f"{key}, {columns}"
@@ -1,10 +1,16 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from app.core.config import settings
 
 # Initialize Supabase Client
+# PostgREST reutiliza conexiones HTTP (pool de httpx); el timeout evita que una
+# consulta colgada retenga un thread del pool de app.db.async_client
 try:
     settings.validate_setup()
-    supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    supabase: Client = create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_KEY,
+        options=ClientOptions(postgrest_client_timeout=settings.DB_TIMEOUT_SECONDS)
+    )
 except ValueError as e:
     print(f"WARNING: Database setup issue: {e}")
     # We allow the app to start so we can see the error, but DB calls will fail.
@@ -0,0 +1,131 @@
+"""
+Keyset Pagination
+Paginacion por cursor sobre (created_at, id) en orden descendente
+
+Con range(offset, ...) y count="exact" cada pagina recorre las filas
+anteriores y recuenta la tabla. Con keyset cada pagina empieza en el
+ultimo (created_at, id) de la anterior y usa el indice compuesto
+(created_at DESC, id DESC); el conteo es opcional ("estimated" usa la
+estimacion del planner de Postgres en tablas grandes).
+
+El cursor es opaco para el cliente: base64 urlsafe de [created_at, id].
+"""
+
+import base64
+import json
+from typing import Dict, List, Optional, Tuple
+
+# Modos de conteo aceptados por los listados
+COUNT_MODES = ('exact', 'estimated', 'none')
+
+
+def encode_cursor(row: Dict, column: str = "created_at") -> str:
+    """
+    Cursor que apunta despues de una fila.
+
+    Args:
+        row: Ultima fila de la pagina (con column e id)
+        column: Columna de orden
+
+    Returns:
+        Cursor opaco
+    """
+    raw = json.dumps([row[column], row['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor: Cursor opaco
+
+    Returns:
+        Tupla (valor de la columna de orden, id)
+
+    Raises:
+        ValueError: Si el cursor no es valido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Cursor de paginacion invalido")
+    if not isinstance(value, str) or not isinstance(row_id, str):
+        raise ValueError("Cursor de paginacion invalido")
+    return value, row_id
+
+
+def count_option(mode: str) -> Optional[str]:
+    """
+    Valor de count para select() segun el modo de conteo.
+
+    Args:
+        mode: 'exact', 'estimated' o 'none'
+
+    Returns:
+        'exact', 'estimated' o None (sin conteo)
+
+    Raises:
+        ValueError: Si el modo no es valido
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"count debe ser uno de: {', '.join(COUNT_MODES)}")
+    return None if mode == 'none' else mode
+
+
+def apply_keyset(
+    query,
+    page_size: int,
+    cursor: Optional[str] = None,
+    column: str = "created_at",
+    offset: int = 0
+):
+    """
+    Ordena por (column, id) descendente y limita a page_size + 1 filas
+    (la fila extra indica si hay otra pagina).
+
+    Args:
+        query: Query builder de Supabase con filtros ya aplicados
+        page_size: Tamano de pagina
+        cursor: Cursor de la pagina anterior (None = primera pagina)
+        column: Columna de orden
+        offset: Desplazamiento sin cursor (compatibilidad con ?page=N)
+
+    Returns:
+        Query builder
+
+    Raises:
+        ValueError: Si el cursor no es valido
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        # (column, id) < (value, row_id), expresado para PostgREST
+        query = query \
+            .lte(column, value) \
+            .or_(f'{column}.lt."{value}",id.lt."{row_id}"')
+
+    query = query.order(column, desc=True).order("id", desc=True)
+
+    if offset and not cursor:
+        return query.range(offset, offset + page_size)
+    return query.limit(page_size + 1)
+
+
+def split_page(rows: List[Dict], page_size: int, column: str = "created_at") -> Tuple[List[Dict], Optional[str]]:
+    """
+    Separa la fila extra de apply_keyset y genera el cursor siguiente.
+
+    Args:
+        rows: Filas devueltas (hasta page_size + 1)
+        page_size: Tamano de pagina
+        column: Columna de orden
+
+    Returns:
+        Tupla (filas de la pagina, cursor siguiente o None si es la ultima)
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1], column)
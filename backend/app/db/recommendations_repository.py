@@ -0,0 +1,115 @@
+"""
+Recommendations Repository
+Escrituras y lecturas agrupadas sobre la tabla recomendaciones
+
+Guardar el top N o marcar varias recomendaciones como vistas cuesta un
+round trip por cada UPSERT_CHUNK_SIZE filas (o IN_CHUNK_SIZE ids), no uno
+por recomendacion.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from app.db.batch_queries import IN_CHUNK_SIZE
+
+TABLE = "recomendaciones"
+
+# Maximo de filas por upsert
+UPSERT_CHUNK_SIZE = 500
+
+# Columnas que se escriben al guardar una recomendacion
+WRITE_COLUMNS = (
+    'oferta_id', 'match_score', 'clasificacion', 'scores_detalle',
+    'fortalezas', 'debilidades', 'match_details'
+)
+
+
+def upsert_recommendations(client, user_id: str, recommendations: List[Dict]) -> Dict[str, Dict]:
+    """
+    Guarda varias recomendaciones de un usuario con un solo upsert
+    (conflicto en usuario_id + oferta_id). Las filas guardadas quedan
+    como no vistas.
+
+    Args:
+        client: Cliente Supabase
+        user_id: ID del usuario
+        recommendations: Recomendaciones con al menos las WRITE_COLUMNS
+
+    Returns:
+        Dict {oferta_id: fila guardada} (con id, fue_vista y created_at)
+    """
+    rows = [
+        {
+            'usuario_id': user_id,
+            **{column: rec.get(column) for column in WRITE_COLUMNS},
+            'fue_vista': False
+        }
+        for rec in recommendations
+    ]
+
+    saved: Dict[str, Dict] = {}
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        response = client.table(TABLE) \
+            .upsert(rows[start:start + UPSERT_CHUNK_SIZE], on_conflict="usuario_id,oferta_id") \
+            .execute()
+        for row in response.data or []:
+            saved[row['oferta_id']] = row
+    return saved
+
+
+def fetch_recommendations_for_ofertas(
+    client,
+    user_id: str,
+    oferta_ids: Iterable[str],
+    columns: str = "id, oferta_id, match_score, fue_vista, vista_at, created_at"
+) -> Dict[str, Dict]:
+    """
+    Recomendaciones guardadas de un usuario para varias ofertas.
+
+    Args:
+        client: Cliente Supabase
+        user_id: ID del usuario
+        oferta_ids: IDs de ofertas
+        columns: Columnas a seleccionar (debe incluir oferta_id)
+
+    Returns:
+        Dict {oferta_id: fila}
+    """
+    ids = list(dict.fromkeys(oferta_ids))
+    rows: Dict[str, Dict] = {}
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        response = client.table(TABLE) \
+            .select(columns) \
+            .eq("usuario_id", user_id) \
+            .in_("oferta_id", ids[start:start + IN_CHUNK_SIZE]) \
+            .execute()
+        for row in response.data or []:
+            rows[row['oferta_id']] = row
+    return rows
+
+
+def mark_viewed(client, user_id: str, recommendation_ids: Iterable[str]) -> List[str]:
+    """
+    Marca varias recomendaciones de un usuario como vistas con un solo
+    update por bloque de ids. Los ids de otros usuarios se ignoran.
+
+    Args:
+        client: Cliente Supabase
+        user_id: ID del usuario
+        recommendation_ids: IDs de recomendaciones
+
+    Returns:
+        IDs que se marcaron
+    """
+    ids = list(dict.fromkeys(i for i in recommendation_ids if i))
+    vista_at = datetime.utcnow().isoformat()
+
+    marked: List[str] = []
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        response = client.table(TABLE) \
+            .update({'fue_vista': True, 'vista_at': vista_at}) \
+            .eq("usuario_id", user_id) \
+            .in_("id", ids[start:start + IN_CHUNK_SIZE]) \
+            .execute()
+        marked.extend(row['id'] for row in response.data or [])
+    return marked
@@ -0,0 +1,156 @@
+"""
+Search Repository
+Busqueda de texto del panel de administracion (usuarios, perfiles y ofertas)
+
+Usa la funcion buscar_admin de la migracion v14: busqueda por prefijos
+sobre indices GIN full-text (configuracion 'spanish' para perfiles y
+ofertas) mas similitud trigram, ordenada por relevancia en Postgres. Si la
+migracion no se aplico, busca con ilike y ordena en Python.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from postgrest.exceptions import APIError
+
+logger = logging.getLogger(__name__)
+
+# Entidades que se pueden buscar
+ENTIDADES = ('usuarios', 'perfiles', 'ofertas')
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+# PostgREST: la funcion no existe en el schema cache (migracion v14 sin aplicar)
+FUNCTION_NOT_FOUND = "PGRST202"
+
+
+def search_terms(texto: str) -> List[str]:
+    """
+    Terminos de busqueda normalizados (minusculas, sin puntuacion).
+
+    Args:
+        texto: Texto escrito por el operador
+
+    Returns:
+        Lista de terminos (cada uno se busca como prefijo)
+    """
+    return _TERM_RE.findall((texto or "").lower())
+
+
+def search(client, texto: str, entidad: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """
+    Busca usuarios, perfiles y ofertas ordenados por relevancia.
+
+    Args:
+        client: Cliente Supabase
+        texto: Texto de busqueda (cada palabra cuenta como prefijo)
+        entidad: 'usuarios', 'perfiles', 'ofertas' o None (todas)
+        limit: Maximo de resultados
+
+    Returns:
+        Lista de {entidad, id, titulo, detalle, rank} de mayor a menor rank
+        (en perfiles, id es el usuario_id)
+
+    Raises:
+        ValueError: Si la entidad no es valida
+        APIError: Si buscar_admin falla por otra causa que no exista
+    """
+    if entidad is not None and entidad not in ENTIDADES:
+        raise ValueError(f"Entidad debe ser una de: {', '.join(ENTIDADES)}")
+
+    if not search_terms(texto):
+        return []
+
+    try:
+        response = client.rpc("buscar_admin", {
+            "p_texto": texto, "p_entidad": entidad, "p_limite": limit
+        }).execute()
+        return [
+            {
+                'entidad': row['entidad'],
+                'id': row['id'],
+                'titulo': row['titulo'],
+                'detalle': row.get('detalle'),
+                'rank': float(row['rank'] or 0),
+            }
+            for row in response.data or []
+        ]
+    except APIError as e:
+        # Solo la migracion faltante usa el fallback; timeouts, permisos o
+        # errores de la funcion no se esconden detras de un scan con ilike
+        if e.code != FUNCTION_NOT_FOUND:
+            raise
+        logger.warning(f"Funcion buscar_admin no disponible, buscando con ilike: {e.message}")
+        return _search_with_ilike(client, texto, entidad, limit)
+
+
+# =============================================================================
+# FALLBACK (sin migracion v14)
+# =============================================================================
+
+# entidad: (tabla, columnas, columnas filtradas con ilike, fila -> (id, titulo, detalle))
+_FALLBACK_SOURCES = {
+    'usuarios': (
+        "usuarios", "id, email, nombre_completo, rol", ("email", "nombre_completo"),
+        lambda r: (r['id'], r.get('nombre_completo') or r['email'], f"{r['email']} - {r['rol']}"),
+    ),
+    'perfiles': (
+        "perfiles_profesionales", "usuario_id, nombre_completo, carrera", ("nombre_completo", "carrera"),
+        lambda r: (r['usuario_id'], r.get('nombre_completo') or 'Perfil sin nombre', r.get('carrera') or ''),
+    ),
+    'ofertas': (
+        "convocatorias_laborales", "id, titulo, tipo, area", ("titulo", "area"),
+        lambda r: (r['id'], r['titulo'], r['tipo'] + (f" - {r['area']}" if r.get('area') else '')),
+    ),
+}
+
+
+def _search_with_ilike(client, texto: str, entidad: Optional[str], limit: int) -> List[Dict]:
+    """Busqueda con ilike por el termino mas largo y ranking en Python"""
+    terms = search_terms(texto)
+    longest = max(terms, key=len)
+
+    results = []
+    for name in ([entidad] if entidad else ENTIDADES):
+        table, columns, filtered, to_result = _FALLBACK_SOURCES[name]
+        response = client.table(table) \
+            .select(columns) \
+            .or_(",".join(f"{column}.ilike.%{longest}%" for column in filtered)) \
+            .limit(limit * 5) \
+            .execute()
+
+        for row in response.data or []:
+            row_id, titulo, detalle = to_result(row)
+            rank = _rank(terms, titulo, detalle)
+            if rank > 0:
+                results.append({
+                    'entidad': name, 'id': row_id, 'titulo': titulo,
+                    'detalle': detalle, 'rank': rank,
+                })
+
+    results.sort(key=lambda r: (-r['rank'], r['titulo']))
+    return results[:limit]
+
+
+def _rank(terms: List[str], titulo: str, detalle: str) -> float:
+    """
+    Relevancia 0-1: cada termino vale 1 si es prefijo de una palabra del
+    titulo, 0.5 si lo es del detalle y 0.25 si solo aparece dentro de un
+    texto. Un termino que no aparece descarta el resultado.
+    """
+    title_words = search_terms(titulo)
+    detail_words = search_terms(detalle)
+    haystack = f"{titulo} {detalle}".lower()
+
+    total = 0.0
+    for term in terms:
+        if any(w.startswith(term) for w in title_words):
+            total += 1.0
+        elif any(w.startswith(term) for w in detail_words):
+            total += 0.5
+        elif term in haystack:
+            total += 0.25
+        else:
+            return 0.0
+    return round(total / len(terms), 3)
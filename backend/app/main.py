@@ -1,11 +1,19 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.endpoints import cv, auth, users, analytics, roles
-from app.api.routes import ml_predictions, institutional_profiles, profile, ofertas, recommendations, postulaciones, admin_ranking
+from app.api.routes import ml_predictions, institutional_profiles, profile, ofertas, recommendations, postulaciones, admin_ranking, admin_import, admin_search
+from app.core.llm_extractor import shutdown_llm_executor
+from app.db.async_client import DatabaseTimeoutError, shutdown_db_executor
 from app.services.ml_integration_service import get_ml_service
+from app.services.cv_job_service import get_cv_job_service
+from app.services.recommendation_matrix_service import get_recommendation_matrix_service
+from app.services.pdf_extraction_service import get_pdf_extraction_service
+from app.services.warmup_service import get_warmup_service
 
 # Configurar logging
 logging.basicConfig(
@@ -20,21 +28,33 @@ async def lifespan(app: FastAPI):
     """
     Eventos de ciclo de vida de la aplicacion
     """
-    # Startup: Cargar modelo ML
+    # Startup: precalentamiento (modelo ML, prediccion de prueba, NLP, caches)
+    # en segundo plano; /health/ready responde 503 hasta que termina
     logger.info("Iniciando aplicacion...")
+    warmup_task = asyncio.create_task(get_warmup_service().run())
+
+    # Workers de la cola de CVs
+    try:
+        await get_cv_job_service().start()
+    except Exception as e:
+        logger.error(f"Error iniciando workers de CV: {e}")
+
+    # Workers de la matriz precalculada de recomendaciones
     try:
-        ml_service = get_ml_service()
-        if ml_service.is_ready:
-            logger.info("Modelo ML cargado correctamente")
-        else:
-            logger.warning("Modelo ML no disponible al inicio")
+        await get_recommendation_matrix_service().start()
     except Exception as e:
-        logger.error(f"Error cargando modelo ML: {e}")
+        logger.error(f"Error iniciando workers de la matriz de recomendaciones: {e}")
 
     yield
 
     # Shutdown
     logger.info("Cerrando aplicacion...")
+    warmup_task.cancel()
+    await get_cv_job_service().stop()
+    await get_recommendation_matrix_service().stop()
+    get_pdf_extraction_service().shutdown()
+    shutdown_llm_executor()
+    shutdown_db_executor()
 
 
 app = FastAPI(
@@ -44,6 +64,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+@app.exception_handler(DatabaseTimeoutError)
+async def database_timeout_handler(request: Request, exc: DatabaseTimeoutError):
+    """Consultas que exceden DB_TIMEOUT_SECONDS responden 504"""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
 # Configure CORS
 origins = [
     "http://localhost:5173",  # Vue default port
@@ -100,6 +126,14 @@ app.include_router(
     admin_ranking.router,
     tags=["Admin - Ranking Candidatos"]
 )
+app.include_router(
+    admin_import.router,
+    tags=["Admin - Importacion CVs"]
+)
+app.include_router(
+    admin_search.router,
+    tags=["Admin - Busqueda"]
+)
 app.include_router(
     users.router,
     prefix="/api/users",
@@ -129,10 +163,27 @@ def read_root():
 
 @app.get("/health", tags=["Health"])
 def health_check():
-    """Detailed health check"""
+    """Detailed health check (liveness, readiness y tiempos de carga por componente)"""
     ml_service = get_ml_service()
     return {
         "status": "healthy",
         "ml_model_loaded": ml_service.is_ready,
-        "version": "2.0.0"
+        "version": "2.0.0",
+        **get_warmup_service().status(),
+        "recommendation_matrix": get_recommendation_matrix_service().metrics()
     }
+
+
+@app.get("/health/live", tags=["Health"])
+def liveness_check():
+    """Liveness: el proceso responde (no depende del precalentamiento)"""
+    return {"live": True}
+
+
+@app.get("/health/ready", tags=["Health"])
+def readiness_check(response: Response):
+    """Readiness: 503 hasta que el precalentamiento termina sin errores"""
+    warmup = get_warmup_service().status()
+    if not warmup["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return warmup
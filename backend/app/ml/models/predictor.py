@@ -122,6 +122,9 @@ class MatchPredictor:
         """
         Predice para multiples ejemplos
 
+        Apila los vectores en una matriz y ejecuta una sola prediccion
+        vectorizada (scaler + Ridge) en lugar de una llamada por ejemplo.
+
         Args:
             feature_vectors: Lista de vectores de features
 
@@ -131,10 +134,29 @@ class MatchPredictor:
         if self.model is None:
             raise ValueError("Modelo no cargado.")
 
+        if len(feature_vectors) == 0:
+            return []
+
+        X = np.vstack([np.asarray(fv, dtype=float).reshape(1, -1) for fv in feature_vectors])
+        batch = self.model.predict_batch(X)
+
+        feature_names = self.model.feature_names or [
+            f"feature_{i}" for i in range(X.shape[1])
+        ]
+
         predictions = []
-        for feature_vector in feature_vectors:
-            pred = self.model.predict_single(feature_vector)
-            predictions.append(pred)
+        for i, score in enumerate(batch['match_scores']):
+            contributions = dict(zip(
+                feature_names,
+                (float(c) for c in batch['contributions'][i])
+            ))
+            predictions.append({
+                'match_score': float(score),
+                'classification': batch['classifications'][i],
+                'feature_contributions': contributions,
+                'top_strengths': self.model._get_top_features(contributions, top=3, positive=True),
+                'top_weaknesses': self.model._get_top_features(contributions, top=3, positive=False)
+            })
 
         return predictions
 
@@ -147,6 +147,38 @@ class InstitutionalMatchModel:
             'top_weaknesses': self._get_top_features(contributions, top=3, positive=False)
         }
 
+    def predict_batch(self, X: np.ndarray) -> Dict:
+        """
+        Predice para MULTIPLES ejemplos en una sola pasada scaler + Ridge
+
+        A diferencia de llamar predict_single() en un loop, aqui el escalado,
+        la prediccion y las contribuciones se calculan como operaciones
+        matriciales sobre toda la matriz.
+
+        Args:
+            X: Matriz de features (n_samples, 18)
+
+        Returns:
+            Dict con:
+                - match_scores: Array (n_samples,) de scores [0-1]
+                - classifications: Lista de clasificaciones
+                - contributions: Matriz (n_samples, n_features) coef x valor
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo no ha sido entrenado.")
+
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        scores = self.predict(X)
+
+        return {
+            'match_scores': scores,
+            'classifications': [self._classify_score(s) for s in scores],
+            'contributions': X * self.model.coef_
+        }
+
     def get_coefficients(self) -> Dict[str, float]:
         """
         Retorna coeficientes del modelo (pesos aprendidos)
@@ -0,0 +1,89 @@
+"""
+Script de Construccion del Vocabulario de Skills
+Ajusta el vocabulario TF-IDF compartido con los skills de todos los CVs y
+ofertas, y lo guarda junto a ridge_v1.joblib
+
+Uso:
+    python app/ml/scripts/build_skill_vocabulary.py               # reconstruir
+    python app/ml/scripts/build_skill_vocabulary.py --incremental # solo nuevos
+"""
+
+import argparse
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from app.db.client import supabase
+from app.scoring.feature_engineering.skill_vocabulary import (
+    SkillVocabulary,
+    DEFAULT_VOCABULARY_PATH
+)
+
+
+def collect_documents():
+    """
+    Lee los skills de perfiles y ofertas
+
+    Returns:
+        Tupla (documentos, ids); cada documento es una lista de skills
+    """
+    documents = []
+    ids = []
+
+    perfiles = supabase.table("perfiles_profesionales") \
+        .select("usuario_id, hard_skills") \
+        .execute()
+    for row in perfiles.data or []:
+        if row.get('hard_skills'):
+            documents.append(row['hard_skills'])
+            ids.append(f"cv:{row['usuario_id']}")
+
+    ofertas = supabase.table("convocatorias_laborales") \
+        .select("id, requirements, requisitos_especificos") \
+        .execute()
+    for row in ofertas.data or []:
+        req = {**(row.get('requisitos_especificos') or {}), **(row.get('requirements') or {})}
+        skills = (req.get('required_skills') or []) + (req.get('preferred_skills') or [])
+        if skills:
+            documents.append(skills)
+            ids.append(f"oferta:{row['id']}")
+
+    return documents, ids
+
+
+def main():
+    """Funcion principal"""
+    parser = argparse.ArgumentParser(description="Construye el vocabulario de skills")
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="Agrega solo CVs/ofertas que no estan en el vocabulario guardado"
+    )
+    parser.add_argument('--output', default=str(DEFAULT_VOCABULARY_PATH))
+    args = parser.parse_args()
+
+    if not supabase:
+        print("ERROR: Base de datos no configurada")
+        return None
+
+    documents, ids = collect_documents()
+    print(f"Documentos encontrados: {len(documents)}")
+
+    if args.incremental and os.path.exists(args.output):
+        vocabulary = SkillVocabulary.load(args.output)
+        added = vocabulary.update(documents, ids)
+        print(f"Documentos nuevos agregados: {added}")
+    else:
+        vocabulary = SkillVocabulary().fit(documents, ids)
+
+    path = vocabulary.save(args.output)
+    print(f"Vocabulario: {vocabulary.size} terminos, {vocabulary.n_documents} documentos")
+    print(f"Guardado en: {path}")
+
+    return vocabulary
+
+
+if __name__ == "__main__":
+    main()
@@ -33,11 +33,34 @@ from .languages_scorer import (
     extract_languages_from_gemini
 )
 
+from .skill_vocabulary import (
+    SkillVocabulary,
+    SkillVector,
+    get_skill_vocabulary,
+    set_skill_vocabulary
+)
+
+from .offer_profile import (
+    OfferRequirementProfile,
+    OfferProfileCache,
+    compile_offer_profile,
+    get_offer_profile_cache
+)
+
+from .candidate_profile import (
+    CandidateFeatureProfile,
+    CandidateProfileCache,
+    get_candidate_profile_cache
+)
+
 from .feature_extractor import (
     extract_features,
+    extract_features_batch,
+    extract_features_for_candidates,
     get_feature_names,
     validate_gemini_output,
     calculate_final_score,
+    calculate_final_scores_batch,
     classify_candidate,
     FeatureExtractor
 )
@@ -63,11 +86,28 @@ __all__ = [
     # Languages
     "calculate_languages_score_from_cv",
     "extract_languages_from_gemini",
+    # Skill Vocabulary
+    "SkillVocabulary",
+    "SkillVector",
+    "get_skill_vocabulary",
+    "set_skill_vocabulary",
+    # Offer Requirement Profile
+    "OfferRequirementProfile",
+    "OfferProfileCache",
+    "compile_offer_profile",
+    "get_offer_profile_cache",
+    # Candidate Feature Profile
+    "CandidateFeatureProfile",
+    "CandidateProfileCache",
+    "get_candidate_profile_cache",
     # Feature Extractor
     "extract_features",
+    "extract_features_batch",
+    "extract_features_for_candidates",
     "get_feature_names",
     "validate_gemini_output",
     "calculate_final_score",
+    "calculate_final_scores_batch",
     "classify_candidate",
     "FeatureExtractor",
 ]
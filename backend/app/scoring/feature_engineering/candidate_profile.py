@@ -0,0 +1,205 @@
+"""
+Candidate Feature Profile
+Datos del CV procesados una sola vez y reutilizados contra todas las ofertas
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.scoring.experience_calculator import calculate_total_experience
+from app.scoring.language_levels import parse_language_entry
+
+from .hard_skills_scorer import normalize_skill, extract_hard_skills_from_gemini
+from .skill_vocabulary import get_skill_vocabulary
+from .soft_skills_scorer import (
+    normalize_soft_skill,
+    get_soft_skill_category,
+    extract_soft_skills_from_gemini
+)
+from .education_scorer import get_highest_degree, extract_education_from_gemini
+from .experience_scorer import extract_experience_from_gemini
+from .languages_scorer import extract_languages_from_gemini
+
+
+class CandidateFeatureProfile:
+    """
+    Datos del CV de un candidato listos para los scorers
+
+    Evaluar un candidato contra N ofertas no debe re-ejecutar N veces los
+    helpers extract_*_from_gemini, la normalizacion de skills, los regex de
+    parse_experience_duration ni el escaneo de get_language_score. Este
+    objeto guarda esos resultados y es inmutable una vez construido.
+    """
+
+    __slots__ = (
+        'candidate_id', 'version',
+        'hard_skills', 'hard_skills_normalized', 'hard_skills_vector',
+        'soft_skills', 'soft_skill_categories',
+        'education', 'highest_degree', 'education_score',
+        'experience', 'total_experience_years',
+        'languages', 'languages_parsed'
+    )
+
+    def __init__(
+        self,
+        gemini_output: Dict,
+        candidate_id: Optional[str] = None,
+        version: Optional[str] = None
+    ):
+        """
+        Args:
+            gemini_output: Output de Gemini con estructura JSON del CV
+            candidate_id: ID del usuario (opcional)
+            version: Version del perfil (ej: updated_at de perfiles_profesionales)
+        """
+        self.candidate_id = candidate_id
+        self.version = version
+
+        # Hard skills
+        hard_skills = extract_hard_skills_from_gemini(gemini_output)
+        self.hard_skills = hard_skills
+        self.hard_skills_normalized = frozenset(
+            normalize_skill(s) for s in hard_skills
+        ) if hard_skills else frozenset()
+        vocabulary = get_skill_vocabulary()
+        self.hard_skills_vector = vocabulary.vectorize(hard_skills) \
+            if vocabulary is not None and hard_skills else None
+
+        # Soft skills (normalizadas + categoria de cada una)
+        soft_skills = extract_soft_skills_from_gemini(gemini_output)
+        self.soft_skills = soft_skills
+        self.soft_skill_categories = {
+            skill: get_soft_skill_category(skill)
+            for skill in set([normalize_soft_skill(s) for s in soft_skills or []])
+        }
+
+        # Educacion
+        self.education = extract_education_from_gemini(gemini_output)
+        self.highest_degree, self.education_score = get_highest_degree(self.education)
+
+        # Experiencia
+        self.experience = extract_experience_from_gemini(gemini_output)
+        self.total_experience_years = calculate_total_experience(self.experience)
+
+        # Idiomas
+        self.languages = extract_languages_from_gemini(gemini_output)
+        self.languages_parsed = [
+            parse_language_entry(l) for l in self.languages or [] if isinstance(l, str)
+        ]
+
+
+class CandidateProfileCache:
+    """
+    Cache LRU de CandidateFeatureProfile por usuario
+
+    Guarda una sola entrada por usuario junto con su version; una lectura
+    con otra version (el perfil se actualizo) se trata como fallo y se
+    recompila. ProfileService precalienta la entrada al escribir el perfil.
+    """
+
+    def __init__(self, max_size: int = 2048):
+        """
+        Args:
+            max_size: Numero maximo de candidatos en memoria
+        """
+        self.max_size = max_size
+        self._profiles: "OrderedDict[str, CandidateFeatureProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        candidate_id: str,
+        version: Optional[str],
+        gemini_output: Dict
+    ) -> CandidateFeatureProfile:
+        """
+        Obtiene el perfil compilado de un candidato (compila si no existe
+        o si la version cambio)
+
+        Args:
+            candidate_id: ID del usuario
+            version: Version actual del perfil
+            gemini_output: CV estructurado, usado solo si hay que compilar
+
+        Returns:
+            CandidateFeatureProfile
+        """
+        with self._lock:
+            profile = self._profiles.get(candidate_id)
+            if profile is not None and version is not None and profile.version == version:
+                self._profiles.move_to_end(candidate_id)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        return self.put(candidate_id, version, gemini_output)
+
+    def put(
+        self,
+        candidate_id: str,
+        version: Optional[str],
+        gemini_output: Dict
+    ) -> CandidateFeatureProfile:
+        """
+        Compila y guarda el perfil de un candidato
+
+        Args:
+            candidate_id: ID del usuario
+            version: Version del perfil
+            gemini_output: CV estructurado
+
+        Returns:
+            CandidateFeatureProfile recien compilado
+        """
+        profile = CandidateFeatureProfile(
+            gemini_output, candidate_id=candidate_id, version=version
+        )
+
+        with self._lock:
+            self._profiles[candidate_id] = profile
+            self._profiles.move_to_end(candidate_id)
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+
+        return profile
+
+    def invalidate(self, candidate_id: str):
+        """
+        Elimina el perfil compilado de un candidato
+
+        Args:
+            candidate_id: ID del usuario
+        """
+        with self._lock:
+            self._profiles.pop(candidate_id, None)
+
+    def clear(self):
+        """Elimina todos los perfiles compilados"""
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self) -> Dict:
+        """Retorna tamanio y aciertos del cache"""
+        return {
+            'size': len(self._profiles),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Global cache instance
+_candidate_profile_cache = CandidateProfileCache()
+
+
+def get_candidate_profile_cache() -> CandidateProfileCache:
+    """
+    Obtiene el cache global de perfiles de candidato compilados
+
+    Returns:
+        Instancia de CandidateProfileCache
+    """
+    return _candidate_profile_cache
@@ -3,7 +3,7 @@ Education Scorer
 Wrapper para get_education_score con logica adicional de evaluacion
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 # Importar desde nuestros modulos de Fase 1
 from app.scoring.education_levels import get_education_score, EDUCATION_LEVELS
@@ -40,25 +40,63 @@ def calculate_education_score(
             'meets_requirement': True
         }
     """
+    highest_degree, cv_score = get_highest_degree(cv_education)
+
+    return calculate_education_score_from_levels(
+        highest_degree=highest_degree,
+        cv_score=cv_score,
+        required_score=get_education_score(required_education_level)
+    )
+
+
+def get_highest_degree(cv_education: List[Dict]) -> Tuple[Optional[Dict], float]:
+    """
+    Obtiene el grado mas alto del CV y su score
+
+    Args:
+        cv_education: Lista de educacion del CV (desde Gemini)
+
+    Returns:
+        Tupla (grado_mas_alto, score) o (None, 0.0) si no hay educacion
+    """
     if not cv_education:
+        return None, 0.0
+
+    highest_degree = max(
+        cv_education,
+        key=lambda x: get_education_score(x.get('degree', ''))
+    )
+
+    return highest_degree, get_education_score(highest_degree.get('degree', ''))
+
+
+def calculate_education_score_from_levels(
+    highest_degree: Optional[Dict],
+    cv_score: float,
+    required_score: float
+) -> Dict:
+    """
+    Calcula score de educacion con los niveles ya resueltos
+
+    Args:
+        highest_degree: Grado mas alto del CV (None si no hay educacion)
+        cv_score: Score del grado mas alto
+        required_score: Score del nivel minimo requerido
+
+    Returns:
+        Dict con score y detalles
+    """
+    if highest_degree is None:
         return {
             'score': 0.0,
             'cv_level': 'Sin especificar',
             'cv_score': 0.0,
-            'required_score': get_education_score(required_education_level),
+            'required_score': required_score,
             'meets_requirement': False,
             'highest_degree': None
         }
 
-    # Obtener el nivel mas alto del CV
-    highest_degree = max(
-        cv_education,
-        key=lambda x: get_education_score(x.get('degree', ''))
-    )
-
     degree_name = highest_degree.get('degree', '')
-    cv_score = get_education_score(degree_name)
-    required_score = get_education_score(required_education_level)
 
     # Determinar si cumple requisito
     meets_requirement = cv_score >= required_score
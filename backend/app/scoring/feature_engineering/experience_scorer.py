@@ -45,6 +45,29 @@ def calculate_experience_score_from_cv(
     # Calcular anios totales de experiencia
     total_years = calculate_total_experience(cv_experience)
 
+    return calculate_experience_score_from_years(
+        total_years=total_years,
+        cv_experience=cv_experience,
+        min_required_years=min_required_years
+    )
+
+
+def calculate_experience_score_from_years(
+    total_years: float,
+    cv_experience: List[Dict],
+    min_required_years: float
+) -> Dict:
+    """
+    Calcula score de experiencia con los anios totales ya calculados
+
+    Args:
+        total_years: Anios totales de experiencia del CV
+        cv_experience: Lista de experiencias (para el detalle)
+        min_required_years: Anios minimos requeridos
+
+    Returns:
+        Dict con score y detalles
+    """
     # Calcular score usando la funcion logaritmica
     result = calculate_experience_score(
         years=total_years,
@@ -3,7 +3,7 @@ Feature Extractor
 Orquesta todos los scorers para generar el vector de features completo
 """
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 try:
     import numpy as np
@@ -12,30 +12,27 @@ except ImportError:
     NUMPY_AVAILABLE = False
 
 from .hard_skills_scorer import (
-    calculate_hard_skills_score,
-    extract_hard_skills_from_gemini
+    calculate_hard_skills_score_normalized
 )
 from .soft_skills_scorer import (
-    calculate_soft_skills_score,
-    extract_soft_skills_from_gemini
+    calculate_soft_skills_score_normalized
 )
 from .education_scorer import (
-    calculate_education_score,
-    extract_education_from_gemini
+    calculate_education_score_from_levels
 )
 from .experience_scorer import (
-    calculate_experience_score_from_cv,
-    extract_experience_from_gemini
+    calculate_experience_score_from_years
 )
 from .languages_scorer import (
-    calculate_languages_score_from_cv,
-    extract_languages_from_gemini
+    calculate_languages_score_from_parsed
 )
-
+from .offer_profile import compile_offer_profile
+from .candidate_profile import CandidateFeatureProfile
 
 def extract_features(
     gemini_output: Dict,
-    institutional_config: Dict
+    institutional_config: Dict,
+    candidate_profile: Optional[CandidateFeatureProfile] = None
 ) -> Dict:
     """
     Extrae features completos desde el CV procesado por Gemini
@@ -47,6 +44,8 @@ def extract_features(
     Args:
         gemini_output: Output de Gemini con estructura JSON del CV
         institutional_config: Configuracion de la institucion (pesos, requisitos)
+        candidate_profile: Datos del CV ya compilados (opcional). Si se pasa,
+            no se vuelve a procesar gemini_output
 
     Returns:
         Dict con:
@@ -86,50 +85,184 @@ def extract_features(
 
     # === PASO 1: EXTRAER DATOS DEL CV ===
 
-    cv_hard_skills = extract_hard_skills_from_gemini(gemini_output)
-    cv_soft_skills = extract_soft_skills_from_gemini(gemini_output)
-    cv_education = extract_education_from_gemini(gemini_output)
-    cv_experience = extract_experience_from_gemini(gemini_output)
-    cv_languages = extract_languages_from_gemini(gemini_output)
+    if candidate_profile is None:
+        candidate_profile = CandidateFeatureProfile(gemini_output)
+
+    result = _build_features(candidate_profile, institutional_config)
+
+    # Agregar numpy array si esta disponible
+    if NUMPY_AVAILABLE:
+        result['feature_vector_array'] = np.array(result['feature_vector']).reshape(1, -1)
+
+    return result
+
+
+def extract_features_batch(
+    gemini_output: Dict,
+    institutional_configs: List[Dict],
+    candidate_profile: Optional[CandidateFeatureProfile] = None
+) -> Dict:
+    """
+    Extrae features de UN CV contra MULTIPLES configuraciones institucionales
+
+    Los datos del CV se extraen una sola vez y todos los vectores se apilan
+    en una matriz (n_configs x 18) lista para una prediccion vectorizada.
+    Una configuracion invalida (ej: pesos que no suman 1.0) no aborta el
+    lote: se registra en 'errors' y su posicion queda en None.
+
+    Args:
+        gemini_output: Output de Gemini con estructura JSON del CV
+        institutional_configs: Lista de configuraciones (pesos, requisitos)
+        candidate_profile: Datos del CV ya compilados (opcional)
+
+    Returns:
+        Dict con:
+            - features: Lista alineada con institutional_configs; cada
+              elemento es el resultado de extract_features() o None
+            - feature_matrix: Matriz (n_validos x 18) con los vectores validos
+            - indices: Posicion en institutional_configs de cada fila
+            - errors: Dict {posicion: mensaje} de configuraciones fallidas
+    """
+    if candidate_profile is None:
+        candidate_profile = CandidateFeatureProfile(gemini_output)
+
+    return _build_feature_batch(
+        (candidate_profile, config) for config in institutional_configs
+    )
+
+
+def extract_features_for_candidates(
+    candidate_profiles: List[CandidateFeatureProfile],
+    institutional_config: Dict
+) -> Dict:
+    """
+    Extrae features de MULTIPLES CVs contra UNA configuracion institucional
+
+    Variante inversa de extract_features_batch() para rankear candidatos
+    de una oferta: los requisitos se compilan una sola vez y los vectores
+    se apilan en una matriz (n_candidatos x 18).
+
+    Args:
+        candidate_profiles: Datos de los CVs ya compilados
+        institutional_config: Configuracion de la institucion
+
+    Returns:
+        Dict con features, feature_matrix, indices y errors (ver
+        extract_features_batch), alineado con candidate_profiles
+
+    Raises:
+        ValueError: Si los pesos de la configuracion no suman 1.0
+    """
+    compile_offer_profile(institutional_config).validate_weights()
+
+    return _build_feature_batch(
+        (candidate, institutional_config) for candidate in candidate_profiles
+    )
+
+
+def _build_feature_batch(pairs: Iterable[Tuple[CandidateFeatureProfile, Dict]]) -> Dict:
+    """
+    Features de cada par (candidato, configuracion) apiladas en una matriz
+
+    Un par que falla (ej: pesos invalidos) no aborta el lote: se registra
+    en 'errors' y su posicion queda en None.
+
+    Args:
+        pairs: Pares (candidato compilado, configuracion institucional)
+
+    Returns:
+        Dict con features, feature_matrix, indices y errors (ver
+        extract_features_batch)
+    """
+    features = []
+    rows = []
+    indices = []
+    errors = {}
+
+    for i, (candidate, config) in enumerate(pairs):
+        try:
+            result = _build_features(candidate, config)
+        except Exception as e:
+            features.append(None)
+            errors[i] = str(e)
+            continue
+
+        features.append(result)
+        rows.append(result['feature_vector'])
+        indices.append(i)
+
+    n_features = len(get_feature_names())
+    if NUMPY_AVAILABLE:
+        feature_matrix = np.array(rows, dtype=float).reshape(-1, n_features)
+    else:
+        feature_matrix = rows
+
+    return {
+        'features': features,
+        'feature_matrix': feature_matrix,
+        'indices': indices,
+        'errors': errors
+    }
+
+
+def _build_features(
+    candidate: CandidateFeatureProfile,
+    institutional_config: Dict
+) -> Dict:
+    """
+    Calcula scores y vector de features para un candidato ya compilado
 
-    # === PASO 2: EXTRAER REQUISITOS INSTITUCIONALES ===
+    Args:
+        candidate: Datos del CV compilados (ver candidate_profile.py)
+        institutional_config: Configuracion de la institucion
+
+    Returns:
+        Dict con cv_scores, institutional_params, feature_vector y metadata
+    """
+    # === PASO 2: OBTENER REQUISITOS INSTITUCIONALES COMPILADOS ===
+    # Normalizacion de skills, categorias, idiomas y nivel educativo se
+    # calculan una vez por configuracion (ver offer_profile.py)
+
+    offer = compile_offer_profile(institutional_config)
 
-    requirements = institutional_config.get('requirements', {})
-    weights = institutional_config.get('weights', {})
+    # Validar que los pesos sumen 1.0 (tolerancia de 0.01)
+    offer.validate_weights()
 
-    required_skills = requirements.get('required_skills', [])
-    preferred_skills = requirements.get('preferred_skills', [])
-    required_soft_skills = requirements.get('required_soft_skills', [])
-    min_experience_years = requirements.get('min_experience_years', 0.0)
-    required_education_level = requirements.get('required_education_level', 'Licenciatura')
-    required_languages = requirements.get('required_languages', [])
+    min_experience_years = offer.min_experience_years
 
     # === PASO 3: CALCULAR SCORES INDIVIDUALES ===
 
-    hard_skills_result = calculate_hard_skills_score(
-        cv_skills=cv_hard_skills,
-        required_skills=required_skills,
-        preferred_skills=preferred_skills
+    hard_skills_result = calculate_hard_skills_score_normalized(
+        cv_skills=candidate.hard_skills,
+        cv_normalized=candidate.hard_skills_normalized,
+        required_skills=offer.required_skills,
+        required_normalized=offer.required_skills_normalized,
+        preferred_normalized=offer.preferred_skills_normalized,
+        cv_vector=candidate.hard_skills_vector,
+        required_vector=offer.required_skills_vector
     )
 
-    soft_skills_result = calculate_soft_skills_score(
-        cv_soft_skills=cv_soft_skills,
-        required_soft_skills=required_soft_skills
+    soft_skills_result = calculate_soft_skills_score_normalized(
+        cv_categories=candidate.soft_skill_categories,
+        required_categories=offer.required_soft_categories,
+        required_missing=offer.required_soft_missing
     )
 
-    education_result = calculate_education_score(
-        cv_education=cv_education,
-        required_education_level=required_education_level
+    education_result = calculate_education_score_from_levels(
+        highest_degree=candidate.highest_degree,
+        cv_score=candidate.education_score,
+        required_score=offer.required_education_score
     )
 
-    experience_result = calculate_experience_score_from_cv(
-        cv_experience=cv_experience,
+    experience_result = calculate_experience_score_from_years(
+        total_years=candidate.total_experience_years,
+        cv_experience=candidate.experience,
         min_required_years=min_experience_years
     )
 
-    languages_result = calculate_languages_score_from_cv(
-        cv_languages=cv_languages,
-        required_languages=required_languages
+    languages_result = calculate_languages_score_from_parsed(
+        cv_parsed=candidate.languages_parsed,
+        required_parsed=offer.required_languages_parsed
     )
 
     # === PASO 4: EXTRAER SCORES BASE [0-1] ===
@@ -144,18 +277,7 @@ def extract_features(
 
     # === PASO 5: EXTRAER PARAMETROS INSTITUCIONALES ===
 
-    institutional_params = {
-        'weight_hard_skills': weights.get('hard_skills', 0.3),
-        'weight_soft_skills': weights.get('soft_skills', 0.2),
-        'weight_experience': weights.get('experience', 0.25),
-        'weight_education': weights.get('education', 0.15),
-        'weight_languages': weights.get('languages', 0.10)
-    }
-
-    # Validar que sumen 1.0 (tolerancia de 0.01)
-    total_weight = sum(institutional_params.values())
-    if abs(total_weight - 1.0) > 0.01:
-        raise ValueError(f"Los pesos institucionales deben sumar 1.0 (actual: {total_weight})")
+    institutional_params = dict(offer.institutional_params)
 
     # === PASO 6: CONSTRUIR FEATURE VECTOR ===
 
@@ -205,19 +327,13 @@ def extract_features(
         'feature_names': get_feature_names()
     }
 
-    result = {
+    return {
         'cv_scores': cv_scores,
         'institutional_params': institutional_params,
         'feature_vector': feature_vector,
         'metadata': metadata
     }
 
-    # Agregar numpy array si esta disponible
-    if NUMPY_AVAILABLE:
-        result['feature_vector_array'] = np.array(feature_vector).reshape(1, -1)
-
-    return result
-
 
 def get_feature_names() -> List[str]:
     """
@@ -275,6 +391,27 @@ def validate_gemini_output(gemini_output: Dict) -> bool:
     return True
 
 
+def calculate_final_scores_batch(feature_matrix) -> List[float]:
+    """
+    Calcula el score final ponderado para cada fila de una matriz de features
+
+    Equivalente vectorizado de calculate_final_score(): el score ponderado
+    es la suma de las 5 features de interaccion (score x peso, columnas 10-14).
+
+    Args:
+        feature_matrix: Matriz (n x 18) de extract_features_batch()
+
+    Returns:
+        Lista de scores finales entre 0 y 1
+    """
+    if not NUMPY_AVAILABLE:
+        return [round(sum(row[10:15]), 3) for row in feature_matrix]
+
+    matrix = np.asarray(feature_matrix, dtype=float).reshape(-1, len(get_feature_names()))
+    scores = matrix[:, 10:15].sum(axis=1)
+    return [round(float(s), 3) for s in scores]
+
+
 def calculate_final_score(feature_result: Dict) -> float:
     """
     Calcula el score final ponderado del candidato
@@ -334,7 +471,8 @@ class FeatureExtractor:
     def extract_features(
         self,
         gemini_output: Dict,
-        institutional_config: Dict
+        institutional_config: Dict,
+        candidate_profile: Optional[CandidateFeatureProfile] = None
     ) -> Dict:
         """
         Extrae features desde CV y configuracion institucional
@@ -342,11 +480,31 @@ class FeatureExtractor:
         Args:
             gemini_output: Output de Gemini (CV estructurado)
             institutional_config: Configuracion de la institucion
+            candidate_profile: Datos del CV ya compilados (opcional)
 
         Returns:
             Dict con feature_vector, cv_scores, institutional_params, metadata
         """
-        return extract_features(gemini_output, institutional_config)
+        return extract_features(gemini_output, institutional_config, candidate_profile)
+
+    def extract_features_batch(
+        self,
+        gemini_output: Dict,
+        institutional_configs: List[Dict],
+        candidate_profile: Optional[CandidateFeatureProfile] = None
+    ) -> Dict:
+        """
+        Extrae features de un CV contra multiples configuraciones
+
+        Args:
+            gemini_output: Output de Gemini (CV estructurado)
+            institutional_configs: Lista de configuraciones institucionales
+            candidate_profile: Datos del CV ya compilados (opcional)
+
+        Returns:
+            Dict con features, feature_matrix, indices y errors
+        """
+        return extract_features_batch(gemini_output, institutional_configs, candidate_profile)
 
     def validate_input(self, gemini_output: Dict) -> bool:
         """
@@ -3,7 +3,7 @@ Hard Skills Scorer
 Evalua competencias tecnicas usando TF-IDF + Jaccard Similarity
 """
 
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
@@ -12,6 +12,8 @@ try:
 except ImportError:
     SKLEARN_AVAILABLE = False
 
+from .skill_vocabulary import SkillVector, get_skill_vocabulary
+
 
 def calculate_jaccard_similarity(set_a: Set[str], set_b: Set[str]) -> float:
     """
@@ -39,14 +41,27 @@ def calculate_jaccard_similarity(set_a: Set[str], set_b: Set[str]) -> float:
     return intersection / union if union > 0 else 0.0
 
 
-def calculate_tfidf_similarity(cv_skills: List[str], required_skills: List[str]) -> float:
+def calculate_tfidf_similarity(
+    cv_skills: List[str],
+    required_skills: List[str],
+    cv_vector: Optional[SkillVector] = None,
+    required_vector: Optional[SkillVector] = None
+) -> float:
     """
     Calcula similitud semantica usando TF-IDF
     Util para detectar skills relacionados (ej: "Machine Learning" vs "ML")
 
+    Si existe un vocabulario de skills persistido (ver skill_vocabulary.py)
+    la similitud es un producto punto entre vectores dispersos, reutilizando
+    los vectores precalculados del candidato y de la oferta (los skills fuera
+    del vocabulario entran con el IDF maximo). Solo si no hay vocabulario se
+    ajusta un TF-IDF para el par.
+
     Args:
         cv_skills: Lista de skills del CV
         required_skills: Lista de skills requeridos
+        cv_vector: Vector precalculado del CV (opcional)
+        required_vector: Vector precalculado de los requeridos (opcional)
 
     Returns:
         Similitud entre 0 y 1
@@ -58,6 +73,12 @@ def calculate_tfidf_similarity(cv_skills: List[str], required_skills: List[str])
         # Fallback: usar Jaccard si sklearn no esta disponible
         return calculate_jaccard_similarity(set(cv_skills), set(required_skills))
 
+    vocabulary = get_skill_vocabulary()
+    if vocabulary is not None:
+        return vocabulary.similarity(
+            cv_skills, required_skills, cv_vector, required_vector
+        )
+
     # Unir skills en strings
     cv_text = ' '.join(cv_skills)
     required_text = ' '.join(required_skills)
@@ -164,6 +185,43 @@ def calculate_hard_skills_score(
     required_normalized = set([normalize_skill(s) for s in required_skills]) if required_skills else set()
     preferred_normalized = set([normalize_skill(s) for s in preferred_skills]) if preferred_skills else set()
 
+    return calculate_hard_skills_score_normalized(
+        cv_skills=cv_skills,
+        cv_normalized=cv_normalized,
+        required_skills=required_skills,
+        required_normalized=required_normalized,
+        preferred_normalized=preferred_normalized
+    )
+
+
+def calculate_hard_skills_score_normalized(
+    cv_skills: List[str],
+    cv_normalized: Set[str],
+    required_skills: List[str],
+    required_normalized: Set[str],
+    preferred_normalized: Set[str],
+    cv_vector: Optional[SkillVector] = None,
+    required_vector: Optional[SkillVector] = None
+) -> Dict:
+    """
+    Calcula score de hard skills con conjuntos ya normalizados
+
+    Variante de calculate_hard_skills_score() para cuando los requisitos
+    de la oferta ya fueron compilados (ver offer_profile.py) y no deben
+    normalizarse de nuevo en cada evaluacion.
+
+    Args:
+        cv_skills: Lista original de skills del CV (para TF-IDF)
+        cv_normalized: Skills del CV normalizados
+        required_skills: Lista original de skills requeridos (para TF-IDF)
+        required_normalized: Skills requeridos normalizados
+        preferred_normalized: Skills preferidos normalizados
+        cv_vector: Vector TF-IDF precalculado del CV (opcional)
+        required_vector: Vector TF-IDF precalculado de los requeridos (opcional)
+
+    Returns:
+        Dict con score y detalles del matching
+    """
     # Si no hay skills requeridos, retornar score perfecto
     if not required_normalized:
         return {
@@ -190,7 +248,9 @@ def calculate_hard_skills_score(
     preferred_match_ratio = len(preferred_matched) / len(preferred_normalized) if preferred_normalized else 0.0
 
     # === MATCHING SEMANTICO (TF-IDF) ===
-    semantic_similarity = calculate_tfidf_similarity(cv_skills, required_skills)
+    semantic_similarity = calculate_tfidf_similarity(
+        cv_skills, required_skills, cv_vector, required_vector
+    )
 
     # === CALCULO DE SCORE FINAL ===
 
@@ -6,7 +6,10 @@ Wrapper para calculate_languages_score con extraccion desde Gemini
 from typing import Dict, List
 
 # Importar desde nuestros modulos de Fase 1
-from app.scoring.language_levels import calculate_languages_score
+from app.scoring.language_levels import (
+    calculate_languages_score,
+    calculate_languages_score_parsed
+)
 
 
 def calculate_languages_score_from_cv(
@@ -45,6 +48,28 @@ def calculate_languages_score_from_cv(
     return result
 
 
+def calculate_languages_score_from_parsed(
+    cv_parsed: List[Dict],
+    required_parsed: List[tuple]
+) -> Dict:
+    """
+    Calcula score de idiomas con idiomas del CV y requisitos ya parseados
+
+    Args:
+        cv_parsed: Idiomas del CV (salida de parse_language_entry)
+        required_parsed: Requisitos (salida de parse_required_languages)
+
+    Returns:
+        Dict con score y detalles
+    """
+    result = calculate_languages_score_parsed(cv_parsed, required_parsed)
+
+    result['total_cv_languages'] = len(cv_parsed)
+    result['total_required_languages'] = len(required_parsed)
+
+    return result
+
+
 def extract_languages_from_gemini(gemini_output: Dict) -> List[str]:
     """
     Extrae idiomas desde el output de Gemini
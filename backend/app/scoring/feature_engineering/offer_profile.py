@@ -0,0 +1,246 @@
+"""
+Offer Requirement Profile
+Requisitos de una oferta compilados una sola vez para evaluar muchos CVs
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.scoring.education_levels import get_education_score
+from app.scoring.language_levels import parse_required_languages
+
+from .hard_skills_scorer import normalize_skill
+from .skill_vocabulary import get_skill_vocabulary
+from .soft_skills_scorer import normalize_soft_skill, get_soft_skill_category
+
+
+class OfferRequirementProfile:
+    """
+    Requisitos y pesos de una configuracion institucional ya normalizados
+
+    Rankear 1.000 candidatos contra una oferta no debe repetir 1.000 veces
+    la misma normalizacion de skills, categorizacion de soft skills,
+    parseo de idiomas y resolucion del nivel educativo. Este objeto guarda
+    esos resultados y es inmutable una vez construido.
+    """
+
+    __slots__ = (
+        'config_id', 'version',
+        'required_skills', 'required_skills_normalized', 'required_skills_vector',
+        'preferred_skills_normalized',
+        'required_soft_skills', 'required_soft_categories',
+        'required_soft_missing',
+        'required_languages', 'required_languages_parsed',
+        'required_education_level', 'required_education_score',
+        'min_experience_years',
+        'institutional_params', 'weight_vector'
+    )
+
+    def __init__(self, institutional_config: Dict, version: Optional[str] = None):
+        """
+        Args:
+            institutional_config: Configuracion de la institucion (pesos, requisitos)
+            version: Version de la configuracion (ver config_version())
+        """
+        requirements = institutional_config.get('requirements', {})
+        weights = institutional_config.get('weights', {})
+
+        self.config_id = institutional_config.get('id')
+        self.version = version if version is not None else config_version(institutional_config)
+
+        # Hard skills
+        required_skills = requirements.get('required_skills') or []
+        preferred_skills = requirements.get('preferred_skills') or []
+        self.required_skills = required_skills
+        self.required_skills_normalized = frozenset(
+            normalize_skill(s) for s in required_skills
+        ) if required_skills else frozenset()
+        self.preferred_skills_normalized = frozenset(
+            normalize_skill(s) for s in preferred_skills
+        ) if preferred_skills else frozenset()
+        vocabulary = get_skill_vocabulary()
+        self.required_skills_vector = vocabulary.vectorize(required_skills) \
+            if vocabulary is not None and required_skills else None
+
+        # Soft skills (normalizadas + categoria de cada una)
+        required_soft_skills = requirements.get('required_soft_skills') or []
+        self.required_soft_skills = required_soft_skills
+        required_soft_normalized = set([normalize_soft_skill(s) for s in required_soft_skills])
+        self.required_soft_categories = {
+            skill: get_soft_skill_category(skill) for skill in required_soft_normalized
+        }
+        self.required_soft_missing = [normalize_soft_skill(s) for s in required_soft_skills]
+
+        # Idiomas
+        required_languages = requirements.get('required_languages') or []
+        self.required_languages = required_languages
+        self.required_languages_parsed = parse_required_languages(required_languages)
+
+        # Educacion
+        self.required_education_level = requirements.get('required_education_level', 'Licenciatura')
+        self.required_education_score = get_education_score(self.required_education_level)
+
+        # Experiencia
+        self.min_experience_years = requirements.get('min_experience_years', 0.0)
+
+        # Pesos
+        self.institutional_params = {
+            'weight_hard_skills': weights.get('hard_skills', 0.3),
+            'weight_soft_skills': weights.get('soft_skills', 0.2),
+            'weight_experience': weights.get('experience', 0.25),
+            'weight_education': weights.get('education', 0.15),
+            'weight_languages': weights.get('languages', 0.10)
+        }
+        self.weight_vector = [
+            self.institutional_params['weight_hard_skills'],
+            self.institutional_params['weight_soft_skills'],
+            self.institutional_params['weight_experience'],
+            self.institutional_params['weight_education'],
+            self.institutional_params['weight_languages']
+        ]
+
+    def validate_weights(self):
+        """
+        Valida que los pesos sumen 1.0 (tolerancia de 0.01)
+
+        Raises:
+            ValueError: Si los pesos no suman 1.0
+        """
+        total_weight = sum(self.weight_vector)
+        if abs(total_weight - 1.0) > 0.01:
+            raise ValueError(f"Los pesos institucionales deben sumar 1.0 (actual: {total_weight})")
+
+
+def config_version(institutional_config: Dict) -> str:
+    """
+    Calcula la version de una configuracion institucional
+
+    Si la configuracion trae 'version' (ej: updated_at de la oferta) se usa
+    directamente; si no, se usa una huella de pesos y requisitos, de modo que
+    una configuracion modificada nunca reutiliza un perfil compilado viejo.
+
+    Args:
+        institutional_config: Configuracion de la institucion
+
+    Returns:
+        String que identifica la version
+    """
+    version = institutional_config.get('version')
+    if version:
+        return str(version)
+
+    return json.dumps(
+        {
+            'weights': institutional_config.get('weights', {}),
+            'requirements': institutional_config.get('requirements', {})
+        },
+        sort_keys=True,
+        default=str
+    )
+
+
+class OfferProfileCache:
+    """
+    Cache LRU de OfferRequirementProfile por (id de config, version)
+
+    Se invalida explicitamente cuando se modifica una oferta
+    (OfertaService.update_oferta / activate / delete) o un perfil
+    institucional (MLIntegrationService.invalidate_cache).
+    """
+
+    def __init__(self, max_size: int = 512):
+        """
+        Args:
+            max_size: Numero maximo de perfiles compilados en memoria
+        """
+        self.max_size = max_size
+        self._profiles: "OrderedDict[tuple, OfferRequirementProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, institutional_config: Dict) -> OfferRequirementProfile:
+        """
+        Obtiene el perfil compilado de una configuracion (compila si no existe)
+
+        Args:
+            institutional_config: Configuracion de la institucion
+
+        Returns:
+            OfferRequirementProfile
+        """
+        version = config_version(institutional_config)
+        key = (institutional_config.get('id'), version)
+
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        profile = OfferRequirementProfile(institutional_config, version=version)
+
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+
+        return profile
+
+    def invalidate(self, config_id: str):
+        """
+        Elimina todas las versiones compiladas de una configuracion
+
+        Args:
+            config_id: ID de la oferta o perfil institucional
+        """
+        with self._lock:
+            stale = [key for key in self._profiles if key[0] == config_id]
+            for key in stale:
+                del self._profiles[key]
+
+    def clear(self):
+        """Elimina todos los perfiles compilados"""
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self) -> Dict:
+        """Retorna tamanio y aciertos del cache"""
+        return {
+            'size': len(self._profiles),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Global cache instance
+_offer_profile_cache = OfferProfileCache()
+
+
+def get_offer_profile_cache() -> OfferProfileCache:
+    """
+    Obtiene el cache global de perfiles de oferta compilados
+
+    Returns:
+        Instancia de OfferProfileCache
+    """
+    return _offer_profile_cache
+
+
+def compile_offer_profile(institutional_config: Dict) -> OfferRequirementProfile:
+    """
+    Obtiene el perfil compilado de una configuracion usando el cache global
+
+    Args:
+        institutional_config: Configuracion de la institucion
+
+    Returns:
+        OfferRequirementProfile
+    """
+    return _offer_profile_cache.get(institutional_config)
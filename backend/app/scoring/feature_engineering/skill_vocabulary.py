@@ -0,0 +1,349 @@
+"""
+Skill Vocabulary
+Vocabulario TF-IDF compartido de skills (CVs + ofertas) para similitud semantica
+
+En lugar de ajustar un TfidfVectorizer nuevo por cada par candidato/oferta,
+se ajusta un vocabulario una sola vez sobre todos los skills conocidos y se
+persiste junto a ridge_v1.joblib. Cada lista de skills se convierte en un
+vector disperso normalizado y la similitud es un producto punto.
+"""
+
+import itertools
+import logging
+import math
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Ruta por defecto (junto al modelo Ridge)
+DEFAULT_VOCABULARY_PATH = (
+    Path(__file__).resolve().parent.parent.parent
+    / 'ml' / 'trained_models' / 'skill_vocabulary_v1.joblib'
+)
+
+# Versiones unicas en el proceso: un vector calculado con un vocabulario
+# nunca se confunde con otro vocabulario (o con otro refresco del mismo)
+_version_counter = itertools.count(1)
+
+
+class SkillVector:
+    """
+    Vector TF-IDF disperso (1 x V) de una lista de skills
+
+    Guarda la version del vocabulario con la que se calculo; si el
+    vocabulario se refresca, el vector se recalcula al usarse. Los terminos
+    fuera del vocabulario van aparte (oov: {termino: peso}) con el IDF de un
+    termino sin documentos, ya normalizados junto con la parte dispersa.
+    """
+
+    __slots__ = ('version', 'matrix', 'oov', 'oov_terms')
+
+    def __init__(self, version: int, matrix, oov: Dict[str, float], oov_terms: int):
+        self.version = version
+        self.matrix = matrix
+        self.oov = oov
+        self.oov_terms = oov_terms
+
+
+class SkillVocabulary:
+    """
+    Vocabulario TF-IDF de skills con refresco incremental
+
+    Usa el mismo analizador que la version por par (minusculas, unigramas
+    y bigramas) y la misma formula de IDF suavizado de sklearn, pero con
+    frecuencias de documento calculadas sobre todo el corpus. Cada CV u
+    oferta es un documento.
+    """
+
+    def __init__(self):
+        self._analyzer = TfidfVectorizer(
+            lowercase=True,
+            ngram_range=(1, 2)
+        ).build_analyzer()
+        self._lock = threading.Lock()
+
+        self.document_frequency: Counter = Counter()
+        self.document_ids: set = set()
+        self.n_documents = 0
+
+        # Estado inmutable que se reemplaza completo en cada refresco:
+        # (version, {termino: indice}, vector idf)
+        self._state: Tuple[int, Dict[str, int], np.ndarray] = (0, {}, np.zeros(0))
+
+    @property
+    def version(self) -> int:
+        """Version actual del vocabulario (cambia en cada refresco)"""
+        return self._state[0]
+
+    @property
+    def size(self) -> int:
+        """Numero de terminos del vocabulario"""
+        return len(self._state[1])
+
+    def _terms(self, skills: Iterable[str]) -> List[str]:
+        """Tokeniza una lista de skills igual que TfidfVectorizer"""
+        return self._analyzer(' '.join(s for s in skills if isinstance(s, str)))
+
+    def fit(
+        self,
+        documents: Iterable[List[str]],
+        document_ids: Optional[Iterable[str]] = None
+    ) -> 'SkillVocabulary':
+        """
+        Ajusta el vocabulario desde cero
+
+        Args:
+            documents: Listas de skills (una por CV u oferta)
+            document_ids: IDs de origen de cada documento (opcional)
+
+        Returns:
+            self
+        """
+        with self._lock:
+            self.document_frequency = Counter()
+            self.document_ids = set()
+            self.n_documents = 0
+        self.update(documents, document_ids)
+        return self
+
+    def update(
+        self,
+        documents: Iterable[List[str]],
+        document_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Agrega documentos al vocabulario sin reajustar desde cero
+
+        Los documentos cuyo ID ya fue agregado antes se ignoran, de modo que
+        un refresco periodico puede volver a pasar todos los CVs y ofertas.
+
+        Args:
+            documents: Listas de skills (una por CV u oferta)
+            document_ids: IDs de origen de cada documento (opcional)
+
+        Returns:
+            Numero de documentos nuevos agregados
+        """
+        documents = list(documents)
+        ids = list(document_ids) if document_ids is not None else [None] * len(documents)
+
+        with self._lock:
+            added = 0
+            for doc_id, skills in zip(ids, documents):
+                if doc_id is not None:
+                    if doc_id in self.document_ids:
+                        continue
+                    self.document_ids.add(doc_id)
+
+                self.document_frequency.update(set(self._terms(skills or [])))
+                self.n_documents += 1
+                added += 1
+
+            if added:
+                self._rebuild_state()
+
+        return added
+
+    def _rebuild_state(self):
+        """Recalcula indices e IDF (llamar con el lock tomado)"""
+        version = next(_version_counter)
+        vocabulary = {
+            term: i for i, term in enumerate(sorted(self.document_frequency))
+        }
+        df = np.array(
+            [self.document_frequency[t] for t in sorted(self.document_frequency)],
+            dtype=np.float64
+        )
+        # IDF suavizado (smooth_idf=True de sklearn)
+        idf = np.log((1 + self.n_documents) / (1 + df)) + 1.0
+        self._state = (version, vocabulary, idf)
+
+    def vectorize(self, skills: List[str]) -> SkillVector:
+        """
+        Calcula el vector TF-IDF normalizado (L2) de una lista de skills
+
+        Args:
+            skills: Lista de skills
+
+        Returns:
+            SkillVector; oov_terms cuenta los unigramas fuera del vocabulario
+        """
+        version, vocabulary, idf = self._state
+        counts = Counter(self._terms(skills or []))
+
+        # IDF de un termino que no aparece en ningun documento (el maximo)
+        unseen_idf = math.log(1 + self.n_documents) + 1.0
+
+        indices = []
+        data = []
+        oov = {}
+        oov_terms = 0
+        for term, tf in counts.items():
+            index = vocabulary.get(term)
+            if index is None:
+                oov[term] = tf * unseen_idf
+                # Los bigramas nuevos entre skills contiguos ("python docker")
+                # son inevitables al unir la lista; solo un unigrama nuevo
+                # indica un skill desconocido
+                if ' ' not in term:
+                    oov_terms += 1
+                continue
+            indices.append(index)
+            data.append(tf * idf[index])
+
+        data = np.asarray(data, dtype=np.float64)
+        squared = float(np.dot(data, data)) + sum(w * w for w in oov.values())
+        norm = math.sqrt(squared)
+        if norm > 0:
+            data = data / norm
+            oov = {term: w / norm for term, w in oov.items()}
+
+        matrix = csr_matrix(
+            (data, (np.zeros(len(indices), dtype=np.int64), indices)),
+            shape=(1, len(vocabulary))
+        )
+        return SkillVector(version, matrix, oov, oov_terms)
+
+    def similarity(
+        self,
+        cv_skills: List[str],
+        required_skills: List[str],
+        cv_vector: Optional[SkillVector] = None,
+        required_vector: Optional[SkillVector] = None
+    ) -> float:
+        """
+        Similitud coseno entre dos listas de skills (producto punto)
+
+        Los vectores precalculados se reutilizan si son de la version
+        actual; si no, se recalculan. Los terminos fuera del vocabulario
+        entran con el IDF maximo, asi todos los pares se comparan en el
+        mismo espacio (un skill nuevo compartido suma, uno no compartido
+        diluye) hasta el siguiente refresco.
+
+        Args:
+            cv_skills: Skills del CV
+            required_skills: Skills requeridos
+            cv_vector: Vector precalculado del CV (opcional)
+            required_vector: Vector precalculado de la oferta (opcional)
+
+        Returns:
+            Similitud entre 0 y 1
+        """
+        version = self.version
+        if cv_vector is None or cv_vector.version != version:
+            cv_vector = self.vectorize(cv_skills)
+        if required_vector is None or required_vector.version != version:
+            required_vector = self.vectorize(required_skills)
+
+        similarity = float(cv_vector.matrix.multiply(required_vector.matrix).sum())
+        if cv_vector.oov and required_vector.oov:
+            similarity += sum(
+                w * required_vector.oov[term]
+                for term, w in cv_vector.oov.items() if term in required_vector.oov
+            )
+        return min(similarity, 1.0)
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Persiste el vocabulario con joblib
+
+        Args:
+            path: Ruta de salida (por defecto junto a ridge_v1.joblib)
+
+        Returns:
+            Ruta donde se guardo
+        """
+        path = Path(path) if path else DEFAULT_VOCABULARY_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            joblib.dump({
+                'document_frequency': dict(self.document_frequency),
+                'document_ids': sorted(self.document_ids),
+                'n_documents': self.n_documents
+            }, path)
+
+        logger.info(f"Vocabulario de skills guardado en: {path}")
+        return str(path)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'SkillVocabulary':
+        """
+        Carga un vocabulario persistido
+
+        Args:
+            path: Ruta del archivo (por defecto junto a ridge_v1.joblib)
+
+        Returns:
+            SkillVocabulary
+        """
+        data = joblib.load(Path(path) if path else DEFAULT_VOCABULARY_PATH)
+
+        vocabulary = cls()
+        vocabulary.document_frequency = Counter(data['document_frequency'])
+        vocabulary.document_ids = set(data.get('document_ids', []))
+        vocabulary.n_documents = data['n_documents']
+        with vocabulary._lock:
+            vocabulary._rebuild_state()
+        return vocabulary
+
+
+# Global vocabulary instance (None si no hay vocabulario persistido)
+_skill_vocabulary: Optional[SkillVocabulary] = None
+_skill_vocabulary_loaded = False
+_skill_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary() -> Optional[SkillVocabulary]:
+    """
+    Obtiene el vocabulario global, cargandolo del disco la primera vez
+
+    Returns:
+        SkillVocabulary o None si no existe el archivo o sklearn no esta
+        disponible (se usa el calculo TF-IDF por par)
+    """
+    global _skill_vocabulary, _skill_vocabulary_loaded
+
+    if _skill_vocabulary_loaded:
+        return _skill_vocabulary
+
+    with _skill_vocabulary_lock:
+        if not _skill_vocabulary_loaded:
+            if SKLEARN_AVAILABLE and DEFAULT_VOCABULARY_PATH.exists():
+                try:
+                    _skill_vocabulary = SkillVocabulary.load()
+                    logger.info(
+                        f"Vocabulario de skills cargado: {_skill_vocabulary.size} terminos"
+                    )
+                except Exception as e:
+                    logger.error(f"Error cargando vocabulario de skills: {e}")
+            _skill_vocabulary_loaded = True
+
+    return _skill_vocabulary
+
+
+def set_skill_vocabulary(vocabulary: Optional[SkillVocabulary]):
+    """
+    Reemplaza el vocabulario global (ej: tras un refresco)
+
+    Args:
+        vocabulary: Nuevo vocabulario, o None para volver al calculo por par
+    """
+    global _skill_vocabulary, _skill_vocabulary_loaded
+
+    with _skill_vocabulary_lock:
+        _skill_vocabulary = vocabulary
+        _skill_vocabulary_loaded = True
@@ -154,14 +154,69 @@ def calculate_soft_skills_score(
     cv_normalized = set([normalize_soft_skill(s) for s in cv_soft_skills])
     required_normalized = set([normalize_soft_skill(s) for s in required_soft_skills])
 
+    cv_categories = {skill: get_soft_skill_category(skill) for skill in cv_normalized}
+    required_categories = {skill: get_soft_skill_category(skill) for skill in required_normalized}
+
+    return calculate_soft_skills_score_normalized(
+        cv_categories=cv_categories,
+        required_categories=required_categories,
+        required_missing=[normalize_soft_skill(s) for s in required_soft_skills]
+    )
+
+
+def calculate_soft_skills_score_normalized(
+    cv_categories: Dict[str, str],
+    required_categories: Dict[str, str],
+    required_missing: List[str]
+) -> Dict:
+    """
+    Calcula score de soft skills con skills ya normalizados y categorizados
+
+    Variante de calculate_soft_skills_score() para requisitos compilados
+    (ver offer_profile.py).
+
+    Args:
+        cv_categories: {skill_normalizado: categoria} del CV
+        required_categories: {skill_normalizado: categoria} requeridos
+        required_missing: Skills requeridos normalizados (en orden original),
+            usados como 'missing' cuando el CV no tiene soft skills
+
+    Returns:
+        Dict con score y detalles
+    """
+    if not required_categories:
+        return {
+            'score': 1.0,  # Si no hay requisitos, score perfecto
+            'exact_match_ratio': 1.0,
+            'category_match_ratio': 1.0,
+            'matched_exact': [],
+            'matched_by_category': [],
+            'missing': [],
+            'cv_categories': [],
+            'required_categories': []
+        }
+
+    if not cv_categories:
+        return {
+            'score': 0.0,
+            'exact_match_ratio': 0.0,
+            'category_match_ratio': 0.0,
+            'matched_exact': [],
+            'matched_by_category': [],
+            'missing': list(required_missing),
+            'cv_categories': [],
+            'required_categories': []
+        }
+
+    cv_normalized = set(cv_categories)
+    required_normalized = set(required_categories)
+
     # === MATCHING EXACTO ===
     exact_matched = cv_normalized & required_normalized
     exact_match_ratio = len(exact_matched) / len(required_normalized)
 
     # === MATCHING POR CATEGORIAS ===
     # Para skills que no hicieron match exacto, ver si comparten categoria
-    cv_categories = {skill: get_soft_skill_category(skill) for skill in cv_normalized}
-    required_categories = {skill: get_soft_skill_category(skill) for skill in required_normalized}
 
     category_matches = set()
     for req_skill, req_category in required_categories.items():
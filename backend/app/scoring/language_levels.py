@@ -146,15 +146,54 @@ def calculate_languages_score(cv_languages: list, required_languages: list) -> d
         parsed = parse_language_entry(lang_str)
         cv_parsed.append(parsed)
 
+    return calculate_languages_score_parsed(
+        cv_parsed,
+        parse_required_languages(required_languages)
+    )
+
+
+def parse_required_languages(required_languages: list) -> list:
+    """
+    Prepara los idiomas requeridos para matching
+
+    Args:
+        required_languages: Lista de idiomas requeridos (ej: ["Ingles"])
+
+    Returns:
+        Lista de tuplas (idioma_original, idioma_en_minusculas)
+    """
+    return [(req_lang, req_lang.lower().strip()) for req_lang in required_languages]
+
+
+def calculate_languages_score_parsed(cv_parsed: list, required_parsed: list) -> dict:
+    """
+    Calcula el score de idiomas con entradas ya parseadas
+
+    Variante de calculate_languages_score() que evita re-parsear los idiomas
+    del CV y los requisitos de la oferta en cada evaluacion.
+
+    Args:
+        cv_parsed: Lista de parse_language_entry() de los idiomas del CV
+        required_parsed: Lista de parse_required_languages()
+
+    Returns:
+        Dict con score global y detalles
+    """
+    if not required_parsed:
+        return {
+            'score': 1.0,  # Si no hay requisitos, score perfecto
+            'matched': [],
+            'missing': [],
+            'details': []
+        }
+
     # Verificar cada idioma requerido
     scores = []
     matched = []
     missing = []
     details = []
 
-    for req_lang in required_languages:
-        req_lang_lower = req_lang.lower().strip()
-
+    for req_lang, req_lang_lower in required_parsed:
         # Buscar coincidencia en CV
         found = False
         for cv_lang in cv_parsed:
@@ -7,6 +7,12 @@ from .ml_integration_service import MLIntegrationService, get_ml_service
 from .profile_service import ProfileService, get_profile_service
 from .oferta_service import OfertaService, get_oferta_service
 from .recommendation_service import RecommendationService, get_recommendation_service
+from .recommendation_matrix_service import RecommendationMatrixService, get_recommendation_matrix_service
+from .skill_index_service import SkillIndexService, get_skill_index_service
+from .pdf_extraction_service import PDFExtractionService, get_pdf_extraction_service
+from .cv_job_service import CVJobService, get_cv_job_service
+from .bulk_import_service import BulkCVImportService, get_bulk_import_service
+from .warmup_service import WarmupService, get_warmup_service
 
 __all__ = [
     "MLIntegrationService",
@@ -17,4 +23,16 @@ __all__ = [
     "get_oferta_service",
     "RecommendationService",
     "get_recommendation_service",
+    "RecommendationMatrixService",
+    "get_recommendation_matrix_service",
+    "SkillIndexService",
+    "get_skill_index_service",
+    "PDFExtractionService",
+    "get_pdf_extraction_service",
+    "CVJobService",
+    "get_cv_job_service",
+    "BulkCVImportService",
+    "get_bulk_import_service",
+    "WarmupService",
+    "get_warmup_service",
 ]
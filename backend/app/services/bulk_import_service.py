@@ -0,0 +1,313 @@
+"""
+Bulk CV Import Service
+Importacion masiva de CVs (cohortes completas)
+
+Etapas:
+    extract_text  -> todos los PDFs en el pool de procesos (PDFExtractionService
+                     limita cuantos entran a la vez)
+    llm           -> varios CVs por request de Gemini (GEMINI_CV_BATCH_SIZE),
+                     respetando MAX_CONCURRENT_GEMINI y el pool de keys
+    match_users   -> una consulta in_() por lote de emails
+    save          -> upserts agrupados en perfiles_profesionales
+
+Cada CV se asocia a un usuario existente por el email en el nombre del
+archivo (juan.perez@ucb.edu.bo.pdf) o, si no tiene, por el email que
+Gemini encuentra en el CV. No se crean usuarios.
+
+Desde la API la importacion corre como job de la cola de CVs
+(CVJobService.submit_bulk_import): los PDFs se guardan como un zip y el
+informe queda en el resultado del job.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import re
+import time
+import zipfile
+import zlib
+from typing import Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core import llm_extractor
+from app.db.async_client import run_db
+from app.db.batch_queries import fetch_by_ids
+from app.db.client import supabase
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+# Maximo por archivo, igual que /upload-cv
+MAX_PDF_BYTES = 10 * 1024 * 1024
+
+
+class ZipLimitError(ValueError):
+    """El zip declara mas PDFs o mas bytes de los permitidos."""
+
+
+def read_pdfs_from_zip(
+    data: Union[bytes, BinaryIO],
+    max_files: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> List[Tuple[str, bytes]]:
+    """
+    PDFs contenidos en un zip (se ignoran otros archivos y carpetas de macOS).
+
+    Los limites se comprueban con el indice del zip (cantidad de entradas y
+    file_size declarado) antes de descomprimir ninguna entrada.
+
+    Args:
+        data: Contenido del zip o archivo abierto en modo binario
+        max_files: Maximo de PDFs aceptados, None = sin limite
+        max_bytes: Maximo de bytes descomprimidos entre todos los PDFs, None = sin limite
+
+    Returns:
+        Lista de (nombre de archivo, bytes)
+
+    Raises:
+        ValueError: Si el zip es invalido
+        ZipLimitError: Si el zip supera max_files o max_bytes
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data) if isinstance(data, bytes) else data)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Zip invalido: {str(e)}")
+
+    with archive:
+        entries = []
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or name.startswith("."):
+                continue
+            if not name.lower().endswith(".pdf") or info.file_size > MAX_PDF_BYTES:
+                continue
+            entries.append((name, info))
+
+        if max_files is not None and len(entries) > max_files:
+            raise ZipLimitError(f"El zip contiene {len(entries)} PDFs; maximo {max_files}")
+        total_bytes = sum(info.file_size for _, info in entries)
+        if max_bytes is not None and total_bytes > max_bytes:
+            raise ZipLimitError(
+                f"El zip declara {total_bytes // (1024 * 1024)} MB de PDFs; "
+                f"maximo {max_bytes // (1024 * 1024)} MB"
+            )
+
+        try:
+            return [(name, archive.read(info)) for name, info in entries]
+        except (zipfile.BadZipFile, zlib.error) as e:
+            raise ValueError(f"Zip invalido: {str(e)}")
+
+
+def pack_pdfs_zip(files: List[Tuple[str, bytes]]) -> bytes:
+    """
+    Empaqueta PDFs en un zip sin comprimir (se lee con read_pdfs_from_zip).
+
+    Args:
+        files: Lista de (nombre de archivo, bytes)
+
+    Returns:
+        Contenido del zip
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for index, (name, data) in enumerate(files):
+            # Prefijo por indice: nombres repetidos no se pisan
+            archive.writestr(f"{index:05d}/{name}", data)
+    return buffer.getvalue()
+
+
+def read_pdfs_from_path(path: str) -> List[Tuple[str, bytes]]:
+    """
+    PDFs de un directorio (recursivo) o de un archivo .zip.
+
+    Args:
+        path: Directorio o archivo zip
+
+    Returns:
+        Lista de (nombre de archivo, bytes)
+    """
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if path.lower().endswith(".zip"):
+            return read_pdfs_from_zip(data)
+        return [(os.path.basename(path), data)]
+
+    files = []
+    for root, _, names in os.walk(path):
+        for name in sorted(names):
+            full = os.path.join(root, name)
+            if name.lower().endswith(".pdf") and os.path.getsize(full) <= MAX_PDF_BYTES:
+                with open(full, "rb") as f:
+                    files.append((name, f.read()))
+    return files
+
+
+def email_from_filename(filename: str) -> Optional[str]:
+    """Email contenido en el nombre del archivo (None si no hay)"""
+    match = EMAIL_RE.search(os.path.splitext(filename)[0])
+    return match.group(0).lower() if match else None
+
+
+class BulkCVImportService:
+    """
+    Servicio de importacion masiva de CVs.
+
+    Implementa patron Singleton.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def import_cvs(
+        self,
+        files: List[Tuple[str, bytes]],
+        batch_size: Optional[int] = None,
+        dry_run: bool = False,
+        on_stage: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Dict:
+        """
+        Importa un lote de CVs y actualiza los perfiles de sus usuarios.
+
+        Args:
+            files: Lista de (nombre de archivo, bytes del PDF)
+            batch_size: CVs por request de Gemini (por defecto GEMINI_CV_BATCH_SIZE)
+            dry_run: Si es True no escribe perfiles
+            on_stage: Callback async llamado al iniciar cada etapa
+                (extract_text, llm, match_users, save)
+
+        Returns:
+            Informe con conteos, errores por archivo, tiempos por etapa y
+            throughput (CVs/min)
+
+        Raises:
+            ValueError: Si la base de datos no esta configurada
+        """
+        from app.services.ml_integration_service import normalize_cv_output
+        from app.services.pdf_extraction_service import get_pdf_extraction_service
+        from app.services.profile_service import get_profile_service
+
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        errors: List[Dict] = []
+        batch_size = batch_size or llm_extractor.GEMINI_CV_BATCH_SIZE
+
+        def fail(filename: str, stage: str, error: str):
+            errors.append({'filename': filename, 'stage': stage, 'error': error})
+
+        async def start_stage(stage: str) -> float:
+            if on_stage is not None:
+                await on_stage(stage)
+            return time.perf_counter()
+
+        # 1. Texto de todos los PDFs en el pool de procesos
+        t = await start_stage('extract_text')
+        pdf_service = get_pdf_extraction_service()
+        texts = await asyncio.gather(
+            *[pdf_service.extract_text(data) for _, data in files],
+            return_exceptions=True
+        )
+        extracted: List[Tuple[str, str]] = []
+        for (filename, _), text in zip(files, texts):
+            if isinstance(text, BaseException):
+                fail(filename, "extract_text", str(text))
+            else:
+                extracted.append((filename, text))
+        timings['extract_text'] = time.perf_counter() - t
+
+        # 2. Gemini con varios CVs por request
+        t = await start_stage('llm')
+        results = await llm_extractor.extract_skills_batch_with_llm(
+            [text for _, text in extracted], batch_size=batch_size
+        )
+        outputs: List[Tuple[str, Dict]] = []
+        for (filename, _), result in zip(extracted, results):
+            try:
+                outputs.append((filename, normalize_cv_output(result)))
+            except ValueError as e:
+                fail(filename, "llm", str(e))
+        timings['llm'] = time.perf_counter() - t
+
+        # 3. Usuario de cada CV (email del archivo o del CV)
+        t = await start_stage('match_users')
+        candidates = []
+        for filename, output in outputs:
+            email = email_from_filename(filename) or \
+                (output.get('personal_info', {}).get('email') or '').strip().lower() or None
+            candidates.append((filename, output, email))
+
+        users = await run_db(
+            fetch_by_ids, supabase, "usuarios", "email",
+            [email for _, _, email in candidates], "id, email"
+        )
+        items: List[Tuple[str, Dict, str]] = []
+        assigned = set()
+        for filename, output, email in candidates:
+            user = users.get(email) if email else None
+            if user is None:
+                fail(filename, "match_users", f"Sin usuario para el email {email}" if email
+                     else "No se encontro email en el nombre del archivo ni en el CV")
+            elif user['id'] in assigned:
+                fail(filename, "match_users", f"Otro CV del lote ya corresponde a {email}")
+            else:
+                assigned.add(user['id'])
+                items.append((user['id'], output, filename))
+        timings['match_users'] = time.perf_counter() - t
+
+        # 4. Upserts agrupados
+        t = await start_stage('save')
+        saved = 0
+        if items and not dry_run:
+            try:
+                profiles = await run_db(get_profile_service().upsert_profiles_from_cv, items)
+                saved = len(profiles)
+            except Exception as e:
+                logger.error(f"Error guardando perfiles importados: {e}")
+                for _, _, filename in items:
+                    fail(filename, "save", str(e))
+        timings['save'] = time.perf_counter() - t
+
+        elapsed = time.perf_counter() - started
+        processed = len(items) if dry_run else saved
+        report = {
+            'total_files': len(files),
+            'imported': processed,
+            'failed': len(errors),
+            'dry_run': dry_run,
+            'batch_size': batch_size,
+            'gemini_concurrency': llm_extractor.MAX_CONCURRENT_GEMINI,
+            'gemini_keys': llm_extractor._key_pool.key_count,
+            'elapsed_seconds': round(elapsed, 2),
+            'cvs_per_minute': round(processed * 60 / elapsed, 1) if elapsed > 0 else 0.0,
+            'stage_seconds': {stage: round(value, 2) for stage, value in timings.items()},
+            'errors': errors,
+        }
+        logger.info(
+            f"Importacion masiva: {processed}/{len(files)} CVs en {elapsed:.1f}s "
+            f"({report['cvs_per_minute']} CVs/min) etapas={report['stage_seconds']}"
+        )
+        return report
+
+
+_bulk_import_service_instance = None
+
+
+def get_bulk_import_service() -> BulkCVImportService:
+    """
+    Obtiene la instancia singleton del servicio de importacion masiva
+
+    Returns:
+        Instancia de BulkCVImportService
+    """
+    global _bulk_import_service_instance
+    if _bulk_import_service_instance is None:
+        _bulk_import_service_instance = BulkCVImportService()
+    return _bulk_import_service_instance
@@ -0,0 +1,651 @@
+"""
+CV Job Service
+Cola de procesamiento asincrono de CVs
+
+La subida del CV solo guarda el PDF y devuelve un job_id; un grupo de
+workers asyncio procesa la cola:
+    extracting_text  -> pool de procesos (PDFExtractionService)
+    extracting_llm   -> Gemini async (semaforo, reintentos, cache)
+    saving           -> ProfileService.update_profile_from_cv (pool de BD)
+
+Las importaciones masivas del panel de administracion (kind 'bulk_import')
+usan la misma cola: el job guarda los PDFs como zip y corre
+BulkCVImportService.import_cvs; su resultado es el informe de la importacion.
+
+Los jobs (y el PDF mientras esta pendiente) viven en SQLite, asi que la cola
+soporta picos de subidas sin retener workers de uvicorn y se comparte entre
+procesos. Cada proceso marca los jobs que toma con su owner
+(host:pid:token) y renueva un heartbeat; una tarea periodica reencola los
+jobs de owners sin heartbeat y, al arrancar, los de procesos muertos del
+mismo host se reencolan de inmediato.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.db.async_client import run_db
+
+logger = logging.getLogger(__name__)
+
+
+JOB_KIND_CV = "cv"
+JOB_KIND_BULK_IMPORT = "bulk_import"
+
+STATUS_QUEUED = "queued"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+TERMINAL_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+# Progreso (%) informado en cada etapa
+STAGE_PROGRESS = {
+    "queued": 0,
+    "extracting_text": 10,
+    "extracting_llm": 35,
+    "matching_users": 70,
+    "saving": 85,
+    "done": 100,
+    "failed": 100,
+}
+
+# Etapa de BulkCVImportService.import_cvs -> etapa del job
+BULK_IMPORT_STAGES = {
+    'extract_text': "extracting_text",
+    'llm': "extracting_llm",
+    'match_users': "matching_users",
+    'save': "saving",
+}
+
+MAX_ATTEMPTS = 3
+FINISHED_JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class CVJobQueueFullError(Exception):
+    """La cola alcanzo CV_JOB_MAX_PENDING jobs pendientes"""
+    pass
+
+
+def build_extraction_summary(gemini_output: Dict) -> Dict[str, Any]:
+    """
+    Resumen de lo extraido de un CV (conteos por seccion).
+
+    Args:
+        gemini_output: Resultado de la extraccion con Gemini
+
+    Returns:
+        Dict con conteos de skills, educacion, experiencia e idiomas
+    """
+    return {
+        'hard_skills_count': len(gemini_output.get('hard_skills', [])),
+        'soft_skills_count': len(gemini_output.get('soft_skills', [])),
+        'education_items': len(gemini_output.get('education', [])),
+        'experience_items': len(gemini_output.get('experience', [])),
+        'languages_detected': gemini_output.get('personal_info', {}).get('languages', [])
+    }
+
+
+def new_owner_id() -> str:
+    """Identificador del proceso duenio de los jobs: host:pid:token"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _owner_process_gone(owner: str, current_owner: Optional[str] = None) -> bool:
+    """
+    True si el owner es de este host y su proceso ya no existe (o es una
+    instancia anterior con el mismo pid que current_owner, p. ej. tras
+    reiniciar un contenedor). Owners de otros hosts dependen solo del
+    heartbeat; current_owner nunca esta caido.
+    """
+    if owner == current_owner:
+        return False
+    try:
+        host, pid, _token = owner.rsplit(":", 2)
+        pid = int(pid)
+    except ValueError:
+        return False
+
+    if host != socket.gethostname():
+        return False
+    if pid == os.getpid():
+        # Mismo pid: es una instancia anterior solo si el token no es el actual
+        return current_owner is not None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class CVJobStore:
+    """
+    Persistencia de jobs en SQLite.
+
+    Los metodos son sincronos y cortos; el servicio los llama con
+    asyncio.to_thread para no bloquear el event loop.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_jobs (
+                id          TEXT PRIMARY KEY,
+                user_id     TEXT NOT NULL,
+                filename    TEXT,
+                status      TEXT NOT NULL,
+                stage       TEXT NOT NULL,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                error       TEXT,
+                result      TEXT,
+                pdf         BLOB,
+                kind        TEXT NOT NULL DEFAULT 'cv',
+                options     TEXT,
+                owner       TEXT,
+                created_at  REAL NOT NULL,
+                updated_at  REAL NOT NULL
+            )
+            """
+        )
+        # Bases creadas antes de las columnas owner, kind y options
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(cv_jobs)")}
+        for column, definition in (
+            ('owner', "TEXT"),
+            ('kind', "TEXT NOT NULL DEFAULT 'cv'"),
+            ('options', "TEXT"),
+        ):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE cv_jobs ADD COLUMN {column} {definition}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_job_owners (
+                owner        TEXT PRIMARY KEY,
+                heartbeat_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cv_jobs_status ON cv_jobs (status, created_at)"
+        )
+        self._conn.commit()
+
+    def create(
+        self,
+        user_id: str,
+        filename: str,
+        pdf_bytes: bytes,
+        kind: str = JOB_KIND_CV,
+        options: Optional[Dict] = None
+    ) -> str:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cv_jobs (id, user_id, filename, status, stage, pdf, kind, options,"
+                " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, filename, STATUS_QUEUED, "queued", pdf_bytes, kind,
+                 json.dumps(options) if options is not None else None, now, now)
+            )
+            self._conn.commit()
+        return job_id
+
+    def count_pending(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cv_jobs WHERE status IN (?, ?)",
+                (STATUS_QUEUED, STATUS_PROCESSING)
+            ).fetchone()[0]
+
+    def claim_next(self, owner: Optional[str] = None) -> Optional[Dict]:
+        """Toma el job en cola mas antiguo (atomico entre procesos)"""
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE cv_jobs SET status = ?, stage = ?, attempts = attempts + 1, owner = ?,"
+                " updated_at = ?"
+                " WHERE id = (SELECT id FROM cv_jobs WHERE status = ? ORDER BY created_at LIMIT 1)"
+                "   AND status = ?"
+                " RETURNING id, user_id, filename, pdf, kind, options, attempts",
+                (STATUS_PROCESSING, "extracting_text", owner, time.time(), STATUS_QUEUED, STATUS_QUEUED)
+            ).fetchone()
+            self._conn.commit()
+        if row is None:
+            return None
+        job = dict(row)
+        job['options'] = json.loads(job['options']) if job['options'] else {}
+        return job
+
+    def set_stage(self, job_id: str, stage: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cv_jobs SET stage = ?, updated_at = ? WHERE id = ?",
+                (stage, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Marca el job como terminado y descarta el PDF"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cv_jobs SET status = ?, stage = ?, result = ?, error = ?, pdf = NULL,"
+                " updated_at = ? WHERE id = ?",
+                (status, status, json.dumps(result, default=str) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, user_id, filename, kind, status, stage, attempts, error, result,"
+                " created_at, updated_at FROM cv_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def heartbeat(self, owner: str):
+        """Registra que el proceso owner sigue vivo"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cv_job_owners (owner, heartbeat_at) VALUES (?, ?)"
+                " ON CONFLICT(owner) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (owner, time.time())
+            )
+            self._conn.commit()
+
+    def release(self, owner: str) -> List[str]:
+        """
+        Reencola los jobs en curso de owner y lo da de baja (shutdown ordenado).
+
+        Returns:
+            Ids reencolados
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE cv_jobs SET status = ?, stage = ?, owner = NULL, updated_at = ?"
+                " WHERE status = ? AND owner = ? RETURNING id",
+                (STATUS_QUEUED, "queued", now, STATUS_PROCESSING, owner)
+            ).fetchall()
+            self._conn.execute("DELETE FROM cv_job_owners WHERE owner = ?", (owner,))
+            self._conn.commit()
+        return [row['id'] for row in rows]
+
+    def recover(self, stale_seconds: float, current_owner: Optional[str] = None) -> List[str]:
+        """
+        Reencola jobs 'processing' de procesos caidos y purga jobs terminados
+        antiguos. Un owner esta caido si no renovo su heartbeat en
+        stale_seconds o si es un proceso de este host que ya no existe; los
+        jobs sin owner usan su updated_at. Tras MAX_ATTEMPTS el job se marca
+        fallido.
+
+        Args:
+            stale_seconds: Segundos sin heartbeat para dar un owner por caido
+            current_owner: Owner del proceso que llama (sus jobs nunca se
+                reencolan aqui)
+
+        Returns:
+            Ids reencolados
+        """
+        now = time.time()
+        with self._lock:
+            live_owners = {
+                row['owner'] for row in self._conn.execute(
+                    "SELECT owner FROM cv_job_owners WHERE heartbeat_at >= ?",
+                    (now - stale_seconds,)
+                )
+            }
+            rows = [
+                row for row in self._conn.execute(
+                    "SELECT id, attempts, owner, updated_at FROM cv_jobs WHERE status = ?",
+                    (STATUS_PROCESSING,)
+                ).fetchall()
+                if (row['updated_at'] < now - stale_seconds if row['owner'] is None
+                    else row['owner'] != current_owner and (
+                        row['owner'] not in live_owners
+                        or _owner_process_gone(row['owner'], current_owner)))
+            ]
+            requeued = []
+            for row in rows:
+                if row['attempts'] >= MAX_ATTEMPTS:
+                    self._conn.execute(
+                        "UPDATE cv_jobs SET status = ?, stage = ?, error = ?, pdf = NULL, owner = NULL,"
+                        " updated_at = ? WHERE id = ?",
+                        (STATUS_FAILED, STATUS_FAILED, "Procesamiento interrumpido", now, row['id'])
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE cv_jobs SET status = ?, stage = ?, owner = NULL, updated_at = ?"
+                        " WHERE id = ?",
+                        (STATUS_QUEUED, "queued", now, row['id'])
+                    )
+                    requeued.append(row['id'])
+
+            self._conn.execute(
+                "DELETE FROM cv_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (STATUS_DONE, STATUS_FAILED, now - FINISHED_JOB_RETENTION_SECONDS)
+            )
+            self._conn.execute(
+                "DELETE FROM cv_job_owners WHERE heartbeat_at < ?",
+                (now - stale_seconds,)
+            )
+            self._conn.commit()
+        return requeued
+
+
+class CVJobService:
+    """
+    Servicio de jobs de procesamiento de CV.
+
+    Implementa patron Singleton; los workers y la tarea de mantenimiento
+    (heartbeat + recover) se inician en el startup de la aplicacion (o con el
+    primer job si no hubo startup).
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._store = None
+            cls._instance._workers = []
+            cls._instance._maintenance = None
+            cls._instance._wakeup = None
+            cls._instance._owner = new_owner_id()
+        return cls._instance
+
+    def _get_store(self) -> CVJobStore:
+        if self._store is None:
+            self._store = CVJobStore(settings.CV_JOBS_DB_PATH)
+        return self._store
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._workers)
+
+    async def start(self):
+        """Inicia los workers en el event loop actual"""
+        if self.is_running:
+            return
+
+        await self._recover()
+
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"cv-job-worker-{i}")
+            for i in range(settings.CV_JOB_WORKERS)
+        ]
+        self._maintenance = asyncio.create_task(self._maintenance_loop(), name="cv-job-maintenance")
+        logger.info(f"CV job workers iniciados: {settings.CV_JOB_WORKERS} (owner {self._owner})")
+
+    async def stop(self):
+        """Detiene los workers y reencola los jobs en curso de este proceso"""
+        tasks = self._workers + ([self._maintenance] if self._maintenance else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._maintenance = None
+
+        if self._store is not None:
+            released = await asyncio.to_thread(self._store.release, self._owner)
+            if released:
+                logger.info(f"CV jobs reencolados al detener: {len(released)}")
+
+    async def _recover(self):
+        """Renueva el heartbeat propio y reencola jobs de procesos caidos"""
+        store = self._get_store()
+        await asyncio.to_thread(store.heartbeat, self._owner)
+        requeued = await asyncio.to_thread(
+            store.recover, settings.CV_JOB_STALE_SECONDS, self._owner
+        )
+        if requeued:
+            logger.info(f"CV jobs reencolados: {len(requeued)}")
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(settings.CV_JOB_HEARTBEAT_SECONDS)
+            try:
+                await self._recover()
+            except Exception as e:
+                logger.error(f"CV jobs: error en heartbeat/recover: {e}")
+
+    async def submit(
+        self,
+        user_id: str,
+        filename: str,
+        pdf_bytes: bytes,
+        kind: str = JOB_KIND_CV,
+        options: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Encola un CV para procesar.
+
+        Args:
+            user_id: ID del usuario duenio del perfil
+            filename: Nombre original del archivo
+            pdf_bytes: Contenido del PDF
+            kind: Tipo de job (JOB_KIND_CV o JOB_KIND_BULK_IMPORT)
+            options: Opciones del job (JSON)
+
+        Returns:
+            Job recien creado
+
+        Raises:
+            CVJobQueueFullError: Si hay CV_JOB_MAX_PENDING jobs pendientes
+        """
+        store = self._get_store()
+        if await asyncio.to_thread(store.count_pending) >= settings.CV_JOB_MAX_PENDING:
+            raise CVJobQueueFullError("Cola de procesamiento de CVs llena, intente en unos minutos")
+
+        job_id = await asyncio.to_thread(store.create, user_id, filename, pdf_bytes, kind, options)
+
+        if not self.is_running:
+            await self.start()
+        self._wakeup.set()
+
+        return await self.get_job(job_id)
+
+    async def submit_bulk_import(
+        self,
+        user_id: str,
+        files: List[Tuple[str, bytes]],
+        batch_size: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict:
+        """
+        Encola una importacion masiva de CVs.
+
+        Args:
+            user_id: ID del administrador que la inicia
+            files: Lista de (nombre de archivo, bytes del PDF)
+            batch_size: CVs por request de Gemini
+            dry_run: Si es True no escribe perfiles
+
+        Returns:
+            Job recien creado
+
+        Raises:
+            CVJobQueueFullError: Si hay CV_JOB_MAX_PENDING jobs pendientes
+        """
+        from app.services.bulk_import_service import pack_pdfs_zip
+
+        archive = await asyncio.to_thread(pack_pdfs_zip, files)
+        return await self.submit(
+            user_id, f"{len(files)} CVs", archive, kind=JOB_KIND_BULK_IMPORT,
+            options={'batch_size': batch_size, 'dry_run': dry_run}
+        )
+
+    async def get_job(self, job_id: str, user_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Estado de un job.
+
+        Args:
+            job_id: ID del job
+            user_id: Si se indica, solo devuelve jobs de ese usuario
+
+        Returns:
+            Dict con status, stage, progress, error y result (o None)
+        """
+        job = await asyncio.to_thread(self._get_store().get, job_id)
+        if job is None or (user_id is not None and job['user_id'] != user_id):
+            return None
+
+        job['progress'] = STAGE_PROGRESS.get(job['stage'], 0)
+        return job
+
+    async def watch_job(
+        self,
+        job_id: str,
+        user_id: Optional[str] = None,
+        interval: float = 0.5
+    ) -> AsyncIterator[Dict]:
+        """
+        Emite el estado del job cada vez que cambia, hasta que termina.
+
+        Args:
+            job_id: ID del job
+            user_id: Duenio del job
+            interval: Segundos entre consultas
+
+        Yields:
+            Estado del job
+        """
+        last_seen = None
+        while True:
+            job = await self.get_job(job_id, user_id)
+            if job is None:
+                return
+
+            marker = (job['status'], job['stage'], job['updated_at'])
+            if marker != last_seen:
+                last_seen = marker
+                yield job
+
+            if job['status'] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(interval)
+
+    async def _worker(self, index: int):
+        store = self._get_store()
+        while True:
+            try:
+                job = await asyncio.to_thread(store.claim_next, self._owner)
+            except Exception as e:
+                logger.error(f"CV job worker {index}: error leyendo la cola: {e}")
+                job = None
+
+            if job is None:
+                # Sin trabajo: esperar un submit local o re-consultar (otros procesos)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job)
+
+    async def _process(self, job: Dict):
+        store = self._get_store()
+        job_id = job['id']
+        started = time.perf_counter()
+        handler = self._process_bulk_import if job['kind'] == JOB_KIND_BULK_IMPORT else self._process_cv
+
+        try:
+            result = await handler(job)
+            await asyncio.to_thread(store.finish, job_id, STATUS_DONE, result)
+            logger.info(f"CV job {job_id} completado en {time.perf_counter() - started:.1f}s")
+
+        except asyncio.CancelledError:
+            # Shutdown: el job queda 'processing' y stop()/recover() lo reencola
+            raise
+        except ValueError as e:
+            logger.warning(f"CV job {job_id} fallido: {e}")
+            await asyncio.to_thread(store.finish, job_id, STATUS_FAILED, None, str(e))
+        except Exception as e:
+            logger.error(f"CV job {job_id} error inesperado: {e}")
+            await asyncio.to_thread(
+                store.finish, job_id, STATUS_FAILED, None, f"Error procesando el CV: {str(e)}"
+            )
+
+    async def _process_bulk_import(self, job: Dict) -> Dict:
+        from app.services.bulk_import_service import get_bulk_import_service, read_pdfs_from_zip
+
+        store = self._get_store()
+        files = await asyncio.to_thread(read_pdfs_from_zip, job['pdf'])
+
+        async def on_stage(stage: str):
+            await asyncio.to_thread(store.set_stage, job['id'], BULK_IMPORT_STAGES[stage])
+
+        return await get_bulk_import_service().import_cvs(
+            files,
+            batch_size=job['options'].get('batch_size'),
+            dry_run=bool(job['options'].get('dry_run')),
+            on_stage=on_stage
+        )
+
+    async def _process_cv(self, job: Dict) -> Dict:
+        from app.services.ml_integration_service import get_ml_service
+        from app.services.pdf_extraction_service import get_pdf_extraction_service
+        from app.services.profile_service import get_profile_service
+
+        store = self._get_store()
+        job_id = job['id']
+
+        text = await get_pdf_extraction_service().extract_text(job['pdf'])
+
+        await asyncio.to_thread(store.set_stage, job_id, "extracting_llm")
+        gemini_output = await get_ml_service().extract_cv_from_text(text)
+
+        await asyncio.to_thread(store.set_stage, job_id, "saving")
+        profile = await run_db(
+            get_profile_service().update_profile_from_cv,
+            job['user_id'],
+            gemini_output,
+            cv_filename=job['filename']
+        )
+
+        return {
+            'message': "CV procesado y perfil actualizado exitosamente",
+            'perfil': profile,
+            'extraction_summary': build_extraction_summary(gemini_output),
+        }
+
+
+_cv_job_service_instance = None
+
+
+def get_cv_job_service() -> CVJobService:
+    """
+    Obtiene la instancia singleton del servicio de jobs de CV
+
+    Returns:
+        Instancia de CVJobService
+    """
+    global _cv_job_service_instance
+    if _cv_job_service_instance is None:
+        _cv_job_service_instance = CVJobService()
+    return _cv_job_service_instance
@@ -6,17 +6,25 @@ Servicio que integra el modulo ML con el backend FastAPI
 import os
 import asyncio
 import base64
-import io
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import pdfplumber
-
 from app.db.client import supabase
 from app.core.llm_extractor import extract_skills_with_llm, extract_oferta_with_llm
-from app.scoring.feature_engineering import FeatureExtractor, extract_features
+from app.services.pdf_extraction_service import (
+    extract_text_from_pdf_bytes,
+    get_pdf_extraction_service,
+)
+from app.scoring.feature_engineering import (
+    FeatureExtractor,
+    extract_features,
+    extract_features_for_candidates,
+    calculate_final_scores_batch,
+    get_offer_profile_cache,
+    CandidateFeatureProfile
+)
 from app.ml.models import MatchPredictor, InstitutionalMatchModel
 
 # Configurar logging
@@ -24,6 +32,35 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def normalize_cv_output(result: Dict) -> Dict:
+    """
+    Valida la salida de Gemini para un CV y completa la estructura minima.
+
+    Args:
+        result: Resultado de extract_skills_with_llm
+
+    Returns:
+        El mismo dict con hard_skills, soft_skills, education, experience
+        y personal_info garantizados
+
+    Raises:
+        ValueError: Si Gemini devolvio error
+    """
+    if 'error' in result and result['error']:
+        raise ValueError(f"Error de Gemini: {result['error']}")
+
+    # Validate minimum structure
+    required_keys = ['hard_skills', 'soft_skills', 'education', 'experience']
+    for key in required_keys:
+        if key not in result:
+            result[key] = []
+
+    if 'personal_info' not in result:
+        result['personal_info'] = {'languages': [], 'summary': ''}
+
+    return result
+
+
 class MLIntegrationService:
     """
     Servicio de integracion ML
@@ -96,68 +133,76 @@ class MLIntegrationService:
 
     def _extract_pdf_text_sync(self, pdf_base64: str) -> str:
         """
-        Extrae texto de un PDF en base64 (sync, CPU-bound).
-        Se ejecuta en thread executor desde el metodo async.
+        Extrae texto de un PDF en base64 (sync, en el proceso actual).
+        Solo para llamadores sincronos; las rutas async usan _extract_pdf_text.
         """
         try:
             pdf_bytes = base64.b64decode(pdf_base64)
-            text = ""
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-
-            if not text.strip():
-                raise ValueError("No se pudo extraer texto del PDF")
-
-            return text
-
         except Exception as e:
-            logger.error(f"Error extrayendo PDF: {e}")
             raise ValueError(f"PDF invalido: {str(e)}")
+        return extract_text_from_pdf_bytes(pdf_bytes)
 
-    # Keep sync version for backward compat (used by deprecated cv.py endpoint)
+    # Keep sync version for backward compat
     def extract_cv_from_base64(self, pdf_base64: str) -> str:
         return self._extract_pdf_text_sync(pdf_base64)
 
-    async def extract_cv_with_gemini(self, pdf_base64: str) -> Dict:
+    async def _extract_pdf_text(self, pdf: Union[bytes, str]) -> str:
+        """
+        Extrae texto de un PDF en el pool de procesos.
+
+        Args:
+            pdf: Bytes del PDF o PDF en base64 (endpoints JSON)
+        """
+        if isinstance(pdf, str):
+            try:
+                pdf = base64.b64decode(pdf)
+            except Exception as e:
+                raise ValueError(f"PDF invalido: {str(e)}")
+        return await get_pdf_extraction_service().extract_text(pdf)
+
+    async def extract_cv_with_gemini(self, pdf: Union[bytes, str]) -> Dict:
         """
         Extrae informacion estructurada del CV usando Gemini (async).
 
-        - PDF text extraction runs in thread executor (no event loop blocking)
+        - PDF text extraction runs in the PDF process pool (no event loop blocking)
         - Gemini call is async with semaphore, timeout and retries
+
+        Args:
+            pdf: Bytes del PDF o PDF en base64
         """
-        # Extract PDF text in thread (CPU-bound, don't block event loop)
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(None, self._extract_pdf_text_sync, pdf_base64)
+        text = await self._extract_pdf_text(pdf)
+
+        return await self.extract_cv_from_text(text)
+
+    async def extract_cv_from_text(self, text: str) -> Dict:
+        """
+        Extrae informacion estructurada de un CV ya convertido a texto.
+
+        Args:
+            text: Texto extraido del PDF
 
+        Returns:
+            gemini_output con hard_skills, soft_skills, education,
+            experience y personal_info garantizados
+
+        Raises:
+            ValueError: Si Gemini devuelve error
+        """
         # Call Gemini (async with semaphore + retries + timeout)
         logger.info("Extrayendo CV con Gemini (async)...")
         result = await extract_skills_with_llm(text)
 
-        if 'error' in result and result['error']:
-            raise ValueError(f"Error de Gemini: {result['error']}")
-
-        # Validate minimum structure
-        required_keys = ['hard_skills', 'soft_skills', 'education', 'experience']
-        for key in required_keys:
-            if key not in result:
-                result[key] = []
-
-        if 'personal_info' not in result:
-            result['personal_info'] = {'languages': [], 'summary': ''}
+        result = normalize_cv_output(result)
 
         logger.info(f"CV extraido: {len(result.get('hard_skills', []))} hard skills")
         return result
 
-    async def extract_oferta_with_gemini(self, pdf_base64: str) -> Dict:
+    async def extract_oferta_with_gemini(self, pdf: Union[bytes, str]) -> Dict:
         """
         Extrae información estructurada de una convocatoria laboral en PDF usando Gemini (async).
         Sigue el mismo patrón que extract_cv_with_gemini.
         """
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(None, self._extract_pdf_text_sync, pdf_base64)
+        text = await self._extract_pdf_text(pdf)
 
         logger.info("Extrayendo oferta laboral con Gemini (async)...")
         result = await extract_oferta_with_llm(text)
@@ -270,14 +315,16 @@ class MLIntegrationService:
         return datetime.utcnow() - self._cache_timestamp < self._cache_ttl
 
     def invalidate_cache(self):
-        """Invalida el cache de perfiles"""
+        """Invalida el cache de perfiles y los requisitos compilados"""
         self._profile_cache = {}
         self._cache_timestamp = None
+        get_offer_profile_cache().clear()
 
     def evaluate_cv(
         self,
         gemini_output: Dict,
-        institutional_config: Dict
+        institutional_config: Dict,
+        candidate_profile: Optional[CandidateFeatureProfile] = None
     ) -> Dict:
         """
         Evalua un CV contra un perfil institucional
@@ -285,6 +332,8 @@ class MLIntegrationService:
         Args:
             gemini_output: Output de Gemini (CV estructurado)
             institutional_config: Configuracion institucional
+            candidate_profile: Datos del CV ya compilados (opcional,
+                ver ProfileService.get_candidate_features)
 
         Returns:
             Dict con prediccion completa
@@ -295,11 +344,105 @@ class MLIntegrationService:
         
         # Extraer features
         extractor = FeatureExtractor()
-        features = extractor.extract_features(gemini_output, institutional_config)
+        features = extractor.extract_features(
+            gemini_output, institutional_config, candidate_profile
+        )
 
         # Calcular score heuristico (suma ponderada)
         heuristic_score = extractor.calculate_weighted_score(features)
 
+        return self.format_evaluation(
+            gemini_output, institutional_config, features, heuristic_score
+        )
+
+    def evaluate_cv_batch(
+        self,
+        gemini_output: Dict,
+        institutional_configs: List[Dict],
+        candidate_profile: Optional[CandidateFeatureProfile] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Evalua un CV contra multiples configuraciones en un solo lote
+
+        Construye una matriz (n_configs x 18) y calcula todos los scores
+        heuristicos con una operacion vectorizada. Produce los mismos
+        resultados que llamar evaluate_cv() por cada configuracion.
+
+        Args:
+            gemini_output: Output de Gemini (CV estructurado)
+            institutional_configs: Lista de configuraciones institucionales
+            candidate_profile: Datos del CV ya compilados (opcional)
+
+        Returns:
+            Lista alineada con institutional_configs; None en las posiciones
+            cuya configuracion no pudo evaluarse
+        """
+        extractor = FeatureExtractor()
+        batch = extractor.extract_features_batch(
+            gemini_output, institutional_configs, candidate_profile
+        )
+
+        for i, error in batch['errors'].items():
+            logger.warning(
+                f"Error evaluando config {institutional_configs[i].get('id', i)}: {error}"
+            )
+
+        scores = calculate_final_scores_batch(batch['feature_matrix'])
+
+        results: List[Optional[Dict]] = [None] * len(institutional_configs)
+        for row, i in enumerate(batch['indices']):
+            results[i] = self.format_evaluation(
+                gemini_output, institutional_configs[i], batch['features'][i], scores[row]
+            )
+
+        return results
+
+    def score_candidates_batch(
+        self,
+        institutional_config: Dict,
+        candidate_profiles: List[CandidateFeatureProfile]
+    ) -> Dict:
+        """
+        Calcula el score de MULTIPLES candidatos contra una configuracion
+
+        Construye una matriz (n_candidatos x 18) y calcula todos los scores
+        heuristicos con una operacion vectorizada. No genera explicaciones;
+        usar format_evaluation() solo para los candidatos que se muestran.
+
+        Args:
+            institutional_config: Configuracion institucional (de la oferta)
+            candidate_profiles: Datos de los CVs ya compilados
+
+        Returns:
+            Dict con 'scores' y 'features', ambas listas alineadas con
+            candidate_profiles (None si el candidato no pudo evaluarse)
+        """
+        batch = extract_features_for_candidates(candidate_profiles, institutional_config)
+
+        for i, error in batch['errors'].items():
+            logger.warning(
+                f"Error evaluando candidato {candidate_profiles[i].candidate_id}: {error}"
+            )
+
+        scores: List[Optional[float]] = [None] * len(candidate_profiles)
+        for row, score in zip(batch['indices'], calculate_final_scores_batch(batch['feature_matrix'])):
+            scores[row] = score
+
+        return {'scores': scores, 'features': batch['features']}
+
+    def format_evaluation(
+        self,
+        gemini_output: Dict,
+        institutional_config: Dict,
+        features: Dict,
+        heuristic_score: float
+    ) -> Dict:
+        """
+        Construye el resultado de evaluacion (clasificacion, explicacion y
+        detalle de matching) a partir de los features y el score calculado.
+        """
+        extractor = FeatureExtractor()
+
         # Clasificar
         classification = extractor.classify(
             heuristic_score,
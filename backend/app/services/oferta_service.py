@@ -8,6 +8,11 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, date
 
 from app.db.client import supabase
+from app.db import pagination
+from app.db.batch_queries import IN_CHUNK_SIZE
+from app.scoring.feature_engineering import get_offer_profile_cache
+from app.services.skill_index_service import get_skill_index_service
+from app.services.recommendation_matrix_service import get_recommendation_matrix_service
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -74,6 +79,8 @@ class OfertaService:
 
             if response.data:
                 logger.info(f"Oferta creada: {response.data[0]['id']}")
+                get_skill_index_service().index_offer(response.data[0])
+                get_recommendation_matrix_service().mark_offer_dirty(response.data[0]['id'])
                 return self._enrich_oferta(response.data[0])
 
             raise ValueError("No se pudo crear la oferta")
@@ -122,8 +129,13 @@ class OfertaService:
                 .eq("id", oferta_id) \
                 .execute()
 
+            # Los requisitos compilados de la version anterior ya no son validos
+            get_offer_profile_cache().invalidate(oferta_id)
+
             if response.data:
                 logger.info(f"Oferta actualizada: {oferta_id}")
+                get_skill_index_service().index_offer(response.data[0])
+                get_recommendation_matrix_service().mark_offer_dirty(response.data[0]['id'])
                 return self._enrich_oferta(response.data[0])
 
             raise ValueError("No se pudo actualizar la oferta")
@@ -167,28 +179,34 @@ class OfertaService:
         sector: str = None,
         include_expired: bool = False,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        count: str = 'estimated'
     ) -> Dict:
         """
-        Lista ofertas con filtros.
+        Lista ofertas con filtros, paginadas por cursor sobre (created_at, id).
 
         Args:
             tipo: Filtrar por tipo ('pasantia' o 'empleo')
             is_active: Filtrar por estado activo
             sector: Filtrar por sector
             include_expired: Incluir ofertas expiradas
-            page: Numero de pagina
+            page: Numero de pagina (solo sin cursor; compatibilidad)
             page_size: Tamano de pagina
+            cursor: Cursor devuelto como next_cursor por la pagina anterior
+            count: Conteo del total: 'exact', 'estimated' o 'none'
 
         Returns:
-            Dict con ofertas y metadata de paginacion
+            Dict con ofertas y metadata de paginacion (next_cursor, has_more)
         """
         if not supabase:
             raise ValueError("Base de datos no configurada")
 
+        count_mode = pagination.count_option(count)
+
         try:
             query = supabase.table("convocatorias_laborales") \
-                .select("*, institutional_profiles(institution_name, sector)", count="exact")
+                .select("*, institutional_profiles(institution_name, sector)", count=count_mode)
 
             # Aplicar filtros
             if tipo:
@@ -201,21 +219,20 @@ class OfertaService:
                 today = date.today().isoformat()
                 query = query.or_(f"fecha_cierre.is.null,fecha_cierre.gte.{today}")
 
-            # Ordenar por fecha de creacion
-            query = query.order("created_at", desc=True)
-
-            # Paginacion
-            offset = (page - 1) * page_size
-            query = query.range(offset, offset + page_size - 1)
+            # Ordenar por fecha de creacion (keyset)
+            query = pagination.apply_keyset(
+                query, page_size, cursor=cursor, offset=(page - 1) * page_size
+            )
 
             response = query.execute()
+            rows, next_cursor = pagination.split_page(response.data or [], page_size)
 
             # Filtrar por sector si se especifica (ya que es un campo del perfil institucional)
-            ofertas = response.data or []
+            ofertas = rows
             if sector:
                 ofertas = [
                     o for o in ofertas
-                    if o.get('institutional_profiles', {}).get('sector') == sector
+                    if (o.get('institutional_profiles') or {}).get('sector') == sector
                 ]
 
             # Enriquecer ofertas
@@ -223,15 +240,50 @@ class OfertaService:
 
             return {
                 'ofertas': ofertas_enriched,
-                'total': response.count or len(ofertas_enriched),
+                'total': response.count,
                 'page': page,
-                'page_size': page_size
+                'page_size': page_size,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
             }
 
         except Exception as e:
             logger.error(f"Error listando ofertas: {e}")
             raise
 
+    def list_open_ofertas(self, oferta_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Lista todas las ofertas activas y vigentes, sin paginar
+        (matriz de recomendaciones: recalculo y lectura de una fila).
+
+        Args:
+            oferta_ids: Limitar a estas ofertas (opcional)
+
+        Returns:
+            Lista de ofertas enriquecidas
+        """
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        today = date.today().isoformat()
+
+        def open_query():
+            return supabase.table("convocatorias_laborales") \
+                .select("*, institutional_profiles(institution_name, sector)") \
+                .eq("is_active", True) \
+                .or_(f"fecha_cierre.is.null,fecha_cierre.gte.{today}")
+
+        if oferta_ids is None:
+            rows = open_query().execute().data or []
+        else:
+            # Los ids van en la URL: trozos acotados
+            ids = list(dict.fromkeys(oferta_ids))
+            rows = []
+            for start in range(0, len(ids), IN_CHUNK_SIZE):
+                rows.extend(open_query().in_("id", ids[start:start + IN_CHUNK_SIZE]).execute().data or [])
+
+        return [self._enrich_oferta(o) for o in rows]
+
     def delete_oferta(self, oferta_id: str) -> bool:
         """
         Desactiva una oferta (soft delete).
@@ -254,6 +306,9 @@ class OfertaService:
                 .eq("id", oferta_id) \
                 .execute()
 
+            get_offer_profile_cache().invalidate(oferta_id)
+            get_skill_index_service().remove_offer(oferta_id)
+
             if response.data:
                 logger.info(f"Oferta desactivada: {oferta_id}")
                 return True
@@ -286,8 +341,12 @@ class OfertaService:
                 .eq("id", oferta_id) \
                 .execute()
 
+            get_offer_profile_cache().invalidate(oferta_id)
+
             if response.data:
                 logger.info(f"Oferta reactivada: {oferta_id}")
+                get_skill_index_service().index_offer(response.data[0])
+                get_recommendation_matrix_service().mark_offer_dirty(response.data[0]['id'])
                 return self._enrich_oferta(response.data[0])
 
             raise ValueError("Oferta no encontrada")
@@ -324,7 +383,8 @@ class OfertaService:
             tipo=tipo,
             is_active=True,
             include_expired=False,
-            page_size=top_n
+            page_size=top_n,
+            count='none'
         )
 
         return result['ofertas']
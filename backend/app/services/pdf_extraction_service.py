@@ -0,0 +1,193 @@
+"""
+PDF Extraction Service
+Extraccion de texto de PDFs en un pool de procesos
+
+pdfplumber es CPU-bound y mantiene el GIL: en un thread del event loop un
+CV de varias paginas frena todas las requests del worker. Aqui el parsing
+corre en procesos separados y recibe los bytes del PDF directamente.
+
+- Documentos de mas de PDF_PARALLEL_MIN_PAGES paginas se reparten en
+  bloques de PDF_PAGES_PER_TASK paginas entre los procesos del pool
+- Se leen como maximo PDF_MAX_PAGES paginas y PDF_TIMEOUT_SECONDS por documento
+- Como maximo PDF_WORKERS * IN_FLIGHT_PER_WORKER documentos entran al pool a
+  la vez; el resto espera su turno fuera del pool y su timeout empieza al
+  entrar (una importacion de 500 CVs no agota el timeout en la cola)
+"""
+
+import asyncio
+import io
+import logging
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import pdfplumber
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Documentos en el pool por proceso worker (uno procesando y uno esperando)
+IN_FLIGHT_PER_WORKER = 2
+
+
+def extract_pdf_pages(pdf_bytes: bytes, start: int, stop: int) -> Tuple[List[str], int]:
+    """
+    Extrae el texto de las paginas [start, stop) (se ejecuta en el proceso worker).
+
+    Args:
+        pdf_bytes: Contenido del PDF
+        start: Primera pagina (base 0)
+        stop: Pagina final (exclusiva)
+
+    Returns:
+        (textos de las paginas con texto, total de paginas del documento)
+
+    Raises:
+        ValueError: Si el PDF es invalido
+    """
+    try:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            total = len(pdf.pages)
+            texts = []
+            for page in pdf.pages[start:stop]:
+                page_text = page.extract_text()
+                if page_text:
+                    texts.append(page_text)
+                # Libera el layout cacheado de la pagina (documentos largos)
+                page.flush_cache()
+    except Exception as e:
+        raise ValueError(f"PDF invalido: {str(e)}")
+    return texts, total
+
+
+def join_pages(pages: List[str]) -> str:
+    """
+    Une el texto de las paginas (una por bloque, con salto final).
+
+    Raises:
+        ValueError: Si no hay texto (p. ej. PDF escaneado)
+    """
+    text = "\n".join(pages)
+    if not text.strip():
+        raise ValueError("No se pudo extraer texto del PDF")
+    return text + "\n"
+
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes, max_pages: Optional[int] = None) -> str:
+    """
+    Extrae el texto de un PDF en el proceso actual (scripts y tests).
+
+    Args:
+        pdf_bytes: Contenido del PDF
+        max_pages: Maximo de paginas a leer (por defecto PDF_MAX_PAGES)
+
+    Returns:
+        Texto de las paginas leidas
+    """
+    max_pages = max_pages or settings.PDF_MAX_PAGES
+    pages, _ = extract_pdf_pages(pdf_bytes, 0, max_pages)
+    return join_pages(pages)
+
+
+class PDFExtractionService:
+    """
+    Servicio de extraccion de texto de PDFs.
+
+    Implementa patron Singleton; el pool de procesos se crea al primer uso.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._executor = None
+            cls._instance._slots = weakref.WeakKeyDictionary()
+        return cls._instance
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Semaforo de documentos en el pool (uno por event loop)"""
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = asyncio.Semaphore(settings.PDF_WORKERS * IN_FLIGHT_PER_WORKER)
+            self._slots[loop] = slots
+        return slots
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+            logger.info(f"Pool de extraccion PDF: {settings.PDF_WORKERS} procesos")
+        return self._executor
+
+    async def extract_text(self, pdf_bytes: bytes) -> str:
+        """
+        Extrae el texto de un PDF sin bloquear el event loop.
+
+        El primer bloque de paginas tambien informa el total; si el documento
+        es largo, el resto de bloques se procesa en paralelo. El timeout
+        cuenta desde que el documento obtiene lugar en el pool.
+
+        Args:
+            pdf_bytes: Contenido del PDF
+
+        Returns:
+            Texto del PDF (hasta PDF_MAX_PAGES paginas)
+
+        Raises:
+            ValueError: Si el PDF es invalido, no tiene texto o excede el tiempo
+        """
+        try:
+            async with self._get_slots():
+                return await asyncio.wait_for(
+                    self._extract_pages(pdf_bytes), timeout=settings.PDF_TIMEOUT_SECONDS
+                )
+        except asyncio.TimeoutError:
+            raise ValueError(
+                f"La extraccion del PDF excedio {settings.PDF_TIMEOUT_SECONDS:g} segundos"
+            )
+
+    async def _extract_pages(self, pdf_bytes: bytes) -> str:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        max_pages = settings.PDF_MAX_PAGES
+        first_stop = min(settings.PDF_PARALLEL_MIN_PAGES, max_pages)
+
+        pages, total = await loop.run_in_executor(
+            executor, extract_pdf_pages, pdf_bytes, 0, first_stop
+        )
+
+        last = min(total, max_pages)
+        if total > max_pages:
+            logger.info(f"PDF de {total} paginas: se leen las primeras {max_pages}")
+
+        if last > first_stop:
+            step = settings.PDF_PAGES_PER_TASK
+            chunks = await asyncio.gather(*[
+                loop.run_in_executor(
+                    executor, extract_pdf_pages, pdf_bytes, start, min(start + step, last)
+                )
+                for start in range(first_stop, last, step)
+            ])
+            for chunk_pages, _ in chunks:
+                pages.extend(chunk_pages)
+
+        return join_pages(pages)
+
+    def shutdown(self):
+        """Libera el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pdf_extraction_service_instance: Optional[PDFExtractionService] = None
+
+
+def get_pdf_extraction_service() -> PDFExtractionService:
+    """Obtiene la instancia del servicio de extraccion PDF"""
+    global _pdf_extraction_service_instance
+    if _pdf_extraction_service_instance is None:
+        _pdf_extraction_service_instance = PDFExtractionService()
+    return _pdf_extraction_service_instance
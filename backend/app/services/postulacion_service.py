@@ -8,13 +8,16 @@ Diferencia con recomendaciones:
 """
 
 import logging
+import threading
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from app.db.analytics_repository import fetch_postulaciones_stats
 from app.db.client import supabase
 from app.services.profile_service import get_profile_service
 from app.services.oferta_service import get_oferta_service
 from app.services.ml_integration_service import get_ml_service
+from app.scoring.feature_engineering import CandidateFeatureProfile
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +31,20 @@ class PostulacionService:
     - Listar postulaciones del usuario
     - Listar ofertas disponibles para el usuario según su rol
     - Respeta configuración propia de la oferta (weights/thresholds/requirements de v3)
+    - Estadísticas de postulaciones por oferta (con cache)
     """
 
     _instance = None
 
+    # Cache de estadisticas por oferta (invalidado en _save_postulacion).
+    # Cada invalidacion incrementa la generacion: una lectura que empezo
+    # antes de invalidar no guarda su resultado.
+    _stats_cache: Optional[Dict[str, Dict]] = None
+    _stats_cache_timestamp = None
+    _stats_generation = 0
+    _stats_cache_ttl = timedelta(minutes=5)
+    _stats_lock = threading.Lock()
+
     FEATURE_NAMES = {
         'hard_skills_score': 'Habilidades tecnicas',
         'soft_skills_score': 'Habilidades blandas',
@@ -97,13 +110,14 @@ class PostulacionService:
         if user_role == 'titulado' and oferta_tipo != 'empleo':
             raise ValueError("Los titulados solo pueden postular a empleos")
 
-        # Obtener datos del perfil para ML
-        gemini_output = profile_service.get_profile_for_recommendations(user_id)
+        # Obtener datos del perfil para ML (sin volver a leer la fila)
+        gemini_output = profile_service.build_gemini_output(profile)
         if not gemini_output:
             raise ValueError("No se pudo obtener los datos del perfil para evaluación")
 
         # Evaluar CV contra la oferta
-        eval_result = self._evaluate_oferta(gemini_output, oferta)
+        candidate_features = profile_service.get_candidate_features(user_id, profile)
+        eval_result = self._evaluate_oferta(gemini_output, oferta, candidate_features)
 
         # Guardar postulación
         saved = self._save_postulacion(user_id, oferta_id, eval_result)
@@ -113,7 +127,12 @@ class PostulacionService:
             'oferta': oferta
         }
 
-    def _evaluate_oferta(self, gemini_output: Dict, oferta: Dict) -> Dict:
+    def _evaluate_oferta(
+        self,
+        gemini_output: Dict,
+        oferta: Dict,
+        candidate_features: Optional[CandidateFeatureProfile] = None
+    ) -> Dict:
         """
         Evalúa un CV contra una oferta.
 
@@ -125,6 +144,7 @@ class PostulacionService:
         Args:
             gemini_output: Perfil extraído del CV
             oferta: Datos de la oferta
+            candidate_features: Datos del CV ya compilados (opcional)
 
         Returns:
             Dict con resultado de evaluación
@@ -160,7 +180,7 @@ class PostulacionService:
                 **oferta['requisitos_especificos']
             }
 
-        result = ml_service.evaluate_cv(gemini_output, profile)
+        result = ml_service.evaluate_cv(gemini_output, profile, candidate_features)
 
         return {
             'match_score': result['match_score'],
@@ -232,6 +252,8 @@ class PostulacionService:
                 .upsert(data, on_conflict="usuario_id,oferta_id") \
                 .execute()
 
+            self.invalidate_stats_cache()
+
             if response.data:
                 row = response.data[0]
                 return {
@@ -248,6 +270,55 @@ class PostulacionService:
             logger.error(f"Error guardando postulacion {oferta_id}: {e}")
             return eval_result
 
+    def get_stats_por_oferta(self) -> Dict[str, Dict]:
+        """
+        Estadísticas de postulaciones agrupadas por oferta.
+
+        Lee la vista postulaciones_stats_por_oferta (migration v9) con
+        fetch_postulaciones_stats y la guarda en cache hasta la siguiente
+        postulación (o como máximo _stats_cache_ttl, por escrituras de otros
+        procesos).
+
+        Returns:
+            Dict {oferta_id: {total, apto, considerado, no_apto,
+            mejor_puntaje, promedio_puntaje}}
+        """
+        with self._stats_lock:
+            if self._stats_cache is not None and self._stats_cache_timestamp \
+                    and datetime.utcnow() - self._stats_cache_timestamp < self._stats_cache_ttl:
+                return self._stats_cache
+            generation = PostulacionService._stats_generation
+
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        stats = {
+            oferta_id: {
+                'total': row['total'],
+                'apto': row['apto'],
+                'considerado': row['considerado'],
+                'no_apto': row['no_apto'],
+                'mejor_puntaje': round(row['max_score'] * 100) if row['max_score'] is not None else None,
+                'promedio_puntaje': round(row['avg_score'] * 100) if row['avg_score'] is not None else None,
+            }
+            for oferta_id, row in fetch_postulaciones_stats(supabase).items()
+        }
+
+        with self._stats_lock:
+            # Si se invalido durante la lectura, el resultado puede estar viejo
+            if PostulacionService._stats_generation == generation:
+                PostulacionService._stats_cache = stats
+                PostulacionService._stats_cache_timestamp = datetime.utcnow()
+
+        return stats
+
+    def invalidate_stats_cache(self):
+        """Invalida el cache de estadísticas por oferta"""
+        with self._stats_lock:
+            PostulacionService._stats_generation += 1
+            PostulacionService._stats_cache = None
+            PostulacionService._stats_cache_timestamp = None
+
     def get_my_postulaciones(self, user_id: str) -> List[Dict]:
         """
         Obtiene todas las postulaciones del usuario con datos de la oferta.
@@ -315,7 +386,8 @@ class PostulacionService:
             tipo=tipo,
             is_active=True,
             include_expired=False,
-            page_size=100
+            page_size=100,
+            count='none'
         )
 
         return result['ofertas']
@@ -5,16 +5,25 @@ Servicio para gestionar perfiles profesionales de usuarios
 
 import logging
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from app.db.client import supabase
 from app.services.ml_integration_service import get_ml_service
+from app.scoring.feature_engineering import (
+    CandidateFeatureProfile,
+    get_candidate_profile_cache
+)
+from app.services.skill_index_service import get_skill_index_service
+from app.services.recommendation_matrix_service import get_recommendation_matrix_service
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Filas por upsert en escrituras masivas de perfiles
+UPSERT_BATCH_SIZE = 200
+
 
 class ProfileService:
     """
@@ -151,6 +160,36 @@ class ProfileService:
         # Asegurar que existe el perfil
         self.get_or_create_profile(user_id)
 
+        update_data = self.build_cv_update(gemini_output, cv_filename)
+
+        try:
+            response = supabase.table("perfiles_profesionales") \
+                .update(update_data) \
+                .eq("usuario_id", user_id) \
+                .execute()
+
+            if response.data:
+                logger.info(f"Perfil actualizado para usuario {user_id}")
+                self._warm_candidate_features(user_id, response.data[0])
+                return response.data[0]
+
+            raise ValueError("No se pudo actualizar el perfil")
+
+        except Exception as e:
+            logger.error(f"Error actualizando perfil: {e}")
+            raise
+
+    def build_cv_update(self, gemini_output: Dict, cv_filename: str = None) -> Dict:
+        """
+        Columnas de perfiles_profesionales a escribir para un CV extraido.
+
+        Args:
+            gemini_output: Salida de Gemini con datos del CV
+            cv_filename: Nombre del archivo CV
+
+        Returns:
+            Dict con los campos del perfil y la completitud calculada
+        """
         # Extraer y normalizar datos
         hard_skills = gemini_output.get('hard_skills', [])
         soft_skills = gemini_output.get('soft_skills', [])
@@ -213,21 +252,47 @@ class ProfileService:
         update_data['completeness_score'] = completeness['score']
         update_data['is_complete'] = completeness['is_complete']
 
-        try:
-            response = supabase.table("perfiles_profesionales") \
-                .update(update_data) \
-                .eq("usuario_id", user_id) \
-                .execute()
+        return update_data
 
-            if response.data:
-                logger.info(f"Perfil actualizado para usuario {user_id}")
-                return response.data[0]
+    def upsert_profiles_from_cv(
+        self,
+        items: List[Tuple[str, Dict, Optional[str]]],
+        batch_size: int = UPSERT_BATCH_SIZE
+    ) -> List[Dict]:
+        """
+        Escribe los perfiles de varios usuarios desde sus CVs con upserts
+        agrupados (importacion masiva) en lugar de 2-3 consultas por usuario.
 
-            raise ValueError("No se pudo actualizar el perfil")
+        Args:
+            items: Tuplas (user_id, gemini_output, cv_filename)
+            batch_size: Filas por upsert
 
-        except Exception as e:
-            logger.error(f"Error actualizando perfil: {e}")
-            raise
+        Returns:
+            Lista de perfiles escritos
+        """
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        # Un upsert masivo de PostgREST usa las mismas columnas en todas las
+        # filas (las ausentes quedarian en null): se agrupa por columnas
+        groups: Dict[Tuple[str, ...], List[Dict]] = {}
+        for user_id, gemini_output, cv_filename in items:
+            row = {'usuario_id': user_id, **self.build_cv_update(gemini_output, cv_filename)}
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        saved = []
+        for rows in groups.values():
+            for start in range(0, len(rows), batch_size):
+                response = supabase.table("perfiles_profesionales") \
+                    .upsert(rows[start:start + batch_size], on_conflict="usuario_id") \
+                    .execute()
+                saved.extend(response.data or [])
+
+        for profile in saved:
+            self._warm_candidate_features(profile['usuario_id'], profile)
+
+        logger.info(f"Perfiles escritos desde CV (upsert masivo): {len(saved)}")
+        return saved
 
     def update_profile_manual(
         self,
@@ -289,6 +354,7 @@ class ProfileService:
 
             if response.data:
                 logger.info(f"Perfil actualizado manualmente: {user_id}")
+                self._warm_candidate_features(user_id, response.data[0])
                 return response.data[0]
 
             raise ValueError("No se pudo actualizar el perfil")
@@ -496,6 +562,18 @@ class ProfileService:
         if not profile:
             return None
 
+        return self.build_gemini_output(profile)
+
+    def build_gemini_output(self, profile: Dict) -> Dict:
+        """
+        Construye el gemini_output para ML desde una fila de perfil ya leida.
+
+        Args:
+            profile: Fila de perfiles_profesionales
+
+        Returns:
+            Dict con formato de gemini_output para ML
+        """
         # Si tiene extraccion de Gemini, usarla directamente
         gemini_extraction = profile.get('gemini_extraction', {})
         if gemini_extraction:
@@ -513,6 +591,59 @@ class ProfileService:
             }
         }
 
+    def get_candidate_features(
+        self,
+        user_id: str,
+        profile: Dict
+    ) -> CandidateFeatureProfile:
+        """
+        Obtiene los datos del CV compilados para el scoring, reutilizando
+        el cache mientras el perfil no cambie (updated_at).
+
+        Args:
+            user_id: ID del usuario
+            profile: Fila de perfiles_profesionales ya leida
+
+        Returns:
+            CandidateFeatureProfile del usuario
+        """
+        return get_candidate_profile_cache().get(
+            user_id,
+            profile.get('updated_at'),
+            self.build_gemini_output(profile)
+        )
+
+    def _warm_candidate_features(self, user_id: str, profile: Dict):
+        """
+        Recompila los datos del CV tras escribir el perfil, para que la
+        siguiente evaluacion no pague la compilacion, actualiza el
+        indice de skills y encola el recalculo de su fila en la matriz
+        de recomendaciones.
+        """
+        index = get_skill_index_service()
+        if profile.get('is_complete'):
+            index.index_candidate(
+                user_id,
+                profile.get('hard_skills'),
+                profile.get('soft_skills'),
+                profile.get('updated_at')
+            )
+        else:
+            index.remove_candidate(user_id)
+
+        if profile.get('is_complete'):
+            get_recommendation_matrix_service().mark_user_dirty(user_id)
+
+        try:
+            get_candidate_profile_cache().put(
+                user_id,
+                profile.get('updated_at'),
+                self.build_gemini_output(profile)
+            )
+        except Exception as e:
+            get_candidate_profile_cache().invalidate(user_id)
+            logger.warning(f"No se pudo precompilar el perfil {user_id}: {e}")
+
     def delete_profile(self, user_id: str) -> bool:
         """
         Elimina el perfil de un usuario (y sus datos de CV).
@@ -547,6 +678,9 @@ class ProfileService:
                 .eq("usuario_id", user_id) \
                 .execute()
 
+            get_candidate_profile_cache().invalidate(user_id)
+            get_skill_index_service().remove_candidate(user_id)
+
             if response.data:
                 logger.info(f"Perfil limpiado para usuario {user_id}")
                 return True
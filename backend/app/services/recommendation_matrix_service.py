@@ -0,0 +1,518 @@
+"""
+Recommendation Matrix Service
+Matriz precalculada de scores candidato x oferta abierta (tabla match_scores)
+
+GET /api/recommendations lee la fila del candidato en lugar de evaluar las
+ofertas en cada request. La matriz se mantiene en segundo plano:
+
+    perfil actualizado                  -> se recalcula la fila del candidato
+    oferta creada, editada o reactivada -> se recalcula la columna de la oferta
+
+Los cambios se acumulan en conjuntos "sucios" (un id queda una sola vez
+aunque cambie varias veces antes de procesarse) y un grupo de workers los
+recalcula por lotes: una fila evalua en una sola llamada vectorizada las
+ofertas abiertas que pasan la primera etapa del indice de skills y una
+columna recorre los perfiles completos por paginas.
+
+Cada celda guarda la version (updated_at) del perfil y de la oferta con que
+se calculo. Al leer, una fila desactualizada se encola para recalculo y la
+respuesta informa su antiguedad. Los conjuntos sucios viven en memoria: tras
+un reinicio esa misma comparacion de versiones vuelve a encolar lo pendiente.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.db.batch_queries import IN_CHUNK_SIZE, fetch_by_ids
+from app.db.client import supabase
+
+logger = logging.getLogger(__name__)
+
+MATRIX_TABLE = "match_scores"
+
+CELL_COLUMNS = (
+    "usuario_id, oferta_id, match_score, clasificacion, scores_detalle, fortalezas,"
+    " debilidades, match_details, perfil_version, oferta_version, computed_at"
+)
+
+# Maximo de celdas por upsert
+UPSERT_CHUNK_SIZE = 500
+
+# Espera de un worker sin trabajo (o tras un error) antes de volver a mirar
+IDLE_WAIT_SECONDS = 1.0
+
+
+def _segments(ofertas: List[Dict]) -> Dict[tuple, List[Dict]]:
+    """Agrupa ofertas por (tipo, sector), los filtros de get_user_scores."""
+    groups: Dict[tuple, List[Dict]] = {}
+    for oferta in ofertas:
+        groups.setdefault((oferta.get('tipo'), oferta.get('sector')), []).append(oferta)
+    return groups
+
+
+class RecommendationMatrixService:
+    """
+    Servicio de la matriz precalculada de recomendaciones.
+
+    Implementa patron Singleton. Los mark_* se pueden llamar desde cualquier
+    thread (los servicios de perfil y ofertas corren en el pool de run_db).
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._reset()
+        return cls._instance
+
+    def _reset(self):
+        """Inicializa los conjuntos sucios y las estadisticas"""
+        self._lock = threading.Lock()
+
+        # id -> instante en que se marco (el mas antiguo pendiente)
+        self._dirty_users: Dict[str, float] = {}
+        self._dirty_offers: Dict[str, float] = {}
+        self._in_progress_users: Set[str] = set()
+        self._in_progress_offers: Set[str] = set()
+
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._stats = {
+            'rows_recomputed': 0,
+            'columns_recomputed': 0,
+            'cells_written': 0,
+            'errors': 0,
+            'last_batch_seconds': None,
+        }
+
+    # =========================================================================
+    # CONJUNTOS SUCIOS
+    # =========================================================================
+
+    def mark_user_dirty(self, user_id: str):
+        """Encola el recalculo de la fila de un candidato"""
+        self._mark(self._dirty_users, user_id)
+
+    def mark_offer_dirty(self, oferta_id: str):
+        """Encola el recalculo de la columna de una oferta"""
+        self._mark(self._dirty_offers, oferta_id)
+
+    def _mark(self, dirty: Dict[str, float], item_id: Optional[str]):
+        if not item_id:
+            return
+        with self._lock:
+            dirty.setdefault(item_id, time.time())
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_batch(self, dirty: Dict[str, float], in_progress: Set[str], size: int) -> List[str]:
+        """Saca hasta size ids (los mas antiguos) que no se esten recalculando"""
+        with self._lock:
+            ids = [item_id for item_id in sorted(dirty, key=dirty.get) if item_id not in in_progress][:size]
+            for item_id in ids:
+                del dirty[item_id]
+                in_progress.add(item_id)
+            return ids
+
+    def _finish_batch(self, dirty: Dict[str, float], in_progress: Set[str], ids: List[str], failed: bool):
+        with self._lock:
+            in_progress.difference_update(ids)
+            if failed:
+                for item_id in ids:
+                    dirty.setdefault(item_id, time.time())
+
+    def is_user_pending(self, user_id: str) -> bool:
+        """Hay un recalculo pendiente o en curso para la fila del candidato"""
+        with self._lock:
+            return user_id in self._dirty_users or user_id in self._in_progress_users
+
+    # =========================================================================
+    # WORKERS
+    # =========================================================================
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._workers)
+
+    async def start(self):
+        """Inicia los workers en el event loop actual"""
+        if self.is_running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"matrix-worker-{i}")
+            for i in range(settings.RECOMMENDATION_MATRIX_WORKERS)
+        ]
+        logger.info(f"Workers de la matriz de recomendaciones iniciados: {len(self._workers)}")
+
+    async def stop(self):
+        """Detiene los workers (lo pendiente se recupera al leer)"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+        self._wakeup = None
+
+    async def _worker(self, index: int):
+        while True:
+            processed = await self.run_pending_batch()
+            if processed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=IDLE_WAIT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            elif processed is False:
+                await asyncio.sleep(IDLE_WAIT_SECONDS)
+
+    async def run_pending_batch(self) -> Optional[bool]:
+        """
+        Procesa un lote de la cola: columnas primero (una oferta nueva afecta a
+        todos los candidatos), despues filas.
+
+        Returns:
+            None si no habia trabajo, True si el lote se proceso, False si fallo
+            (los ids vuelven a la cola)
+        """
+        queues = (
+            (self._dirty_offers, self._in_progress_offers, self.recompute_offers, "columnas"),
+            (self._dirty_users, self._in_progress_users, self.recompute_users, "filas"),
+        )
+        for dirty, in_progress, recompute, label in queues:
+            ids = self._take_batch(dirty, in_progress, settings.RECOMMENDATION_MATRIX_BATCH_SIZE)
+            if not ids:
+                continue
+
+            start = time.perf_counter()
+            failed = True
+            try:
+                await asyncio.to_thread(recompute, ids)
+                failed = False
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats['errors'] += 1
+                logger.error(f"Error recalculando {len(ids)} {label} de la matriz: {e}")
+            finally:
+                self._finish_batch(dirty, in_progress, ids, failed)
+
+            self._stats['last_batch_seconds'] = round(time.perf_counter() - start, 3)
+            return not failed
+        return None
+
+    # =========================================================================
+    # RECALCULO
+    # =========================================================================
+
+    def recompute_users(self, user_ids: Iterable[str]) -> int:
+        """
+        Recalcula las filas de varios candidatos.
+
+        Primera etapa (skill_index_service.select_ofertas): de las ofertas
+        abiertas de cada tipo y sector solo pasan al modelo las que comparten
+        mas skills con el candidato (mas las que no exigen skills). Las celdas
+        que la fila ya no incluye se borran.
+
+        Args:
+            user_ids: IDs de usuario
+
+        Returns:
+            Numero de celdas escritas
+        """
+        from app.services.oferta_service import get_oferta_service
+        from app.services.profile_service import get_profile_service
+        from app.services.recommendation_service import get_recommendation_service
+        from app.services.skill_index_service import get_skill_index_service
+
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        profile_service = get_profile_service()
+        recommendation_service = get_recommendation_service()
+        skill_index = get_skill_index_service()
+        top_k = recommendation_service.retrieval_k(recommendation_service.MAX_TOP_N)
+
+        ofertas = get_oferta_service().list_open_ofertas()
+        profiles = fetch_by_ids(
+            supabase, "perfiles_profesionales", "usuario_id", user_ids,
+            recommendation_service.PROFILE_COLUMNS
+        )
+
+        computed_at = datetime.utcnow().isoformat()
+        cells = []
+        for user_id, profile in profiles.items():
+            if not profile.get('is_complete') or not ofertas:
+                continue
+
+            usuario = profile.get('usuarios') or {}
+            candidate_info = {
+                'carrera': profile.get('carrera'),
+                'semestre_actual': profile.get('semestre_actual'),
+                'user_role': usuario.get('rol'),
+            }
+            features = profile_service.get_candidate_features(user_id, profile)
+            # El recorte top-K se hace por tipo y sector: get_user_scores filtra
+            # por ellos al leer, y un top-K global podria dejar la fila sin
+            # ninguna oferta del tipo pedido
+            keep = set()
+            for segment in _segments(ofertas).values():
+                keep.update(id(o) for o in skill_index.select_ofertas(
+                    features.hard_skills_normalized,
+                    features.soft_skill_categories.keys(),
+                    segment,
+                    top_k=top_k
+                ))
+            selected = [o for o in ofertas if id(o) in keep]
+            results = recommendation_service._evaluate_ofertas(
+                profile_service.build_gemini_output(profile),
+                selected,
+                candidate_info,
+                features
+            )
+            cells.extend(
+                self._cell(user_id, profile, oferta, result, computed_at)
+                for oferta, result in zip(selected, results) if result
+            )
+
+        self._save_cells(cells)
+        self._delete_cells_before(list(profiles), computed_at)
+        self._stats['rows_recomputed'] += len(profiles)
+        return len(cells)
+
+    def recompute_offers(self, oferta_ids: Iterable[str]) -> int:
+        """
+        Recalcula las columnas de varias ofertas contra todos los perfiles completos.
+
+        Los perfiles se leen por paginas una sola vez para todo el lote de
+        ofertas; cada pagina se evalua con una llamada vectorizada por oferta.
+        Las ofertas cerradas o inactivas se ignoran (la lectura las filtra).
+
+        Args:
+            oferta_ids: IDs de ofertas
+
+        Returns:
+            Numero de celdas escritas
+        """
+        from app.services.ml_integration_service import get_ml_service
+        from app.services.oferta_service import get_oferta_service
+        from app.services.profile_service import get_profile_service
+        from app.services.recommendation_service import get_recommendation_service
+
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        ml_service = get_ml_service()
+        profile_service = get_profile_service()
+        recommendation_service = get_recommendation_service()
+
+        configs = []
+        for oferta in get_oferta_service().list_open_ofertas(list(oferta_ids)):
+            try:
+                configs.append((oferta, recommendation_service._create_profile_from_oferta(oferta)))
+            except Exception as e:
+                logger.warning(f"Error preparando oferta {oferta.get('id')} para la matriz: {e}")
+        if not configs:
+            return 0
+
+        written = 0
+        for page in recommendation_service._iter_complete_profiles(settings.RECOMMENDATION_MATRIX_PAGE_SIZE):
+            computed_at = datetime.utcnow().isoformat()
+            candidates = []
+            for row in page:
+                usuario = row.get('usuarios') or {}
+                candidates.append((
+                    row,
+                    {
+                        'carrera': row.get('carrera'),
+                        'semestre_actual': row.get('semestre_actual'),
+                        'user_role': usuario.get('rol'),
+                    },
+                    profile_service.get_candidate_features(row['usuario_id'], row)
+                ))
+
+            cells = []
+            for oferta, config in configs:
+                eligible = []
+                for row, candidate_info, features in candidates:
+                    eligibility = recommendation_service._check_eligibility(
+                        candidate_info, config['requirements']
+                    )
+                    if eligibility['eligible']:
+                        eligible.append((row, features))
+                    else:
+                        cells.append(self._cell(
+                            row['usuario_id'], row, oferta,
+                            recommendation_service._ineligible_result(eligibility['reason']),
+                            computed_at
+                        ))
+                if not eligible:
+                    continue
+
+                batch = ml_service.score_candidates_batch(config, [f for _, f in eligible])
+                for (row, _), score, features in zip(eligible, batch['scores'], batch['features']):
+                    if score is None:
+                        continue
+                    result = ml_service.format_evaluation(
+                        profile_service.build_gemini_output(row), config, features, score
+                    )
+                    cells.append(self._cell(
+                        row['usuario_id'], row, oferta,
+                        recommendation_service._evaluation_result(result),
+                        computed_at
+                    ))
+
+            self._save_cells(cells)
+            written += len(cells)
+
+        self._stats['columns_recomputed'] += len(configs)
+        return written
+
+    def _cell(self, user_id: str, profile: Dict, oferta: Dict, result: Dict, computed_at: str) -> Dict:
+        """Fila de match_scores con las versiones usadas en el calculo"""
+        return {
+            'usuario_id': user_id,
+            'oferta_id': oferta['id'],
+            'match_score': result['match_score'],
+            'clasificacion': result['clasificacion'],
+            'scores_detalle': result['scores_detalle'],
+            'fortalezas': result['fortalezas'],
+            'debilidades': result['debilidades'],
+            'match_details': result.get('match_details'),
+            'perfil_version': profile.get('updated_at'),
+            'oferta_version': oferta.get('updated_at'),
+            'computed_at': computed_at,
+        }
+
+    def _save_cells(self, cells: List[Dict]):
+        """Upserts agrupados (una request por UPSERT_CHUNK_SIZE celdas)"""
+        for start in range(0, len(cells), UPSERT_CHUNK_SIZE):
+            supabase.table(MATRIX_TABLE) \
+                .upsert(cells[start:start + UPSERT_CHUNK_SIZE], on_conflict="usuario_id,oferta_id") \
+                .execute()
+        self._stats['cells_written'] += len(cells)
+
+    def _delete_cells_before(self, user_ids: List[str], computed_at: str):
+        """
+        Borra las celdas de estas filas que el recalculo no reescribio
+        (ofertas descartadas por la primera etapa o perfiles incompletos).
+        """
+        for start in range(0, len(user_ids), IN_CHUNK_SIZE):
+            supabase.table(MATRIX_TABLE) \
+                .delete() \
+                .in_("usuario_id", user_ids[start:start + IN_CHUNK_SIZE]) \
+                .lt("computed_at", computed_at) \
+                .execute()
+
+    # =========================================================================
+    # LECTURA
+    # =========================================================================
+
+    def get_user_scores(
+        self,
+        user_id: str,
+        profile: Dict,
+        tipo: Optional[str] = None,
+        sector: Optional[str] = None
+    ) -> Dict:
+        """
+        Lee la fila precalculada de un candidato: sus celdas ordenadas por
+        score y las ofertas de esas celdas (por id), sin listar las ofertas
+        abiertas. Las ofertas cerradas o de otro tipo/sector se descartan.
+
+        Si la fila esta desactualizada (perfil u oferta cambiaron), se encola
+        su recalculo y se devuelve lo que hay. Las ofertas nuevas llegan a la
+        fila por el recalculo de su columna.
+
+        Args:
+            user_id: ID del usuario
+            profile: Perfil actual (su updated_at es la version vigente)
+            tipo: Tipo de oferta ('pasantia' o 'empleo'), None = todas
+            sector: Sector de la institucion, None = todos
+
+        Returns:
+            Dict con 'scores' (celdas con su 'oferta', por match_score desc),
+            'cells' (celdas leidas, 0 = fila sin calcular) y 'staleness'
+        """
+        from app.services.oferta_service import get_oferta_service
+
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        response = supabase.table(MATRIX_TABLE) \
+            .select(CELL_COLUMNS) \
+            .eq("usuario_id", user_id) \
+            .order("match_score", desc=True) \
+            .execute()
+        cells = response.data or []
+
+        ofertas = {
+            o['id']: o
+            for o in get_oferta_service().list_open_ofertas([c['oferta_id'] for c in cells])
+            if (tipo is None or o.get('tipo') == tipo) and (sector is None or o.get('sector') == sector)
+        }
+        scores = [dict(c, oferta=ofertas[c['oferta_id']]) for c in cells if c['oferta_id'] in ofertas]
+
+        perfil_stale = any(c.get('perfil_version') != profile.get('updated_at') for c in scores)
+        stale_ofertas = sum(
+            1 for c in scores if c.get('oferta_version') != c['oferta'].get('updated_at')
+        )
+
+        # Recalcular la fila cubre tanto el perfil como las ofertas que cambiaron
+        if perfil_stale or stale_ofertas:
+            self.mark_user_dirty(user_id)
+
+        computed = [c['computed_at'] for c in scores if c.get('computed_at')]
+
+        return {
+            'scores': scores,
+            'cells': len(cells),
+            'staleness': {
+                'computed_at': min(computed) if computed else None,
+                'stale': bool(perfil_stale or stale_ofertas),
+                'perfil_stale': perfil_stale,
+                'stale_ofertas': stale_ofertas,
+                'pending_recompute': self.is_user_pending(user_id),
+            },
+        }
+
+    def metrics(self) -> Dict:
+        """Tamanio de la cola y estadisticas de recalculo"""
+        with self._lock:
+            now = time.time()
+            oldest = min(list(self._dirty_users.values()) + list(self._dirty_offers.values()), default=None)
+            return {
+                'running': self.is_running,
+                'dirty_users': len(self._dirty_users),
+                'dirty_offers': len(self._dirty_offers),
+                'in_progress_users': len(self._in_progress_users),
+                'in_progress_offers': len(self._in_progress_offers),
+                'oldest_pending_seconds': round(now - oldest, 2) if oldest else None,
+                **self._stats,
+            }
+
+
+_recommendation_matrix_service_instance = None
+
+
+def get_recommendation_matrix_service() -> RecommendationMatrixService:
+    """
+    Obtiene la instancia singleton del servicio de la matriz de recomendaciones
+
+    Returns:
+        Instancia de RecommendationMatrixService
+    """
+    global _recommendation_matrix_service_instance
+    if _recommendation_matrix_service_instance is None:
+        _recommendation_matrix_service_instance = RecommendationMatrixService()
+    return _recommendation_matrix_service_instance
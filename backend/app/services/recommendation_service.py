@@ -3,15 +3,22 @@ Recommendation Service - Sistema de Recomendaciones v2
 Servicio para generar recomendaciones basadas en perfil guardado
 """
 
+import asyncio
+import heapq
+import itertools
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime
 
+from app.db.async_client import run_db
+from app.db.batch_queries import IN_CHUNK_SIZE
 from app.db.client import supabase
+from app.db import recommendations_repository
 from app.services.profile_service import get_profile_service
 from app.services.oferta_service import get_oferta_service
 from app.services.ml_integration_service import get_ml_service
-from app.scoring.feature_engineering import FeatureExtractor
+from app.services.skill_index_service import get_skill_index_service
+from app.services.recommendation_matrix_service import get_recommendation_matrix_service
+from app.scoring.feature_engineering import FeatureExtractor, CandidateFeatureProfile
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -43,6 +50,21 @@ class RecommendationService:
         'total_experience_years': 'Anos de experiencia'
     }
 
+    # Recuperacion en dos etapas (skill_index_service): ofertas con skills
+    # requeridos que pasan al modelo = max(top_n * factor, minimo). La fila de
+    # la matriz se calcula para el top_n maximo del endpoint.
+    RETRIEVAL_FACTOR = 5
+    RETRIEVAL_MIN_K = 50
+    MAX_TOP_N = 50
+
+    # Perfiles completos con los datos de evaluacion y elegibilidad
+    PROFILE_COLUMNS = (
+        "usuario_id, updated_at, is_complete, gemini_extraction, hard_skills, soft_skills,"
+        " languages, education_level, experience_years, completeness_score,"
+        " nombre_completo, email_contacto, telefono, carrera, semestre_actual,"
+        " usuarios(email, nombre_completo, rol)"
+    )
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -72,7 +94,6 @@ class RecommendationService:
             Dict con recomendaciones y metadata
         """
         profile_service = get_profile_service()
-        oferta_service = get_oferta_service()
         ml_service = get_ml_service()
 
         # Verificar que el modelo ML esta listo
@@ -108,77 +129,56 @@ class RecommendationService:
                 tipo = 'empleo'
             # admin/administrador: tipo queda None, obtiene todas las ofertas
 
-        # Obtener ofertas activas
-        ofertas_result = oferta_service.list_ofertas(
-            tipo=tipo,
-            is_active=True,
-            sector=sector,
-            include_expired=False,
-            page_size=100  # Maximo de ofertas a evaluar
-        )
+        # Scores precalculados (recommendation_matrix_service): la fila del
+        # candidato y sus ofertas se leen por id, sin listar ni evaluar ofertas.
+        # Solo se calcula en la request si se pide recalcular o si la fila
+        # todavia no existe.
+        matrix = get_recommendation_matrix_service()
+        if recalcular:
+            matrix.recompute_users([user_id])
 
-        ofertas = ofertas_result['ofertas']
+        row = matrix.get_user_scores(user_id, profile, tipo=tipo, sector=sector)
+        if not row['cells'] and not recalcular:
+            matrix.recompute_users([user_id])
+            row = matrix.get_user_scores(user_id, profile, tipo=tipo, sector=sector)
 
-        if not ofertas:
+        if not row['scores']:
             return {
                 'recomendaciones': [],
                 'total': 0,
                 'nuevas': 0,
-                'perfil_summary': self._get_profile_summary(profile, completeness)
+                'perfil_summary': self._get_profile_summary(profile, completeness),
+                'matriz': row['staleness']
             }
 
-        # Obtener perfil en formato Gemini para ML
-        gemini_output = profile_service.get_profile_for_recommendations(user_id)
-
-        # Si no hay recalculo, intentar obtener recomendaciones existentes
-        if not recalcular:
-            existing = self._get_existing_recommendations(user_id, [o['id'] for o in ofertas])
-            if existing and len(existing) >= min(top_n, len(ofertas)):
-                return self._format_recommendations_response(
-                    existing[:top_n],
-                    profile,
-                    completeness
-                )
-
-        # Datos de elegibilidad del candidato (carrera y semestre)
-        candidate_info = {
-            'carrera': profile.get('carrera'),
-            'semestre_actual': profile.get('semestre_actual'),
-            'user_role': user_role,
-        }
-
-        # Evaluar cada oferta
-        recommendations = []
-
-        for oferta in ofertas:
-            try:
-                result = self._evaluate_oferta(gemini_output, oferta, candidate_info)
-
-                if result:
-                    recommendations.append({
-                        'oferta_id': oferta['id'],
-                        'oferta': oferta,
-                        **result
-                    })
-
-            except Exception as e:
-                logger.warning(f"Error evaluando oferta {oferta['id']}: {e}")
-                continue
-
-        # Ordenar por score descendente
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-
-        # Tomar top N
-        top_recommendations = recommendations[:top_n]
+        top_recommendations = [
+            {
+                'oferta_id': cell['oferta_id'],
+                'oferta': cell['oferta'],
+                'match_score': cell['match_score'],
+                'clasificacion': cell['clasificacion'],
+                'scores_detalle': cell.get('scores_detalle') or {},
+                'fortalezas': cell.get('fortalezas') or [],
+                'debilidades': cell.get('debilidades') or [],
+                'match_details': cell.get('match_details'),
+            }
+            for cell in row['scores'][:top_n]
+        ]
 
-        # Guardar recomendaciones
-        saved = self._save_recommendations(user_id, top_recommendations)
+        # Historial (recomendaciones): solo se escriben las nuevas o las que cambiaron
+        saved = self._sync_recommendations(user_id, top_recommendations)
 
-        return self._format_recommendations_response(
+        response = self._format_recommendations_response(
             saved,
             profile,
             completeness
         )
+        response['matriz'] = row['staleness']
+        return response
+
+    def retrieval_k(self, top_n: int) -> int:
+        """Ofertas con skills requeridos que pasan la primera etapa para un top_n"""
+        return max(top_n * self.RETRIEVAL_FACTOR, self.RETRIEVAL_MIN_K)
 
     def _evaluate_oferta(
         self,
@@ -189,47 +189,95 @@ class RecommendationService:
         """
         Evalua una oferta contra el perfil del usuario.
 
+        Args:
+            gemini_output: Perfil en formato Gemini
+            oferta: Datos de la oferta (puede incluir weights/thresholds/requirements propios)
+            candidate_info: {'carrera', 'semestre_actual', 'user_role'} para pre-filtro
+
+        Returns:
+            Dict con resultado de evaluacion o None
+        """
+        return self._evaluate_ofertas(gemini_output, [oferta], candidate_info)[0]
+
+    def _evaluate_ofertas(
+        self,
+        gemini_output: Dict,
+        ofertas: List[Dict],
+        candidate_info: Optional[Dict] = None,
+        candidate_features: Optional[CandidateFeatureProfile] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Evalua un lote de ofertas contra el perfil del usuario.
+
         Prioridad de configuracion (migration v3):
         1. Config propia de la oferta (weights / thresholds / requirements)
         2. Config del perfil institucional asociado
         3. Config generica por defecto
 
         Antes de invocar el modelo ML se aplica un pre-filtro de elegibilidad
-        basado en carrera y semestre del candidato.
+        basado en carrera y semestre del candidato. Las ofertas elegibles se
+        evaluan juntas con ml_service.evaluate_cv_batch (una matriz de
+        features por lote en lugar de una llamada por oferta).
 
         Args:
             gemini_output: Perfil en formato Gemini
-            oferta: Datos de la oferta (puede incluir weights/thresholds/requirements propios)
+            ofertas: Lista de ofertas a evaluar
             candidate_info: {'carrera', 'semestre_actual', 'user_role'} para pre-filtro
+            candidate_features: Datos del CV ya compilados (opcional)
 
         Returns:
-            Dict con resultado de evaluacion o None
+            Lista alineada con ofertas; None si la oferta no pudo evaluarse
         """
         ml_service = get_ml_service()
 
-        # La configuracion de evaluacion (pesos, requisitos, umbrales) viene
-        # UNICAMENTE de la oferta. El perfil institucional solo aporta datos
-        # de identidad (institution_name, sector) que ya vienen en el JOIN
-        # realizado por oferta_service. No se cargan ni usan pesos del perfil
-        # institucional para evitar que una config de nivel institucional
-        # sobreescriba la de la oferta.
-        profile = self._create_profile_from_oferta(oferta)
-
-        # PRE-FILTRO DE ELEGIBILIDAD (binario, antes del modelo ML)
-        if candidate_info:
-            eligibility = self._check_eligibility(candidate_info, profile['requirements'])
-            if not eligibility['eligible']:
-                return {
-                    'match_score': 0.0,
-                    'clasificacion': 'NO_APTO',
-                    'scores_detalle': {},
-                    'fortalezas': [],
-                    'debilidades': [eligibility['reason']],
-                    'match_details': {'eligibility_reason': eligibility['reason']}
-                }
+        results: List[Optional[Dict]] = [None] * len(ofertas)
+        pending_indices = []
+        pending_profiles = []
+
+        for i, oferta in enumerate(ofertas):
+            # La configuracion de evaluacion (pesos, requisitos, umbrales) viene
+            # UNICAMENTE de la oferta. El perfil institucional solo aporta datos
+            # de identidad (institution_name, sector) que ya vienen en el JOIN
+            # realizado por oferta_service. No se cargan ni usan pesos del perfil
+            # institucional para evitar que una config de nivel institucional
+            # sobreescriba la de la oferta.
+            try:
+                profile = self._create_profile_from_oferta(oferta)
+            except Exception as e:
+                logger.warning(f"Error evaluando oferta {oferta.get('id')}: {e}")
+                continue
+
+            # PRE-FILTRO DE ELEGIBILIDAD (binario, antes del modelo ML)
+            if candidate_info:
+                eligibility = self._check_eligibility(candidate_info, profile['requirements'])
+                if not eligibility['eligible']:
+                    results[i] = self._ineligible_result(eligibility['reason'])
+                    continue
+
+            pending_indices.append(i)
+            pending_profiles.append(profile)
+
+        if not pending_profiles:
+            return results
+
+        try:
+            evaluations = ml_service.evaluate_cv_batch(
+                gemini_output, pending_profiles, candidate_features
+            )
+        except Exception as e:
+            logger.warning(f"Error evaluando lote de {len(pending_profiles)} ofertas: {e}")
+            return results
+
+        for i, result in zip(pending_indices, evaluations):
+            if result is None:
+                continue
+
+            results[i] = self._evaluation_result(result)
 
-        result = ml_service.evaluate_cv(gemini_output, profile)
+        return results
 
+    def _evaluation_result(self, result: Dict) -> Dict:
+        """Resultado de format_evaluation en el formato de recomendaciones."""
         return {
             'match_score': result['match_score'],
             'clasificacion': result['classification'],
@@ -239,6 +287,270 @@ class RecommendationService:
             'match_details': result.get('match_details')
         }
 
+    def _ineligible_result(self, reason: str) -> Dict:
+        """Resultado de una oferta descartada por el pre-filtro de elegibilidad."""
+        return {
+            'match_score': 0.0,
+            'clasificacion': 'NO_APTO',
+            'scores_detalle': {},
+            'fortalezas': [],
+            'debilidades': [reason],
+            'match_details': {'eligibility_reason': reason}
+        }
+
+    def rank_candidates_for_oferta(
+        self,
+        oferta_id: str,
+        top_n: int = 10,
+        page_size: int = 500,
+        prefilter_k: Optional[int] = None
+    ) -> Dict:
+        """
+        Rankea TODOS los perfiles completos contra una oferta (matching inverso).
+
+        Los perfiles se leen por paginas; cada pagina se evalua con una sola
+        llamada vectorizada y solo se conserva un heap con los top_n, de modo
+        que la memoria no crece con el numero de perfiles. Las explicaciones
+        se generan al final, solo para los seleccionados.
+
+        Args:
+            oferta_id: ID de la oferta
+            top_n: Numero de candidatos a devolver
+            page_size: Perfiles leidos y evaluados por pagina
+            prefilter_k: Si se indica, solo se evaluan los prefilter_k
+                candidatos con mas skills en comun (skill_index_service)
+
+        Returns:
+            Dict con oferta, total_evaluados, total_no_elegibles y candidatos
+        """
+        ranking = self._start_ranking(oferta_id, prefilter_k)
+        for page in self._iter_complete_profiles(page_size, ranking['candidate_ids']):
+            self._score_ranking_page(ranking, page, top_n)
+        return self._finish_ranking(ranking, top_n)
+
+    async def rank_candidates_for_oferta_async(
+        self,
+        oferta_id: str,
+        top_n: int = 10,
+        page_size: int = 500,
+        prefilter_k: Optional[int] = None
+    ) -> Dict:
+        """
+        Igual que rank_candidates_for_oferta, para rutas async: las lecturas
+        paginadas van al pool de la base de datos (run_db) y la evaluacion
+        CPU-bound de cada pagina a un thread aparte, sin ocupar el pool.
+
+        Returns:
+            Dict con oferta, total_evaluados, total_no_elegibles y candidatos
+        """
+        ranking = await run_db(self._start_ranking, oferta_id, prefilter_k)
+
+        page_number, has_more = 0, True
+        while has_more:
+            page, has_more = await run_db(
+                self._read_profiles_page, page_size, page_number, ranking['candidate_ids']
+            )
+            page_number += 1
+            if page:
+                await asyncio.to_thread(self._score_ranking_page, ranking, page, top_n)
+
+        return await asyncio.to_thread(self._finish_ranking, ranking, top_n)
+
+    def _start_ranking(self, oferta_id: str, prefilter_k: Optional[int]) -> Dict:
+        """
+        Lee la oferta y, con prefilter_k, recupera los candidatos por skills.
+
+        Returns:
+            Estado del ranking (oferta, config, rol requerido, candidatos,
+            heap y contadores)
+
+        Raises:
+            ValueError: Si la base de datos no esta configurada o la oferta no existe
+        """
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        oferta = get_oferta_service().get_oferta(oferta_id)
+        if not oferta:
+            raise ValueError("Oferta no encontrada")
+
+        # Etapa opcional de recuperacion por skills
+        candidate_ids = None
+        if prefilter_k:
+            index = get_skill_index_service()
+            index.load_candidates()
+            retrieved = index.retrieve_candidates(oferta, prefilter_k)
+            if retrieved is not None:
+                candidate_ids = [user_id for user_id, _ in retrieved]
+
+        return {
+            'oferta': oferta,
+            'config': self._create_profile_from_oferta(oferta),
+            # Rol compatible con el tipo de oferta (igual que en postulaciones)
+            'required_role': {'pasantia': 'estudiante', 'empleo': 'titulado'}.get(oferta.get('tipo')),
+            'candidate_ids': candidate_ids,
+            'heap': [],
+            'counter': itertools.count(),
+            'total_evaluados': 0,
+            'total_no_elegibles': 0,
+        }
+
+    def _score_ranking_page(self, ranking: Dict, page: List[Dict], top_n: int):
+        """Evalua una pagina de perfiles y actualiza el heap con los top_n"""
+        config = ranking['config']
+        required_role = ranking['required_role']
+        heap = ranking['heap']
+
+        candidates = []
+        rows = []
+        for row in page:
+            usuario = row.get('usuarios') or {}
+            user_role = usuario.get('rol')
+            if required_role and user_role in ('estudiante', 'titulado') \
+                    and user_role != required_role:
+                continue
+
+            candidate_info = {
+                'carrera': row.get('carrera'),
+                'semestre_actual': row.get('semestre_actual'),
+                'user_role': user_role,
+            }
+            if not self._check_eligibility(candidate_info, config['requirements'])['eligible']:
+                ranking['total_no_elegibles'] += 1
+                continue
+
+            gemini_output = get_profile_service().build_gemini_output(row)
+            candidates.append(CandidateFeatureProfile(
+                gemini_output,
+                candidate_id=row['usuario_id'],
+                version=row.get('updated_at')
+            ))
+            rows.append(row)
+
+        if not candidates:
+            return
+
+        batch = get_ml_service().score_candidates_batch(config, candidates)
+        ranking['total_evaluados'] += len(candidates)
+
+        for row, score, features in zip(rows, batch['scores'], batch['features']):
+            if score is None:
+                continue
+            entry = (score, next(ranking['counter']), row, features)
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    def _finish_ranking(self, ranking: Dict, top_n: int) -> Dict:
+        """Explicaciones y datos de perfil de los top_n del heap"""
+        ml_service = get_ml_service()
+        config = ranking['config']
+        ranked = sorted(ranking['heap'], key=lambda x: (-x[0], x[1]))
+
+        candidatos = []
+        for rank, (score, _, row, features) in enumerate(ranked, start=1):
+            gemini_output = get_profile_service().build_gemini_output(row)
+            result = ml_service.format_evaluation(gemini_output, config, features, score)
+            usuario = row.get('usuarios') or {}
+
+            candidatos.append({
+                'rank': rank,
+                'usuario_id': row['usuario_id'],
+                'match_score': result['match_score'],
+                'clasificacion': result['classification'],
+                'scores_detalle': result['cv_scores'],
+                'fortalezas': self._extract_fortalezas(result),
+                'debilidades': self._extract_debilidades(result),
+                'match_details': result.get('match_details'),
+                'perfil': {
+                    'nombre_completo': row.get('nombre_completo') or usuario.get('nombre_completo') or 'Sin nombre',
+                    'email': row.get('email_contacto') or usuario.get('email'),
+                    'telefono': row.get('telefono'),
+                    'rol': usuario.get('rol'),
+                    'carrera': row.get('carrera'),
+                    'hard_skills': row.get('hard_skills') or [],
+                    'soft_skills': row.get('soft_skills') or [],
+                    'education_level': row.get('education_level'),
+                    'experience_years': row.get('experience_years') or 0,
+                    'languages': row.get('languages') or [],
+                    'completeness_score': row.get('completeness_score') or 0,
+                },
+            })
+
+        return {
+            'oferta': ranking['oferta'],
+            'total_evaluados': ranking['total_evaluados'],
+            'total_no_elegibles': ranking['total_no_elegibles'],
+            'top_n': top_n,
+            'candidatos': candidatos,
+        }
+
+    def _iter_complete_profiles(
+        self,
+        page_size: int,
+        candidate_ids: Optional[List[str]] = None
+    ):
+        """
+        Recorre los perfiles completos por paginas (generador).
+
+        Args:
+            page_size: Perfiles por pagina
+            candidate_ids: Si se indica, solo estos usuarios
+
+        Yields:
+            Lista de filas de perfiles_profesionales (con usuarios embebido)
+        """
+        page_number, has_more = 0, True
+        while has_more:
+            rows, has_more = self._read_profiles_page(page_size, page_number, candidate_ids)
+            page_number += 1
+            if rows:
+                yield rows
+
+    def _read_profiles_page(
+        self,
+        page_size: int,
+        page_number: int,
+        candidate_ids: Optional[List[str]] = None
+    ):
+        """
+        Lee una pagina de perfiles completos.
+
+        Args:
+            page_size: Perfiles por pagina
+            page_number: Pagina (base 0)
+            candidate_ids: Si se indica, solo estos usuarios
+
+        Returns:
+            Tupla (filas de perfiles_profesionales, hay mas paginas)
+        """
+        columns = self.PROFILE_COLUMNS
+
+        if candidate_ids is not None:
+            # Los ids van en la URL: trozos acotados
+            chunk = min(page_size, IN_CHUNK_SIZE)
+            start = page_number * chunk
+            ids = candidate_ids[start:start + chunk]
+            if not ids:
+                return [], False
+            response = supabase.table("perfiles_profesionales") \
+                .select(columns) \
+                .eq("is_complete", True) \
+                .in_("usuario_id", ids) \
+                .execute()
+            return response.data or [], start + chunk < len(candidate_ids)
+
+        offset = page_number * page_size
+        response = supabase.table("perfiles_profesionales") \
+            .select(columns) \
+            .eq("is_complete", True) \
+            .order("usuario_id") \
+            .range(offset, offset + page_size - 1) \
+            .execute()
+        rows = response.data or []
+        return rows, len(rows) == page_size
+
     def _check_eligibility(self, candidate_info: Dict, requirements: Dict) -> Dict:
         """
         Aplica el pre-filtro de elegibilidad basado en carrera y semestre.
@@ -313,6 +625,8 @@ class RecommendationService:
 
         return {
             'id': oferta.get('id', 'generic'),
+            # updated_at versiona los requisitos compilados (offer_profile.py)
+            'version': oferta.get('updated_at'),
             'institution_name': oferta.get('institution_name', 'Empresa'),
             'sector': oferta.get('sector', 'General'),
             'weights': {
@@ -361,7 +675,8 @@ class RecommendationService:
         recommendations: List[Dict]
     ) -> List[Dict]:
         """
-        Guarda las recomendaciones en la base de datos.
+        Guarda las recomendaciones en la base de datos con un solo upsert
+        (conflicto en usuario_id + oferta_id).
 
         Args:
             user_id: ID del usuario
@@ -370,103 +685,81 @@ class RecommendationService:
         Returns:
             Lista de recomendaciones guardadas con IDs
         """
-        if not supabase:
+        if not supabase or not recommendations:
             return recommendations
 
-        saved = []
+        try:
+            saved_rows = recommendations_repository.upsert_recommendations(
+                supabase, user_id, recommendations
+            )
+        except Exception as e:
+            logger.warning(f"Error guardando recomendaciones: {e}")
+            return recommendations
 
+        saved = []
         for rec in recommendations:
-            try:
-                data = {
-                    'usuario_id': user_id,
-                    'oferta_id': rec['oferta_id'],
-                    'match_score': rec['match_score'],
-                    'clasificacion': rec['clasificacion'],
-                    'scores_detalle': rec['scores_detalle'],
-                    'fortalezas': rec['fortalezas'],
-                    'debilidades': rec['debilidades'],
-                    'match_details': rec.get('match_details'),
-                    'fue_vista': False
-                }
-
-                # Upsert para evitar duplicados
-                response = supabase.table("recomendaciones") \
-                    .upsert(data, on_conflict="usuario_id,oferta_id") \
-                    .execute()
-
-                if response.data:
-                    saved.append({
-                        **rec,
-                        'id': response.data[0]['id'],
-                        'fue_vista': response.data[0]['fue_vista'],
-                        'created_at': response.data[0]['created_at']
-                    })
-
-            except Exception as e:
-                logger.warning(f"Error guardando recomendacion: {e}")
+            row = saved_rows.get(rec['oferta_id'])
+            if row is None:
                 saved.append(rec)
-
+                continue
+            saved.append({
+                **rec,
+                'id': row['id'],
+                'fue_vista': row['fue_vista'],
+                'created_at': row['created_at']
+            })
         return saved
 
-    def _get_existing_recommendations(
+    def _sync_recommendations(
         self,
         user_id: str,
-        oferta_ids: List[str]
+        recommendations: List[Dict]
     ) -> List[Dict]:
         """
-        Obtiene recomendaciones existentes para las ofertas dadas.
+        Registra en el historial las recomendaciones mostradas.
+
+        Las que ya estaban guardadas con el mismo score conservan su id y su
+        estado de lectura; solo se escriben las nuevas y las que cambiaron.
 
         Args:
             user_id: ID del usuario
-            oferta_ids: Lista de IDs de ofertas
+            recommendations: Top N leido de la matriz
 
         Returns:
-            Lista de recomendaciones existentes
+            Lista de recomendaciones con id, fue_vista y created_at
         """
-        if not supabase:
-            return []
+        if not supabase or not recommendations:
+            return recommendations
 
         try:
-            response = supabase.table("recomendaciones") \
-                .select("*, convocatorias_laborales(*, institutional_profiles(institution_name, sector))") \
-                .eq("usuario_id", user_id) \
-                .in_("oferta_id", oferta_ids) \
-                .order("match_score", desc=True) \
-                .execute()
-
-            if not response.data:
-                return []
-
-            # Formatear respuesta
-            result = []
-            for rec in response.data:
-                oferta_data = rec.pop('convocatorias_laborales', {}) or {}
-                inst_profile = oferta_data.pop('institutional_profiles', None) or {}
-
-                result.append({
-                    'id': rec['id'],
-                    'oferta_id': rec['oferta_id'],
-                    'oferta': {
-                        **oferta_data,
-                        'institution_name': inst_profile.get('institution_name'),
-                        'sector': inst_profile.get('sector')
-                    },
-                    'match_score': rec['match_score'],
-                    'clasificacion': rec['clasificacion'],
-                    'scores_detalle': rec.get('scores_detalle', {}),
-                    'fortalezas': rec.get('fortalezas', []),
-                    'debilidades': rec.get('debilidades', []),
-                    'match_details': rec.get('match_details'),
-                    'fue_vista': rec['fue_vista'],
-                    'vista_at': rec.get('vista_at'),
-                    'created_at': rec['created_at']
-                })
-
-            return result
-
+            existing = recommendations_repository.fetch_recommendations_for_ofertas(
+                supabase, user_id, [r['oferta_id'] for r in recommendations]
+            )
         except Exception as e:
             logger.error(f"Error obteniendo recomendaciones existentes: {e}")
-            return []
+            existing = {}
+
+        changed = []
+        for rec in recommendations:
+            stored = existing.get(rec['oferta_id'])
+            if stored is None or round(float(stored['match_score'] or 0), 3) != round(rec['match_score'], 3):
+                changed.append(rec)
+        saved_by_oferta = {r['oferta_id']: r for r in self._save_recommendations(user_id, changed)}
+
+        result = []
+        for rec in recommendations:
+            if rec['oferta_id'] in saved_by_oferta:
+                result.append(saved_by_oferta[rec['oferta_id']])
+                continue
+            stored = existing[rec['oferta_id']]
+            result.append({
+                **rec,
+                'id': stored['id'],
+                'fue_vista': stored['fue_vista'],
+                'vista_at': stored.get('vista_at'),
+                'created_at': stored['created_at']
+            })
+        return result
 
     def get_recommendation_history(
         self,
@@ -550,24 +843,27 @@ class RecommendationService:
         Returns:
             True si se actualizo correctamente
         """
-        if not supabase:
-            return False
+        return bool(self.mark_many_as_viewed(user_id, [recommendation_id]))
 
-        try:
-            response = supabase.table("recomendaciones") \
-                .update({
-                    'fue_vista': True,
-                    'vista_at': datetime.utcnow().isoformat()
-                }) \
-                .eq("id", recommendation_id) \
-                .eq("usuario_id", user_id) \
-                .execute()
+    def mark_many_as_viewed(self, user_id: str, recommendation_ids: List[str]) -> List[str]:
+        """
+        Marca varias recomendaciones del usuario como vistas en un solo update.
 
-            return bool(response.data)
+        Args:
+            user_id: ID del usuario
+            recommendation_ids: IDs de las recomendaciones
 
+        Returns:
+            IDs actualizados (los que no pertenecen al usuario se ignoran)
+        """
+        if not supabase or not recommendation_ids:
+            return []
+
+        try:
+            return recommendations_repository.mark_viewed(supabase, user_id, recommendation_ids)
         except Exception as e:
-            logger.error(f"Error marcando como vista: {e}")
-            return False
+            logger.error(f"Error marcando como vistas: {e}")
+            return []
 
     def _get_profile_summary(self, profile: Dict, completeness: Dict) -> Dict:
         """Genera resumen del perfil para incluir en respuesta."""
@@ -0,0 +1,361 @@
+"""
+Skill Index Service - Recuperacion en dos etapas
+Indice invertido en memoria de skills -> candidatos y skills -> ofertas
+
+Antes de evaluar con el modelo completo se hace una pasada barata de
+generacion de candidatos (conteo de skills en comun) y solo los top-K
+pasan a la evaluacion ML (rerank).
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.db.client import supabase
+from app.scoring.feature_engineering import normalize_skill, normalize_soft_skill
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SkillIndexService:
+    """
+    Indice invertido de skills normalizados.
+
+    Puntaje de la etapa de recuperacion (entero, mayor es mejor):
+    - 2 por cada skill requerido de la oferta que tiene el candidato
+    - 1 por cada skill preferido de la oferta que tiene el candidato
+    - 1 por cada soft skill requerida que tiene el candidato
+
+    Las ofertas sin skills requeridos no se pueden descartar por skills
+    (su hard_skills_score es 1.0), por eso siempre pasan a la etapa ML.
+
+    Se mantiene incrementalmente desde ProfileService y OfertaService.
+    """
+
+    _instance = None
+
+    WEIGHT_REQUIRED = 2
+    WEIGHT_PREFERRED = 1
+    WEIGHT_SOFT = 1
+
+    # Tamanio de pagina al cargar perfiles desde la BD
+    LOAD_PAGE_SIZE = 1000
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._reset()
+        return cls._instance
+
+    def _reset(self):
+        """Inicializa las estructuras vacias"""
+        self._lock = threading.RLock()
+
+        # skill -> ids
+        self._candidates_by_hard: Dict[str, Set[str]] = defaultdict(set)
+        self._candidates_by_soft: Dict[str, Set[str]] = defaultdict(set)
+        self._offers_by_required: Dict[str, Set[str]] = defaultdict(set)
+        self._offers_by_preferred: Dict[str, Set[str]] = defaultdict(set)
+        self._offers_by_soft: Dict[str, Set[str]] = defaultdict(set)
+
+        # id -> (version, hard, soft) / (version, required, preferred, soft)
+        self._candidates: Dict[str, Tuple] = {}
+        self._offers: Dict[str, Tuple] = {}
+
+        self._candidates_loaded = False
+
+    # =========================================================================
+    # MANTENIMIENTO INCREMENTAL
+    # =========================================================================
+
+    def index_candidate(
+        self,
+        user_id: str,
+        hard_skills: Optional[List[str]],
+        soft_skills: Optional[List[str]],
+        version: Optional[str] = None
+    ):
+        """
+        Agrega o reemplaza las skills de un candidato en el indice.
+
+        Args:
+            user_id: ID del usuario
+            hard_skills: Hard skills del perfil
+            soft_skills: Soft skills del perfil
+            version: Version del perfil (updated_at)
+        """
+        hard = _normalize(hard_skills, normalize_skill)
+        soft = _normalize(soft_skills, normalize_soft_skill)
+
+        with self._lock:
+            self._remove_candidate_locked(user_id)
+            self._candidates[user_id] = (version, hard, soft)
+            for skill in hard:
+                self._candidates_by_hard[skill].add(user_id)
+            for skill in soft:
+                self._candidates_by_soft[skill].add(user_id)
+
+    def remove_candidate(self, user_id: str):
+        """
+        Quita un candidato del indice.
+
+        Args:
+            user_id: ID del usuario
+        """
+        with self._lock:
+            self._remove_candidate_locked(user_id)
+
+    def _remove_candidate_locked(self, user_id: str):
+        entry = self._candidates.pop(user_id, None)
+        if entry is None:
+            return
+        _, hard, soft = entry
+        _discard(self._candidates_by_hard, hard, user_id)
+        _discard(self._candidates_by_soft, soft, user_id)
+
+    def index_offer(self, oferta: Dict):
+        """
+        Agrega o reemplaza los requisitos de una oferta en el indice.
+        Las ofertas inactivas se quitan.
+
+        Args:
+            oferta: Fila de convocatorias_laborales
+        """
+        oferta_id = oferta.get('id')
+        if not oferta_id:
+            return
+
+        if oferta.get('is_active') is False:
+            self.remove_offer(oferta_id)
+            return
+
+        requirements = _offer_requirements(oferta)
+        required = _normalize(requirements.get('required_skills'), normalize_skill)
+        preferred = _normalize(requirements.get('preferred_skills'), normalize_skill)
+        soft = _normalize(requirements.get('required_soft_skills'), normalize_soft_skill)
+
+        with self._lock:
+            self._remove_offer_locked(oferta_id)
+            self._offers[oferta_id] = (oferta.get('updated_at'), required, preferred, soft)
+            for skill in required:
+                self._offers_by_required[skill].add(oferta_id)
+            for skill in preferred:
+                self._offers_by_preferred[skill].add(oferta_id)
+            for skill in soft:
+                self._offers_by_soft[skill].add(oferta_id)
+
+    def remove_offer(self, oferta_id: str):
+        """
+        Quita una oferta del indice.
+
+        Args:
+            oferta_id: ID de la oferta
+        """
+        with self._lock:
+            self._remove_offer_locked(oferta_id)
+
+    def _remove_offer_locked(self, oferta_id: str):
+        entry = self._offers.pop(oferta_id, None)
+        if entry is None:
+            return
+        _, required, preferred, soft = entry
+        _discard(self._offers_by_required, required, oferta_id)
+        _discard(self._offers_by_preferred, preferred, oferta_id)
+        _discard(self._offers_by_soft, soft, oferta_id)
+
+    def load_candidates(self) -> int:
+        """
+        Carga en el indice todos los perfiles completos (paginado).
+        Se ejecuta una sola vez; despues el indice se mantiene con las
+        escrituras de ProfileService.
+
+        Returns:
+            Numero de candidatos indexados
+        """
+        if not supabase:
+            raise ValueError("Base de datos no configurada")
+
+        with self._lock:
+            if self._candidates_loaded:
+                return len(self._candidates)
+
+            offset = 0
+            while True:
+                response = supabase.table("perfiles_profesionales") \
+                    .select("usuario_id, hard_skills, soft_skills, updated_at") \
+                    .eq("is_complete", True) \
+                    .order("usuario_id") \
+                    .range(offset, offset + self.LOAD_PAGE_SIZE - 1) \
+                    .execute()
+
+                rows = response.data or []
+                for row in rows:
+                    self.index_candidate(
+                        row['usuario_id'],
+                        row.get('hard_skills'),
+                        row.get('soft_skills'),
+                        row.get('updated_at')
+                    )
+
+                if len(rows) < self.LOAD_PAGE_SIZE:
+                    break
+                offset += self.LOAD_PAGE_SIZE
+
+            self._candidates_loaded = True
+            logger.info(f"Indice de skills: {len(self._candidates)} candidatos cargados")
+            return len(self._candidates)
+
+    # =========================================================================
+    # RECUPERACION (ETAPA 1)
+    # =========================================================================
+
+    def retrieve_candidates(
+        self,
+        oferta: Dict,
+        top_k: int
+    ) -> Optional[List[Tuple[str, int]]]:
+        """
+        Genera los top-K candidatos para una oferta por skills en comun.
+
+        Args:
+            oferta: Fila de convocatorias_laborales
+            top_k: Numero de candidatos a devolver
+
+        Returns:
+            Lista de (usuario_id, puntaje) ordenada de mayor a menor, o None
+            si la oferta no tiene skills requeridos (no se puede filtrar)
+        """
+        requirements = _offer_requirements(oferta)
+        required = _normalize(requirements.get('required_skills'), normalize_skill)
+        if not required:
+            return None
+
+        preferred = _normalize(requirements.get('preferred_skills'), normalize_skill)
+        soft = _normalize(requirements.get('required_soft_skills'), normalize_soft_skill)
+
+        scores: Dict[str, int] = defaultdict(int)
+        with self._lock:
+            _accumulate(scores, self._candidates_by_hard, required, self.WEIGHT_REQUIRED)
+            _accumulate(scores, self._candidates_by_hard, preferred, self.WEIGHT_PREFERRED)
+            _accumulate(scores, self._candidates_by_soft, soft, self.WEIGHT_SOFT)
+
+        return _top_k(scores, top_k)
+
+    def select_ofertas(
+        self,
+        hard_skills: Iterable[str],
+        soft_skills: Iterable[str],
+        ofertas: List[Dict],
+        top_k: int
+    ) -> List[Dict]:
+        """
+        Reduce una lista de ofertas a las top-K por skills en comun con un
+        candidato. Las ofertas sin skills requeridos se conservan siempre.
+
+        Args:
+            hard_skills: Hard skills del candidato (ya normalizadas)
+            soft_skills: Soft skills del candidato (ya normalizadas)
+            ofertas: Ofertas a filtrar
+            top_k: Numero de ofertas con skills requeridos a conservar
+
+        Returns:
+            Ofertas seleccionadas, en el orden original
+        """
+        if len(ofertas) <= top_k:
+            return ofertas
+
+        # Indexar ofertas nuevas o modificadas
+        for oferta in ofertas:
+            entry = self._offers.get(oferta.get('id'))
+            if entry is None or entry[0] != oferta.get('updated_at'):
+                self.index_offer(oferta)
+
+        candidate_ids = {o.get('id') for o in ofertas}
+        scores: Dict[str, int] = defaultdict(int)
+        with self._lock:
+            _accumulate(scores, self._offers_by_required, hard_skills, self.WEIGHT_REQUIRED)
+            _accumulate(scores, self._offers_by_preferred, hard_skills, self.WEIGHT_PREFERRED)
+            _accumulate(scores, self._offers_by_soft, soft_skills, self.WEIGHT_SOFT)
+
+            unconstrained = {
+                oferta_id for oferta_id in candidate_ids
+                if oferta_id in self._offers and not self._offers[oferta_id][1]
+            }
+
+        scores = {k: v for k, v in scores.items() if k in candidate_ids}
+        keep = unconstrained | {oferta_id for oferta_id, _ in _top_k(scores, top_k)}
+
+        return [o for o in ofertas if o.get('id') in keep]
+
+    def get_stats(self) -> Dict:
+        """Retorna tamanio del indice"""
+        with self._lock:
+            return {
+                'candidates': len(self._candidates),
+                'offers': len(self._offers),
+                'hard_skills': len(self._candidates_by_hard),
+                'candidates_loaded': self._candidates_loaded
+            }
+
+
+def _normalize(skills: Optional[Iterable[str]], normalizer) -> frozenset:
+    """Normaliza una lista de skills ignorando valores no string"""
+    return frozenset(
+        normalizer(s) for s in skills or [] if isinstance(s, str) and s.strip()
+    )
+
+
+def _offer_requirements(oferta: Dict) -> Dict:
+    """Requisitos de la oferta (requirements sobre requisitos_especificos)"""
+    return {
+        **(oferta.get('requisitos_especificos') or {}),
+        **(oferta.get('requirements') or {})
+    }
+
+
+def _discard(postings: Dict[str, Set[str]], skills: Iterable[str], item_id: str):
+    """Quita un id de las listas de varios skills"""
+    for skill in skills:
+        ids = postings.get(skill)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del postings[skill]
+
+
+def _accumulate(
+    scores: Dict[str, int],
+    postings: Dict[str, Set[str]],
+    skills: Iterable[str],
+    weight: int
+):
+    """Suma weight a cada id presente en las listas de los skills dados"""
+    for skill in skills:
+        for item_id in postings.get(skill, ()):
+            scores[item_id] += weight
+
+
+def _top_k(scores: Dict[str, int], top_k: int) -> List[Tuple[str, int]]:
+    """Top-K por puntaje (desempate estable por id)"""
+    ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+    return ranked[:top_k]
+
+
+# Singleton instance
+_skill_index_service_instance = None
+
+
+def get_skill_index_service() -> SkillIndexService:
+    """
+    Obtiene la instancia singleton del indice de skills.
+
+    Returns:
+        Instancia de SkillIndexService
+    """
+    global _skill_index_service_instance
+    if _skill_index_service_instance is None:
+        _skill_index_service_instance = SkillIndexService()
+    return _skill_index_service_instance
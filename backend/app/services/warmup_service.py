@@ -0,0 +1,276 @@
+"""
+Warm-up Service
+Precalentamiento al arranque y estado de readiness
+
+Antes de recibir trafico se cargan el modelo Ridge (sklearn/joblib), se
+ejecuta una prediccion en lote de prueba (feature engineering + scaler +
+Ridge), se carga el pipeline spaCy y se llenan los caches que la primera
+request pagaria (perfiles institucionales, vocabulario de skills, indice
+de skills). /health/ready responde 503 hasta que termina.
+
+Los componentes requeridos bloquean el readiness si fallan; los caches son
+opcionales (sin BD se marcan como omitidos y se llenan en la primera request).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from app.core import nlp
+from app.db.client import supabase
+
+logger = logging.getLogger(__name__)
+
+# Filas de la prediccion de prueba (mismo camino vectorizado que las recomendaciones)
+WARMUP_BATCH_SIZE = 32
+
+WARMUP_CV = {
+    "personal_info": {"languages": ["Espanol (Nativo)", "Ingles (B2)"]},
+    "hard_skills": ["Python", "SQL", "Excel"],
+    "soft_skills": ["Liderazgo", "Trabajo en equipo"],
+    "education": [{"degree": "Licenciatura en Administracion de Empresas", "institution": "UCB"}],
+    "experience": [{"role": "Analista", "duration": "2 anios"}],
+}
+
+WARMUP_CONFIG = {
+    "id": "warmup",
+    "weights": {
+        "hard_skills": 0.30,
+        "soft_skills": 0.20,
+        "experience": 0.25,
+        "education": 0.15,
+        "languages": 0.10,
+    },
+    "requirements": {
+        "min_experience_years": 1,
+        "required_skills": ["Python", "SQL"],
+        "preferred_skills": ["Power BI"],
+        "required_soft_skills": ["Liderazgo"],
+        "required_education_level": "Licenciatura",
+        "required_languages": ["Ingles"],
+    },
+    "thresholds": {"apto": 0.70, "considerado": 0.50},
+}
+
+WARMUP_CV_TEXT = """Juan Perez
+juan.perez@ucb.edu.bo | 71234567
+EXPERIENCIA LABORAL
+Analista de Sistemas en Banco Union (2019 - 2022)
+FORMACION ACADEMICA
+Licenciatura en Ingenieria de Sistemas, Universidad Catolica Boliviana
+HABILIDADES
+Python, SQL, Power BI
+"""
+
+
+class WarmupService:
+    """
+    Servicio de precalentamiento.
+
+    Implementa patron Singleton. Liveness: el proceso responde. Readiness:
+    el precalentamiento termino y ningun componente requerido fallo.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._reset()
+        return cls._instance
+
+    def _reset(self):
+        """Estado inicial (sin precalentar)"""
+        self._components: Dict[str, Dict] = {}
+        self._started_at: Optional[float] = None
+        self._finished = False
+        self._total_seconds: Optional[float] = None
+
+    # =========================================================================
+    # EJECUCION
+    # =========================================================================
+
+    def _run_component(self, name: str, fn: Callable[[], Optional[Dict]], required: bool = True):
+        """
+        Ejecuta un paso del precalentamiento y registra su estado y tiempo.
+
+        Args:
+            name: Nombre del componente
+            fn: Funcion sin argumentos; puede devolver un dict de detalle,
+                o None para marcar el componente como omitido
+            required: Si es True, un fallo deja la instancia no lista
+        """
+        component = {'status': 'loading', 'required': required, 'seconds': None}
+        self._components[name] = component
+
+        start = time.perf_counter()
+        try:
+            detail = fn()
+            component['status'] = 'skipped' if detail is None else 'ready'
+            if detail:
+                component['detail'] = detail
+        except Exception as e:
+            component['status'] = 'failed'
+            component['error'] = str(e)
+            log = logger.error if required else logger.warning
+            log(f"Precalentamiento de {name} fallo: {e}")
+        component['seconds'] = round(time.perf_counter() - start, 3)
+
+    async def run(self):
+        """
+        Precalienta todos los componentes (llamar al arrancar la aplicacion).
+
+        El modelo ML y el pipeline NLP se cargan en paralelo en threads para
+        no bloquear el event loop; los caches se llenan despues.
+        """
+        self._reset()
+        self._started_at = time.perf_counter()
+
+        def ml_chain():
+            self._run_component('ml_model', _load_ml_model)
+            self._run_component('ml_prediction', _dummy_prediction)
+
+        await asyncio.gather(
+            asyncio.to_thread(ml_chain),
+            asyncio.to_thread(self._run_component, 'nlp', _load_nlp),
+        )
+        await asyncio.to_thread(self._run_caches)
+
+        self._total_seconds = round(time.perf_counter() - self._started_at, 3)
+        self._finished = True
+
+        timings = {name: c['seconds'] for name, c in self._components.items()}
+        if self.is_ready:
+            logger.info(f"Precalentamiento completo en {self._total_seconds}s: {timings}")
+        else:
+            logger.error(f"Precalentamiento con errores en {self._total_seconds}s: {timings}")
+
+    def _run_caches(self):
+        """Caches opcionales (requieren BD, excepto el vocabulario)"""
+        self._run_component('skill_vocabulary', _load_skill_vocabulary, required=False)
+        self._run_component('institutional_profiles', _prime_institutional_profiles, required=False)
+        self._run_component('skill_index', _prime_skill_index, required=False)
+
+    # =========================================================================
+    # ESTADO
+    # =========================================================================
+
+    @property
+    def is_live(self) -> bool:
+        return True
+
+    @property
+    def is_ready(self) -> bool:
+        """Precalentamiento terminado y sin fallos en componentes requeridos"""
+        if not self._finished:
+            return False
+        return all(
+            c['status'] != 'failed' for c in self._components.values() if c['required']
+        )
+
+    def status(self) -> Dict:
+        """
+        Estado del precalentamiento para /health.
+
+        Returns:
+            Dict con live, ready, estado y tiempo de carga por componente
+        """
+        if self._started_at is None:
+            state = 'pending'
+        elif not self._finished:
+            state = 'warming_up'
+        else:
+            state = 'ready' if self.is_ready else 'degraded'
+
+        return {
+            'live': self.is_live,
+            'ready': self.is_ready,
+            'warmup': state,
+            'warmup_seconds': self._total_seconds,
+            'components': {name: dict(c) for name, c in self._components.items()},
+        }
+
+
+# =============================================================================
+# COMPONENTES
+# =============================================================================
+
+def _load_ml_model() -> Dict:
+    """Modelo Ridge (importa sklearn/joblib y deserializa el modelo)"""
+    from app.services.ml_integration_service import get_ml_service
+
+    ml_service = get_ml_service()
+    if not ml_service.is_ready:
+        raise ValueError("Modelo ML no disponible")
+    return {'model_path': str(ml_service._predictor.model_path)}
+
+
+def _dummy_prediction() -> Dict:
+    """Prediccion en lote de prueba por los dos caminos vectorizados"""
+    from app.services.ml_integration_service import get_ml_service
+
+    ml_service = get_ml_service()
+    results = ml_service.evaluate_cv_batch(WARMUP_CV, [WARMUP_CONFIG] * WARMUP_BATCH_SIZE)
+    if any(r is None for r in results):
+        raise ValueError("La evaluacion de prueba no produjo resultados")
+
+    predictions = ml_service._predictor.batch_predict(
+        [np.zeros(ml_service._predictor.model.model.coef_.shape[0])] * WARMUP_BATCH_SIZE
+    )
+    return {'rows': WARMUP_BATCH_SIZE, 'predictions': len(predictions)}
+
+
+def _load_nlp() -> Dict:
+    """Pipeline spaCy y patrones del analizador de CVs"""
+    load_seconds = nlp.warm_up()
+    cleaned = nlp.clean_text(WARMUP_CV_TEXT)
+    nlp.get_nlp()(cleaned)
+    nlp.analyze_cv_text(cleaned)
+    return {'model': nlp.SPACY_MODEL, 'load_seconds': round(load_seconds, 3)}
+
+
+def _load_skill_vocabulary() -> Optional[Dict]:
+    """Vocabulario TF-IDF persistido (None si no existe)"""
+    from app.scoring.feature_engineering.skill_vocabulary import get_skill_vocabulary
+
+    vocabulary = get_skill_vocabulary()
+    if vocabulary is None:
+        return None
+    return {'terms': vocabulary.size}
+
+
+def _prime_institutional_profiles() -> Optional[Dict]:
+    """Cache de perfiles institucionales activos"""
+    from app.services.ml_integration_service import get_ml_service
+
+    if not supabase:
+        return None
+    return {'profiles': len(get_ml_service().load_all_active_profiles())}
+
+
+def _prime_skill_index() -> Optional[Dict]:
+    """Indice invertido de skills de candidatos"""
+    from app.services.skill_index_service import get_skill_index_service
+
+    if not supabase:
+        return None
+    return {'candidates': get_skill_index_service().load_candidates()}
+
+
+_warmup_service_instance = None
+
+
+def get_warmup_service() -> WarmupService:
+    """
+    Obtiene la instancia singleton del servicio de precalentamiento
+
+    Returns:
+        Instancia de WarmupService
+    """
+    global _warmup_service_instance
+    if _warmup_service_instance is None:
+        _warmup_service_instance = WarmupService()
+    return _warmup_service_instance
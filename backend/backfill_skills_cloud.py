@@ -0,0 +1,36 @@
+"""
+Backfill de la nube de skills materializada (migracion v11)
+Reconstruye skills_frecuencia_diaria a partir de los perfiles existentes.
+Despues de esto el trigger de perfiles_profesionales la mantiene al dia.
+
+Uso:
+    python backfill_skills_cloud.py
+"""
+
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+from app.db.client import supabase
+
+
+def backfill():
+    if not supabase:
+        print("Error: SUPABASE_URL or SUPABASE_KEY not set in .env")
+        return 1
+
+    try:
+        response = supabase.rpc("skills_frecuencia_recalcular", {}).execute()
+    except Exception as e:
+        print(f"Error ejecutando skills_frecuencia_recalcular: {e}")
+        print("Verifica que migrations/migration_v11_skills_frecuencia.sql este aplicada.")
+        return 1
+
+    print(f"skills_frecuencia_diaria reconstruida: {response.data} filas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(backfill())
@@ -0,0 +1,69 @@
+"""
+Importacion masiva de CVs
+Lee los PDFs de un directorio o zip, los procesa con Gemini (varios CVs por
+request) y actualiza los perfiles de los usuarios existentes con upserts
+agrupados. Cada CV se asocia por el email del nombre del archivo
+(juan.perez@ucb.edu.bo.pdf) o por el email que aparece en el CV.
+
+Uso:
+    python import_cvs.py ruta/a/cvs/ [--batch-size 5] [--dry-run]
+    python import_cvs.py cohorte_2025.zip
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+from app.db.async_client import shutdown_db_executor
+from app.services.bulk_import_service import get_bulk_import_service, read_pdfs_from_path
+from app.services.pdf_extraction_service import get_pdf_extraction_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importacion masiva de CVs")
+    parser.add_argument("path", help="Directorio con PDFs o archivo .zip")
+    parser.add_argument("--batch-size", type=int, default=None, help="CVs por request de Gemini")
+    parser.add_argument("--dry-run", action="store_true", help="No escribe perfiles")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Error: no existe {args.path}")
+        return 1
+
+    files = read_pdfs_from_path(args.path)
+    if not files:
+        print("Error: no se encontraron PDFs")
+        return 1
+    print(f"{len(files)} CVs encontrados en {args.path}")
+
+    try:
+        report = asyncio.run(
+            get_bulk_import_service().import_cvs(files, batch_size=args.batch_size, dry_run=args.dry_run)
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        get_pdf_extraction_service().shutdown()
+        shutdown_db_executor()
+
+    print(f"\nImportados: {report['imported']}/{report['total_files']}"
+          f"{' (dry run)' if report['dry_run'] else ''}")
+    print(f"Tiempo total: {report['elapsed_seconds']}s  ({report['cvs_per_minute']} CVs/min)")
+    print(f"Gemini: {report['batch_size']} CVs/request, concurrencia {report['gemini_concurrency']}, "
+          f"{report['gemini_keys']} key(s)")
+    for stage, seconds in report['stage_seconds'].items():
+        print(f"  {stage:<12} {seconds}s")
+    if report['errors']:
+        print(f"\nErrores ({report['failed']}):")
+        print(json.dumps(report['errors'], indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+-- =====================================================
+-- MIGRACION V10: Vistas agregadas para informes (analytics)
+-- =====================================================
+-- Los informes de /api/analytics descargaban postulaciones, usuarios y
+-- perfiles_profesionales completos para agruparlos en Python. Estas vistas
+-- hacen los joins y conteos en Postgres; al backend solo llega una fila
+-- por oferta o por institucion.
+--
+-- Requiere la vista postulaciones_stats_por_oferta (migracion v9).
+-- =====================================================
+
+-- Postulantes por oferta: rol y carreras (informe de ofertas)
+CREATE OR REPLACE VIEW postulantes_por_oferta AS
+WITH por_rol AS (
+    SELECT
+        p.oferta_id,
+        COUNT(*) FILTER (WHERE u.rol = 'estudiante') AS estudiantes,
+        COUNT(*) FILTER (WHERE u.rol = 'titulado')   AS titulados
+    FROM postulaciones p
+    LEFT JOIN usuarios u ON u.id = p.usuario_id
+    GROUP BY p.oferta_id
+),
+por_carrera AS (
+    SELECT p.oferta_id, pp.carrera, COUNT(*) AS n
+    FROM postulaciones p
+    JOIN perfiles_profesionales pp ON pp.usuario_id = p.usuario_id
+    WHERE pp.carrera IS NOT NULL AND pp.carrera <> ''
+    GROUP BY p.oferta_id, pp.carrera
+)
+SELECT
+    r.oferta_id,
+    r.estudiantes,
+    r.titulados,
+    COALESCE(
+        (SELECT array_agg(c.carrera ORDER BY c.n DESC, c.carrera)
+         FROM por_carrera c
+         WHERE c.oferta_id = r.oferta_id),
+        '{}'
+    ) AS carreras
+FROM por_rol r;
+
+COMMENT ON VIEW postulantes_por_oferta IS
+    'Postulantes estudiantes/titulados y carreras (de mas a menos frecuente) por oferta';
+
+-- Ofertas y postulaciones por institucion (informe de perfiles institucionales)
+CREATE OR REPLACE VIEW ofertas_stats_por_institucion AS
+SELECT
+    o.institutional_profile_id,
+    COUNT(*) AS total_ofertas,
+    COUNT(*) FILTER (
+        WHERE o.is_active AND (o.fecha_cierre IS NULL OR o.fecha_cierre >= CURRENT_DATE)
+    ) AS ofertas_activas,
+    COALESCE(SUM(s.total), 0) AS total_postulaciones
+FROM convocatorias_laborales o
+LEFT JOIN postulaciones_stats_por_oferta s ON s.oferta_id = o.id
+WHERE o.institutional_profile_id IS NOT NULL
+GROUP BY o.institutional_profile_id;
+
+COMMENT ON VIEW ofertas_stats_por_institucion IS
+    'Total de ofertas, ofertas vigentes y postulaciones recibidas por institucion';
+
+-- Los joins usan idx_postulaciones_oferta (v4) y las PK/UNIQUE de usuarios
+-- y perfiles_profesionales(usuario_id)
+
+-- =====================================================
+-- FIN DE MIGRACION V10
+-- =====================================================
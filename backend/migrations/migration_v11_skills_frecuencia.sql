@@ -0,0 +1,164 @@
+-- =====================================================
+-- MIGRACION V11: Nube de skills materializada
+-- =====================================================
+-- GET /api/analytics/skills-cloud descargaba hard_skills/soft_skills de
+-- todos los perfiles del rango y los contaba en Python en cada request.
+--
+-- skills_frecuencia_diaria guarda, por dia de updated_at del perfil y por
+-- skill normalizado (lower/trim), cuantas veces aparece el skill. Cada
+-- perfil aporta sus skills actuales al dia de su ultima actualizacion, igual
+-- que el filtro por updated_at del informe original.
+--
+-- Un trigger sobre perfiles_profesionales mantiene la tabla en cada escritura
+-- (ProfileService, borrados en cascada, ediciones manuales): resta el aporte
+-- anterior (OLD) y suma el nuevo (NEW). El endpoint pasa a ser una suma por
+-- rango de dias (funcion skills_cloud).
+--
+-- Backfill de perfiles existentes:
+--     SELECT skills_frecuencia_recalcular();
+-- o desde el backend:
+--     python backfill_skills_cloud.py
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS skills_frecuencia_diaria (
+    tipo    TEXT    NOT NULL CHECK (tipo IN ('hard', 'soft')),
+    dia     DATE    NOT NULL,
+    skill   TEXT    NOT NULL,
+    total   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tipo, dia, skill)
+);
+
+COMMENT ON TABLE skills_frecuencia_diaria IS
+    'Frecuencia de skills por dia de actualizacion del perfil (mantenida por trigger)';
+
+ALTER TABLE skills_frecuencia_diaria ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Permitir acceso total skills frecuencia" ON skills_frecuencia_diaria;
+CREATE POLICY "Permitir acceso total skills frecuencia" ON skills_frecuencia_diaria
+    FOR ALL USING (true) WITH CHECK (true);
+
+
+-- Suma (signo = 1) o resta (signo = -1) el aporte de una lista de skills
+CREATE OR REPLACE FUNCTION skills_frecuencia_aplicar(
+    p_tipo   TEXT,
+    p_dia    DATE,
+    p_skills TEXT[],
+    p_signo  INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_dia IS NULL OR p_skills IS NULL OR cardinality(p_skills) = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO skills_frecuencia_diaria (tipo, dia, skill, total)
+    SELECT p_tipo, p_dia, s.skill, p_signo * COUNT(*)
+    FROM (
+        SELECT lower(btrim(x, E' \t\r\n')) AS skill FROM unnest(p_skills) AS x
+    ) s
+    WHERE s.skill IS NOT NULL AND s.skill <> ''
+    GROUP BY s.skill
+    ON CONFLICT (tipo, dia, skill)
+    DO UPDATE SET total = skills_frecuencia_diaria.total + EXCLUDED.total;
+
+    IF p_signo < 0 THEN
+        DELETE FROM skills_frecuencia_diaria
+        WHERE tipo = p_tipo AND dia = p_dia AND total <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION perfiles_skills_frecuencia_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_dia_old DATE;
+    v_dia_new DATE;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_dia_old := (OLD.updated_at AT TIME ZONE 'UTC')::date;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_dia_new := (NEW.updated_at AT TIME ZONE 'UTC')::date;
+    END IF;
+
+    -- Escrituras que no tocan skills ni cambian de dia no mueven contadores
+    IF TG_OP = 'UPDATE'
+       AND v_dia_old IS NOT DISTINCT FROM v_dia_new
+       AND OLD.hard_skills IS NOT DISTINCT FROM NEW.hard_skills
+       AND OLD.soft_skills IS NOT DISTINCT FROM NEW.soft_skills THEN
+        RETURN NEW;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM skills_frecuencia_aplicar('hard', v_dia_old, OLD.hard_skills, -1);
+        PERFORM skills_frecuencia_aplicar('soft', v_dia_old, OLD.soft_skills, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM skills_frecuencia_aplicar('hard', v_dia_new, NEW.hard_skills, 1);
+        PERFORM skills_frecuencia_aplicar('soft', v_dia_new, NEW.soft_skills, 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS perfiles_skills_frecuencia ON perfiles_profesionales;
+CREATE TRIGGER perfiles_skills_frecuencia
+    AFTER INSERT OR UPDATE OR DELETE ON perfiles_profesionales
+    FOR EACH ROW EXECUTE FUNCTION perfiles_skills_frecuencia_trigger();
+
+
+-- Nube de skills: suma de los contadores diarios en el rango [p_desde, p_hasta]
+-- (NULL = sin limite)
+CREATE OR REPLACE FUNCTION skills_cloud(
+    p_tipo   TEXT,
+    p_desde  DATE DEFAULT NULL,
+    p_hasta  DATE DEFAULT NULL,
+    p_limite INTEGER DEFAULT 15
+)
+RETURNS TABLE (skill TEXT, total BIGINT) AS $$
+    SELECT f.skill, SUM(f.total)::BIGINT AS total
+    FROM skills_frecuencia_diaria f
+    WHERE f.tipo = p_tipo
+      AND (p_desde IS NULL OR f.dia >= p_desde)
+      AND (p_hasta IS NULL OR f.dia <= p_hasta)
+    GROUP BY f.skill
+    HAVING SUM(f.total) > 0
+    ORDER BY total DESC, f.skill
+    LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
+
+
+-- Backfill / reconstruccion completa desde perfiles_profesionales
+CREATE OR REPLACE FUNCTION skills_frecuencia_recalcular()
+RETURNS INTEGER AS $$
+DECLARE
+    v_filas INTEGER;
+BEGIN
+    LOCK TABLE skills_frecuencia_diaria IN EXCLUSIVE MODE;
+    DELETE FROM skills_frecuencia_diaria;
+
+    INSERT INTO skills_frecuencia_diaria (tipo, dia, skill, total)
+    SELECT s.tipo, s.dia, s.skill, COUNT(*)
+    FROM (
+        SELECT 'hard' AS tipo, (p.updated_at AT TIME ZONE 'UTC')::date AS dia,
+               lower(btrim(x, E' \t\r\n')) AS skill
+        FROM perfiles_profesionales p, unnest(p.hard_skills) AS x
+        UNION ALL
+        SELECT 'soft', (p.updated_at AT TIME ZONE 'UTC')::date,
+               lower(btrim(x, E' \t\r\n'))
+        FROM perfiles_profesionales p, unnest(p.soft_skills) AS x
+    ) s
+    WHERE s.dia IS NOT NULL AND s.skill IS NOT NULL AND s.skill <> ''
+    GROUP BY s.tipo, s.dia, s.skill;
+
+    GET DIAGNOSTICS v_filas = ROW_COUNT;
+    RETURN v_filas;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT skills_frecuencia_recalcular();
+
+-- =====================================================
+-- FIN DE MIGRACION V11
+-- =====================================================
@@ -0,0 +1,58 @@
+-- =====================================================
+-- MIGRACION V12: Matriz precalculada de recomendaciones
+-- =====================================================
+-- GET /api/recommendations evaluaba las ofertas activas contra el perfil en
+-- cada request y solo reutilizaba filas de recomendaciones si alcanzaban.
+--
+-- match_scores guarda el score de cada candidato (perfil completo) contra
+-- cada oferta abierta. La mantiene el backend en segundo plano
+-- (recommendation_matrix_service):
+--   - perfil actualizado                  -> se recalcula su fila
+--   - oferta creada, editada o reactivada -> se recalcula su columna
+-- y el endpoint pasa a ser una lectura por (usuario_id, oferta_id).
+--
+-- perfil_version / oferta_version guardan el updated_at (tal como lo
+-- devuelve la API) del perfil y de la oferta usados en el calculo; si no
+-- coinciden con los actuales la celda esta desactualizada y se recalcula.
+--
+-- recomendaciones sigue siendo el historial de lo mostrado al usuario
+-- (fue_vista, vista_at).
+--
+-- No requiere backfill: la primera lectura de cada candidato calcula su fila.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS match_scores (
+    usuario_id      UUID NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
+    oferta_id       UUID NOT NULL REFERENCES convocatorias_laborales(id) ON DELETE CASCADE,
+    -- Resultado de la evaluacion (mismo formato que recomendaciones)
+    match_score     NUMERIC(4,3) CHECK (match_score >= 0 AND match_score <= 1),
+    clasificacion   TEXT CHECK (clasificacion IN ('APTO', 'CONSIDERADO', 'NO_APTO')),
+    scores_detalle  JSONB,
+    match_details   JSONB,
+    fortalezas      TEXT[],
+    debilidades     TEXT[],
+    -- Versiones usadas en el calculo (staleness)
+    perfil_version  TEXT,
+    oferta_version  TEXT,
+    computed_at     TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc', now()),
+    PRIMARY KEY (usuario_id, oferta_id)
+);
+
+COMMENT ON TABLE match_scores IS
+    'Matriz precalculada candidato x oferta (mantenida por recommendation_matrix_service)';
+
+-- Fila de un candidato ordenada por score (lectura del endpoint)
+CREATE INDEX IF NOT EXISTS idx_match_scores_usuario_score
+    ON match_scores (usuario_id, match_score DESC);
+-- Columna de una oferta (borrados en cascada y ranking por oferta)
+CREATE INDEX IF NOT EXISTS idx_match_scores_oferta
+    ON match_scores (oferta_id);
+
+ALTER TABLE match_scores ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Permitir acceso total match scores" ON match_scores;
+CREATE POLICY "Permitir acceso total match scores" ON match_scores
+    FOR ALL USING (true) WITH CHECK (true);
+
+-- =====================================================
+-- FIN DE MIGRACION V12
+-- =====================================================
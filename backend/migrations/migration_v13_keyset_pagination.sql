@@ -0,0 +1,37 @@
+-- =====================================================
+-- MIGRACION V13: Indices para paginacion por cursor
+-- =====================================================
+-- Los listados de admin (GET /api/users y GET /api/admin/convocatorias) paginaban
+-- con range(offset, ...) y count="exact": cada pagina recorria las filas
+-- anteriores y recontaba la tabla completa.
+--
+-- Ahora paginan por cursor (keyset) sobre (created_at, id) descendente:
+--   WHERE created_at <= :c AND (created_at < :c OR id < :id)
+--   ORDER BY created_at DESC, id DESC LIMIT :n + 1
+-- y el conteo es opcional (count=estimated usa la estimacion del planner
+-- en tablas grandes; count=none lo omite).
+--
+-- Los indices compuestos permiten resolver cada pagina con un index scan
+-- que empieza en el cursor, sin ordenar ni saltar filas. Las variantes
+-- con rol / tipo + is_active cubren los filtros mas usados.
+-- =====================================================
+
+-- Usuarios: listado completo y filtrado por rol
+CREATE INDEX IF NOT EXISTS idx_usuarios_created_id
+    ON usuarios (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_usuarios_rol_created_id
+    ON usuarios (rol, created_at DESC, id DESC);
+
+-- Ofertas: listado completo y filtrado por tipo / estado
+CREATE INDEX IF NOT EXISTS idx_convocatorias_created_id
+    ON convocatorias_laborales (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_convocatorias_tipo_active_created_id
+    ON convocatorias_laborales (tipo, is_active, created_at DESC, id DESC);
+
+-- Estadisticas para que count=estimated sea razonable desde el inicio
+ANALYZE usuarios;
+ANALYZE convocatorias_laborales;
+
+-- =====================================================
+-- FIN DE MIGRACION V13
+-- =====================================================
@@ -0,0 +1,152 @@
+-- =====================================================
+-- MIGRACION V14: Busqueda de texto para administracion
+-- =====================================================
+-- La busqueda de usuarios usaba or_(email.ilike.%t%, nombre_completo.ilike.%t%):
+-- un ilike con comodin inicial no puede usar indices B-tree y cada tecla
+-- del operador recorria la tabla completa.
+--
+-- Esta migracion agrega:
+--   - pg_trgm + indices GIN trigram sobre los campos que se filtran con
+--     ilike (el listado GET /api/users los usa sin cambios en el backend)
+--   - un documento tsvector por tabla (usuarios: 'simple', para nombres y
+--     correos; perfiles y convocatorias: 'spanish') indexado con GIN como
+--     indice de expresion, sin columnas nuevas (los select("*") existentes
+--     no cambian)
+--   - buscar_admin(): busqueda por prefijos ("ana ing" -> ana:* & ing:*)
+--     ordenada por ts_rank_cd + similitud trigram, que usa
+--     GET /api/admin/search
+--
+-- Sin esta migracion el endpoint responde igual con ilike (mas lento).
+-- =====================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+
+-- Documentos de busqueda (IMMUTABLE: requisito de los indices de expresion)
+CREATE OR REPLACE FUNCTION usuarios_documento(p_nombre TEXT, p_email TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('simple'::regconfig, coalesce(p_nombre, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig,
+               regexp_replace(coalesce(p_email, ''), '[@._-]+', ' ', 'g')), 'B')
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION perfiles_documento(
+    p_nombre      TEXT,
+    p_carrera     TEXT,
+    p_hard_skills TEXT[],
+    p_soft_skills TEXT[]
+)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('spanish'::regconfig, coalesce(p_nombre, '')), 'A')
+        || setweight(to_tsvector('spanish'::regconfig, coalesce(p_carrera, '')), 'B')
+        || setweight(to_tsvector('spanish'::regconfig,
+               coalesce(array_to_string(p_hard_skills || p_soft_skills, ' '), '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION convocatorias_documento(
+    p_titulo      TEXT,
+    p_area        TEXT,
+    p_ubicacion   TEXT,
+    p_descripcion TEXT
+)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('spanish'::regconfig, coalesce(p_titulo, '')), 'A')
+        || setweight(to_tsvector('spanish'::regconfig,
+               coalesce(p_area, '') || ' ' || coalesce(p_ubicacion, '')), 'B')
+        || setweight(to_tsvector('spanish'::regconfig, coalesce(p_descripcion, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Texto libre -> tsquery de prefijos: "Ana  Ing." -> 'ana':* & 'ing':*
+CREATE OR REPLACE FUNCTION busqueda_prefijos(p_texto TEXT, p_config REGCONFIG)
+RETURNS TSQUERY AS $$
+    SELECT to_tsquery(p_config, string_agg(quote_literal(t) || ':*', ' & '))
+    FROM regexp_split_to_table(lower(coalesce(p_texto, '')), '[^[:alnum:]]+') AS t
+    WHERE t <> ''
+$$ LANGUAGE sql IMMUTABLE;
+
+
+-- Indices full-text
+CREATE INDEX IF NOT EXISTS idx_usuarios_busqueda
+    ON usuarios USING GIN (usuarios_documento(nombre_completo, email));
+CREATE INDEX IF NOT EXISTS idx_perfiles_busqueda
+    ON perfiles_profesionales USING GIN (
+        perfiles_documento(nombre_completo, carrera, hard_skills, soft_skills)
+    );
+CREATE INDEX IF NOT EXISTS idx_convocatorias_busqueda
+    ON convocatorias_laborales USING GIN (
+        convocatorias_documento(titulo, area, ubicacion, descripcion)
+    );
+
+-- Indices trigram (ilike '%t%' y tolerancia a errores de tipeo)
+CREATE INDEX IF NOT EXISTS idx_usuarios_email_trgm
+    ON usuarios USING GIN (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_usuarios_nombre_trgm
+    ON usuarios USING GIN (nombre_completo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_perfiles_nombre_trgm
+    ON perfiles_profesionales USING GIN (nombre_completo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_convocatorias_titulo_trgm
+    ON convocatorias_laborales USING GIN (titulo gin_trgm_ops);
+
+
+-- Busqueda unificada para el panel de administracion
+-- p_entidad: 'usuarios', 'perfiles', 'ofertas' o NULL (todas)
+CREATE OR REPLACE FUNCTION buscar_admin(
+    p_texto   TEXT,
+    p_entidad TEXT DEFAULT NULL,
+    p_limite  INTEGER DEFAULT 20
+)
+RETURNS TABLE (entidad TEXT, id UUID, titulo TEXT, detalle TEXT, rank REAL) AS $$
+    WITH q AS (
+        SELECT busqueda_prefijos(p_texto, 'simple')  AS simple,
+               busqueda_prefijos(p_texto, 'spanish') AS spanish,
+               lower(btrim(p_texto))                 AS texto
+    ),
+    resultados AS (
+        SELECT 'usuarios'::TEXT AS entidad,
+               u.id,
+               coalesce(u.nombre_completo, u.email) AS titulo,
+               u.email || ' - ' || u.rol AS detalle,
+               (ts_rank_cd(usuarios_documento(u.nombre_completo, u.email), q.simple)
+                + greatest(similarity(u.email, q.texto),
+                           similarity(coalesce(u.nombre_completo, ''), q.texto)))::REAL AS rank
+        FROM usuarios u, q
+        WHERE (p_entidad IS NULL OR p_entidad = 'usuarios')
+          AND (usuarios_documento(u.nombre_completo, u.email) @@ q.simple
+               OR u.email % q.texto
+               OR u.nombre_completo % q.texto)
+
+        UNION ALL
+
+        SELECT 'perfiles'::TEXT,
+               p.usuario_id,
+               coalesce(p.nombre_completo, 'Perfil sin nombre'),
+               coalesce(p.carrera, ''),
+               (ts_rank_cd(perfiles_documento(p.nombre_completo, p.carrera, p.hard_skills, p.soft_skills), q.spanish)
+                + similarity(coalesce(p.nombre_completo, ''), q.texto))::REAL
+        FROM perfiles_profesionales p, q
+        WHERE (p_entidad IS NULL OR p_entidad = 'perfiles')
+          AND (perfiles_documento(p.nombre_completo, p.carrera, p.hard_skills, p.soft_skills) @@ q.spanish
+               OR p.nombre_completo % q.texto)
+
+        UNION ALL
+
+        SELECT 'ofertas'::TEXT,
+               c.id,
+               c.titulo,
+               c.tipo || coalesce(' - ' || c.area, ''),
+               (ts_rank_cd(convocatorias_documento(c.titulo, c.area, c.ubicacion, c.descripcion), q.spanish)
+                + similarity(c.titulo, q.texto))::REAL
+        FROM convocatorias_laborales c, q
+        WHERE (p_entidad IS NULL OR p_entidad = 'ofertas')
+          AND (convocatorias_documento(c.titulo, c.area, c.ubicacion, c.descripcion) @@ q.spanish
+               OR c.titulo % q.texto)
+    )
+    SELECT r.entidad, r.id, r.titulo, r.detalle, r.rank
+    FROM resultados r
+    ORDER BY r.rank DESC, r.titulo
+    LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- FIN DE MIGRACION V14
+-- =====================================================
@@ -0,0 +1,28 @@
+-- =====================================================
+-- MIGRACION V9: Estadisticas de postulaciones por oferta
+-- =====================================================
+-- Vista agregada usada por el listado de convocatorias del ranking de
+-- administrador (GET /api/admin/ranking/convocatorias). Reemplaza una
+-- consulta a postulaciones por cada oferta con una sola consulta.
+-- =====================================================
+
+CREATE OR REPLACE VIEW postulaciones_stats_por_oferta AS
+SELECT
+    oferta_id,
+    COUNT(*)                                              AS total,
+    COUNT(*) FILTER (WHERE clasificacion = 'APTO')        AS apto,
+    COUNT(*) FILTER (WHERE clasificacion = 'CONSIDERADO') AS considerado,
+    COUNT(*) FILTER (WHERE clasificacion = 'NO_APTO')     AS no_apto,
+    MAX(match_score)                                      AS max_score,
+    AVG(match_score)                                      AS avg_score
+FROM postulaciones
+GROUP BY oferta_id;
+
+COMMENT ON VIEW postulaciones_stats_por_oferta IS
+    'Conteos por clasificacion y max/promedio de match_score agrupados por oferta';
+
+-- La agregacion recorre idx_postulaciones_oferta (migracion v4)
+
+-- =====================================================
+-- FIN DE MIGRACION V9
+-- =====================================================
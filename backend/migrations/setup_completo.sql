@@ -274,5 +274,350 @@ SELECT
     (SELECT AVG(match_score) FROM recomendaciones)                                         AS promedio_match_score,
     (SELECT COUNT(*) FROM institutional_profiles WHERE is_active = true)                   AS perfiles_institucionales_activos;
 -- ============================================================================
+-- 11. VISTA: postulaciones_stats_por_oferta (migración v9)
+--     Estadísticas de postulaciones agrupadas por oferta (ranking admin)
+-- ============================================================================
+CREATE OR REPLACE VIEW postulaciones_stats_por_oferta AS
+SELECT
+    oferta_id,
+    COUNT(*)                                              AS total,
+    COUNT(*) FILTER (WHERE clasificacion = 'APTO')        AS apto,
+    COUNT(*) FILTER (WHERE clasificacion = 'CONSIDERADO') AS considerado,
+    COUNT(*) FILTER (WHERE clasificacion = 'NO_APTO')     AS no_apto,
+    MAX(match_score)                                      AS max_score,
+    AVG(match_score)                                      AS avg_score
+FROM postulaciones
+GROUP BY oferta_id;
+-- ============================================================================
+-- 12. VISTAS: postulantes_por_oferta y ofertas_stats_por_institucion (migración v10)
+--     Agregados para los informes de /api/analytics
+-- ============================================================================
+CREATE OR REPLACE VIEW postulantes_por_oferta AS
+WITH por_rol AS (
+    SELECT
+        p.oferta_id,
+        COUNT(*) FILTER (WHERE u.rol = 'estudiante') AS estudiantes,
+        COUNT(*) FILTER (WHERE u.rol = 'titulado')   AS titulados
+    FROM postulaciones p
+    LEFT JOIN usuarios u ON u.id = p.usuario_id
+    GROUP BY p.oferta_id
+),
+por_carrera AS (
+    SELECT p.oferta_id, pp.carrera, COUNT(*) AS n
+    FROM postulaciones p
+    JOIN perfiles_profesionales pp ON pp.usuario_id = p.usuario_id
+    WHERE pp.carrera IS NOT NULL AND pp.carrera <> ''
+    GROUP BY p.oferta_id, pp.carrera
+)
+SELECT
+    r.oferta_id,
+    r.estudiantes,
+    r.titulados,
+    COALESCE(
+        (SELECT array_agg(c.carrera ORDER BY c.n DESC, c.carrera)
+         FROM por_carrera c
+         WHERE c.oferta_id = r.oferta_id),
+        '{}'
+    ) AS carreras
+FROM por_rol r;
+
+CREATE OR REPLACE VIEW ofertas_stats_por_institucion AS
+SELECT
+    o.institutional_profile_id,
+    COUNT(*) AS total_ofertas,
+    COUNT(*) FILTER (
+        WHERE o.is_active AND (o.fecha_cierre IS NULL OR o.fecha_cierre >= CURRENT_DATE)
+    ) AS ofertas_activas,
+    COALESCE(SUM(s.total), 0) AS total_postulaciones
+FROM convocatorias_laborales o
+LEFT JOIN postulaciones_stats_por_oferta s ON s.oferta_id = o.id
+WHERE o.institutional_profile_id IS NOT NULL
+GROUP BY o.institutional_profile_id;
+-- ============================================================================
+-- 13. TABLA: skills_frecuencia_diaria (migración v11)
+--     Nube de skills materializada, mantenida por trigger en perfiles_profesionales
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS skills_frecuencia_diaria (
+    tipo    TEXT    NOT NULL CHECK (tipo IN ('hard', 'soft')),
+    dia     DATE    NOT NULL,
+    skill   TEXT    NOT NULL,
+    total   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tipo, dia, skill)
+);
+
+COMMENT ON TABLE skills_frecuencia_diaria IS
+    'Frecuencia de skills por dia de actualizacion del perfil (mantenida por trigger)';
+
+ALTER TABLE skills_frecuencia_diaria ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Permitir acceso total skills frecuencia" ON skills_frecuencia_diaria;
+CREATE POLICY "Permitir acceso total skills frecuencia" ON skills_frecuencia_diaria
+    FOR ALL USING (true) WITH CHECK (true);
+
+-- Suma (signo = 1) o resta (signo = -1) el aporte de una lista de skills
+CREATE OR REPLACE FUNCTION skills_frecuencia_aplicar(
+    p_tipo   TEXT,
+    p_dia    DATE,
+    p_skills TEXT[],
+    p_signo  INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_dia IS NULL OR p_skills IS NULL OR cardinality(p_skills) = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO skills_frecuencia_diaria (tipo, dia, skill, total)
+    SELECT p_tipo, p_dia, s.skill, p_signo * COUNT(*)
+    FROM (
+        SELECT lower(btrim(x, E' \t\r\n')) AS skill FROM unnest(p_skills) AS x
+    ) s
+    WHERE s.skill IS NOT NULL AND s.skill <> ''
+    GROUP BY s.skill
+    ON CONFLICT (tipo, dia, skill)
+    DO UPDATE SET total = skills_frecuencia_diaria.total + EXCLUDED.total;
+
+    IF p_signo < 0 THEN
+        DELETE FROM skills_frecuencia_diaria
+        WHERE tipo = p_tipo AND dia = p_dia AND total <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION perfiles_skills_frecuencia_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_dia_old DATE;
+    v_dia_new DATE;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_dia_old := (OLD.updated_at AT TIME ZONE 'UTC')::date;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_dia_new := (NEW.updated_at AT TIME ZONE 'UTC')::date;
+    END IF;
+
+    -- Escrituras que no tocan skills ni cambian de dia no mueven contadores
+    IF TG_OP = 'UPDATE'
+       AND v_dia_old IS NOT DISTINCT FROM v_dia_new
+       AND OLD.hard_skills IS NOT DISTINCT FROM NEW.hard_skills
+       AND OLD.soft_skills IS NOT DISTINCT FROM NEW.soft_skills THEN
+        RETURN NEW;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM skills_frecuencia_aplicar('hard', v_dia_old, OLD.hard_skills, -1);
+        PERFORM skills_frecuencia_aplicar('soft', v_dia_old, OLD.soft_skills, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM skills_frecuencia_aplicar('hard', v_dia_new, NEW.hard_skills, 1);
+        PERFORM skills_frecuencia_aplicar('soft', v_dia_new, NEW.soft_skills, 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS perfiles_skills_frecuencia ON perfiles_profesionales;
+CREATE TRIGGER perfiles_skills_frecuencia
+    AFTER INSERT OR UPDATE OR DELETE ON perfiles_profesionales
+    FOR EACH ROW EXECUTE FUNCTION perfiles_skills_frecuencia_trigger();
+
+-- Nube de skills: suma de los contadores diarios en el rango [p_desde, p_hasta]
+-- (NULL = sin limite)
+CREATE OR REPLACE FUNCTION skills_cloud(
+    p_tipo   TEXT,
+    p_desde  DATE DEFAULT NULL,
+    p_hasta  DATE DEFAULT NULL,
+    p_limite INTEGER DEFAULT 15
+)
+RETURNS TABLE (skill TEXT, total BIGINT) AS $$
+    SELECT f.skill, SUM(f.total)::BIGINT AS total
+    FROM skills_frecuencia_diaria f
+    WHERE f.tipo = p_tipo
+      AND (p_desde IS NULL OR f.dia >= p_desde)
+      AND (p_hasta IS NULL OR f.dia <= p_hasta)
+    GROUP BY f.skill
+    HAVING SUM(f.total) > 0
+    ORDER BY total DESC, f.skill
+    LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
+
+-- Backfill / reconstruccion completa desde perfiles_profesionales
+CREATE OR REPLACE FUNCTION skills_frecuencia_recalcular()
+RETURNS INTEGER AS $$
+DECLARE
+    v_filas INTEGER;
+BEGIN
+    LOCK TABLE skills_frecuencia_diaria IN EXCLUSIVE MODE;
+    DELETE FROM skills_frecuencia_diaria;
+
+    INSERT INTO skills_frecuencia_diaria (tipo, dia, skill, total)
+    SELECT s.tipo, s.dia, s.skill, COUNT(*)
+    FROM (
+        SELECT 'hard' AS tipo, (p.updated_at AT TIME ZONE 'UTC')::date AS dia,
+               lower(btrim(x, E' \t\r\n')) AS skill
+        FROM perfiles_profesionales p, unnest(p.hard_skills) AS x
+        UNION ALL
+        SELECT 'soft', (p.updated_at AT TIME ZONE 'UTC')::date,
+               lower(btrim(x, E' \t\r\n'))
+        FROM perfiles_profesionales p, unnest(p.soft_skills) AS x
+    ) s
+    WHERE s.dia IS NOT NULL AND s.skill IS NOT NULL AND s.skill <> ''
+    GROUP BY s.tipo, s.dia, s.skill;
+
+    GET DIAGNOSTICS v_filas = ROW_COUNT;
+    RETURN v_filas;
+END;
+$$ LANGUAGE plpgsql;
+-- ============================================================================
+-- 14. TABLA: match_scores (migración v12)
+--     Matriz precalculada candidato x oferta, mantenida por el backend
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS match_scores (
+    usuario_id      UUID NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
+    oferta_id       UUID NOT NULL REFERENCES convocatorias_laborales(id) ON DELETE CASCADE,
+    match_score     NUMERIC(4,3) CHECK (match_score >= 0 AND match_score <= 1),
+    clasificacion   TEXT CHECK (clasificacion IN ('APTO', 'CONSIDERADO', 'NO_APTO')),
+    scores_detalle  JSONB,
+    match_details   JSONB,
+    fortalezas      TEXT[],
+    debilidades     TEXT[],
+    perfil_version  TEXT,
+    oferta_version  TEXT,
+    computed_at     TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc', now()),
+    PRIMARY KEY (usuario_id, oferta_id)
+);
+CREATE INDEX IF NOT EXISTS idx_match_scores_usuario_score ON match_scores (usuario_id, match_score DESC);
+CREATE INDEX IF NOT EXISTS idx_match_scores_oferta        ON match_scores (oferta_id);
+ALTER TABLE match_scores ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Permitir acceso total match scores" ON match_scores;
+CREATE POLICY "Permitir acceso total match scores" ON match_scores
+    FOR ALL USING (true) WITH CHECK (true);
+-- ============================================================================
+-- 15. ÍNDICES: paginación por cursor (migración v13)
+--     Keyset sobre (created_at, id) en los listados de usuarios y ofertas
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_usuarios_created_id                 ON usuarios (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_usuarios_rol_created_id             ON usuarios (rol, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_convocatorias_created_id            ON convocatorias_laborales (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_convocatorias_tipo_active_created_id ON convocatorias_laborales (tipo, is_active, created_at DESC, id DESC);
+-- ============================================================================
+-- 16. BÚSQUEDA: pg_trgm, documentos tsvector y buscar_admin (migración v14)
+--     Índices de expresión GIN (full-text) y trigram para la búsqueda admin
+-- ============================================================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- Documentos de busqueda (IMMUTABLE: requisito de los indices de expresion)
+CREATE OR REPLACE FUNCTION usuarios_documento(p_nombre TEXT, p_email TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('simple'::regconfig, coalesce(p_nombre, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig,
+               regexp_replace(coalesce(p_email, ''), '[@._-]+', ' ', 'g')), 'B')
+$$ LANGUAGE sql IMMUTABLE;
+CREATE OR REPLACE FUNCTION perfiles_documento(
+    p_nombre      TEXT,
+    p_carrera     TEXT,
+    p_hard_skills TEXT[],
+    p_soft_skills TEXT[]
+)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('spanish'::regconfig, coalesce(p_nombre, '')), 'A')
+        || setweight(to_tsvector('spanish'::regconfig, coalesce(p_carrera, '')), 'B')
+        || setweight(to_tsvector('spanish'::regconfig,
+               coalesce(array_to_string(p_hard_skills || p_soft_skills, ' '), '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+CREATE OR REPLACE FUNCTION convocatorias_documento(
+    p_titulo      TEXT,
+    p_area        TEXT,
+    p_ubicacion   TEXT,
+    p_descripcion TEXT
+)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('spanish'::regconfig, coalesce(p_titulo, '')), 'A')
+        || setweight(to_tsvector('spanish'::regconfig,
+               coalesce(p_area, '') || ' ' || coalesce(p_ubicacion, '')), 'B')
+        || setweight(to_tsvector('spanish'::regconfig, coalesce(p_descripcion, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+-- Texto libre -> tsquery de prefijos: "Ana  Ing." -> 'ana':* & 'ing':*
+CREATE OR REPLACE FUNCTION busqueda_prefijos(p_texto TEXT, p_config REGCONFIG)
+RETURNS TSQUERY AS $$
+    SELECT to_tsquery(p_config, string_agg(quote_literal(t) || ':*', ' & '))
+    FROM regexp_split_to_table(lower(coalesce(p_texto, '')), '[^[:alnum:]]+') AS t
+    WHERE t <> ''
+$$ LANGUAGE sql IMMUTABLE;
+-- Indices full-text
+CREATE INDEX IF NOT EXISTS idx_usuarios_busqueda
+    ON usuarios USING GIN (usuarios_documento(nombre_completo, email));
+CREATE INDEX IF NOT EXISTS idx_perfiles_busqueda
+    ON perfiles_profesionales USING GIN (
+        perfiles_documento(nombre_completo, carrera, hard_skills, soft_skills)
+    );
+CREATE INDEX IF NOT EXISTS idx_convocatorias_busqueda
+    ON convocatorias_laborales USING GIN (
+        convocatorias_documento(titulo, area, ubicacion, descripcion)
+    );
+-- Indices trigram (ilike '%t%' y tolerancia a errores de tipeo)
+CREATE INDEX IF NOT EXISTS idx_usuarios_email_trgm
+    ON usuarios USING GIN (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_usuarios_nombre_trgm
+    ON usuarios USING GIN (nombre_completo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_perfiles_nombre_trgm
+    ON perfiles_profesionales USING GIN (nombre_completo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_convocatorias_titulo_trgm
+    ON convocatorias_laborales USING GIN (titulo gin_trgm_ops);
+-- Busqueda unificada para el panel de administracion
+-- p_entidad: 'usuarios', 'perfiles', 'ofertas' o NULL (todas)
+CREATE OR REPLACE FUNCTION buscar_admin(
+    p_texto   TEXT,
+    p_entidad TEXT DEFAULT NULL,
+    p_limite  INTEGER DEFAULT 20
+)
+RETURNS TABLE (entidad TEXT, id UUID, titulo TEXT, detalle TEXT, rank REAL) AS $$
+    WITH q AS (
+        SELECT busqueda_prefijos(p_texto, 'simple')  AS simple,
+               busqueda_prefijos(p_texto, 'spanish') AS spanish,
+               lower(btrim(p_texto))                 AS texto
+    ),
+    resultados AS (
+        SELECT 'usuarios'::TEXT AS entidad,
+               u.id,
+               coalesce(u.nombre_completo, u.email) AS titulo,
+               u.email || ' - ' || u.rol AS detalle,
+               (ts_rank_cd(usuarios_documento(u.nombre_completo, u.email), q.simple)
+                + greatest(similarity(u.email, q.texto),
+                           similarity(coalesce(u.nombre_completo, ''), q.texto)))::REAL AS rank
+        FROM usuarios u, q
+        WHERE (p_entidad IS NULL OR p_entidad = 'usuarios')
+          AND (usuarios_documento(u.nombre_completo, u.email) @@ q.simple
+               OR u.email % q.texto
+               OR u.nombre_completo % q.texto)
+        UNION ALL
+        SELECT 'perfiles'::TEXT,
+               p.usuario_id,
+               coalesce(p.nombre_completo, 'Perfil sin nombre'),
+               coalesce(p.carrera, ''),
+               (ts_rank_cd(perfiles_documento(p.nombre_completo, p.carrera, p.hard_skills, p.soft_skills), q.spanish)
+                + similarity(coalesce(p.nombre_completo, ''), q.texto))::REAL
+        FROM perfiles_profesionales p, q
+        WHERE (p_entidad IS NULL OR p_entidad = 'perfiles')
+          AND (perfiles_documento(p.nombre_completo, p.carrera, p.hard_skills, p.soft_skills) @@ q.spanish
+               OR p.nombre_completo % q.texto)
+        UNION ALL
+        SELECT 'ofertas'::TEXT,
+               c.id,
+               c.titulo,
+               c.tipo || coalesce(' - ' || c.area, ''),
+               (ts_rank_cd(convocatorias_documento(c.titulo, c.area, c.ubicacion, c.descripcion), q.spanish)
+                + similarity(c.titulo, q.texto))::REAL
+        FROM convocatorias_laborales c, q
+        WHERE (p_entidad IS NULL OR p_entidad = 'ofertas')
+          AND (convocatorias_documento(c.titulo, c.area, c.ubicacion, c.descripcion) @@ q.spanish
+               OR c.titulo % q.texto)
+    )
+    SELECT r.entidad, r.id, r.titulo, r.detalle, r.rank
+    FROM resultados r
+    ORDER BY r.rank DESC, r.titulo
+    LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
+-- ============================================================================
 -- ¡SETUP COMPLETO! La base de datos está lista para usar.
 -- ============================================================================
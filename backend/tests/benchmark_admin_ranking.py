@@ -0,0 +1,64 @@
+"""
+Benchmark del ranking de administrador (N+1 vs consultas agrupadas)
+Compara round trips y latencia contra una base de datos local simulada
+(fake_supabase con latencia fija por consulta).
+
+Uso:
+    python tests/benchmark_admin_ranking.py [latencia_ms]
+"""
+
+import os
+import sys
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_supabase import FakeSupabase
+from test_admin_ranking_queries import _tables
+
+import app.api.routes.admin_ranking as admin_ranking
+
+
+def load_ranked_candidatos_n_plus_1(client, oferta_id: str, top_n: int):
+    """Patron anterior: count aparte + perfil y usuario por candidato"""
+    posts = client.table("postulaciones").select("*").eq("oferta_id", oferta_id) \
+        .order("match_score", desc=True).limit(top_n).execute().data or []
+    client.table("postulaciones").select("id", count="exact").eq("oferta_id", oferta_id).execute()
+
+    candidatos = []
+    for post in posts:
+        perfil = client.table("perfiles_profesionales").select(admin_ranking.PERFIL_COLUMNS) \
+            .eq("usuario_id", post["usuario_id"]).execute().data
+        usuario = client.table("usuarios").select("email, nombre_completo, rol") \
+            .eq("id", post["usuario_id"]).execute().data
+        candidatos.append((post, perfil, usuario))
+    return candidatos
+
+
+def run(latency_ms: float = 5.0):
+    print("=" * 70)
+    print(f"BENCHMARK RANKING ADMIN (latencia simulada: {latency_ms} ms/consulta)")
+    print("=" * 70)
+    print(f"{'top_n':>6} | {'antes: consultas':>16} | {'antes: ms':>9} | "
+          f"{'ahora: consultas':>16} | {'ahora: ms':>9}")
+
+    for top_n in (3, 20, 50):
+        before = FakeSupabase(_tables(500), latency=latency_ms / 1000)
+        start = time.perf_counter()
+        load_ranked_candidatos_n_plus_1(before, "o1", top_n)
+        before_ms = (time.perf_counter() - start) * 1000
+
+        after = FakeSupabase(_tables(500), latency=latency_ms / 1000)
+        admin_ranking.supabase = after
+        start = time.perf_counter()
+        admin_ranking._load_ranked_candidatos("o1", top_n)
+        after_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{top_n:>6} | {len(before.queries):>16} | {before_ms:>9.1f} | "
+              f"{len(after.queries):>16} | {after_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
@@ -0,0 +1,66 @@
+"""
+Benchmark del listado de usuarios de admin (N+1 vs consulta agrupada)
+Compara round trips y latencia contra una base de datos local simulada
+(fake_supabase con latencia fija por consulta).
+
+Uso:
+    python tests/benchmark_list_users.py [latencia_ms]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_supabase import FakeSupabase
+from test_list_users_queries import _tables
+
+import app.api.endpoints.users as users_module
+
+
+def list_users_n_plus_1(client, page_size: int):
+    """Patron anterior: select("*") y una consulta de perfil por usuario"""
+    users = client.table("usuarios").select("*", count="exact") \
+        .range(0, page_size - 1).order("created_at", desc=True).execute().data or []
+
+    rows = []
+    for user in users:
+        profile = client.table("perfiles_profesionales") \
+            .select("id, is_complete, completeness_score, cv_uploaded_at") \
+            .eq("usuario_id", user["id"]).execute().data
+        rows.append((user, profile))
+    return rows
+
+
+def run(latency_ms: float = 5.0):
+    print("=" * 70)
+    print(f"BENCHMARK LISTADO DE USUARIOS (latencia simulada: {latency_ms} ms/consulta)")
+    print("=" * 70)
+    print(f"{'page':>6} | {'antes: consultas':>16} | {'antes: ms':>9} | "
+          f"{'ahora: consultas':>16} | {'ahora: ms':>9}")
+
+    for page_size in (20, 50, 100):
+        before = FakeSupabase(_tables(1000), latency=latency_ms / 1000)
+        start = time.perf_counter()
+        list_users_n_plus_1(before, page_size)
+        before_ms = (time.perf_counter() - start) * 1000
+
+        after = FakeSupabase(_tables(1000), latency=latency_ms / 1000)
+        users_module.supabase = after
+        start = time.perf_counter()
+        asyncio.run(users_module.list_users(
+            page=1, page_size=page_size, role=None, search=None,
+            cursor=None, count='estimated', current_user={}
+        ))
+        after_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{page_size:>6} | {len(before.queries):>16} | {before_ms:>9.1f} | "
+              f"{len(after.queries):>16} | {after_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
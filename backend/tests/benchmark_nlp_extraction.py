@@ -0,0 +1,54 @@
+"""
+Benchmark del analisis regex de CVs (patrones por llamada vs precompilados)
+Compara la implementacion anterior (un re.search por keyword de carrera y un
+bucle de keywords por linea para las secciones) con analyze_cv_text sobre un
+corpus de CVs de ejemplo.
+
+Uso:
+    python tests/benchmark_nlp_extraction.py [cantidad_cvs] [repeticiones]
+"""
+
+import os
+import sys
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from test_nlp_analyzer import _corpus, legacy_analyze
+
+from app.core import nlp
+
+
+def _time_ms(fn, texts, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(size: int = 200, repeats: int = 20):
+    print("=" * 70)
+    print(f"BENCHMARK ANALISIS DE CVs ({size} CVs x {repeats} repeticiones)")
+    print("=" * 70)
+    print(f"{'texto':>10} | {'antes: ms':>10} | {'ahora: ms':>10} | {'speedup':>8}")
+
+    raw = _corpus(size)
+    for label, texts in (("crudo", raw), ("limpio", [nlp.clean_text(t) for t in raw])):
+        # Calentar la cache de re y los patrones
+        legacy_analyze(texts[0])
+        nlp.analyze_cv_text(texts[0])
+
+        before_ms = _time_ms(legacy_analyze, texts, repeats)
+        after_ms = _time_ms(nlp.analyze_cv_text, texts, repeats)
+
+        print(f"{label:>10} | {before_ms:>10.1f} | {after_ms:>10.1f} | {before_ms / after_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
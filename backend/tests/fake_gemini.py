@@ -0,0 +1,38 @@
+"""
+Servidor Gemini falso para tests
+Reemplaza a llm_extractor._call_gemini_sync: aplica una cuota de requests
+por key en una ventana de tiempo (con la ventana corta los tests son
+rapidos), responde 429 con "retry in Ns" como la API real al excederla y
+simula latencia. Registra las llamadas por key.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+
+class FakeGeminiServer:
+    def __init__(self, quota_per_key=None, window: float = 1.0, latency: float = 0.0, retry_after: float = 0.05):
+        self.quota_per_key = quota_per_key or {}
+        self.window = window
+        self.latency = latency
+        self.retry_after = retry_after
+        self.calls = defaultdict(list)
+        self.quota_errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, key=None):
+        now = time.monotonic()
+        with self._lock:
+            recent = [t for t in self.calls[key] if now - t < self.window]
+            quota = self.quota_per_key.get(key)
+            if quota is not None and len(recent) >= quota:
+                self.quota_errors[key] += 1
+                raise Exception(
+                    f"429 Resource has been exhausted (e.g. check quota). Please retry in {self.retry_after}s."
+                )
+            self.calls[key].append(now)
+
+        if self.latency:
+            time.sleep(self.latency)
+        return {"hard_skills": ["Python"], "soft_skills": [], "education": [], "experience": []}
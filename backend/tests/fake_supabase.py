@@ -0,0 +1,204 @@
+"""
+Cliente Supabase en memoria para tests
+Implementa el subconjunto del query builder que usan los servicios
+(select / eq / lt / lte / gt / gte / in_ / or_ / order / range / limit / upsert /
+update / delete / execute, y rpc sobre funciones Python) y cuenta las consultas
+ejecutadas para poder verificar patrones N+1. Con latency > 0 cada execute()
+simula el round trip a la base de datos.
+"""
+
+import time
+
+from postgrest.exceptions import APIError
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.order_by = []
+        self.offset = 0
+        self.limit_n = None
+        self.count = None
+        self.upsert_rows = None
+        self.on_conflict = None
+        self.update_values = None
+        self.delete_rows = False
+
+    def select(self, columns="*", count=None):
+        self.count = count
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(_condition(column, "lt", value))
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(_condition(column, "lte", value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(_condition(column, "gt", value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(_condition(column, "gte", value))
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, conditions):
+        # Sintaxis PostgREST: "col.op.valor,col.op.valor" (is.null, eq, gt, gte, lt, lte, ilike)
+        checks = []
+        for condition in conditions.split(","):
+            column, op, value = condition.split(".", 2)
+            checks.append(_condition(column, op, value))
+        self.filters.append(lambda row: any(check(row) for check in checks))
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.limit_n = end - start + 1
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def upsert(self, rows, on_conflict=""):
+        self.upsert_rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        return self
+
+    def delete(self):
+        self.delete_rows = True
+        return self
+
+    def update(self, values):
+        self.update_values = values
+        return self
+
+    def execute(self):
+        self.client.queries.append(self.table)
+        if self.client.latency:
+            time.sleep(self.client.latency)
+
+        if self.upsert_rows is not None:
+            return FakeResponse(self._apply_upsert())
+
+        rows = [r for r in self.client.tables.get(self.table, []) if all(f(r) for f in self.filters)]
+        if self.delete_rows:
+            table = self.client.tables.get(self.table, [])
+            table[:] = [r for r in table if not all(f(r) for f in self.filters)]
+            return FakeResponse([dict(r) for r in rows])
+        if self.update_values is not None:
+            for row in rows:
+                row.update(self.update_values)
+            return FakeResponse([dict(r) for r in rows])
+
+        # Orden estable por columnas, de la ultima a la primera
+        for column, desc in reversed(self.order_by):
+            rows.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+
+        total = len(rows)
+        rows = rows[self.offset:]
+        if self.limit_n is not None:
+            rows = rows[:self.limit_n]
+
+        return FakeResponse([dict(r) for r in rows], total if self.count else None)
+
+    def _apply_upsert(self):
+        table = self.client.tables.setdefault(self.table, [])
+        saved = []
+        keys = [k.strip() for k in self.on_conflict.split(",") if k.strip()]
+        for new_row in self.upsert_rows:
+            existing = next(
+                (r for r in table if keys and all(r.get(k) == new_row.get(k) for k in keys)),
+                None
+            )
+            if existing is None:
+                # Valores por defecto de la tabla (id, created_at...) para filas nuevas
+                default = self.client.defaults.get(self.table)
+                existing = dict(default()) if default else {}
+                table.append(existing)
+            existing.update(new_row)
+            saved.append(dict(existing))
+        return saved
+
+
+def _condition(column, op, value):
+    # Valores entre comillas dobles (reservados de PostgREST: fechas, uuids)
+    value = str(value)
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if op == "is":
+        return lambda row: row.get(column) is None
+    if op == "ilike":
+        needle = value.strip("%*").lower()
+        return lambda row: needle in str(row.get(column) or "").lower()
+    compare = {
+        "eq": lambda a, b: a == b,
+        "gt": lambda a, b: a > b,
+        "gte": lambda a, b: a >= b,
+        "lt": lambda a, b: a < b,
+        "lte": lambda a, b: a <= b,
+    }[op]
+    return lambda row: row.get(column) is not None and compare(str(row.get(column)), value)
+
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def delete(self):
+        self.delete_rows = True
+        return self
+
+    def update(self, values):
+        self.update_values = values
+        return self
+
+    def execute(self):
+        self.client.queries.append(f"rpc:{self.name}")
+        if self.name not in self.client.functions:
+            # Lo mismo que PostgREST cuando la funcion no esta en el schema cache
+            raise APIError({
+                "code": "PGRST202",
+                "message": f"Could not find the function public.{self.name} in the schema cache",
+            })
+        return FakeResponse(self.client.functions[self.name](**self.params))
+
+
+class FakeSupabase:
+    def __init__(self, tables=None, latency: float = 0.0, functions=None, defaults=None):
+        self.tables = tables or {}
+        self.queries = []
+        self.latency = latency
+        self.functions = functions or {}
+        self.defaults = defaults or {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeRpc(self, name, params or {})
@@ -0,0 +1,80 @@
+"""
+Test de consultas del ranking de administrador
+Verifica que el ranking usa un numero constante de consultas (sin N+1)
+"""
+
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.api.routes.admin_ranking as admin_ranking
+
+
+def _tables(n: int):
+    return {
+        "postulaciones": [
+            {
+                "id": f"p{i}",
+                "oferta_id": "o1" if i % 4 else "o2",
+                "usuario_id": f"u{i}",
+                "match_score": round(i / 100, 2),
+                "clasificacion": "APTO",
+                "estado": "pendiente",
+            }
+            for i in range(n)
+        ],
+        "perfiles_profesionales": [
+            {
+                "usuario_id": f"u{i}",
+                "nombre_completo": f"Candidato {i}" if i % 2 else None,
+                "hard_skills": ["Python"],
+                "gemini_extraction": {"hard_skills": ["Python"]},
+            }
+            for i in range(n)
+        ],
+        "usuarios": [
+            {"id": f"u{i}", "email": f"u{i}@emi.edu.bo", "nombre_completo": f"Usuario {i}", "rol": "estudiante"}
+            for i in range(n)
+        ],
+    }
+
+
+def test_ranking_uses_constant_queries(monkeypatch):
+    """Top 50 cuesta 3 consultas y conserva el orden y los datos"""
+    fake = FakeSupabase(_tables(120))
+    monkeypatch.setattr(admin_ranking, "supabase", fake)
+
+    candidatos, total = admin_ranking._load_ranked_candidatos("o1", 50)
+
+    assert len(fake.queries) == 3
+    assert total == 90
+    assert len(candidatos) == 50
+    assert [c["rank"] for c in candidatos] == list(range(1, 51))
+    assert candidatos[0]["usuario_id"] == "u119"
+    assert candidatos[0]["perfil"]["nombre_completo"] == "Candidato 119"
+    assert candidatos[1]["perfil"]["nombre_completo"] == "Usuario 118"
+    assert candidatos[0]["perfil"]["rol"] == "estudiante"
+    assert "gemini_extraction" not in candidatos[0]
+
+    informe, _ = admin_ranking._load_ranked_candidatos("o1", 5, include_gemini=True)
+    assert informe[0]["gemini_extraction"] == {"hard_skills": ["Python"]}
+
+
+def test_empty_ranking_single_query(monkeypatch):
+    """Sin postulaciones no se consultan perfiles ni usuarios"""
+    fake = FakeSupabase(_tables(0))
+    monkeypatch.setattr(admin_ranking, "supabase", fake)
+
+    candidatos, total = admin_ranking._load_ranked_candidatos("o1", 10)
+
+    assert candidatos == [] and total == 0
+    assert fake.queries == ["postulaciones"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,106 @@
+"""
+Test de la busqueda del panel de administracion
+Verifica que se usa la funcion buscar_admin (una sola llamada) y, sin la
+migracion v14, la busqueda por prefijos con ilike y ranking en Python (solo
+si la funcion no existe; otros errores de la base se propagan)
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from fake_supabase import FakeSupabase
+
+import app.api.routes.admin_search as admin_search
+from app.db import search_repository
+
+
+def _tables():
+    return {
+        "usuarios": [
+            {"id": "u1", "email": "ana.ingrid@ucb.edu.bo", "nombre_completo": "Ana Ingrid Rojas", "rol": "estudiante"},
+            {"id": "u2", "email": "mariana@ucb.edu.bo", "nombre_completo": "Mariana Quispe", "rol": "titulado"},
+            {"id": "u3", "email": "operador@ucb.edu.bo", "nombre_completo": None, "rol": "operador"},
+        ],
+        "perfiles_profesionales": [
+            {"usuario_id": "u1", "nombre_completo": "Ana Ingrid Rojas", "carrera": "Ingenieria de Sistemas"},
+            {"usuario_id": "u2", "nombre_completo": "Mariana Quispe", "carrera": "Administracion de Empresas"},
+        ],
+        "convocatorias_laborales": [
+            {"id": "o1", "titulo": "Pasantia Ingenieria de Datos", "tipo": "pasantia", "area": "Tecnologia"},
+            {"id": "o2", "titulo": "Analista Contable", "tipo": "empleo", "area": None},
+        ],
+    }
+
+
+def test_uses_ranked_database_function():
+    calls = []
+
+    def buscar_admin(p_texto, p_entidad, p_limite):
+        calls.append((p_texto, p_entidad, p_limite))
+        return [{"entidad": "ofertas", "id": "o1", "titulo": "Pasantia Ingenieria de Datos",
+                 "detalle": "pasantia - Tecnologia", "rank": "0.61"}]
+
+    fake = FakeSupabase(_tables(), functions={"buscar_admin": buscar_admin})
+    results = search_repository.search(fake, "ingen", entidad="ofertas", limit=5)
+
+    assert fake.queries == ["rpc:buscar_admin"]
+    assert calls == [("ingen", "ofertas", 5)]
+    assert results[0]["rank"] == 0.61
+
+
+def test_fallback_prefix_search_and_ranking():
+    fake = FakeSupabase(_tables())
+
+    results = search_repository.search(fake, "Ana ing")
+    # Todos los terminos deben aparecer; el prefijo en el titulo pesa mas
+    assert [(r["entidad"], r["id"]) for r in results] == [("usuarios", "u1"), ("perfiles", "u1")]
+    assert results[0]["rank"] == 1.0
+
+    ingenieria = search_repository.search(fake, "ingenieria", entidad="ofertas")
+    assert [r["id"] for r in ingenieria] == ["o1"]
+
+    # "ana" dentro de "mariana" cuenta, pero por debajo de un prefijo
+    ana = search_repository.search(fake, "ana", entidad="usuarios")
+    assert [r["id"] for r in ana] == ["u1", "u2"]
+    assert ana[0]["rank"] > ana[1]["rank"]
+
+    assert search_repository.search(fake, "  ..  ") == []
+    with pytest.raises(ValueError):
+        search_repository.search(fake, "ana", entidad="roles")
+
+
+def test_other_database_errors_are_not_hidden():
+    def buscar_admin(p_texto, p_entidad, p_limite):
+        raise APIError({"code": "57014", "message": "canceling statement due to statement timeout"})
+
+    fake = FakeSupabase(_tables(), functions={"buscar_admin": buscar_admin})
+    with pytest.raises(APIError) as error:
+        search_repository.search(fake, "ingen")
+
+    # Sin fallback: ningun scan con ilike despues del error
+    assert error.value.code == "57014"
+    assert fake.queries == ["rpc:buscar_admin"]
+
+
+def test_endpoint(monkeypatch):
+    monkeypatch.setattr(admin_search, "supabase", FakeSupabase(_tables()))
+
+    body = asyncio.run(admin_search.search(q="contable", entidad=None, limit=10, current_user={}))
+    assert body["total"] == 1 and body["resultados"][0]["id"] == "o2"
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(admin_search.search(q="ana", entidad="roles", limit=10, current_user={}))
+    assert error.value.status_code == 400
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,172 @@
+"""
+Test de informes de analytics con agregados del servidor
+Verifica que los informes leen las vistas agregadas (migraciones v9-v11)
+y nunca descargan postulaciones, usuarios ni perfiles completos; el
+reporte de usuarios solo lee los perfiles de los usuarios filtrados
+"""
+
+import asyncio
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.api.endpoints.analytics as analytics
+
+RAW_TABLES = {"postulaciones", "usuarios", "perfiles_profesionales"}
+
+
+def _tables():
+    inst = {"institution_name": "Banco Union", "sector": "Finanzas", "tipo_institucion": "Privada"}
+    return {
+        "convocatorias_laborales": [
+            {"id": "o1", "titulo": "Dev", "tipo": "pasantia", "modalidad": "remoto", "is_active": True,
+             "fecha_cierre": None, "cupos_disponibles": 2, "created_at": "2025-02-01",
+             "institutional_profile_id": "i1", "institutional_profiles": inst},
+            {"id": "o2", "titulo": "Analista", "tipo": "empleo", "modalidad": "presencial", "is_active": True,
+             "fecha_cierre": None, "cupos_disponibles": 1, "created_at": "2025-01-01",
+             "institutional_profile_id": "i1", "institutional_profiles": inst},
+        ],
+        "institutional_profiles": [
+            {"id": "i1", "institution_name": "Banco Union", "sector": "Finanzas", "is_active": True,
+             "created_at": "2025-01-01"},
+        ],
+        "postulaciones_stats_por_oferta": [
+            {"oferta_id": "o1", "total": 3, "apto": 2, "considerado": 1, "no_apto": 0,
+             "max_score": 0.9, "avg_score": "0.75"},
+        ],
+        "postulantes_por_oferta": [
+            {"oferta_id": "o1", "estudiantes": 2, "titulados": 1,
+             "carreras": ["Sistemas", "Civil", "Industrial", "Comercial"]},
+        ],
+        "ofertas_stats_por_institucion": [
+            {"institutional_profile_id": "i1", "total_ofertas": 2, "ofertas_activas": 2,
+             "total_postulaciones": 3},
+        ],
+    }
+
+
+def _call(endpoint, **kwargs):
+    # Los parametros Query() deben pasarse explicitamente fuera de FastAPI
+    defaults = {name: None for name in endpoint.__code__.co_varnames[:endpoint.__code__.co_argcount]}
+    defaults.update(kwargs, current_user={"role": "administrador"})
+    return asyncio.run(endpoint(**defaults))
+
+
+def test_offers_report_uses_aggregated_views(monkeypatch):
+    fake = FakeSupabase(_tables())
+    monkeypatch.setattr(analytics, "supabase", fake)
+
+    report = _call(analytics.get_offers_report)
+    by_id = {o["id"]: o for o in report["ofertas"]}
+
+    assert by_id["o1"]["total_postulaciones"] == 3
+    assert by_id["o1"]["avg_match_score"] == 75.0
+    assert by_id["o1"]["aptos"] == 2
+    assert by_id["o1"]["postulantes_titulados"] == 1
+    assert by_id["o1"]["top_carreras"] == ["Sistemas", "Civil", "Industrial"]
+    assert by_id["o2"]["total_postulaciones"] == 0
+    assert by_id["o2"]["avg_match_score"] is None
+    assert report["stats"]["total_postulaciones"] == 3
+    assert not RAW_TABLES & set(fake.queries)
+
+    # El filtro por carrera considera todas las carreras, no solo el top 3
+    fake.queries.clear()
+    filtered = _call(analytics.get_offers_report, carrera_postulante="comercial")
+    assert [o["id"] for o in filtered["ofertas"]] == ["o1"]
+
+
+def test_profiles_and_compliance_reports(monkeypatch):
+    fake = FakeSupabase(_tables())
+    monkeypatch.setattr(analytics, "supabase", fake)
+
+    profiles = _call(analytics.get_profiles_report)
+    assert profiles["profiles"][0]["total_ofertas"] == 2
+    assert profiles["profiles"][0]["total_postulaciones"] == 3
+
+    compliance = _call(analytics.get_compliance_report)
+    by_id = {c["id"]: c for c in compliance["convocatorias"]}
+    assert by_id["o1"]["pct_cumplimiento"] == 100.0
+    assert by_id["o2"]["aptos"] == 0
+
+    positions = _call(analytics.get_positions_by_sector)
+    assert positions["summary_by_tipo"]["Privada"]["total_postulaciones"] == 3
+    assert not RAW_TABLES & set(fake.queries)
+
+
+def test_users_report_fetches_only_filtered_profiles(monkeypatch):
+    tables = _tables()
+    tables["usuarios"] = [
+        {"id": "u1", "email": "ana@ucb.edu.bo", "nombre_completo": None, "rol": "estudiante",
+         "created_at": "2025-03-01"},
+        {"id": "u2", "email": "luis@ucb.edu.bo", "nombre_completo": "Luis", "rol": "titulado",
+         "created_at": "2025-03-02"},
+        {"id": "u3", "email": "eva@ucb.edu.bo", "nombre_completo": "Eva", "rol": "estudiante",
+         "created_at": "2024-06-01"},
+    ]
+    tables["perfiles_profesionales"] = [
+        {"usuario_id": u, "is_complete": True, "cv_filename": "cv.pdf", "cv_uploaded_at": "2025-03-05",
+         "completeness_score": 0.8, "updated_at": "2025-03-05", "carrera": "Sistemas",
+         "semestre_actual": 6, "hard_skills": ["Python"], "soft_skills": [], "nombre_completo": "Ana"}
+        for u in ("u1", "u2", "u3")
+    ]
+    fake = FakeSupabase(tables)
+    monkeypatch.setattr(analytics, "supabase", fake)
+
+    requested = []
+    fetch_by_ids = analytics.fetch_by_ids
+
+    def spy(client, table, column, ids, columns="*"):
+        requested.append((table, list(ids)))
+        return fetch_by_ids(client, table, column, ids, columns)
+
+    monkeypatch.setattr(analytics, "fetch_by_ids", spy)
+
+    report = _call(analytics.get_users_report, start_date="2025-01-01", role="estudiante")
+
+    # Los perfiles se piden solo para los usuarios que pasaron fecha y rol
+    assert requested == [("perfiles_profesionales", ["u1"])]
+    assert [u["id"] for u in report["users"]] == ["u1"]
+    assert report["users"][0]["nombre_completo"] == "Ana"
+    assert report["stats"]["with_cv"] == 1
+
+
+def test_skills_cloud_reads_materialized_counts(monkeypatch):
+    calls = []
+
+    def skills_cloud(p_tipo, p_desde, p_hasta, p_limite):
+        calls.append((p_tipo, p_desde, p_hasta, p_limite))
+        return [{"skill": "python", "total": 4}] if p_tipo == "hard" else [{"skill": "liderazgo", "total": 2}]
+
+    fake = FakeSupabase(_tables(), functions={"skills_cloud": skills_cloud})
+    monkeypatch.setattr(analytics, "supabase", fake)
+
+    cloud = _call(analytics.get_skills_cloud, start_date="2025-01-01", end_date="2025-01-31")
+    assert cloud == {
+        "hard_skills": [{"name": "python", "count": 4}],
+        "soft_skills": [{"name": "liderazgo", "count": 2}],
+    }
+    assert calls[0] == ("hard", "2025-01-01", "2025-01-31", 15)
+    assert "perfiles_profesionales" not in fake.queries
+
+
+def test_skills_cloud_falls_back_without_migration(monkeypatch):
+    tables = _tables()
+    tables["perfiles_profesionales"] = [
+        {"hard_skills": [" Python", "SQL"], "soft_skills": ["Liderazgo"]},
+        {"hard_skills": ["python"], "soft_skills": []},
+    ]
+    fake = FakeSupabase(tables)
+    monkeypatch.setattr(analytics, "supabase", fake)
+
+    cloud = _call(analytics.get_skills_cloud)
+    assert cloud["hard_skills"][0] == {"name": "python", "count": 2}
+    assert cloud["soft_skills"] == [{"name": "liderazgo", "count": 1}]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
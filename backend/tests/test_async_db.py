@@ -0,0 +1,75 @@
+"""
+Test de la capa asincrona de base de datos
+Verifica timeout, limite de concurrencia y el envoltorio del query builder
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.db.async_client as async_client
+from app.db.async_client import DatabaseTimeoutError, async_db, run_db
+
+
+def test_query_builder_runs_in_pool():
+    """execute() asincrono devuelve lo mismo que el cliente sincrono"""
+    fake = FakeSupabase({"usuarios": [{"id": "u1", "rol": "estudiante"}, {"id": "u2", "rol": "titulado"}]})
+
+    async def main():
+        query = async_db(fake).table("usuarios").select("*")
+        query = query.eq("rol", "titulado")
+        return await query.execute()
+
+    response = asyncio.run(main())
+    assert [r["id"] for r in response.data] == ["u2"]
+    assert fake.queries == ["usuarios"]
+
+
+def test_timeout_raises_database_timeout():
+    """Una consulta lenta se corta con DatabaseTimeoutError"""
+    async def main():
+        await run_db(time.sleep, 0.5, timeout=0.05)
+
+    try:
+        asyncio.run(main())
+    except DatabaseTimeoutError:
+        pass
+    else:
+        raise AssertionError("Se esperaba DatabaseTimeoutError")
+
+
+def test_concurrency_limit_across_loops(monkeypatch):
+    """Nunca hay mas de DB_MAX_CONCURRENCY consultas en vuelo, en cada loop"""
+    monkeypatch.setattr(async_client.settings, "DB_MAX_CONCURRENCY", 2)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def slow_query():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return True
+
+    async def main():
+        return await asyncio.gather(*(run_db(slow_query) for _ in range(8)))
+
+    # Dos event loops distintos: cada uno con su propio semaforo
+    for _ in range(2):
+        assert all(asyncio.run(main()))
+        assert state["peak"] == 2
+        state["peak"] = 0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
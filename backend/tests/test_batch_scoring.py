@@ -0,0 +1,121 @@
+"""
+Test de scoring en lote
+Verifica que la ruta vectorizada produce los mismos resultados que la
+evaluacion oferta por oferta
+"""
+
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from app.ml.models import MatchPredictor
+from app.scoring.feature_engineering import (
+    extract_features,
+    extract_features_batch,
+    calculate_final_score,
+    calculate_final_scores_batch,
+)
+from app.services.ml_integration_service import get_ml_service
+
+
+gemini_output = {
+    "personal_info": {"languages": ["Espanol (Nativo)", "Ingles (B2)"]},
+    "hard_skills": ["Python", "React", "SQL", "Docker"],
+    "soft_skills": ["Liderazgo", "Trabajo en equipo"],
+    "education": [{"degree": "Ingenieria de Sistemas", "institution": "EMI"}],
+    "experience": [{"role": "Developer", "duration": "2 anios"}],
+}
+
+
+def _config(i: int, languages: float = 0.10) -> dict:
+    return {
+        "id": f"oferta-{i}",
+        "weights": {
+            "hard_skills": 0.30,
+            "soft_skills": 0.20,
+            "experience": 0.25,
+            "education": 0.15,
+            "languages": languages,
+        },
+        "requirements": {
+            "min_experience_years": i % 3,
+            "required_skills": ["Python", "SQL", "Java"][: 1 + i % 3],
+            "preferred_skills": ["Docker"],
+            "required_soft_skills": ["Liderazgo"],
+            "required_education_level": "Licenciatura",
+            "required_languages": ["Ingles"] if i % 2 else [],
+        },
+        "thresholds": {"apto": 0.70, "considerado": 0.50},
+    }
+
+
+def test_feature_matrix_matches_single_extraction():
+    """La matriz del lote coincide fila a fila con extract_features()"""
+    configs = [_config(i) for i in range(6)]
+
+    batch = extract_features_batch(gemini_output, configs)
+
+    assert batch["feature_matrix"].shape == (6, 18)
+    assert batch["indices"] == list(range(6))
+    assert batch["errors"] == {}
+
+    scores = calculate_final_scores_batch(batch["feature_matrix"])
+    for i, config in enumerate(configs):
+        single = extract_features(gemini_output, config)
+        assert np.allclose(batch["feature_matrix"][i], single["feature_vector"])
+        assert scores[i] == calculate_final_score(single)
+
+
+def test_invalid_config_does_not_abort_batch():
+    """Una configuracion con pesos invalidos queda en None sin romper el lote"""
+    configs = [_config(0), _config(1, languages=0.50), _config(2)]
+
+    batch = extract_features_batch(gemini_output, configs)
+
+    assert batch["features"][1] is None
+    assert 1 in batch["errors"]
+    assert batch["indices"] == [0, 2]
+    assert batch["feature_matrix"].shape == (2, 18)
+
+
+def test_evaluate_cv_batch_matches_evaluate_cv():
+    """evaluate_cv_batch produce el mismo resultado que evaluate_cv"""
+    service = get_ml_service()
+    configs = [_config(i) for i in range(4)] + [_config(9, languages=0.50)]
+
+    results = service.evaluate_cv_batch(gemini_output, configs)
+
+    assert len(results) == 5
+    assert results[4] is None
+    for config, result in zip(configs[:4], results[:4]):
+        expected = service.evaluate_cv(gemini_output, config)
+        assert result["match_score"] == expected["match_score"]
+        assert result["classification"] == expected["classification"]
+        assert result["match_details"] == expected["match_details"]
+
+
+def test_ridge_batch_matches_predict_single():
+    """predict_batch del modelo Ridge coincide con predict_single"""
+    predictor = MatchPredictor()
+    batch = extract_features_batch(gemini_output, [_config(i) for i in range(5)])
+
+    predictions = predictor.batch_predict(list(batch["feature_matrix"]))
+
+    for row, pred in zip(batch["feature_matrix"], predictions):
+        single = predictor.model.predict_single(row)
+        assert abs(pred["match_score"] - single["match_score"]) < 1e-9
+        assert pred["classification"] == single["classification"]
+        for name, value in single["feature_contributions"].items():
+            assert abs(pred["feature_contributions"][name] - value) < 1e-9
+
+
+if __name__ == "__main__":
+    test_feature_matrix_matches_single_extraction()
+    test_invalid_config_does_not_abort_batch()
+    test_evaluate_cv_batch_matches_evaluate_cv()
+    test_ridge_batch_matches_predict_single()
+    print("[OK] Tests de scoring en lote pasados")
@@ -0,0 +1,284 @@
+"""
+Test de la importacion masiva de CVs
+Verifica que varios CVs viajan en una sola request de Gemini, que los
+perfiles se escriben con un upsert agrupado y el informe por archivo; un
+lote que no se puede alinear se reintenta por CV, uno que fallo no, y los
+limites del zip se aplican antes de descomprimir
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException, UploadFile
+
+from fake_supabase import FakeSupabase
+
+import app.api.routes.admin_import as admin_import
+
+import app.core.extraction_cache as extraction_cache
+import app.core.llm_extractor as llm_extractor
+import app.services.bulk_import_service as bulk_import_service
+import app.services.pdf_extraction_service as pdf_extraction_service
+import app.services.profile_service as profile_service
+from app.core.gemini_rate_limiter import GeminiRateLimiter
+from app.services.bulk_import_service import ZipLimitError, get_bulk_import_service, read_pdfs_from_zip
+
+
+class _FakePDF:
+    async def extract_text(self, pdf_bytes):
+        if pdf_bytes == b"roto":
+            raise ValueError("PDF invalido: roto")
+        return pdf_bytes.decode()
+
+
+def _cv(name, email=None):
+    return {"personal_info": {"name": name, "email": email, "languages": []},
+            "hard_skills": ["Python"], "soft_skills": [], "education": [], "experience": []}
+
+
+def test_import_batches_gemini_and_upserts(monkeypatch):
+    fake = FakeSupabase({
+        "usuarios": [
+            {"id": "u1", "email": "ana@ucb.edu.bo"},
+            {"id": "u2", "email": "luis@ucb.edu.bo"},
+        ],
+        "perfiles_profesionales": [{"id": "p1", "usuario_id": "u1", "nombre_completo": "Ana"}],
+    })
+    monkeypatch.setattr(bulk_import_service, "supabase", fake)
+    monkeypatch.setattr(profile_service, "supabase", fake)
+    monkeypatch.setattr(pdf_extraction_service, "get_pdf_extraction_service", lambda: _FakePDF())
+    monkeypatch.setattr(llm_extractor.settings, "EXTRACTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(llm_extractor._key_pool, "_keys", ["test-key"])
+
+    prompts = []
+
+    def fake_gemini(prompt, key=None):
+        prompts.append(prompt)
+        return [
+            dict(_cv("Ana"), cv_index=0),
+            dict(_cv("Luis", "LUIS@ucb.edu.bo"), cv_index=1),
+            dict(_cv("Alguien", "nadie@ucb.edu.bo"), cv_index=2),
+        ]
+
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", fake_gemini)
+
+    files = [
+        ("ana@ucb.edu.bo.pdf", b"CV de Ana"),
+        ("cv_luis.pdf", b"CV de Luis"),
+        ("otro.pdf", b"CV de alguien"),
+        ("roto.pdf", b"roto"),
+    ]
+    report = asyncio.run(get_bulk_import_service().import_cvs(files, batch_size=5))
+
+    assert len(prompts) == 1
+    assert report["imported"] == 2 and report["total_files"] == 4
+    assert {(e["filename"], e["stage"]) for e in report["errors"]} == {
+        ("otro.pdf", "match_users"), ("roto.pdf", "extract_text")
+    }
+    assert set(report["stage_seconds"]) == {"extract_text", "llm", "match_users", "save"}
+
+    perfiles = {p["usuario_id"]: p for p in fake.tables["perfiles_profesionales"]}
+    assert perfiles["u1"]["id"] == "p1" and perfiles["u1"]["cv_filename"] == "ana@ucb.edu.bo.pdf"
+    assert perfiles["u2"]["nombre_completo"] == "Luis"
+    assert fake.queries.count("perfiles_profesionales") <= 2  # un upsert por grupo de columnas
+
+
+def test_batch_falls_back_to_single_requests(monkeypatch):
+    monkeypatch.setattr(llm_extractor.settings, "EXTRACTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(llm_extractor._key_pool, "_keys", ["test-key"])
+
+    singles = []
+
+    def fake_gemini(prompt, key=None):
+        if "=== CV 0 ===" in prompt:
+            return [dict(_cv("A"), cv_index=0)]  # respuesta incompleta
+        name = "A" if "cv a" in prompt else "B"
+        singles.append(name)
+        return _cv(name)
+
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", fake_gemini)
+
+    # Con un objeto de menos no se puede alinear: todo el lote va uno por uno
+    results = asyncio.run(llm_extractor.extract_skills_batch_with_llm(["cv a", "cv b"], batch_size=2))
+    assert [r["personal_info"]["name"] for r in results] == ["A", "B"]
+    assert sorted(singles) == ["A", "B"]
+
+
+def _batch_gemini(batch_response):
+    """Gemini falso: la request de lote recibe batch_response, las individuales
+    devuelven el CV cuyo nombre aparece en el prompt"""
+    calls = {"batch": 0, "single": []}
+
+    def fake_gemini(prompt, key=None):
+        if "=== CV 0 ===" in prompt:
+            calls["batch"] += 1
+            return batch_response
+        for name in ("Ana", "Luis", "Eva"):
+            if f"CV de {name}" in prompt:
+                calls["single"].append(name)
+                return _cv(name, f"{name.lower()}@ucb.edu.bo")
+        raise AssertionError("prompt inesperado")
+
+    return fake_gemini, calls
+
+
+def _setup_batch(monkeypatch, batch_response, cache_enabled=False):
+    monkeypatch.setattr(llm_extractor.settings, "EXTRACTION_CACHE_ENABLED", cache_enabled)
+    monkeypatch.setattr(llm_extractor._key_pool, "_keys", ["test-key"])
+    monkeypatch.setattr(llm_extractor, "_rate_limiter", GeminiRateLimiter(
+        lambda: ["test-key"], rpm_per_key=6000, tpm_per_key=10_000_000
+    ))
+    fake_gemini, calls = _batch_gemini(batch_response)
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", fake_gemini)
+    return calls
+
+
+TEXTS = ["CV de Ana\nana@ucb.edu.bo", "CV de Luis\nluis@ucb.edu.bo", "CV de Eva\neva@ucb.edu.bo"]
+
+
+def test_batch_shifted_indexes_retry_whole_batch(monkeypatch):
+    # Gemini numera los CVs desde 1: no se confia en cv_index
+    calls = _setup_batch(monkeypatch, [
+        dict(_cv("Ana", "ana@ucb.edu.bo"), cv_index=1),
+        dict(_cv("Luis", "luis@ucb.edu.bo"), cv_index=2),
+        dict(_cv("Eva", "eva@ucb.edu.bo"), cv_index=3),
+    ])
+
+    results = asyncio.run(llm_extractor.extract_skills_batch_with_llm(TEXTS, batch_size=3))
+
+    assert [r["personal_info"]["name"] for r in results] == ["Ana", "Luis", "Eva"]
+    assert calls["batch"] == 1 and sorted(calls["single"]) == ["Ana", "Eva", "Luis"]
+
+
+def test_batch_duplicate_indexes_retry_whole_batch(monkeypatch):
+    calls = _setup_batch(monkeypatch, [
+        dict(_cv("Ana", "ana@ucb.edu.bo"), cv_index=0),
+        dict(_cv("Luis", "luis@ucb.edu.bo"), cv_index=0),
+        dict(_cv("Eva", "eva@ucb.edu.bo"), cv_index=2),
+    ])
+
+    results = asyncio.run(llm_extractor.extract_skills_batch_with_llm(TEXTS, batch_size=3))
+
+    assert [r["personal_info"]["email"] for r in results] == [
+        "ana@ucb.edu.bo", "luis@ucb.edu.bo", "eva@ucb.edu.bo"
+    ]
+    assert len(calls["single"]) == 3
+
+
+def test_batch_reordered_indexes_and_source_check(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_extractor.settings, "EXTRACTION_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(extraction_cache, "_extraction_cache", None)
+
+    # Indices validos pero desordenados; el objeto de Eva trae datos de otra persona
+    calls = _setup_batch(monkeypatch, [
+        dict(_cv("Luis", "luis@ucb.edu.bo"), cv_index=1),
+        dict(_cv("Ana", "ana@ucb.edu.bo"), cv_index=0),
+        dict(_cv("Marco", "marco@ucb.edu.bo"), cv_index=2),
+    ], cache_enabled=True)
+
+    results = asyncio.run(llm_extractor.extract_skills_batch_with_llm(TEXTS, batch_size=3))
+
+    assert [r["personal_info"]["name"] for r in results] == ["Ana", "Luis", "Eva"]
+    assert "cv_index" not in results[0]
+    assert calls["single"] == ["Eva"]
+
+    # El resultado ajeno no quedo en cache bajo el texto de Eva
+    again = asyncio.run(llm_extractor.extract_skills_batch_with_llm(TEXTS, batch_size=3))
+    assert [r["personal_info"]["name"] for r in again] == ["Ana", "Luis", "Eva"]
+    assert calls["batch"] == 1
+
+
+def test_failed_batch_request_is_not_retried_per_cv(monkeypatch):
+    calls = _setup_batch(monkeypatch, None)
+    monkeypatch.setattr(llm_extractor, "MAX_RETRIES", 1)
+
+    def failing_gemini(prompt, key=None):
+        calls["batch"] += 1
+        raise RuntimeError("503 Service Unavailable")
+
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", failing_gemini)
+
+    # Los reintentos del lote ya se agotaron: cada CV recibe el error, sin
+    # una request individual por CV
+    results = asyncio.run(llm_extractor.extract_skills_batch_with_llm(TEXTS, batch_size=3))
+
+    assert calls["batch"] == 1 and calls["single"] == []
+    assert all("503" in r["error"] for r in results)
+
+
+def test_zip_reader_skips_non_pdf_entries():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("cohorte/ana@ucb.edu.bo.pdf", b"%PDF")
+        archive.writestr("__MACOSX/cohorte/._ana.pdf", b"x")
+        archive.writestr("cohorte/notas.txt", json.dumps({}))
+
+    assert read_pdfs_from_zip(buffer.getvalue()) == [("ana@ucb.edu.bo.pdf", b"%PDF")]
+
+
+def _zip(n, size=4):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(n):
+            archive.writestr(f"cv{i}.pdf", b"%" * size)
+    return buffer.getvalue()
+
+
+def test_zip_limits_are_checked_before_reading(monkeypatch):
+    def no_read(self, *args, **kwargs):
+        raise AssertionError("se descomprimio una entrada")
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", no_read)
+
+    with pytest.raises(ZipLimitError):
+        read_pdfs_from_zip(_zip(3), max_files=2)
+    # file_size declarado: 2 x 1 MB sin comprimir (el zip ocupa unos pocos KB)
+    with pytest.raises(ZipLimitError):
+        read_pdfs_from_zip(_zip(2, size=1024 * 1024), max_bytes=1024 * 1024)
+
+
+def test_import_route_rejects_oversized_zip(monkeypatch):
+    monkeypatch.setattr(admin_import, "MAX_FILES_PER_REQUEST", 2)
+    submitted = []
+
+    class _Jobs:
+        async def submit_bulk_import(self, *args, **kwargs):
+            submitted.append(args)
+            return {"id": "job-1", "status": "queued"}
+
+    monkeypatch.setattr(admin_import, "get_cv_job_service", lambda: _Jobs())
+
+    def call(*uploads):
+        return asyncio.run(admin_import.import_cvs(
+            files=list(uploads), batch_size=None, dry_run=False, admin_user={"user_id": "admin"}
+        ))
+
+    with pytest.raises(HTTPException) as exc:
+        call(UploadFile(io.BytesIO(_zip(3)), filename="cohorte.zip"))
+    assert exc.value.status_code == 413
+
+    # El cupo se comparte entre los archivos de la request
+    with pytest.raises(HTTPException) as exc:
+        call(
+            UploadFile(io.BytesIO(b"%PDF"), filename="ana@ucb.edu.bo.pdf"),
+            UploadFile(io.BytesIO(_zip(2)), filename="cohorte.zip"),
+        )
+    assert exc.value.status_code == 413
+    assert submitted == []
+
+    response = call(UploadFile(io.BytesIO(_zip(2)), filename="cohorte.zip"))
+    assert response["total_files"] == 2 and len(submitted) == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
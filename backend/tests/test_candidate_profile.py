@@ -0,0 +1,97 @@
+"""
+Test de datos del CV compilados
+Verifica el cache de CandidateFeatureProfile por version de perfil
+"""
+
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from app.scoring.feature_engineering import (
+    CandidateFeatureProfile,
+    CandidateProfileCache,
+    extract_features,
+    extract_features_batch,
+)
+
+
+gemini_output = {
+    "personal_info": {"languages": ["Espanol (Nativo)", "Ingles (B2)"]},
+    "hard_skills": ["Python", "React.js", "SQL"],
+    "soft_skills": ["Liderazgo", "Trabajo en equipo"],
+    "education": [{"degree": "Licenciatura en Sistemas"}],
+    "experience": [{"role": "Developer", "duration": "2 anios"}],
+}
+
+config = {
+    "id": "oferta-1",
+    "weights": {
+        "hard_skills": 0.35,
+        "soft_skills": 0.15,
+        "experience": 0.25,
+        "education": 0.15,
+        "languages": 0.10,
+    },
+    "requirements": {
+        "min_experience_years": 1.0,
+        "required_skills": ["Python", "React"],
+        "preferred_skills": ["Docker"],
+        "required_soft_skills": ["Liderazgo"],
+        "required_education_level": "Licenciatura",
+        "required_languages": ["Ingles"],
+    },
+}
+
+
+def test_profile_precomputes_cv_data():
+    """El perfil compilado guarda los datos del CV ya procesados"""
+    profile = CandidateFeatureProfile(gemini_output)
+
+    assert profile.hard_skills_normalized == {"python", "react", "sql"}
+    assert profile.highest_degree == {"degree": "Licenciatura en Sistemas"}
+    assert profile.total_experience_years == 2.0
+    assert len(profile.languages_parsed) == 2
+
+
+def test_cache_hits_by_version():
+    """El cache reutiliza mientras la version no cambie y esta acotado"""
+    cache = CandidateProfileCache(max_size=2)
+
+    first = cache.get("user-1", "v1", gemini_output)
+    assert cache.get("user-1", "v1", gemini_output) is first
+    assert cache.stats()["hits"] == 1
+
+    # Perfil actualizado: nueva version recompila
+    second = cache.get("user-1", "v2", gemini_output)
+    assert second is not first
+    assert cache.stats()["size"] == 1
+
+    cache.get("user-2", "v1", gemini_output)
+    cache.get("user-3", "v1", gemini_output)
+    assert cache.stats()["size"] == 2
+
+    cache.invalidate("user-3")
+    assert cache.stats()["size"] == 1
+
+
+def test_features_match_with_and_without_profile():
+    """extract_features da lo mismo con y sin datos del CV compilados"""
+    profile = CandidateFeatureProfile(gemini_output)
+
+    direct = extract_features(gemini_output, config)
+    cached = extract_features(gemini_output, config, profile)
+    assert direct["feature_vector"] == cached["feature_vector"]
+
+    batch = extract_features_batch(gemini_output, [config, config], profile)
+    assert np.allclose(batch["feature_matrix"][0], direct["feature_vector"])
+
+
+if __name__ == "__main__":
+    test_profile_precomputes_cv_data()
+    test_cache_hits_by_version()
+    test_features_match_with_and_without_profile()
+    print("[OK] Tests de datos del CV compilados pasados")
@@ -0,0 +1,237 @@
+"""
+Test de la cola de procesamiento de CVs
+Verifica que el job pasa por las etapas, guarda el resultado, registra el
+error de un PDF invalido y que los jobs interrumpidos se reencolan: de
+inmediato si el proceso duenio murio y, sin reiniciar, cuando su owner deja
+de renovar el heartbeat. Tambien que una importacion masiva corre como job
+de la cola con su informe como resultado
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app.services.bulk_import_service as bulk_import_service
+import app.services.cv_job_service as cv_job_service
+import app.services.ml_integration_service as ml_integration_service
+import app.services.pdf_extraction_service as pdf_extraction_service
+import app.services.profile_service as profile_service
+from app.services.cv_job_service import CVJobService, CVJobStore, new_owner_id
+
+
+class _FakePDF:
+    async def extract_text(self, pdf_bytes):
+        if pdf_bytes == b"roto":
+            raise ValueError("PDF invalido: roto")
+        return pdf_bytes.decode()
+
+
+class _FakeML:
+    async def extract_cv_from_text(self, text):
+        return {"hard_skills": ["Python", "SQL"], "soft_skills": [], "education": [],
+                "experience": [], "personal_info": {"languages": ["Espanol"]}}
+
+
+class _FakeProfiles:
+    def __init__(self):
+        self.saved = []
+
+    def update_profile_from_cv(self, user_id, gemini_output, cv_filename=None):
+        self.saved.append((user_id, cv_filename))
+        return {"id": "p1", "usuario_id": user_id, "hard_skills": gemini_output["hard_skills"]}
+
+
+class _FakeBulkImport:
+    def __init__(self):
+        self.calls = []
+
+    async def import_cvs(self, files, batch_size=None, dry_run=False, on_stage=None):
+        stages = []
+        for stage in ("extract_text", "llm", "match_users", "save"):
+            await on_stage(stage)
+            stages.append(stage)
+        self.calls.append((files, batch_size, dry_run))
+        return {"total_files": len(files), "imported": len(files), "stages": stages}
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(cv_job_service.settings, "CV_JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(cv_job_service.settings, "CV_JOB_WORKERS", 2)
+    monkeypatch.setattr(CVJobService, "_instance", None)
+    profiles = _FakeProfiles()
+    monkeypatch.setattr(pdf_extraction_service, "get_pdf_extraction_service", lambda: _FakePDF())
+    monkeypatch.setattr(ml_integration_service, "get_ml_service", lambda: _FakeML())
+    monkeypatch.setattr(profile_service, "get_profile_service", lambda: profiles)
+    return CVJobService(), profiles
+
+
+def test_job_runs_through_stages(tmp_path, monkeypatch):
+    service, profiles = _setup(tmp_path, monkeypatch)
+
+    async def scenario():
+        ok = await service.submit("u1", "cv.pdf", b"CV de prueba")
+        bad = await service.submit("u1", "roto.pdf", b"roto")
+        assert ok["status"] == "queued"
+
+        events = [job async for job in service.watch_job(ok["id"], "u1", interval=0.01)]
+        failed = [job async for job in service.watch_job(bad["id"], "u1", interval=0.01)][-1]
+        hidden = await service.get_job(ok["id"], "otro-usuario")
+        await service.stop()
+        return events, failed, hidden
+
+    events, failed, hidden = asyncio.run(scenario())
+
+    done = events[-1]
+    assert done["status"] == "done" and done["progress"] == 100
+    assert done["result"]["extraction_summary"]["hard_skills_count"] == 2
+    assert done["result"]["perfil"]["usuario_id"] == "u1"
+    assert profiles.saved == [("u1", "cv.pdf")]
+
+    assert failed["status"] == "failed"
+    assert failed["error"] == "PDF invalido: roto"
+    assert hidden is None
+
+
+def test_bulk_import_runs_as_job(tmp_path, monkeypatch):
+    service, _ = _setup(tmp_path, monkeypatch)
+    bulk = _FakeBulkImport()
+    monkeypatch.setattr(bulk_import_service, "get_bulk_import_service", lambda: bulk)
+    files = [("ana@ucb.edu.bo.pdf", b"%PDF-a"), ("cv.pdf", b"%PDF-b"), ("cv.pdf", b"%PDF-c")]
+
+    async def scenario():
+        job = await service.submit_bulk_import("admin", files, batch_size=5, dry_run=True)
+        events = [event async for event in service.watch_job(job["id"], interval=0.01)]
+        await service.stop()
+        return job, events
+
+    job, events = asyncio.run(scenario())
+
+    assert job["kind"] == "bulk_import" and job["status"] == "queued"
+    done = events[-1]
+    assert done["status"] == "done"
+    assert done["result"]["imported"] == 3
+    assert bulk.calls == [(files, 5, True)]
+
+
+def test_stale_jobs_are_requeued(tmp_path):
+    store = CVJobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("u1", "cv.pdf", b"pdf")
+    claimed = store.claim_next()
+
+    assert claimed["id"] == job_id and claimed["pdf"] == b"pdf"
+    assert store.claim_next() is None
+    assert store.recover(stale_seconds=0) == [job_id]
+    assert store.get(job_id)["status"] == "queued"
+
+
+def test_job_of_dead_process_is_requeued_immediately(tmp_path):
+    store = CVJobStore(str(tmp_path / "jobs.sqlite3"))
+    dead_owner = f"{socket.gethostname()}:999999999:deadbeef"
+    job_id = store.create("u1", "cv.pdf", b"pdf")
+    store.heartbeat(dead_owner)
+    store.claim_next(dead_owner)
+
+    # Atascado pero no stale: heartbeat reciente, el proceso ya no existe
+    assert store.recover(stale_seconds=900) == [job_id]
+    assert store.get(job_id)["status"] == "queued"
+
+    # Un owner vivo de este host con heartbeat reciente se respeta
+    live_owner = f"{socket.gethostname()}:{os.getppid()}:cafecafe"
+    store.heartbeat(live_owner)
+    store.claim_next(live_owner)
+    assert store.recover(stale_seconds=900) == []
+    assert store.get(job_id)["status"] == "processing"
+
+
+def test_periodic_recover_requeues_without_restart(tmp_path, monkeypatch):
+    service, profiles = _setup(tmp_path, monkeypatch)
+    monkeypatch.setattr(cv_job_service.settings, "CV_JOB_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(cv_job_service.settings, "CV_JOB_STALE_SECONDS", 0.2)
+    store = service._get_store()
+
+    # Owner de otro host (solo cuenta el heartbeat) que deja de responder
+    other_owner = "otro-host:1234:abcdabcd"
+    job_id = store.create("u2", "cv.pdf", b"CV atascado")
+    store.heartbeat(other_owner)
+    store.claim_next(other_owner)
+
+    async def scenario():
+        await service.start()
+        assert (await service.get_job(job_id))["status"] == "processing"
+        deadline = time.time() + 5
+        while (await service.get_job(job_id))["status"] != "done" and time.time() < deadline:
+            await asyncio.sleep(0.05)
+        await service.stop()
+
+    asyncio.run(scenario())
+
+    assert store.get(job_id)["status"] == "done"
+    assert profiles.saved == [("u2", "cv.pdf")]
+
+
+def test_recover_keeps_own_jobs_while_processing(tmp_path, monkeypatch):
+    service, profiles = _setup(tmp_path, monkeypatch)
+    monkeypatch.setattr(cv_job_service.settings, "CV_JOB_HEARTBEAT_SECONDS", 0.02)
+    recovered = []
+    store = service._get_store()
+    recover = store.recover
+
+    def traced_recover(*args):
+        requeued = recover(*args)
+        recovered.append(requeued)
+        return requeued
+
+    monkeypatch.setattr(store, "recover", traced_recover)
+
+    class _SlowPDF(_FakePDF):
+        async def extract_text(self, pdf_bytes):
+            await asyncio.sleep(0.3)
+            return pdf_bytes.decode()
+
+    monkeypatch.setattr(pdf_extraction_service, "get_pdf_extraction_service", lambda: _SlowPDF())
+
+    async def scenario():
+        job = await service.submit("u1", "cv.pdf", b"CV lento")
+        done = [event async for event in service.watch_job(job["id"], interval=0.01)][-1]
+        await service.stop()
+        return done
+
+    done = asyncio.run(scenario())
+
+    # recover corrio varias veces mientras el job estaba en curso
+    assert len(recovered) >= 5 and not any(recovered)
+    assert done["status"] == "done" and done["attempts"] == 1
+    assert profiles.saved == [("u1", "cv.pdf")]
+
+
+def test_previous_instance_with_same_pid_is_gone(tmp_path):
+    store = CVJobStore(str(tmp_path / "jobs.sqlite3"))
+    current, previous = new_owner_id(), new_owner_id()
+    job_id = store.create("u1", "cv.pdf", b"pdf")
+    store.heartbeat(previous)
+    store.claim_next(previous)
+
+    # Sin owner actual no se puede distinguir: el job se respeta
+    assert store.recover(stale_seconds=900) == []
+    assert store.recover(stale_seconds=900, current_owner=previous) == []
+    assert store.recover(stale_seconds=900, current_owner=current) == [job_id]
+
+
+def test_stop_releases_own_jobs(tmp_path):
+    store = CVJobStore(str(tmp_path / "jobs.sqlite3"))
+    owner = new_owner_id()
+    job_id = store.create("u1", "cv.pdf", b"pdf")
+    store.claim_next(owner)
+
+    assert store.release(owner) == [job_id]
+    assert store.get(job_id)["status"] == "queued"
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
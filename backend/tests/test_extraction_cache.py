@@ -0,0 +1,83 @@
+"""
+Test del cache de extracciones de Gemini
+Verifica clave por contenido, TTL, eviccion por tamano y que una segunda
+extraccion del mismo texto no llama a la API. Tambien que las rutas de los
+archivos SQLite no dependen del directorio actual
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app.core.extraction_cache as extraction_cache
+import app.core.llm_extractor as llm_extractor
+from app.core.config import BACKEND_DIR, backend_path, settings
+from app.core.extraction_cache import ExtractionCache, make_cache_key
+
+
+def test_key_depends_on_content_prompt_and_model():
+    base = make_cache_key("Juan Perez\nPython  SQL", "cv", "cv-v1", "gemini-2.5-flash")
+    assert base == make_cache_key("  juan perez python sql ", "cv", "cv-v1", "gemini-2.5-flash")
+    assert base != make_cache_key("Juan Perez Python", "cv", "cv-v1", "gemini-2.5-flash")
+    assert base != make_cache_key("Juan Perez Python SQL", "cv", "cv-v2", "gemini-2.5-flash")
+    assert base != make_cache_key("Juan Perez Python SQL", "cv", "cv-v1", "gemini-2.5-pro")
+    assert base != make_cache_key("Juan Perez Python SQL", "oferta", "cv-v1", "gemini-2.5-flash")
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "c.sqlite3"), ttl_seconds=60, max_bytes=200)
+
+    cache.put("a", "cv", {"hard_skills": ["x" * 60]})
+    cache.put("b", "cv", {"hard_skills": ["y" * 60]})
+    assert cache.get("a")["hard_skills"] == ["x" * 60]  # a pasa a ser la mas reciente
+
+    cache.put("c", "cv", {"hard_skills": ["z" * 60]})   # excede 200 bytes: sale b
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["size_bytes"] <= 200
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_second_extraction_is_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache.settings, "EXTRACTION_CACHE_PATH", str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(extraction_cache.settings, "EXTRACTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(extraction_cache, "_extraction_cache", None)
+    monkeypatch.setattr(llm_extractor._key_pool, "_keys", ["test-key"])
+
+    calls = []
+
+    def fake_gemini(prompt, key=None):
+        calls.append(prompt)
+        return {"hard_skills": ["Python"], "soft_skills": [], "education": [], "experience": []}
+
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", fake_gemini)
+
+    first = asyncio.run(llm_extractor.extract_skills_with_llm("CV de prueba\nPython"))
+    first["hard_skills"].append("mutado por el llamador")
+    second = asyncio.run(llm_extractor.extract_skills_with_llm("cv de prueba python"))
+
+    assert len(calls) == 1
+    assert second["hard_skills"] == ["Python"]
+
+    # La extraccion de ofertas usa otra clave aunque el texto sea igual
+    asyncio.run(llm_extractor.extract_oferta_with_llm("CV de prueba\nPython"))
+    assert len(calls) == 2
+
+
+def test_sqlite_paths_resolve_from_backend_dir(tmp_path):
+    assert settings.EXTRACTION_CACHE_PATH == os.path.join(BACKEND_DIR, ".cache", "gemini_extractions.sqlite3")
+    assert settings.CV_JOBS_DB_PATH == os.path.join(BACKEND_DIR, ".cache", "cv_jobs.sqlite3")
+    assert os.path.isfile(os.path.join(BACKEND_DIR, "app", "main.py"))
+    assert backend_path(str(tmp_path / "x.sqlite3")) == str(tmp_path / "x.sqlite3")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,93 @@
+"""
+Test del rate limiter de Gemini
+Verifica el reparto proactivo entre keys, la espera por presupuesto, el
+enfriamiento adaptativo ante 429 y las extracciones contra un servidor
+Gemini falso con cuota y latencia
+"""
+
+import asyncio
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_gemini import FakeGeminiServer
+
+import app.core.llm_extractor as llm_extractor
+from app.core.gemini_rate_limiter import GeminiRateLimiter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_spreads_calls_and_waits_for_budget():
+    clock = _Clock()
+    limiter = GeminiRateLimiter(lambda: ["key-a", "key-b"], rpm_per_key=10, tpm_per_key=1_000_000, clock=clock)
+
+    # Rafaga de 1 request por key (10% de 10 RPM): una en cada key
+    first, _ = limiter.try_acquire(100)
+    second, _ = limiter.try_acquire(100)
+    assert {first, second} == {"key-a", "key-b"}
+
+    key, wait = limiter.try_acquire(100)
+    assert key is None and 5.9 < wait <= 6.0  # 1 request cada 6 s por key
+
+    clock.now += 6
+    assert limiter.try_acquire(100)[0] is not None
+
+
+def test_quota_error_cools_down_and_halves_rpm():
+    clock = _Clock()
+    limiter = GeminiRateLimiter(lambda: ["key-a", "key-b"], rpm_per_key=60, tpm_per_key=1_000_000, clock=clock)
+
+    key, _ = limiter.try_acquire(100)
+    assert limiter.report_quota_error(key, retry_after=30) == 30
+
+    usage = {k["slot"]: k for k in limiter.metrics()["keys"]}
+    slot = ["key-a", "key-b"].index(key)
+    assert usage[slot]["rpm_effective"] == 30
+    assert usage[slot]["cooldown_seconds"] == 30
+    assert usage[slot]["quota_errors"] == 1
+
+    # Mientras se enfria, todas las llamadas van a la otra key
+    for _ in range(5):
+        other, _ = limiter.try_acquire(100)
+        assert other not in (None, key)
+        limiter.report_success(other)
+        clock.now += 1
+
+
+def test_extractions_route_around_quota_on_fake_server(monkeypatch):
+    server = FakeGeminiServer(quota_per_key={"key-a": 1}, window=5.0, latency=0.01, retry_after=5.0)
+    limiter = GeminiRateLimiter(lambda: ["key-a", "key-b"], rpm_per_key=6000, tpm_per_key=10_000_000)
+
+    monkeypatch.setattr(llm_extractor._key_pool, "_keys", ["key-a", "key-b"])
+    monkeypatch.setattr(llm_extractor, "_rate_limiter", limiter)
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", server)
+    monkeypatch.setattr(llm_extractor.settings, "EXTRACTION_CACHE_ENABLED", False)
+
+    async def run():
+        return await asyncio.gather(*[
+            llm_extractor.extract_skills_with_llm(f"CV numero {i}") for i in range(8)
+        ])
+
+    results = asyncio.run(run())
+
+    assert all(not r.get("error") for r in results)
+    assert len(server.calls["key-a"]) == 1
+    assert len(server.calls["key-b"]) == 7
+    # Solo fallan las llamadas que ya iban a key-a antes del primer 429;
+    # despues key-a queda en enfriamiento
+    assert server.quota_errors["key-a"] <= 4
+    assert limiter.metrics()["keys"][0]["quota_errors"] == server.quota_errors["key-a"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
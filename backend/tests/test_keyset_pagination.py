@@ -0,0 +1,135 @@
+"""
+Test de la paginacion por cursor (keyset)
+Verifica que recorrer ofertas y usuarios con next_cursor devuelve todas las
+filas una sola vez en orden (created_at, id) descendente, incluso con
+created_at repetidos, que el conteo es opcional y que un cursor invalido
+se rechaza
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+
+from fake_supabase import FakeSupabase
+
+import app.api.endpoints.users as users_module
+import app.services.oferta_service as oferta_module
+from app.db import pagination
+from app.services.oferta_service import get_oferta_service
+
+
+def _ofertas(n: int):
+    # Varias ofertas comparten created_at: el id desempata
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{j:012d}",
+            "titulo": f"Oferta {j}",
+            "tipo": "pasantia" if j % 3 else "empleo",
+            "is_active": True,
+            "fecha_cierre": None,
+            "created_at": f"2026-01-{j // 3 + 1:02d}T10:00:00+00:00",
+            "institutional_profiles": {"institution_name": "UCB", "sector": "Tecnologia"},
+        }
+        for j in range(23)
+    ][:n]
+
+
+def _users(n: int):
+    return [
+        {
+            "id": f"u-{j:04d}",
+            "email": f"user{j}@ucb.edu.bo",
+            "nombre_completo": f"Usuario {j}",
+            "rol": "estudiante",
+            "created_at": f"2026-02-{j // 4 + 1:02d}T08:00:00+00:00",
+        }
+        for j in range(n)
+    ]
+
+
+def _expected_order(rows):
+    return [r["id"] for r in sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)]
+
+
+def test_cursor_round_trip():
+    cursor = pagination.encode_cursor({"created_at": "2026-01-01T10:00:00+00:00", "id": "abc"})
+    assert pagination.decode_cursor(cursor) == ("2026-01-01T10:00:00+00:00", "abc")
+
+    with pytest.raises(ValueError):
+        pagination.decode_cursor("no-es-un-cursor")
+    with pytest.raises(ValueError):
+        pagination.count_option("aproximado")
+
+
+def test_list_ofertas_walks_all_pages(monkeypatch):
+    rows = _ofertas(23)
+    fake = FakeSupabase({"convocatorias_laborales": rows})
+    monkeypatch.setattr(oferta_module, "supabase", fake)
+    service = get_oferta_service()
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        result = service.list_ofertas(include_expired=True, page_size=5, cursor=cursor, count='none')
+        seen.extend(o["id"] for o in result["ofertas"])
+        pages += 1
+        assert result["total"] is None
+        cursor = result["next_cursor"]
+        assert result["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+
+    assert pages == 5
+    assert seen == _expected_order(rows)
+
+    # Con filtro y conteo
+    first = service.list_ofertas(tipo="empleo", include_expired=True, page_size=3, count='exact')
+    assert first["total"] == 8
+    second = service.list_ofertas(
+        tipo="empleo", include_expired=True, page_size=3, cursor=first["next_cursor"]
+    )
+    empleo = _expected_order([r for r in rows if r["tipo"] == "empleo"])
+    assert [o["id"] for o in first["ofertas"] + second["ofertas"]] == empleo[:6]
+
+    # Compatibilidad: ?page=N sin cursor
+    legacy = service.list_ofertas(include_expired=True, page=2, page_size=5)
+    assert [o["id"] for o in legacy["ofertas"]] == _expected_order(rows)[5:10]
+
+    with pytest.raises(ValueError):
+        service.list_ofertas(cursor="roto")
+
+
+def test_list_users_keyset(monkeypatch):
+    rows = _users(10)
+    fake = FakeSupabase({"usuarios": rows, "perfiles_profesionales": []})
+    monkeypatch.setattr(users_module, "supabase", fake)
+
+    def page(cursor=None, count='estimated'):
+        return asyncio.run(users_module.list_users(
+            page=1, page_size=4, role=None, search=None,
+            cursor=cursor, count=count, current_user={}
+        ))
+
+    first = page()
+    assert first.total == 10 and first.has_more
+    second = page(first.next_cursor, count='none')
+    third = page(second.next_cursor, count='none')
+    assert second.total is None
+    assert not third.has_more and third.next_cursor is None
+
+    seen = [u.id for p in (first, second, third) for u in p.usuarios]
+    assert seen == _expected_order(rows)
+
+    with pytest.raises(HTTPException) as error:
+        page(cursor="roto")
+    assert error.value.status_code == 400
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,116 @@
+"""
+Test de consultas del listado de usuarios (admin)
+Verifica que una pagina cuesta dos consultas (usuarios + perfiles con in_)
+sin importar su tamano, que el resumen de perfil se conserva y que las
+consultas de los endpoints de usuarios corren en el pool de la base de datos
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.api.endpoints.users as users_module
+
+
+def _tables(n: int):
+    return {
+        "usuarios": [
+            {
+                "id": f"u-{i:04d}",
+                "email": f"user{i}@ucb.edu.bo",
+                "nombre_completo": f"Usuario {i}",
+                "rol": "estudiante" if i % 2 else "titulado",
+                "password_hash": "hash",
+                "created_at": f"2026-03-{i % 28 + 1:02d}T09:00:00+00:00",
+            }
+            for i in range(n)
+        ],
+        # Cada tercer usuario no tiene perfil
+        "perfiles_profesionales": [
+            {
+                "id": f"p-{i}",
+                "usuario_id": f"u-{i:04d}",
+                "is_complete": i % 5 == 0,
+                "completeness_score": round(i / n, 2),
+                "cv_uploaded_at": "2026-03-10T00:00:00+00:00" if i % 5 == 0 else None,
+                "gemini_extraction": {"hard_skills": ["Python"] * 50},
+            }
+            for i in range(n) if i % 3
+        ],
+    }
+
+
+def list_users(page_size: int, role=None):
+    return asyncio.run(users_module.list_users(
+        page=1, page_size=page_size, role=role, search=None,
+        cursor=None, count='estimated', current_user={}
+    ))
+
+
+def test_page_costs_two_queries(monkeypatch):
+    tables = _tables(150)
+    fake = FakeSupabase(tables)
+    monkeypatch.setattr(users_module, "supabase", fake)
+
+    result = list_users(100)
+
+    assert fake.queries == ["usuarios", "perfiles_profesionales"]
+    assert len(result.usuarios) == 100
+
+    profiles = {p["usuario_id"]: p for p in tables["perfiles_profesionales"]}
+    for user in result.usuarios:
+        profile = profiles.get(user.id)
+        assert user.tiene_perfil == (profile is not None)
+        assert user.perfil_completo == bool(profile and profile["is_complete"])
+        assert user.completeness_score == float(profile["completeness_score"] if profile else 0)
+        assert (user.cv_uploaded_at is None) == ((profile or {}).get("cv_uploaded_at") is None)
+
+
+def test_empty_page_skips_profiles(monkeypatch):
+    fake = FakeSupabase(_tables(10))
+    monkeypatch.setattr(users_module, "supabase", fake)
+
+    result = list_users(20, role="operador")
+
+    assert result.usuarios == []
+    assert fake.queries == ["usuarios"]
+
+
+def test_queries_run_on_db_pool(monkeypatch):
+    fake = FakeSupabase(_tables(10))
+    monkeypatch.setattr(users_module, "supabase", fake)
+    threads = []
+    table = fake.table
+
+    def tracking_table(name):
+        query = table(name)
+        execute = query.execute
+
+        def traced_execute():
+            threads.append(threading.current_thread().name)
+            return execute()
+
+        query.execute = traced_execute
+        return query
+
+    monkeypatch.setattr(fake, "table", tracking_table)
+
+    list_users(5)
+    detail = asyncio.run(users_module.get_user_detail("u-0001", current_user={}))
+    account = asyncio.run(users_module.get_my_account(current_user={"user_id": "u-0002"}))
+
+    assert detail.id == "u-0001" and detail.tiene_perfil
+    assert account["email"] == "user2@ucb.edu.bo"
+    assert len(threads) == 5
+    assert all(name.startswith("db") for name in threads)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
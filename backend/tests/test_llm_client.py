@@ -0,0 +1,121 @@
+"""
+Test del cliente async de Gemini
+Verifica que el semaforo funciona en varios event loops, que cancelar al
+llamador deja de esperar a Gemini y libera la key, y que process_cv_text_async
+no bloquea el loop. Tambien que cada key usa su propio cliente (sin
+genai.configure global)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_gemini import FakeGeminiServer
+
+import app.core.llm_extractor as llm_extractor
+from app.core.gemini_rate_limiter import GeminiRateLimiter
+
+
+def _setup(monkeypatch, server):
+    limiter = GeminiRateLimiter(lambda: ["key-a"], rpm_per_key=60000, tpm_per_key=100_000_000)
+    monkeypatch.setattr(llm_extractor._key_pool, "_keys", ["key-a"])
+    monkeypatch.setattr(llm_extractor, "_rate_limiter", limiter)
+    monkeypatch.setattr(llm_extractor, "_call_gemini_sync", server)
+    monkeypatch.setattr(llm_extractor, "MAX_CONCURRENT_GEMINI", 2)
+    monkeypatch.setattr(llm_extractor.settings, "EXTRACTION_CACHE_ENABLED", False)
+    return limiter
+
+
+def test_semaphore_works_across_event_loops(monkeypatch):
+    _setup(monkeypatch, FakeGeminiServer(latency=0.02))
+
+    async def burst():
+        return await asyncio.gather(*[llm_extractor.extract_skills_with_llm(f"cv {i}") for i in range(5)])
+
+    # Con contencion en dos loops distintos (antes: "bound to a different event loop")
+    for _ in range(2):
+        assert all(not r.get("error") for r in asyncio.run(burst()))
+
+
+def test_cancel_stops_waiting_and_releases_key(monkeypatch):
+    limiter = _setup(monkeypatch, FakeGeminiServer(latency=1.0))
+
+    async def scenario():
+        task = asyncio.create_task(llm_extractor.extract_skills_with_llm("cv lento"))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return time.perf_counter() - started
+
+    assert asyncio.run(scenario()) < 0.5
+    assert limiter.metrics()["keys"][0]["in_flight"] == 0
+
+
+def test_process_cv_text_async_does_not_block_loop(monkeypatch):
+    from app.core import nlp
+
+    _setup(monkeypatch, FakeGeminiServer(latency=0.3))
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        result = await nlp.process_cv_text_async("Juan Perez juan@mail.com Python")
+        tick_task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert result["entities"]["LLM_SKILLS"]["hard_skills"] == ["Python"]
+    assert result["entities"]["EMAIL"] == ["juan@mail.com"]
+    assert ticks >= 10
+
+
+def test_each_key_gets_its_own_client(monkeypatch):
+    created, requests = [], []
+
+    class FakeClient:
+        def __init__(self, client_options):
+            created.append(client_options["api_key"])
+            self.key = client_options["api_key"]
+
+        def generate_content(self, request, timeout):
+            requests.append((self.key, request.model, request.contents[0].parts[0].text, timeout))
+            part = llm_extractor.glm.Part(text='```json\n{"hard_skills": ["Python"]}\n```')
+            return llm_extractor.glm.GenerateContentResponse(candidates=[
+                llm_extractor.glm.Candidate(content=llm_extractor.glm.Content(parts=[part]))
+            ])
+
+    def no_global_configure(**kwargs):
+        raise AssertionError("genai.configure no debe usarse con una key explicita")
+
+    monkeypatch.setattr(llm_extractor.glm, "GenerativeServiceClient", FakeClient)
+    monkeypatch.setattr(llm_extractor.genai, "configure", no_global_configure)
+    monkeypatch.setattr(llm_extractor, "_clients_by_key", {})
+
+    for key in ("key-a", "key-b", "key-a"):
+        assert llm_extractor._call_gemini_sync("prompt", key) == {"hard_skills": ["Python"]}
+
+    assert created == ["key-a", "key-b"]
+    assert [r[0] for r in requests] == ["key-a", "key-b", "key-a"]
+    assert requests[0][1] == f"models/{llm_extractor.GEMINI_MODEL}"
+    assert requests[0][2] == "prompt"
+    assert requests[0][3] == llm_extractor.GEMINI_TIMEOUT_SECONDS
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,286 @@
+"""
+Test del analizador de texto de CVs con patrones precompilados
+Compara emails, telefonos, carreras y segmentos contra la implementacion
+anterior (un re.search por keyword y un bucle por seccion) sobre un corpus
+de CVs de ejemplo
+"""
+
+import os
+import re
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core import nlp
+
+
+# =============================================
+# Implementacion anterior (referencia)
+# =============================================
+
+def legacy_extract_emails(text: str) -> list:
+    """Extract email addresses using regex."""
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    return list(set(re.findall(email_pattern, text)))
+
+def legacy_extract_phone_numbers(text: str) -> list:
+    """
+    Extract phone numbers with strict filtering to avoid dates/indices.
+    """
+    # General pattern: Optional Country Code (+34, +51) + Blocks of digits
+    # Must be at least 8 digits long.
+    # Matches formats like: +34 600 000 000, 600-000-000, 600 000 000, or 8 consecutive digits
+    phone_pattern = r'(?:\+?\d{1,3}[ -]?)?(?:[679]\d{2}[ -]?\d{3}[ -]?\d{3}|\b\d{3}[ -]?\d{2}[ -]?\d{2}[ -]?\d{2}\b|\b\d{4}[ -]?\d{4}\b|\b\d{8}\b)'
+    
+    matches = re.findall(phone_pattern, text)
+    valid_phones = []
+    for m in matches:
+        # Cleanup
+        clean_p = re.sub(r'\D', '', m)
+        
+        # Length check (7 to 15 digits)
+        if not (7 <= len(clean_p) <= 15):
+            continue
+            
+        # Anti-Date/Year Heuristics
+        # 1. Single Year: If it looks like a year 1990-2030 standing alone (4 digits), ignore (covered by length check > 7, but just in case logic changes)
+        
+        # 2. Date Ranges (e.g. 2017-2019, 1990-2000). Total digits = 8.
+        if len(clean_p) == 8:
+            # Check if it starts with 19 or 20 (common centuries)
+            if clean_p.startswith('19') or clean_p.startswith('20'):
+                # Check for separator structure
+                # If the match has a separator in the middle, likely a date range
+                # Regex to split: 2017-2019 -> ['2017', '2019']
+                parts = re.split(r'\D+', m)
+                parts = [p for p in parts if p] # filter empty
+                
+                # If we have 2 parts of 4 digits, and both look like years
+                if len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 4:
+                     p1, p2 = int(parts[0]), int(parts[1])
+                     if (1900 <= p1 <= 2100) and (1900 <= p2 <= 2100):
+                         continue
+
+        valid_phones.append(m.strip())
+            
+    return list(set(valid_phones))
+
+def legacy_extract_careers(text: str) -> list:
+    """
+    Extract potential degrees/careers using Regex patterns and expanded Keywords.
+    """
+    careers = []
+    cleaned_text = re.sub(r'\s+', ' ', text) # Single line for easier regex
+
+    # 1. Regex Patterns for precise titles
+    patterns = [
+        r'(?i)(?:Ingenier[ía|o]|Licenciatur[a|o]|Grado|Diplomatura|Técnic[o|a]|Máster|Doctorado) (?:en|de) [a-zA-ZáéíóúÁÉÍÓÚñÑ ]+',
+        r'(?i)(?:Arquitect[o|ura]|Psicólog[o|ía]|Abogad[o|a])'
+    ]
+    
+    for pat in patterns:
+        matches = re.findall(pat, cleaned_text)
+        for m in matches:
+            # Filter out too long phrases (false positives capturing whole paragraphs)
+            if len(m.split()) <= 6: 
+                careers.append(m.strip())
+
+    # 2. Keyword fallback (if regex didn't catch specific "Administrador")
+    keywords = [
+        "Analista de Sistemas", "Desarrollador Full Stack", "Project Manager",
+        "Contador Público", "Economista", "Administrador de Empresas",
+        "Enfermero", "Médico Cirujano", "Marketing Digital", "Community Manager",
+        "Diseñador Gráfico", "Diseño Gráfico", "Consultor", "Auditor", "Psicólogo Organizacional",
+        "Recursos Humanos", "Ventas", "Atención al Cliente", "Soporte Técnico"
+    ]
+    
+    for k in keywords:
+        # Case insensitive search for keywords
+        if re.search(r'\b' + re.escape(k) + r'\b', cleaned_text, re.IGNORECASE):
+            careers.append(k)
+
+    return list(set(careers))
+
+def legacy_segment_cv(text: str) -> dict:
+    """
+    Segment CV into sections based on heuristic keywords.
+    """
+    segments = {
+        "personal_info": "",
+        "experience": "",
+        "education": "",
+        "skills": "",
+        "other": ""
+    }
+    
+    # Simple keyword-based segmentation
+    lower_text = text.lower()
+    lines = text.split('\n')
+    
+    current_section = "personal_info" # Default start
+    
+    # Keywords to trigger section change
+    section_map = {
+        "experiencia": "experience",
+        "laboral": "experience",
+        "trayectoria": "experience",
+        "educación": "education",
+        "formación": "education",
+        "estudios": "education",
+        "académica": "education",
+        "habilidades": "skills",
+        "competencias": "skills",
+        "conocimientos": "skills",
+        "skills": "skills",
+        "idiomas": "skills",
+        "proyectos": "other",
+        "referencias": "other"
+    }
+    
+    buffer = []
+    
+    for line in lines:
+        clean_line = line.strip().lower()
+        
+        # Check if line is a likely header (short, contains keyword)
+        if len(clean_line) < 40:
+            found_section = None
+            for key, sec in section_map.items():
+                if key in clean_line:
+                    found_section = sec
+                    break
+            
+            if found_section:
+                # Save buffer to current section
+                if buffer:
+                    segments[current_section] += "\n".join(buffer) + "\n"
+                    buffer = []
+                current_section = found_section
+                continue # Don't add header to body
+                
+        buffer.append(line)
+        
+    # Flush last buffer
+    if buffer:
+        segments[current_section] += "\n".join(buffer)
+        
+    return segments
+
+
+def legacy_analyze(cleaned_text: str) -> dict:
+    segments = legacy_segment_cv(cleaned_text)
+    search_scope_careers = segments['education'] + "\n" + segments['personal_info'] if segments['education'] else cleaned_text
+    return {
+        'segments': segments,
+        'emails': legacy_extract_emails(cleaned_text),
+        'phones': legacy_extract_phone_numbers(cleaned_text),
+        'careers': legacy_extract_careers(search_scope_careers),
+    }
+
+
+# =============================================
+# Corpus
+# =============================================
+
+_NAMES = ["Ana Quispe", "Luis Mamani", "Carla Rojas", "Jorge Vargas", "Maria Flores"]
+_TITLES = [
+    "Ingeniería de Sistemas", "Licenciatura en Administración de Empresas",
+    "Técnico en Contabilidad", "Grado en Psicología", "Máster en Marketing Digital"
+]
+_ROLES = [
+    "Analista de Sistemas", "Desarrollador Full Stack", "Contador Público",
+    "Community Manager", "Soporte Técnico", "Atención al Cliente", "Auditor"
+]
+_HEADERS = [
+    ("EXPERIENCIA LABORAL", "FORMACIÓN ACADÉMICA", "HABILIDADES", "IDIOMAS", "REFERENCIAS"),
+    ("Trayectoria", "Estudios", "Competencias y conocimientos", "Proyectos", "Referencias laborales"),
+    ("Experiencia profesional", "Educación", "Skills", "Idiomas", "Otros"),
+]
+
+
+def sample_cv(i: int) -> str:
+    """CV sintetico i (varia nombres, titulos, encabezados y formatos de telefono)"""
+    name = _NAMES[i % len(_NAMES)]
+    title = _TITLES[i % len(_TITLES)]
+    role = _ROLES[i % len(_ROLES)]
+    other_role = _ROLES[(i + 3) % len(_ROLES)]
+    exp, edu, skills, langs, refs = _HEADERS[i % len(_HEADERS)]
+    phone = ["+591 712 345 678", "712-34-56-78", "7123 4567", "71234567"][i % 4]
+    return f"""{name}
+{name.lower().replace(' ', '.')}{i}@ucb.edu.bo | Tel: {phone}
+La Paz, Bolivia
+
+{exp}
+{role} en Empresa {i} (2017-2019)
+- Responsable de ventas y recursos humanos del area comercial
+{other_role.upper()} en Consultora {i + 1} (2019 - 2021)
+- Trabajo con el equipo de marketing digital y diseño gráfico
+
+{edu}
+{title}, Universidad Catolica Boliviana (2012-2016)
+Diplomatura en Gestion de Proyectos
+
+{skills}
+Python, SQL, Excel avanzado, Power BI, liderazgo
+{langs}
+Español (nativo), Inglés (avanzado)
+
+{refs}
+Ing. Pedro Lopez - 76543210 - pedro.lopez@empresa.com
+"""
+
+
+def _corpus(size: int = 60):
+    return [sample_cv(i) for i in range(size)]
+
+
+def _normalize(result: dict) -> dict:
+    """Las funciones devuelven list(set(...)): se comparan como conjuntos"""
+    return {
+        'segments': result['segments'],
+        'emails': set(result['emails']),
+        'phones': set(result['phones']),
+        'careers': set(result['careers']),
+    }
+
+
+def test_analyzer_matches_legacy_on_corpus():
+    for cv in _corpus():
+        for text in (cv, nlp.clean_text(cv)):
+            assert _normalize(nlp.analyze_cv_text(text)) == _normalize(legacy_analyze(text))
+
+
+def test_segments_raw_cv():
+    segments = nlp.segment_cv(sample_cv(0))
+
+    assert "Analista de Sistemas" in segments['experience']
+    assert "Ingeniería de Sistemas" in segments['education']
+    assert "Power BI" in segments['skills']
+    assert segments == legacy_segment_cv(sample_cv(0))
+
+
+def test_header_priority_follows_section_order():
+    # "habilidades" y "experiencia" en la misma linea: gana la primera del mapa
+    text = "Juan\nHabilidades y experiencia\nPython"
+    assert nlp.segment_cv(text) == legacy_segment_cv(text)
+    assert nlp.segment_cv(text)['experience'] == "Python"
+
+
+def test_careers_keywords_case_insensitive():
+    text = "ANALISTA DE SISTEMAS y community manager; ventas"
+    careers = set(nlp.extract_careers(text))
+
+    assert {"Community Manager", "Ventas"} <= careers
+    assert careers == set(legacy_extract_careers(text))
+
+
+def test_phone_date_ranges_are_ignored():
+    text = "Trabajo 2017-2019 y 1998 2004. Celular 71234567"
+    assert nlp.extract_phone_numbers(text) == ["71234567"]
+    assert set(nlp.extract_phone_numbers(text)) == set(legacy_extract_phone_numbers(text))
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,41 @@
+"""
+Test de la carga diferida del pipeline spaCy
+Verifica que importar el modulo no carga el modelo y que se carga una sola
+vez aunque haya threads concurrentes
+"""
+
+import os
+import sys
+import threading
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import spacy
+
+from app.core import nlp
+
+
+def test_model_loads_once_on_first_use(monkeypatch):
+    loads = []
+
+    def fake_load():
+        loads.append(1)
+        return spacy.blank("es")
+
+    monkeypatch.setattr(nlp, "_nlp", None)
+    monkeypatch.setattr(nlp, "load_spacy_model", fake_load)
+
+    threads = [threading.Thread(target=nlp.get_nlp) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    assert nlp.nlp is nlp.get_nlp()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,109 @@
+"""
+Test de requisitos de oferta compilados
+Verifica el cache de OfferRequirementProfile y su invalidacion
+"""
+
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.scoring.feature_engineering import (
+    OfferProfileCache,
+    OfferRequirementProfile,
+    extract_features,
+    calculate_hard_skills_score,
+    calculate_soft_skills_score,
+)
+
+
+config = {
+    "id": "oferta-1",
+    "version": "2025-01-01T00:00:00",
+    "weights": {
+        "hard_skills": 0.35,
+        "soft_skills": 0.15,
+        "experience": 0.25,
+        "education": 0.15,
+        "languages": 0.10,
+    },
+    "requirements": {
+        "min_experience_years": 1.0,
+        "required_skills": ["Python", "React.js", "PostgreSQL"],
+        "preferred_skills": ["Docker"],
+        "required_soft_skills": ["Teamwork", "Liderazgo"],
+        "required_education_level": "Maestria",
+        "required_languages": ["Ingles"],
+    },
+}
+
+
+def test_profile_normalizes_requirements():
+    """El perfil compilado guarda requisitos normalizados"""
+    profile = OfferRequirementProfile(config)
+
+    assert profile.required_skills_normalized == {"python", "react", "postgres"}
+    assert profile.preferred_skills_normalized == {"docker"}
+    assert profile.required_soft_categories == {
+        "trabajo en equipo": "interpersonal",
+        "liderazgo": "interpersonal",
+    }
+    assert profile.required_languages_parsed == [("Ingles", "ingles")]
+    assert profile.required_education_score == 0.92
+    assert profile.weight_vector == [0.35, 0.15, 0.25, 0.15, 0.10]
+
+
+def test_cache_reuses_and_invalidates():
+    """El cache reutiliza por (id, version) y se invalida por id"""
+    cache = OfferProfileCache(max_size=2)
+
+    first = cache.get(config)
+    assert cache.get(dict(config)) is first
+    assert cache.stats()["hits"] == 1
+
+    # Una nueva version de la oferta compila un perfil nuevo
+    updated = {**config, "version": "2025-02-01T00:00:00"}
+    assert cache.get(updated) is not first
+
+    cache.invalidate("oferta-1")
+    assert cache.stats()["size"] == 0
+
+    # Sin 'version', la huella del contenido distingue configuraciones
+    a = {k: v for k, v in config.items() if k != "version"}
+    b = {**a, "requirements": {**a["requirements"], "required_skills": ["Java"]}}
+    assert cache.get(a) is not cache.get(b)
+
+    # LRU acotado
+    cache.get({**a, "id": "oferta-2"})
+    assert cache.stats()["size"] == 2
+
+
+def test_compiled_scores_match_public_scorers():
+    """extract_features con requisitos compilados coincide con los scorers"""
+    cv = {
+        "hard_skills": ["Python", "React", "SQL"],
+        "soft_skills": ["Trabajo en equipo", "Comunicacion"],
+        "education": [{"degree": "Licenciatura en Sistemas"}],
+        "experience": [{"duration": "2 anios"}],
+        "personal_info": {"languages": ["Ingles (B2)"]},
+    }
+    req = config["requirements"]
+
+    features = extract_features(cv, config)
+    hard = calculate_hard_skills_score(
+        cv["hard_skills"], req["required_skills"], req["preferred_skills"]
+    )
+    soft = calculate_soft_skills_score(cv["soft_skills"], req["required_soft_skills"])
+
+    assert features["cv_scores"]["hard_skills_score"] == hard["score"]
+    assert features["cv_scores"]["soft_skills_score"] == soft["score"]
+    assert features["cv_scores"]["education_score"] == round(0.75 / 0.92, 3)
+    assert features["cv_scores"]["languages_score"] == 0.75
+
+
+if __name__ == "__main__":
+    test_profile_normalizes_requirements()
+    test_cache_reuses_and_invalidates()
+    test_compiled_scores_match_public_scorers()
+    print("[OK] Tests de requisitos compilados pasados")
@@ -0,0 +1,90 @@
+"""
+Test de la extraccion de texto de PDFs en el pool de procesos
+Verifica orden de paginas con bloques en paralelo, limite de paginas y
+errores de PDFs invalidos, y que muchos documentos a la vez entran al pool
+de a pocos sin que la espera cuente para su timeout
+"""
+
+import asyncio
+import os
+import sys
+from io import BytesIO
+
+import pytest
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from reportlab.pdfgen import canvas
+
+import app.services.pdf_extraction_service as pdf_extraction_service
+from app.services.pdf_extraction_service import PDFExtractionService
+
+
+def _pdf(n_pages: int) -> bytes:
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer)
+    for i in range(n_pages):
+        c.drawString(72, 720, f"Pagina {i + 1}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(pdf_extraction_service.settings, "PDF_WORKERS", 2)
+    monkeypatch.setattr(pdf_extraction_service.settings, "PDF_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(pdf_extraction_service.settings, "PDF_PAGES_PER_TASK", 2)
+    monkeypatch.setattr(pdf_extraction_service.settings, "PDF_MAX_PAGES", 7)
+    monkeypatch.setattr(PDFExtractionService, "_instance", None)
+    svc = PDFExtractionService()
+    yield svc
+    svc.shutdown()
+
+
+def test_pages_are_extracted_in_order_up_to_limit(service):
+    text = asyncio.run(service.extract_text(_pdf(9)))
+
+    assert text.splitlines() == [f"Pagina {i}" for i in range(1, 8)]
+    assert text.endswith("\n")
+
+
+def test_invalid_pdf_raises_value_error(service):
+    with pytest.raises(ValueError, match="PDF invalido"):
+        asyncio.run(service.extract_text(b"no es un pdf"))
+
+    blank = BytesIO()
+    c = canvas.Canvas(blank)
+    c.showPage()
+    c.save()
+    with pytest.raises(ValueError, match="No se pudo extraer texto"):
+        asyncio.run(service.extract_text(blank.getvalue()))
+
+
+def test_documents_are_admitted_in_slots(service, monkeypatch):
+    monkeypatch.setattr(pdf_extraction_service.settings, "PDF_TIMEOUT_SECONDS", 0.1)
+    in_flight, peak = 0, 0
+
+    async def fake_extract_pages(pdf_bytes):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.03)
+        in_flight -= 1
+        return pdf_bytes.decode()
+
+    monkeypatch.setattr(service, "_extract_pages", fake_extract_pages)
+
+    async def scenario():
+        return await asyncio.gather(*[service.extract_text(f"CV {i}".encode()) for i in range(24)])
+
+    # 24 documentos en tandas de 4 tardan ~0.18s: mas que el timeout de cada uno
+    texts = asyncio.run(scenario())
+
+    assert texts == [f"CV {i}" for i in range(24)]
+    assert peak == 2 * pdf_extraction_service.IN_FLIGHT_PER_WORKER
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
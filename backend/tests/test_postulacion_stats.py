@@ -0,0 +1,108 @@
+"""
+Test de estadisticas de postulaciones por oferta
+Verifica la agregacion, el cache y su invalidacion al postular, incluso si
+la invalidacion llega mientras se lee la vista
+"""
+
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.services.postulacion_service as postulacion_module
+from app.services.postulacion_service import get_postulacion_service
+
+
+postulaciones = [
+    {"id": "p1", "oferta_id": "o1", "clasificacion": "APTO", "match_score": 0.81},
+    {"id": "p2", "oferta_id": "o1", "clasificacion": "NO_APTO", "match_score": 0.30},
+    {"id": "p3", "oferta_id": "o1", "clasificacion": "CONSIDERADO", "match_score": None},
+    {"id": "p4", "oferta_id": "o2", "clasificacion": "APTO", "match_score": 0.90},
+]
+
+
+class FakeSupabaseSinVista(FakeSupabase):
+    """Base de datos sin la migracion v9 aplicada"""
+
+    def table(self, name):
+        if name == "postulaciones_stats_por_oferta":
+            raise RuntimeError("relation does not exist")
+        return super().table(name)
+
+
+def test_stats_fallback_and_cache(monkeypatch):
+    """Sin la vista se agrega en Python; la segunda lectura usa el cache"""
+    fake = FakeSupabaseSinVista({"postulaciones": postulaciones})
+    monkeypatch.setattr(postulacion_module, "supabase", fake)
+
+    service = get_postulacion_service()
+    service.invalidate_stats_cache()
+
+    stats = service.get_stats_por_oferta()
+    assert stats["o1"] == {
+        "total": 3, "apto": 1, "considerado": 1, "no_apto": 1,
+        "mejor_puntaje": 81, "promedio_puntaje": round((0.81 + 0.30) / 2 * 100),
+    }
+    assert stats["o2"]["total"] == 1
+
+    queries = len(fake.queries)
+    service.get_stats_por_oferta()
+    assert len(fake.queries) == queries
+
+    service.invalidate_stats_cache()
+    service.get_stats_por_oferta()
+    assert len(fake.queries) == queries + 1
+
+
+def test_stats_from_view(monkeypatch):
+    """Con la vista de la migracion v9 se hace una sola consulta"""
+    fake = FakeSupabase({"postulaciones_stats_por_oferta": [
+        {"oferta_id": "o1", "total": 2, "apto": 2, "considerado": 0, "no_apto": 0,
+         "max_score": 0.75, "avg_score": 0.7},
+    ]})
+    monkeypatch.setattr(postulacion_module, "supabase", fake)
+
+    service = get_postulacion_service()
+    service.invalidate_stats_cache()
+
+    stats = service.get_stats_por_oferta()
+    assert fake.queries == ["postulaciones_stats_por_oferta"]
+    assert stats["o1"]["mejor_puntaje"] == 75
+    assert stats["o1"]["promedio_puntaje"] == 70
+    service.invalidate_stats_cache()
+
+
+def test_invalidation_during_read_is_not_lost(monkeypatch):
+    """Una postulacion que invalida durante la lectura no deja cache viejo"""
+    service = get_postulacion_service()
+    service.invalidate_stats_cache()
+
+    class FakeSupabasePostulaDuranteLectura(FakeSupabase):
+        def table(self, name):
+            if name == "postulaciones_stats_por_oferta" and len(self.queries) == 0:
+                # Otra request guarda una postulacion mientras se lee la vista
+                service.invalidate_stats_cache()
+            return super().table(name)
+
+    fake = FakeSupabasePostulaDuranteLectura({"postulaciones_stats_por_oferta": [
+        {"oferta_id": "o1", "total": 1, "apto": 1, "considerado": 0, "no_apto": 0,
+         "max_score": "0.8", "avg_score": "0.8"},
+    ]})
+    monkeypatch.setattr(postulacion_module, "supabase", fake)
+
+    assert service.get_stats_por_oferta()["o1"]["mejor_puntaje"] == 80
+    service.get_stats_por_oferta()
+    assert fake.queries == ["postulaciones_stats_por_oferta"] * 2
+
+    # Sin invalidaciones concurrentes la tercera lectura ya usa el cache
+    service.get_stats_por_oferta()
+    assert len(fake.queries) == 2
+    service.invalidate_stats_cache()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
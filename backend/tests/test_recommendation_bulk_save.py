@@ -0,0 +1,102 @@
+"""
+Test del guardado agrupado de recomendaciones
+Verifica que el top N se escribe con un solo upsert (conflicto en
+usuario_id + oferta_id) y que marcar varias recomendaciones como vistas
+es un solo update limitado al usuario
+"""
+
+import itertools
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.services.recommendation_service as recommendation_module
+from app.db import recommendations_repository
+from app.services.recommendation_service import get_recommendation_service
+
+
+_ids = itertools.count()
+
+
+def _rec(j: int, score: float = 0.5):
+    return {
+        "oferta_id": f"o{j}",
+        "match_score": score,
+        "clasificacion": "CONSIDERADO",
+        "scores_detalle": {"hard_skills": score},
+        "fortalezas": ["Habilidades tecnicas"],
+        "debilidades": [],
+        "match_details": None,
+    }
+
+
+def _setup(monkeypatch, rows=None):
+    fake = FakeSupabase({"recomendaciones": rows or []}, defaults={
+        "recomendaciones": lambda: {
+            "id": f"rec-{next(_ids)}", "fue_vista": False, "created_at": "2026-10-01"
+        },
+    })
+    monkeypatch.setattr(recommendation_module, "supabase", fake)
+    return fake
+
+
+def test_top_n_saved_with_single_upsert(monkeypatch):
+    fake = _setup(monkeypatch)
+    service = get_recommendation_service()
+
+    saved = service._save_recommendations("u1", [_rec(j) for j in range(10)])
+
+    assert fake.queries == ["recomendaciones"]
+    assert len(fake.tables["recomendaciones"]) == 10
+    assert [r["oferta_id"] for r in saved] == [f"o{j}" for j in range(10)]
+    assert all(r["id"].startswith("rec-") and r["fue_vista"] is False for r in saved)
+
+    # Segundo guardado: conflicto en usuario_id + oferta_id, sin duplicados
+    fake.queries.clear()
+    again = service._save_recommendations("u1", [_rec(j, 0.8) for j in range(10)])
+    assert fake.queries == ["recomendaciones"]
+    assert len(fake.tables["recomendaciones"]) == 10
+    assert [r["id"] for r in again] == [r["id"] for r in saved]
+    assert all(r["match_score"] == 0.8 for r in fake.tables["recomendaciones"])
+
+
+def test_upsert_is_chunked(monkeypatch):
+    fake = _setup(monkeypatch)
+    monkeypatch.setattr(recommendations_repository, "UPSERT_CHUNK_SIZE", 4)
+
+    saved = recommendations_repository.upsert_recommendations(fake, "u1", [_rec(j) for j in range(10)])
+
+    assert fake.queries.count("recomendaciones") == 3
+    assert set(saved) == {f"o{j}" for j in range(10)}
+
+
+def test_mark_many_as_viewed_in_one_update(monkeypatch):
+    rows = [
+        {"id": f"r{j}", "usuario_id": "u1" if j < 4 else "u2", "oferta_id": f"o{j}",
+         "fue_vista": False, "vista_at": None}
+        for j in range(6)
+    ]
+    fake = _setup(monkeypatch, rows)
+    service = get_recommendation_service()
+
+    # r4 pertenece a otro usuario y se ignora
+    marked = service.mark_many_as_viewed("u1", ["r0", "r1", "r2", "r4", "r1"])
+
+    assert sorted(marked) == ["r0", "r1", "r2"]
+    assert fake.queries == ["recomendaciones"]
+    viewed = {r["id"] for r in fake.tables["recomendaciones"] if r["fue_vista"]}
+    assert viewed == {"r0", "r1", "r2"}
+    assert all(r["vista_at"] for r in fake.tables["recomendaciones"] if r["fue_vista"])
+
+    # El endpoint individual usa el mismo camino
+    assert service.mark_as_viewed("u1", "r3") is True
+    assert service.mark_as_viewed("u1", "r5") is False
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
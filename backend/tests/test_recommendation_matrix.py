@@ -0,0 +1,252 @@
+"""
+Test de la matriz precalculada de recomendaciones
+Verifica que filas y columnas producen los mismos scores que la evaluacion
+por oferta, que los cambios de perfil/oferta encolan el recalculo y que el
+endpoint lee la matriz e informa su antiguedad
+"""
+
+import asyncio
+import itertools
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.services.oferta_service as oferta_module
+import app.services.profile_service as profile_module
+import app.services.recommendation_matrix_service as matrix_module
+import app.services.recommendation_service as recommendation_module
+from app.services.recommendation_matrix_service import RecommendationMatrixService
+from app.services.recommendation_service import get_recommendation_service
+
+
+SKILLS = ["Python", "SQL", "React", "Docker", "Java", "Excel"]
+
+_ids = itertools.count()
+
+
+def _ofertas(n: int):
+    return [
+        {
+            "id": f"o{j}",
+            "titulo": f"Oferta {j}",
+            "tipo": "pasantia" if j % 2 == 0 else "empleo",
+            "is_active": j != 3,
+            "fecha_cierre": None,
+            "created_at": f"2026-01-{j + 1:02d}",
+            "updated_at": "v1",
+            "requirements": {
+                "required_skills": SKILLS[j % 4: j % 4 + 2],
+                "required_soft_skills": ["Liderazgo"],
+                "semestre_minimo": 5 if j == 2 else None,
+            },
+        }
+        for j in range(n)
+    ]
+
+
+def _profiles(n: int):
+    rows = []
+    for i in range(n):
+        rows.append({
+            "usuario_id": f"u{i}",
+            "updated_at": "v1",
+            "is_complete": True,
+            "carrera": "Sistemas",
+            "semestre_actual": 3 + i % 4,
+            "hard_skills": SKILLS[i % 3: i % 3 + 3],
+            "soft_skills": ["Liderazgo", "Trabajo en equipo"],
+            "languages": ["Ingles (B1)"],
+            "education_level": "Licenciatura",
+            "experience_years": 1,
+            "gemini_extraction": {
+                "hard_skills": SKILLS[i % 3: i % 3 + 3],
+                "soft_skills": ["Liderazgo", "Trabajo en equipo"],
+                "education": [{"degree": "Licenciatura en Sistemas"}],
+                "experience": [{"duration": f"{i % 4} anios"}],
+                "personal_info": {
+                    "languages": ["Ingles (B1)"],
+                    "summary": "Estudiante de sistemas con experiencia en datos",
+                },
+            },
+            "usuarios": {"rol": "estudiante"},
+        })
+    return rows
+
+
+def _setup(monkeypatch, n_profiles=6, n_ofertas=5):
+    fake = FakeSupabase({
+        "perfiles_profesionales": _profiles(n_profiles),
+        "convocatorias_laborales": _ofertas(n_ofertas),
+        "match_scores": [],
+        "recomendaciones": [],
+    }, defaults={
+        "recomendaciones": lambda: {
+            "id": f"rec-{next(_ids)}", "fue_vista": False, "created_at": "2026-10-01"
+        },
+    })
+    for module in (matrix_module, recommendation_module, oferta_module, profile_module):
+        monkeypatch.setattr(module, "supabase", fake)
+
+    # Singleton: lo mismo que devuelve get_recommendation_matrix_service()
+    matrix = RecommendationMatrixService()
+    matrix._reset()
+    return fake, matrix
+
+
+def _cells(fake):
+    return {(c["usuario_id"], c["oferta_id"]): c for c in fake.tables["match_scores"]}
+
+
+def test_rows_and_columns_match_per_offer_evaluation(monkeypatch):
+    fake, matrix = _setup(monkeypatch)
+    service = get_recommendation_service()
+
+    matrix.recompute_users([f"u{i}" for i in range(6)])
+    by_row = {k: v["match_score"] for k, v in _cells(fake).items()}
+
+    # Solo ofertas activas: 6 candidatos x 4 ofertas
+    assert len(by_row) == 24
+    assert not any(oferta_id == "o3" for _, oferta_id in by_row)
+
+    fake.tables["match_scores"] = []
+    matrix.recompute_offers([f"o{j}" for j in range(5)])
+    by_column = {k: v["match_score"] for k, v in _cells(fake).items()}
+    assert by_column == by_row
+
+    # Referencia: una oferta por vez con _evaluate_oferta
+    profile = fake.tables["perfiles_profesionales"][0]
+    oferta = next(o for o in oferta_module.get_oferta_service().list_open_ofertas() if o["id"] == "o2")
+    expected = service._evaluate_oferta(
+        profile["gemini_extraction"], oferta,
+        {"carrera": "Sistemas", "semestre_actual": 3, "user_role": "estudiante"}
+    )
+    cell = _cells(fake)[("u0", "o2")]
+    assert cell["match_score"] == expected["match_score"] == 0.0
+    assert cell["clasificacion"] == "NO_APTO"
+    assert cell["perfil_version"] == "v1" and cell["oferta_version"] == "v1"
+
+
+def test_changes_mark_dirty_and_workers_recompute(monkeypatch):
+    fake, matrix = _setup(monkeypatch)
+
+    matrix.recompute_users(["u0", "u1"])
+    fake.queries.clear()
+
+    # Un perfil cambia dos veces y una oferta se reactiva: un solo recalculo por id
+    profile = dict(fake.tables["perfiles_profesionales"][0], updated_at="v2")
+    fake.tables["perfiles_profesionales"][0] = profile
+    profile_module.get_profile_service()._warm_candidate_features("u0", profile)
+    profile_module.get_profile_service()._warm_candidate_features("u0", profile)
+    matrix.mark_offer_dirty("o1")
+    assert matrix.metrics()["dirty_users"] == 1
+    assert matrix.metrics()["dirty_offers"] == 1
+
+    async def drain():
+        results = []
+        while True:
+            processed = await matrix.run_pending_batch()
+            if processed is None:
+                return results
+            results.append(processed)
+
+    assert asyncio.run(drain()) == [True, True]
+    assert matrix.metrics()["dirty_users"] == matrix.metrics()["dirty_offers"] == 0
+
+    cells = _cells(fake)
+    assert all(c["perfil_version"] == "v2" for (u, _), c in cells.items() if u == "u0")
+    # La columna de o1 cubre a todos los perfiles completos
+    assert {u for (u, o) in cells if o == "o1"} == {f"u{i}" for i in range(6)}
+
+
+def test_rows_use_skill_index_pruning(monkeypatch):
+    fake, matrix = _setup(monkeypatch)
+    matrix.recompute_users(["u0"])
+    assert sum(1 for (u, _) in _cells(fake) if u == "u0") == 4
+
+    # Primera etapa con top_k = 2: solo las ofertas con mas skills en comun
+    # llegan al modelo y las celdas que la fila ya no incluye se borran
+    service = recommendation_module.get_recommendation_service()
+    monkeypatch.setattr(type(service), "MAX_TOP_N", 1)
+    monkeypatch.setattr(type(service), "RETRIEVAL_FACTOR", 2)
+    monkeypatch.setattr(type(service), "RETRIEVAL_MIN_K", 2)
+    assert service.retrieval_k(service.MAX_TOP_N) == 2
+
+    profile = dict(fake.tables["perfiles_profesionales"][0], updated_at="v2")
+    fake.tables["perfiles_profesionales"][0] = profile
+    matrix.recompute_users(["u0"])
+
+    row = {o: c for (u, o), c in _cells(fake).items() if u == "u0"}
+    # top_k por tipo: 2 de las 3 pasantias mas el unico empleo activo
+    assert len(row) == 3
+    assert all(c["perfil_version"] == "v2" for c in row.values())
+
+    # u0 sabe Python, SQL y React: o2 (React, Docker) comparte un solo skill
+    assert "o2" not in row
+    assert "o1" in row
+
+
+def test_pruning_keeps_top_k_per_tipo(monkeypatch):
+    fake, matrix = _setup(monkeypatch, n_ofertas=6)
+    # 4 empleos que comparten mas skills que las 2 pasantias
+    for j, oferta in enumerate(fake.tables["convocatorias_laborales"]):
+        oferta["is_active"] = True
+        oferta["tipo"] = "empleo" if j < 4 else "pasantia"
+        oferta["requirements"]["required_skills"] = (
+            ["Python", "SQL", "React"] if j < 4 else ["Python", "Java"]
+        )
+        oferta["requirements"]["semestre_minimo"] = None
+        oferta["updated_at"] = "v2"
+
+    service = recommendation_module.get_recommendation_service()
+    monkeypatch.setattr(type(service), "MAX_TOP_N", 1)
+    monkeypatch.setattr(type(service), "RETRIEVAL_FACTOR", 2)
+    monkeypatch.setattr(type(service), "RETRIEVAL_MIN_K", 2)
+
+    matrix.recompute_users(["u0"])
+    row = {o: c for (u, o), c in _cells(fake).items() if u == "u0"}
+    assert sorted(row) == ["o0", "o1", "o4", "o5"]
+
+    # La lectura filtrada por tipo encuentra sus ofertas en la fila
+    profile = fake.tables["perfiles_profesionales"][0]
+    result = matrix.get_user_scores("u0", profile, tipo="pasantia")
+    assert result["cells"] == 4
+    assert sorted(c["oferta_id"] for c in result["scores"]) == ["o4", "o5"]
+
+
+def test_endpoint_reads_matrix_and_reports_staleness(monkeypatch):
+    fake, matrix = _setup(monkeypatch)
+    service = get_recommendation_service()
+
+    # Primera lectura: la fila no existe y se calcula en la request
+    first = service.get_recommendations_for_user("u1", "estudiante", top_n=2)
+    assert len(first["recomendaciones"]) == 2
+    assert first["matriz"]["stale"] is False
+    assert all(r["oferta"]["tipo"] == "pasantia" for r in first["recomendaciones"])
+    assert len(fake.tables["recomendaciones"]) == 2
+
+    # Lectura en caliente: sin escrituras ni evaluaciones
+    fake.queries.clear()
+    second = service.get_recommendations_for_user("u1", "estudiante", top_n=2)
+    assert [r["match_score"] for r in second["recomendaciones"]] == \
+        [r["match_score"] for r in first["recomendaciones"]]
+    # Solo la fila de la matriz, sus ofertas por id y el historial
+    assert fake.queries.count("match_scores") == 1
+    assert fake.queries.count("convocatorias_laborales") == 1
+    assert fake.queries.count("recomendaciones") == 1
+
+    # Una oferta cambia: se sirve la fila vieja marcada y se encola el recalculo
+    fake.tables["convocatorias_laborales"][0]["updated_at"] = "v2"
+    stale = service.get_recommendations_for_user("u1", "estudiante", top_n=2)
+    assert stale["matriz"]["stale"] is True
+    assert stale["matriz"]["stale_ofertas"] == 1
+    assert stale["matriz"]["pending_recompute"] is True
+    assert matrix.is_user_pending("u1")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,124 @@
+"""
+Test de matching inverso (oferta -> candidatos)
+Verifica que el ranking paginado coincide con evaluar cada perfil por separado
+y que la version async lee en el pool de la base de datos pero evalua fuera
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_supabase import FakeSupabase
+
+import app.services.recommendation_service as recommendation_module
+from app.services.ml_integration_service import get_ml_service
+from app.services.oferta_service import get_oferta_service
+from app.services.recommendation_service import get_recommendation_service
+
+
+SKILLS = ["Python", "SQL", "React", "Docker", "Java", "Excel"]
+
+oferta = {
+    "id": "oferta-1",
+    "tipo": "pasantia",
+    "is_active": True,
+    "updated_at": "v1",
+    "requirements": {
+        "required_skills": ["Python", "SQL"],
+        "preferred_skills": ["Docker"],
+        "required_soft_skills": ["Liderazgo"],
+        "semestre_minimo": 5,
+    },
+}
+
+
+def _profiles(n: int):
+    rows = []
+    for i in range(n):
+        rows.append({
+            "usuario_id": f"u{i:03d}",
+            "updated_at": "v1",
+            "is_complete": i % 7 != 0,
+            "carrera": "Sistemas",
+            "semestre_actual": 3 + i % 6,
+            "gemini_extraction": {
+                "hard_skills": SKILLS[i % 3: i % 3 + 1 + i % 4],
+                "soft_skills": ["Liderazgo"] if i % 2 else [],
+                "education": [{"degree": "Licenciatura"}],
+                "experience": [{"duration": f"{i % 4} anios"}],
+                "personal_info": {"languages": ["Ingles (B1)"]},
+            },
+            "usuarios": {"rol": "titulado" if i % 11 == 0 else "estudiante"},
+        })
+    return rows
+
+
+def test_paged_ranking_matches_individual_evaluation(monkeypatch):
+    """El top N paginado es el mismo que evaluar perfil por perfil"""
+    fake = FakeSupabase({"perfiles_profesionales": _profiles(60)})
+    monkeypatch.setattr(recommendation_module, "supabase", fake)
+    monkeypatch.setattr(get_oferta_service(), "get_oferta", lambda _id: dict(oferta))
+
+    service = get_recommendation_service()
+    result = service.rank_candidates_for_oferta("oferta-1", top_n=5, page_size=8)
+
+    # Referencia: evaluar cada perfil elegible con evaluate_cv
+    config = service._create_profile_from_oferta(oferta)
+    expected = []
+    for row in fake.tables["perfiles_profesionales"]:
+        if not row["is_complete"] or row["usuarios"]["rol"] != "estudiante":
+            continue
+        if row["semestre_actual"] < 5:
+            continue
+        evaluation = get_ml_service().evaluate_cv(row["gemini_extraction"], config)
+        expected.append((-evaluation["match_score"], row["usuario_id"]))
+    expected.sort()
+
+    scores = [c["match_score"] for c in result["candidatos"]]
+    assert scores == [-s for s, _ in expected[:5]]
+    assert result["total_evaluados"] == len(expected)
+    assert all(c["fortalezas"] for c in result["candidatos"])
+
+    # Paginado: varias consultas con rango, ninguna por perfil
+    n_complete = sum(1 for r in fake.tables["perfiles_profesionales"] if r["is_complete"])
+    assert len(fake.queries) == n_complete // 8 + 1
+
+
+def test_async_ranking_scores_outside_db_pool(monkeypatch):
+    fake = FakeSupabase({"perfiles_profesionales": _profiles(60)})
+    monkeypatch.setattr(recommendation_module, "supabase", fake)
+    monkeypatch.setattr(get_oferta_service(), "get_oferta", lambda _id: dict(oferta))
+
+    service = get_recommendation_service()
+    expected = service.rank_candidates_for_oferta("oferta-1", top_n=5, page_size=8)
+
+    threads = {"read": set(), "score": set()}
+    read_page, score_page = service._read_profiles_page, service._score_ranking_page
+
+    def traced_read(*args):
+        threads["read"].add(threading.current_thread().name)
+        return read_page(*args)
+
+    def traced_score(*args):
+        threads["score"].add(threading.current_thread().name)
+        return score_page(*args)
+
+    monkeypatch.setattr(service, "_read_profiles_page", traced_read)
+    monkeypatch.setattr(service, "_score_ranking_page", traced_score)
+
+    result = asyncio.run(service.rank_candidates_for_oferta_async("oferta-1", top_n=5, page_size=8))
+
+    assert [c["usuario_id"] for c in result["candidatos"]] == \
+        [c["usuario_id"] for c in expected["candidatos"]]
+    assert result["total_evaluados"] == expected["total_evaluados"]
+    assert all(name.startswith("db") for name in threads["read"])
+    assert threads["score"] and not any(name.startswith("db") for name in threads["score"])
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,85 @@
+"""
+Test del indice invertido de skills
+Verifica el mantenimiento incremental y la etapa de recuperacion
+"""
+
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.skill_index_service import SkillIndexService
+
+
+def _offer(oferta_id, required, preferred=None, soft=None, **extra):
+    return {
+        "id": oferta_id,
+        "updated_at": "v1",
+        "requirements": {
+            "required_skills": required,
+            "preferred_skills": preferred or [],
+            "required_soft_skills": soft or [],
+        },
+        **extra,
+    }
+
+
+def _fresh_index() -> SkillIndexService:
+    index = SkillIndexService()
+    index._reset()
+    return index
+
+
+def test_retrieve_candidates_ranks_by_overlap():
+    """Los candidatos se ordenan por skills requeridos/preferidos en comun"""
+    index = _fresh_index()
+    index.index_candidate("u1", ["Python", "React.js"], ["Liderazgo"])
+    index.index_candidate("u2", ["Python"], [])
+    index.index_candidate("u3", ["Java"], [])
+
+    oferta = _offer("o1", ["Python", "React"], soft=["Liderazgo"])
+    ranked = index.retrieve_candidates(oferta, top_k=5)
+
+    assert ranked == [("u1", 5), ("u2", 2)]
+    assert index.retrieve_candidates(oferta, top_k=1) == [("u1", 5)]
+
+    # Sin skills requeridos no se puede filtrar
+    assert index.retrieve_candidates(_offer("o2", []), top_k=5) is None
+
+
+def test_incremental_updates():
+    """Reindexar o eliminar un candidato actualiza las listas invertidas"""
+    index = _fresh_index()
+    index.index_candidate("u1", ["Python"], [])
+    index.index_candidate("u1", ["Java"], [])
+
+    assert index.retrieve_candidates(_offer("o1", ["Python"]), top_k=5) == []
+    assert index.retrieve_candidates(_offer("o1", ["Java"]), top_k=5) == [("u1", 2)]
+
+    index.remove_candidate("u1")
+    assert index.get_stats()["hard_skills"] == 0
+
+
+def test_select_ofertas_keeps_unconstrained():
+    """select_ofertas conserva el top-K y las ofertas sin skills requeridos"""
+    index = _fresh_index()
+    ofertas = [
+        _offer("o1", ["Python"]),
+        _offer("o2", ["Java"]),
+        _offer("o3", []),
+        _offer("o4", ["Python", "SQL"]),
+        _offer("o5", ["Go"], is_active=False),
+    ]
+
+    selected = index.select_ofertas({"python", "sql"}, set(), ofertas, top_k=1)
+
+    assert [o["id"] for o in selected] == ["o3", "o4"]
+    assert index.get_stats()["offers"] == 4
+
+
+if __name__ == "__main__":
+    test_retrieve_candidates_ranks_by_overlap()
+    test_incremental_updates()
+    test_select_ofertas_keeps_unconstrained()
+    print("[OK] Tests de indice de skills pasados")
@@ -0,0 +1,107 @@
+"""
+Test del vocabulario de skills compartido
+Verifica la similitud por producto punto, el refresco incremental, los
+skills fuera del vocabulario (IDF maximo, sin calculo por par) y el fallback
+por par cuando no hay vocabulario
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+import app.scoring.feature_engineering.hard_skills_scorer as hard_skills_scorer
+from app.scoring.feature_engineering import (
+    SkillVocabulary,
+    calculate_tfidf_similarity,
+    get_skill_vocabulary,
+    set_skill_vocabulary,
+)
+
+
+documents = [
+    ["Python", "Machine Learning", "SQL"],
+    ["React", "JavaScript", "Node"],
+    ["Python", "Django", "PostgreSQL"],
+    ["Machine Learning", "Deep Learning", "Python"],
+]
+
+
+def test_similarity_matches_sklearn_on_same_corpus():
+    """El producto punto coincide con un TfidfVectorizer ajustado al corpus"""
+    vocabulary = SkillVocabulary().fit(documents)
+
+    reference = TfidfVectorizer(lowercase=True, ngram_range=(1, 2))
+    matrix = reference.fit_transform([' '.join(d) for d in documents])
+    expected = cosine_similarity(matrix[0:1], matrix[3:4])[0][0]
+
+    similarity = vocabulary.similarity(documents[0], documents[3])
+    assert abs(similarity - expected) < 1e-9
+
+
+def test_oov_and_incremental_refresh():
+    """Skills nuevos entran con el IDF maximo hasta refrescar el vocabulario"""
+    vocabulary = SkillVocabulary().fit(documents, ids := ["cv:1", "cv:2", "cv:3", "cv:4"])
+
+    cv_vector = vocabulary.vectorize(["Python", "Kubernetes"])
+    assert cv_vector.oov_terms > 0
+    diluted = vocabulary.similarity(["Python", "Kubernetes"], ["Python"], cv_vector)
+    assert 0 < diluted < 1
+
+    # Un skill desconocido pesa como el mas raro del corpus: diluye mas que SQL
+    assert diluted < vocabulary.similarity(["Python", "SQL"], ["Python"])
+    # Y si ambos lados lo comparten, cuenta como coincidencia
+    assert vocabulary.similarity(["Kubernetes"], ["Kubernetes"]) == pytest.approx(1.0)
+    assert vocabulary.similarity(["Rust"], ["Kubernetes"]) == 0.0
+
+    # IDs ya agregados se ignoran
+    assert vocabulary.update(documents, ids) == 0
+
+    version = vocabulary.version
+    assert vocabulary.update([["Kubernetes", "Docker"]], ["oferta:9"]) == 1
+    assert vocabulary.version != version
+
+    # El vector viejo se recalcula con la nueva version
+    similarity = vocabulary.similarity(["Python", "Kubernetes"], ["Kubernetes"], cv_vector)
+    assert similarity > 0
+
+
+def test_scorer_uses_persisted_vocabulary(monkeypatch):
+    """calculate_tfidf_similarity usa el vocabulario global y cae al par si no hay"""
+    previous = get_skill_vocabulary()
+    try:
+        set_skill_vocabulary(None)
+        pairwise = calculate_tfidf_similarity(["Python", "Rust"], ["Python"])
+        assert 0 < pairwise < 1
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "skill_vocabulary_v1.joblib")
+            SkillVocabulary().fit(documents).save(path)
+            loaded = SkillVocabulary.load(path)
+        assert loaded.size > 0
+        set_skill_vocabulary(loaded)
+
+        shared = calculate_tfidf_similarity(documents[0], documents[2])
+        assert abs(shared - loaded.similarity(documents[0], documents[2])) < 1e-12
+
+        # "Rust" esta fuera del vocabulario: se queda en el espacio compartido,
+        # sin ajustar un TF-IDF para el par
+        def no_pairwise(*args, **kwargs):
+            raise AssertionError("TF-IDF por par con vocabulario cargado")
+
+        monkeypatch.setattr(hard_skills_scorer, "TfidfVectorizer", no_pairwise)
+        assert calculate_tfidf_similarity(["Python", "Rust"], ["Python"]) == \
+            loaded.similarity(["Python", "Rust"], ["Python"])
+    finally:
+        set_skill_vocabulary(previous)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
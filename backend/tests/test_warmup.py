@@ -0,0 +1,84 @@
+"""
+Test del precalentamiento al arranque
+Verifica que el readiness espera al precalentamiento, que se registran los
+tiempos por componente y que un componente requerido que falla deja la
+instancia viva pero no lista
+"""
+
+import asyncio
+import os
+import sys
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import Response
+
+import app.main as main
+import app.services.warmup_service as warmup_service
+from app.services.warmup_service import WarmupService
+
+
+def _fresh_service() -> WarmupService:
+    service = WarmupService()
+    service._reset()
+    return service
+
+
+def test_warmup_loads_components_and_becomes_ready():
+    service = _fresh_service()
+    assert service.status()['warmup'] == 'pending'
+    assert service.is_live and not service.is_ready
+
+    asyncio.run(service.run())
+
+    state = service.status()
+    assert state['ready'] and state['warmup'] == 'ready'
+    for name in ('ml_model', 'ml_prediction', 'nlp'):
+        component = state['components'][name]
+        assert component['status'] == 'ready'
+        assert component['seconds'] is not None
+    assert state['components']['ml_prediction']['detail']['rows'] == warmup_service.WARMUP_BATCH_SIZE
+
+
+def test_required_failure_keeps_instance_not_ready(monkeypatch):
+    def broken_nlp():
+        raise OSError("modelo spaCy no instalado")
+
+    monkeypatch.setattr(warmup_service, "_load_nlp", broken_nlp)
+    service = _fresh_service()
+    asyncio.run(service.run())
+
+    state = service.status()
+    assert state['live'] and not state['ready']
+    assert state['warmup'] == 'degraded'
+    assert state['components']['nlp']['status'] == 'failed'
+    assert "spaCy" in state['components']['nlp']['error']
+
+    response = Response()
+    main.readiness_check(response)
+    assert response.status_code == 503
+    assert main.liveness_check() == {"live": True}
+
+
+def test_optional_failure_does_not_block_readiness(monkeypatch):
+    def broken_cache():
+        raise ConnectionError("BD no disponible")
+
+    monkeypatch.setattr(warmup_service, "_prime_skill_index", broken_cache)
+    service = _fresh_service()
+    asyncio.run(service.run())
+
+    assert service.is_ready
+    assert service.status()['components']['skill_index']['status'] == 'failed'
+
+    response = Response()
+    body = main.readiness_check(response)
+    assert response.status_code == 200
+    assert body['ready']
+    assert main.health_check()['components']['ml_model']['status'] == 'ready'
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
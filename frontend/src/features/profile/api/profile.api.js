@@ -15,13 +15,37 @@ export const getProfileCompleteness = async () => {
     return response.data
 }
 
-export const uploadCV = async (file) => {
+const CV_JOB_POLL_MS = 1000
+
+const wait = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
+export const getCVJob = async (jobId) => {
+    const response = await api.get(`/api/profile/cv-jobs/${jobId}`)
+    return response.data
+}
+
+// Encola el CV (202 + job_id) y consulta el job hasta que termina.
+// Devuelve el mismo resultado que /upload-cv: { message, perfil, extraction_summary }
+export const uploadCV = async (file, { onProgress } = {}) => {
     const formData = new FormData()
     formData.append('file', file)
-    const response = await api.post('/api/profile/upload-cv', formData, {
+    const response = await api.post('/api/profile/upload-cv/jobs', formData, {
         headers: { 'Content-Type': 'multipart/form-data' }
     })
-    return response.data
+
+    const jobId = response.data.job_id
+    for (;;) {
+        const job = await getCVJob(jobId)
+        onProgress?.(job)
+        if (job.status === 'done') return job.result
+        if (job.status === 'failed') {
+            // Misma forma que un error de axios para formatApiError
+            const error = new Error(job.error || 'Error procesando el CV')
+            error.response = { data: { detail: job.error || 'Error procesando el CV' } }
+            throw error
+        }
+        await wait(CV_JOB_POLL_MS)
+    }
 }
 
 export const deleteMyProfile = async () => {